@@ -0,0 +1,158 @@
+"""
+=============================================================================
+SCRIPT NAME: bench_action_parser.py
+=============================================================================
+
+Micro-benchmark: single-pass ActionParser vs the old regex parse_actions.
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+Replays agent replies rebuilt from the gold workspaces (one <write_file>
+per generated file, then <done>) and a set of adversarial replies:
+a missing closing tag in a large reply, thousands of unclosed openers,
+'<' floods and a reply streamed one character at a time. Each input is
+parsed by the legacy eight-regex parser and by ActionParser; timings are
+printed per input size so growth (linear vs super-linear) is visible.
+
+USAGE:
+    python benchmarks/bench_action_parser.py
+    python benchmarks/bench_action_parser.py --gold-dir gold --sizes 10000 100000 1000000
+
+=============================================================================
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vibe_eval.action_parser import ActionParser, AgentAction, parse_actions  # noqa: E402
+
+
+def legacy_parse_actions(response: str) -> AgentAction:
+    """The regex-based parse_actions this parser replaced (for comparison)."""
+    action = AgentAction()
+    for match in re.finditer(r'<write_file\s+path="([^"]+)">(.*?)</write_file>', response, re.DOTALL):
+        action.files_to_write[match.group(1)] = match.group(2).strip()
+    for match in re.finditer(r'<read_file\s+path="([^"]+)"\s*/>', response):
+        action.files_to_read.append(match.group(1))
+    for match in re.finditer(r'<list_files\s+path="([^"]+)"\s*/>', response):
+        action.dirs_to_list.append(match.group(1))
+    for match in re.finditer(r'<run_command>(.*?)</run_command>', response, re.DOTALL):
+        command = match.group(1).strip()
+        if command:
+            action.commands_to_run.append(command)
+    if '<run_tests/>' in response or '<run_tests>' in response:
+        action.run_tests = True
+    for match in re.finditer(r'<lint_code\s+path="([^"]+)"\s*/>', response):
+        action.lint_files.append(match.group(1))
+    if '<lint_code/>' in response:
+        action.lint_files.append("")
+    for match in re.finditer(r'<web_search\s+query="([^"]+)"\s*/>', response):
+        action.web_searches.append(match.group(1))
+    done_match = re.search(r'<done>(.*?)</done>', response, re.DOTALL)
+    if done_match:
+        action.is_done = True
+        action.done_message = done_match.group(1).strip()
+    return action
+
+
+def gold_transcripts(gold_dir: Path) -> list[str]:
+    """Rebuild one agent reply per gold workspace."""
+    transcripts = []
+    for workspace in sorted(p for p in gold_dir.glob("*/*/*") if p.is_dir()):
+        parts = ["I'll build this now.\n"]
+        for path in sorted(workspace.rglob("*")):
+            if path.is_file():
+                rel = path.relative_to(workspace)
+                parts.append(f'<write_file path="{rel}">\n{path.read_text(errors="replace")}\n</write_file>\n')
+        parts.append("<run_command>ls</run_command>\n<done>Built it.</done>")
+        transcripts.append("".join(parts))
+    return transcripts
+
+
+def adversarial_inputs(size: int) -> dict[str, str]:
+    """Replies designed to trigger worst-case behaviour, each about `size` chars."""
+    body = "x = 1  # filler\n" * (size // 16)
+    return {
+        "missing closing tag": f'<write_file path="big.py">{body}',
+        "unclosed openers": '<write_file path="a">' * (size // 21),
+        "unclosed commands": "<run_command>ls " * (size // 16),
+        "'<' flood": "<" * size,
+        "long attribute": '<write_file path="' + "a" * size,
+    }
+
+
+def time_call(func: Callable[[], object], min_seconds: float = 0.05) -> float:
+    """Best-of-3 seconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        runs = 0
+        start = time.perf_counter()
+        while True:
+            func()
+            runs += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_seconds or elapsed > 1.0:
+                break
+        best = min(best, elapsed / runs)
+    return best
+
+
+def streamed(text: str, chunk: int) -> AgentAction:
+    parser = ActionParser()
+    for i in range(0, len(text), chunk):
+        parser.feed(text[i:i + chunk])
+    return parser.finish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("DESCRIPTION:")[0])
+    parser.add_argument("--gold-dir", default="gold", help="Directory of gold runs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 400_000])
+    parser.add_argument("--legacy-timeout", type=float, default=5.0,
+                        help="Skip legacy timing for an input once it exceeds this many seconds")
+    args = parser.parse_args()
+
+    gold_dir = Path(args.gold_dir)
+    transcripts = gold_transcripts(gold_dir) if gold_dir.exists() else []
+    if transcripts:
+        total = sum(len(t) for t in transcripts)
+        mismatches = sum(
+            1 for t in transcripts
+            if legacy_parse_actions(t).files_to_write != parse_actions(t).files_to_write
+        )
+        legacy = time_call(lambda: [legacy_parse_actions(t) for t in transcripts])
+        single = time_call(lambda: [parse_actions(t) for t in transcripts])
+        stream = time_call(lambda: [streamed(t, 16) for t in transcripts])
+        print(f"Gold transcripts: {len(transcripts)} replies, {total / 1000:.0f} KB, "
+              f"{mismatches} mismatches")
+        print(f"  legacy regex       {legacy * 1000:9.2f} ms")
+        print(f"  ActionParser       {single * 1000:9.2f} ms")
+        print(f"  streamed (16 B)    {stream * 1000:9.2f} ms")
+        print()
+
+    print(f"{'input':<22}{'size':>10}{'legacy ms':>12}{'parser ms':>12}{'streamed ms':>13}")
+    slow_legacy = set()
+    for size in args.sizes:
+        for name, text in adversarial_inputs(size).items():
+            if name in slow_legacy:
+                legacy_ms = "skipped"
+            else:
+                legacy = time_call(lambda: legacy_parse_actions(text), min_seconds=0)
+                legacy_ms = f"{legacy * 1000:.2f}"
+                if legacy > args.legacy_timeout:
+                    slow_legacy.add(name)
+            single = time_call(lambda: parse_actions(text), min_seconds=0)
+            stream = time_call(lambda: streamed(text, 64), min_seconds=0)
+            print(f"{name:<22}{len(text):>10}{legacy_ms:>12}{single * 1000:>12.2f}{stream * 1000:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+=============================================================================
+SCRIPT NAME: bench_page_snapshot.py
+=============================================================================
+
+Benchmark: cold page loads vs restored page snapshots for HTML tests.
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+Runs every gold HTML workspace's functional tests twice with
+FunctionalTestRunner: once loading the app cold for every test and once
+with snapshot=True. For each case it reports how many tests were
+read-only (eligible for the snapshot), the mean per-test time of those
+tests on both paths, the one-off capture load, and any test whose
+pass/fail differs between the two runs (there should be none).
+
+Without Playwright only the read-only classification is printed.
+
+USAGE:
+    python benchmarks/bench_page_snapshot.py
+    python benchmarks/bench_page_snapshot.py --gold-dir gold --cases case_03_calculator
+
+=============================================================================
+"""
+
+import argparse
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vibe_eval.sandbox.browser import shutdown_browser_thread  # noqa: E402
+from vibe_eval.sandbox.snapshot import is_read_only  # noqa: E402
+from vibe_eval.sandbox.test_runner import FunctionalTestRunner  # noqa: E402
+
+
+def html_workspaces(gold_dir: Path, cases_dir: Path, only: list[str]) -> list[tuple[str, Path, Path]]:
+    """(case, workspace, tests.py) for each gold workspace containing HTML."""
+    found = []
+    for workspace in sorted(p for p in gold_dir.glob("*/*/*") if p.is_dir()):
+        case = workspace.parent.name
+        test_file = cases_dir / case / "tests.py"
+        if only and case not in only:
+            continue
+        if test_file.exists() and any(workspace.rglob("*.html")):
+            found.append((case, workspace, test_file))
+    return found
+
+
+def playwright_available() -> bool:
+    return importlib.util.find_spec("playwright") is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("DESCRIPTION:")[0])
+    parser.add_argument("--gold-dir", default="gold", help="Directory of gold runs")
+    parser.add_argument("--cases-dir", default="eval_cases", help="Directory of eval cases")
+    parser.add_argument("--cases", nargs="*", default=[], help="Only these cases")
+    args = parser.parse_args()
+
+    workspaces = html_workspaces(Path(args.gold_dir), Path(args.cases_dir), args.cases)
+    if not workspaces:
+        print("No gold HTML workspaces with tests found")
+        return
+
+    runner = FunctionalTestRunner()
+    if not playwright_available():
+        print("Playwright not installed: read-only classification only\n")
+        print(f"{'case':<26}{'tests':>7}{'read-only':>11}")
+        for case, _, test_file in workspaces:
+            tests = runner._load_test_functions(test_file)
+            read_only = sum(1 for _, func in tests if is_read_only(func))
+            print(f"{case:<26}{len(tests):>7}{read_only:>11}")
+        return
+
+    cold_runner = FunctionalTestRunner(snapshot=False)
+    snapshot_runner = FunctionalTestRunner(snapshot=True)
+    print(f"{'case':<26}{'tests':>7}{'read-only':>11}{'cold ms/test':>14}"
+          f"{'snapshot ms/test':>18}{'capture ms':>12}{'run s cold/snap':>17}  mismatches")
+    saved_ms = 0.0
+    try:
+        for case, workspace, test_file in workspaces:
+            start = time.perf_counter()
+            cold = cold_runner.run_tests(workspace, test_file)
+            cold_s = time.perf_counter() - start
+            start = time.perf_counter()
+            snap = snapshot_runner.run_tests(workspace, test_file)
+            snap_s = time.perf_counter() - start
+
+            restored = [r.name for r in snap.results if r.from_snapshot]
+            cold_by_name = {r.name: r for r in cold.results}
+            cold_ms = [cold_by_name[n].duration_ms for n in restored if n in cold_by_name]
+            snap_ms = [r.duration_ms for r in snap.results if r.from_snapshot]
+            mismatches = [
+                r.name for r in snap.results
+                if r.name in cold_by_name and r.passed != cold_by_name[r.name].passed
+            ]
+            # Capture time is the snapshot run's overhead beyond its tests
+            capture_ms = snap_s * 1000 - sum(r.duration_ms for r in snap.results)
+            mean = (lambda xs: sum(xs) / len(xs) if xs else 0.0)
+            saved_ms += sum(cold_ms) - sum(snap_ms)
+            print(f"{case:<26}{len(snap.results):>7}{len(restored):>11}{mean(cold_ms):>14.1f}"
+                  f"{mean(snap_ms):>18.1f}{capture_ms:>12.1f}{cold_s:>8.2f}/{snap_s:<8.2f}  "
+                  f"{', '.join(mismatches) or '-'}")
+    finally:
+        FunctionalTestRunner.cleanup()
+        shutdown_browser_thread()
+    print(f"\nRead-only test time saved: {saved_ms / 1000:.2f} s (before capture cost)")
+
+
+if __name__ == "__main__":
+    main()
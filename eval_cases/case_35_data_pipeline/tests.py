@@ -1,11 +1,10 @@
 """
 Functional tests for Data Pipeline (case_35_data_pipeline).
 
-Tests verify the pipeline processes data correctly.
+Tests verify the pipeline processes data correctly. The pipeline runs once
+(run_once fixture) and every test inspects that run's output files.
 """
 import json
-import subprocess
-import sys
 from pathlib import Path
 
 
@@ -16,68 +15,41 @@ def test_pipeline_file_exists(workspace: Path, main_file: Path):
         "pipeline.py not found"
 
 
-def test_pipeline_runs_without_error(workspace: Path, main_file: Path):
+def test_pipeline_runs_without_error(workspace: Path, main_file: Path, run_once):
     """Pipeline should execute successfully."""
-    result = subprocess.run(
-        [sys.executable, str(main_file)],
-        capture_output=True,
-        text=True,
-        cwd=str(workspace),
-        timeout=30
-    )
+    result = run_once()
     assert result.returncode == 0, f"Pipeline failed: {result.stderr}"
 
 
-def test_creates_valid_employees_file(workspace: Path, main_file: Path):
+def test_creates_valid_employees_file(workspace: Path, main_file: Path, run_once):
     """Should create valid_employees.json."""
-    # Run pipeline first
-    subprocess.run(
-        [sys.executable, str(main_file)],
-        capture_output=True,
-        cwd=str(workspace),
-        timeout=30
-    )
+    run = run_once()
     
-    output_file = workspace / "valid_employees.json"
+    output_file = run.path("valid_employees.json")
     assert output_file.exists(), "valid_employees.json not created"
 
 
-def test_creates_invalid_records_file(workspace: Path, main_file: Path):
+def test_creates_invalid_records_file(workspace: Path, main_file: Path, run_once):
     """Should create invalid_records.json."""
-    subprocess.run(
-        [sys.executable, str(main_file)],
-        capture_output=True,
-        cwd=str(workspace),
-        timeout=30
-    )
+    run = run_once()
     
-    output_file = workspace / "invalid_records.json"
+    output_file = run.path("invalid_records.json")
     assert output_file.exists(), "invalid_records.json not created"
 
 
-def test_creates_department_summary_file(workspace: Path, main_file: Path):
+def test_creates_department_summary_file(workspace: Path, main_file: Path, run_once):
     """Should create department_summary.json."""
-    subprocess.run(
-        [sys.executable, str(main_file)],
-        capture_output=True,
-        cwd=str(workspace),
-        timeout=30
-    )
+    run = run_once()
     
-    output_file = workspace / "department_summary.json"
+    output_file = run.path("department_summary.json")
     assert output_file.exists(), "department_summary.json not created"
 
 
-def test_valid_employees_has_transformations(workspace: Path, main_file: Path):
+def test_valid_employees_has_transformations(workspace: Path, main_file: Path, run_once):
     """Valid employees should have transformation fields."""
-    subprocess.run(
-        [sys.executable, str(main_file)],
-        capture_output=True,
-        cwd=str(workspace),
-        timeout=30
-    )
+    run = run_once()
     
-    output_file = workspace / "valid_employees.json"
+    output_file = run.path("valid_employees.json")
     if output_file.exists():
         data = json.loads(output_file.read_text())
         if len(data) > 0:
@@ -89,16 +61,11 @@ def test_valid_employees_has_transformations(workspace: Path, main_file: Path):
                 "Missing transformation fields (email_domain, salary_band)"
 
 
-def test_invalid_records_has_errors(workspace: Path, main_file: Path):
+def test_invalid_records_has_errors(workspace: Path, main_file: Path, run_once):
     """Invalid records should include error reasons."""
-    subprocess.run(
-        [sys.executable, str(main_file)],
-        capture_output=True,
-        cwd=str(workspace),
-        timeout=30
-    )
+    run = run_once()
     
-    output_file = workspace / "invalid_records.json"
+    output_file = run.path("invalid_records.json")
     if output_file.exists():
         data = json.loads(output_file.read_text())
         if len(data) > 0:
@@ -107,16 +74,11 @@ def test_invalid_records_has_errors(workspace: Path, main_file: Path):
             assert has_errors, "Invalid records missing error reasons"
 
 
-def test_catches_invalid_email(workspace: Path, main_file: Path):
+def test_catches_invalid_email(workspace: Path, main_file: Path, run_once):
     """Should catch invalid email formats."""
-    subprocess.run(
-        [sys.executable, str(main_file)],
-        capture_output=True,
-        cwd=str(workspace),
-        timeout=30
-    )
+    run = run_once()
     
-    output_file = workspace / "invalid_records.json"
+    output_file = run.path("invalid_records.json")
     if output_file.exists():
         content = output_file.read_text().lower()
         # Jane Doe or Henry Taylor have invalid emails
@@ -124,16 +86,11 @@ def test_catches_invalid_email(workspace: Path, main_file: Path):
         assert has_email_error, "Did not catch invalid email"
 
 
-def test_catches_invalid_age(workspace: Path, main_file: Path):
+def test_catches_invalid_age(workspace: Path, main_file: Path, run_once):
     """Should catch invalid age (negative)."""
-    subprocess.run(
-        [sys.executable, str(main_file)],
-        capture_output=True,
-        cwd=str(workspace),
-        timeout=30
-    )
+    run = run_once()
     
-    output_file = workspace / "invalid_records.json"
+    output_file = run.path("invalid_records.json")
     if output_file.exists():
         content = output_file.read_text().lower()
         # Eve Johnson has age -5
@@ -141,16 +98,11 @@ def test_catches_invalid_age(workspace: Path, main_file: Path):
         assert has_age_error, "Did not catch invalid age"
 
 
-def test_department_summary_has_aggregates(workspace: Path, main_file: Path):
+def test_department_summary_has_aggregates(workspace: Path, main_file: Path, run_once):
     """Department summary should have aggregated stats."""
-    subprocess.run(
-        [sys.executable, str(main_file)],
-        capture_output=True,
-        cwd=str(workspace),
-        timeout=30
-    )
+    run = run_once()
     
-    output_file = workspace / "department_summary.json"
+    output_file = run.path("department_summary.json")
     if output_file.exists():
         data = json.loads(output_file.read_text())
         # Should have departments with counts
@@ -0,0 +1,203 @@
+"""
+=============================================================================
+SCRIPT NAME: test_action_parser.py
+=============================================================================
+
+Tests for the single-pass action parser.
+
+Tests cover:
+- Same actions as the old regex parser on well-formed replies
+- Incremental feeding (any split gives the same result)
+- Opaque block bodies
+- Diagnostics for malformed and unclosed tags
+- Linear-time behaviour on adversarial replies
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import re
+import time
+
+import pytest
+
+from vibe_eval.action_parser import MAX_TAG_LENGTH, ActionParser, AgentAction, parse_actions
+
+
+def legacy_parse_actions(response: str) -> AgentAction:
+    """Reference copy of the regex parser ActionParser replaced."""
+    action = AgentAction()
+    for match in re.finditer(r'<write_file\s+path="([^"]+)">(.*?)</write_file>', response, re.DOTALL):
+        action.files_to_write[match.group(1)] = match.group(2).strip()
+    for match in re.finditer(r'<read_file\s+path="([^"]+)"\s*/>', response):
+        action.files_to_read.append(match.group(1))
+    for match in re.finditer(r'<list_files\s+path="([^"]+)"\s*/>', response):
+        action.dirs_to_list.append(match.group(1))
+    for match in re.finditer(r'<run_command>(.*?)</run_command>', response, re.DOTALL):
+        command = match.group(1).strip()
+        if command:
+            action.commands_to_run.append(command)
+    if '<run_tests/>' in response or '<run_tests>' in response:
+        action.run_tests = True
+    for match in re.finditer(r'<lint_code\s+path="([^"]+)"\s*/>', response):
+        action.lint_files.append(match.group(1))
+    if '<lint_code/>' in response:
+        action.lint_files.append("")
+    for match in re.finditer(r'<web_search\s+query="([^"]+)"\s*/>', response):
+        action.web_searches.append(match.group(1))
+    done_match = re.search(r'<done>(.*?)</done>', response, re.DOTALL)
+    if done_match:
+        action.is_done = True
+        action.done_message = done_match.group(1).strip()
+    return action
+
+
+WELL_FORMED = [
+    '<write_file path="app.py">\nprint("hi")\n</write_file>\n<run_command>python app.py</run_command>',
+    'Let me look.\n<read_file path="app.py"/>\n<list_files path="."/>',
+    '<run_tests/>\n<lint_code path="app.py"/>\n<web_search query="flask routing"/>',
+    '<write_file path="index.html"><!DOCTYPE html>\n<p>a &lt; b</p></write_file><done>\nAll set.\n</done>',
+    '<write_file path="a.py">a</write_file><write_file path="a.py">b</write_file><run_tests>',
+    'if x < 3 and y > 2: <done>fine</done>',
+    'No actions here, just prose with <b>html</b>.',
+    '<web_search query="a > b"/>\n<read_file path="x<y>.py"/>\n<write_file path="a>b.txt">hi</write_file>',
+]
+
+
+def fields(action: AgentAction) -> tuple:
+    return (
+        action.files_to_write, action.files_to_read, action.dirs_to_list,
+        action.commands_to_run, action.run_tests, action.lint_files,
+        action.web_searches, action.is_done, action.done_message,
+    )
+
+
+class TestLegacyEquivalence:
+    """ActionParser agrees with the old parser on well-formed replies."""
+
+    @pytest.mark.parametrize("reply", WELL_FORMED)
+    def test_same_actions(self, reply):
+        assert fields(parse_actions(reply)) == fields(legacy_parse_actions(reply))
+        assert parse_actions(reply).diagnostics == []
+
+
+class TestIncremental:
+    """Tests for feed()."""
+
+    @pytest.mark.parametrize("reply", WELL_FORMED)
+    @pytest.mark.parametrize("size", [1, 2, 5, 13])
+    def test_any_split_matches_one_shot(self, reply, size):
+        parser = ActionParser()
+        for i in range(0, len(reply), size):
+            parser.feed(reply[i:i + size])
+
+        assert fields(parser.finish()) == fields(parse_actions(reply))
+        assert parser.text == reply
+
+    def test_closing_tag_split_across_deltas(self):
+        parser = ActionParser()
+
+        assert parser.feed('<run_command>ls</run_') == []
+        assert parser.feed('comm') == []
+        assert parser.feed('and>')[0].commands_to_run == ["ls"]
+
+    def test_feed_after_finish_rejected(self):
+        parser = ActionParser()
+        parser.finish()
+
+        with pytest.raises(RuntimeError):
+            parser.feed("more")
+
+
+class TestOpaqueBodies:
+    """Tags inside a block body are content, not actions."""
+
+    def test_nested_tags_ignored(self):
+        action = parse_actions(
+            '<write_file path="NOTES.md">Use <run_command>make</run_command> and '
+            '<read_file path="x"/> then <done>no</done></write_file>'
+        )
+
+        assert action.commands_to_run == []
+        assert action.files_to_read == []
+        assert not action.is_done
+        assert "<run_command>make</run_command>" in action.files_to_write["NOTES.md"]
+
+    def test_first_done_wins(self):
+        action = parse_actions("<done>first</done><done>second</done>")
+
+        assert action.done_message == "first"
+
+
+class TestDiagnostics:
+    """Malformed tags are reported instead of silently dropped."""
+
+    def test_unclosed_block_rescanned_as_text(self):
+        action = parse_actions('<write_file path="a.py">x = 1\n<read_file path="b.py"/>')
+
+        assert action.files_to_write == {}
+        assert action.files_to_read == ["b.py"]
+        assert action.diagnostics == ["unclosed <write_file> (no </write_file> before end of response) at offset 0"]
+
+    def test_missing_path(self):
+        action = parse_actions('<write_file>x</write_file><read_file/>')
+
+        assert action.files_to_write == {}
+        assert any('missing path="..."' in d for d in action.diagnostics)
+        assert any("<read_file/>" in d for d in action.diagnostics)
+
+    def test_stray_closer(self):
+        assert parse_actions("done</done>").diagnostics == ["stray </done> without an opening tag at offset 4"]
+
+    def test_read_file_must_self_close(self):
+        action = parse_actions('<read_file path="a.py">')
+
+        assert action.files_to_read == []
+        assert action.diagnostics == ["<read_file> must be self-closing (<read_file .../>) at offset 0"]
+
+    def test_unquoted_attribute(self):
+        action = parse_actions("<write_file path=a.py>x</write_file>")
+
+        assert action.files_to_write == {}
+        assert action.diagnostics[0] == 'malformed <write_file> tag (attributes are name="value") at offset 0'
+
+    def test_unterminated_quote(self):
+        action = parse_actions('Searching. <web_search query="a > b/>')
+
+        assert action.web_searches == []
+        assert action.diagnostics == ['malformed <web_search> tag (attributes are name="value") at offset 11']
+
+    def test_unknown_tags_are_silent(self):
+        assert parse_actions("<div>hello</div><br/>").diagnostics == []
+
+
+class TestWorstCase:
+    """Adversarial replies parse in roughly linear time."""
+
+    SIZE = 200_000
+
+    @pytest.mark.parametrize("reply", [
+        '<write_file path="a">' * (SIZE // 21),
+        "<run_command>ls " * (SIZE // 16),
+        "<" * SIZE,
+        '<write_file path="big.py">' + "x = 1\n" * (SIZE // 6),
+        '<read_file path="' + "a" * SIZE,
+        '<read_file path="a > ' * (SIZE // 20),
+    ], ids=["unclosed-openers", "unclosed-commands", "lt-flood", "missing-closer", "long-attribute", "quoted-gt"])
+    def test_bounded_time(self, reply):
+        start = time.perf_counter()
+        parse_actions(reply)
+        parser = ActionParser()
+        for i in range(0, len(reply), 64):
+            parser.feed(reply[i:i + 64])
+        parser.finish()
+
+        # The old parser took seconds on the first two; allow a wide margin
+        assert time.perf_counter() - start < 2.0
+
+    def test_overlong_tag_is_text(self):
+        action = parse_actions('<read_file path="' + "a" * MAX_TAG_LENGTH + '"/>')
+
+        assert action.files_to_read == []
@@ -0,0 +1,179 @@
+"""
+=============================================================================
+SCRIPT NAME: test_async_agent_loop.py
+=============================================================================
+
+Tests for AsyncAgentLoop.
+
+Tests cover:
+- Same AgentResult and metrics as AgentLoop.run() for a scripted session
+- Sync-only adapters and streamed replies with early actions
+- The session timeout cancelling a model call in flight
+- Errors reported like run()
+- Hundreds of sessions on one event loop without a thread each
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import asyncio
+import threading
+import time
+
+from vibe_eval.agent_loop import AgentLoop, AsyncAgentLoop
+from vibe_eval.models.base import AsyncBaseModel, BaseModel, ModelResponse
+
+REPLIES = [
+    '<write_file path="main.py">print("hi")</write_file>'
+    '<run_command>python main.py</run_command>',
+    '<write_file path="main.py">print("hello")</write_file><read_file path="main.py"/>',
+    'Thinking it over.',
+    '<done>ok</done>',
+]
+
+
+class ScriptedModel(BaseModel):
+    """Sync adapter replaying fixed replies."""
+
+    def __init__(self, replies=REPLIES):
+        self.replies = list(replies)
+
+    def complete(self, messages):
+        return ModelResponse(
+            content=self.replies.pop(0), model="scripted", usage={"input_tokens": 10, "output_tokens": 2},
+        )
+
+    @property
+    def name(self):
+        return "scripted"
+
+    @property
+    def provider(self):
+        return "test"
+
+
+class AsyncScriptedModel(AsyncBaseModel):
+    """Async adapter replaying fixed replies after a delay."""
+
+    def __init__(self, replies=REPLIES, delay: float = 0.0):
+        self.replies = list(replies)
+        self.delay = delay
+
+    async def acomplete(self, messages):
+        await asyncio.sleep(self.delay)
+        return ModelResponse(
+            content=self.replies.pop(0), model="scripted", usage={"input_tokens": 10, "output_tokens": 2},
+        )
+
+    async def acomplete_stream(self, messages, on_text):
+        response = await self.acomplete(messages)
+        for i in range(0, len(response.content), 5):
+            on_text(response.content[i:i + 5])
+            await asyncio.sleep(0)
+        return response
+
+    @property
+    def name(self):
+        return "scripted"
+
+    @property
+    def provider(self):
+        return "test"
+
+
+def summary(result):
+    metrics = result.metrics.to_dict()
+    for key in ("time_to_first_token", "time_to_first_action", "model_seconds", "tool_seconds"):
+        metrics.pop(key)
+    return (
+        result.completed, result.turns, sorted(result.files_created), result.error,
+        result.total_input_tokens, result.total_output_tokens,
+        [m.content for m in result.conversation], metrics,
+    )
+
+
+class TestContract:
+    """AsyncAgentLoop.arun() matches AgentLoop.run()."""
+
+    def test_same_result_as_run(self, tmp_path):
+        sync = AgentLoop(ScriptedModel(), "spec", workspace=tmp_path / "a").run()
+        result = asyncio.run(AsyncAgentLoop(AsyncScriptedModel(), "spec", workspace=tmp_path / "b").arun())
+
+        assert summary(result) == summary(sync)
+        assert result.completed and result.turns == 4
+        assert result.metrics.backtrack_count == 1 and result.metrics.planning_turns == 1
+
+    def test_sync_adapter(self, tmp_path):
+        result = asyncio.run(AsyncAgentLoop(ScriptedModel(), "spec", workspace=tmp_path).arun())
+
+        assert result.completed and (tmp_path / "main.py").read_text() == 'print("hello")'
+
+    def test_streaming_runs_actions_early(self, tmp_path):
+        loop = AsyncAgentLoop(AsyncScriptedModel(), "spec", workspace=tmp_path, stream=True)
+
+        result = asyncio.run(loop.arun())
+
+        assert result.completed and result.metrics.commands_run == 1
+        assert result.metrics.early_actions == 4
+        assert "hi" in result.conversation[3].content
+
+    def test_error_reported(self, tmp_path):
+        result = asyncio.run(AsyncAgentLoop(AsyncScriptedModel(replies=[]), "spec", workspace=tmp_path).arun())
+
+        assert not result.completed and result.error == "pop from empty list"
+        assert result.metrics.errors_encountered == 1
+
+
+class TestTimeout:
+    """The session timeout cancels the turn in progress."""
+
+    def test_cancels_slow_model_call(self, tmp_path):
+        loop = AsyncAgentLoop(AsyncScriptedModel(delay=60), "spec", workspace=tmp_path, timeout_minutes=0.01)
+
+        start = time.time()
+        result = asyncio.run(loop.arun())
+
+        assert time.time() - start < 3
+        assert not result.completed and result.error is None and result.turns == 1
+
+    def test_kills_running_command(self, tmp_path):
+        replies = ['<run_command>sleep 60</run_command>', '<done>ok</done>']
+        loop = AsyncAgentLoop(AsyncScriptedModel(replies), "spec", workspace=tmp_path, timeout_minutes=0.01)
+
+        start = time.time()
+        result = asyncio.run(loop.arun())
+
+        assert time.time() - start < 3 and not result.completed
+
+
+class TestConcurrency:
+    """Many sessions on one event loop."""
+
+    def test_hundreds_of_sessions(self, tmp_path):
+        replies = ['<write_file path="a.txt">x</write_file>', 'Hmm.', '<done>ok</done>']
+        loops = [
+            AsyncAgentLoop(AsyncScriptedModel(replies, delay=0.2), "spec", workspace=tmp_path / str(i))
+            for i in range(200)
+        ]
+        threads_seen = []
+
+        async def run_all():
+            async def watch():
+                while True:
+                    threads_seen.append(threading.active_count())
+                    await asyncio.sleep(0.05)
+
+            watcher = asyncio.ensure_future(watch())
+            try:
+                return await asyncio.gather(*(loop.arun() for loop in loops))
+            finally:
+                watcher.cancel()
+
+        start = time.time()
+        results = asyncio.run(run_all())
+
+        assert all(r.completed and r.turns == 3 for r in results)
+        assert time.time() - start < 10  # Serially: 200 sessions x 3 calls x 0.2s
+        assert max(threads_seen) < 50
@@ -0,0 +1,196 @@
+"""
+=============================================================================
+SCRIPT NAME: test_async_executor.py
+=============================================================================
+
+Tests for the asyncio sandbox executor.
+
+Tests cover:
+- Which commands count as read-only and how a turn is batched
+- arun() matching run(): output, blocking, budget and timeouts
+- Concurrent batches finishing together with results in command order
+- Many commands sharing one event loop
+- Per-command CPU limits
+- AgentLoop(parallel_commands=True) feedback order and metrics
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from vibe_eval.agent_loop import AgentLoop
+from vibe_eval.models.base import BaseModel, ModelResponse
+from vibe_eval.models.pool import close_shared_clients
+from vibe_eval.sandbox.async_executor import AsyncSandboxExecutor, is_read_only, plan_batches
+from vibe_eval.sandbox.executor import SandboxExecutor
+from vibe_eval.sandbox.isolation import ResourceLimits
+
+SLOW_TEST = "python -m unittest -q slow_test"
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "main.py").write_text("print('hi')\n")
+    (tmp_path / "slow_test.py").write_text(
+        "import time, unittest\n\n"
+        "class T(unittest.TestCase):\n"
+        "    def test_slow(self):\n"
+        "        time.sleep(0.5)\n"
+    )
+    return tmp_path
+
+
+class TestPlanning:
+    """Tests for is_read_only() and plan_batches()."""
+
+    @pytest.mark.parametrize("command", [
+        "python -m unittest -v", "python3 -m pytest -q", "ruff check .", "ls -la | grep py",
+        "grep -i todo main.py && wc -l main.py", "python -m py_compile main.py",
+    ])
+    def test_read_only(self, command):
+        assert is_read_only(command)
+
+    @pytest.mark.parametrize("command", [
+        "python main.py", "python -c 'print(1)'", "ruff check --fix .", "ls > files.txt",
+        "rm -rf build", "pytest; rm log.txt", "find . -delete", "python -m http.server",
+        "cat 'unterminated",
+    ])
+    def test_may_write(self, command):
+        assert not is_read_only(command)
+
+    def test_batches_split_at_writers(self):
+        commands = ["ruff check .", "python -m unittest", "python main.py", "ls", "cat main.py", "rm x"]
+
+        assert plan_batches(commands) == [[0, 1], [2], [3, 4], [5]]
+
+
+class TestArun:
+    """arun() reports like run()."""
+
+    @pytest.mark.parametrize("command", [
+        "python main.py", "echo out; echo err >&2; exit 3", "python missing.py", "pip install requests",
+    ])
+    def test_same_result_as_run(self, workspace, command):
+        executor = AsyncSandboxExecutor(workspace)
+
+        assert asyncio.run(executor.arun(command)) == SandboxExecutor(workspace).run(command)
+
+    def test_output_budget(self, workspace):
+        executor = AsyncSandboxExecutor(workspace, timeout=30, max_output_bytes=100_000)
+
+        result = asyncio.run(executor.arun("yes"))
+
+        assert result.output_limited and not result.success
+        assert 100_000 < result.output_bytes < 300_000
+
+    def test_timeout_kills_group(self, workspace):
+        executor = AsyncSandboxExecutor(workspace, timeout=1)
+
+        start = time.time()
+        result = asyncio.run(executor.arun("sleep 30 | cat"))
+
+        assert result.timed_out and result.return_code == -1
+        assert time.time() - start < 5
+
+    @pytest.mark.skipif(os.name != "posix", reason="rlimits are POSIX-only")
+    def test_cpu_limit(self, workspace):
+        executor = AsyncSandboxExecutor(
+            workspace, timeout=30, limits=ResourceLimits(cpu_seconds=1, memory_mb=None),
+        )
+
+        start = time.time()
+        result = asyncio.run(executor.arun("python -c 'while True: pass'"))
+
+        assert not result.success and not result.timed_out
+        assert time.time() - start < 10
+
+
+class TestConcurrency:
+    """Concurrent batches and shared event loops."""
+
+    def test_read_only_commands_overlap_in_order(self, workspace):
+        executor = AsyncSandboxExecutor(workspace)
+        commands = [SLOW_TEST, SLOW_TEST, "echo done"]
+
+        start = time.time()
+        results = asyncio.run(executor.arun_many(commands, concurrent=True))
+        elapsed = time.time() - start
+
+        assert [r.success for r in results] == [True, True, True]
+        assert results[2].stdout == "done\n"
+        assert elapsed < 0.95  # Sequentially at least 1s
+
+    def test_sequential_by_default(self, workspace):
+        executor = AsyncSandboxExecutor(workspace)
+
+        start = time.time()
+        asyncio.run(executor.arun_many([SLOW_TEST, SLOW_TEST]))
+
+        assert time.time() - start >= 1.0
+
+    def test_writer_waits_for_earlier_commands(self, workspace):
+        executor = AsyncSandboxExecutor(workspace)
+        commands = ["sleep 0.3; echo first > log.txt", "cat log.txt"]
+
+        results = asyncio.run(executor.arun_many(commands, concurrent=True))
+
+        assert results[1].stdout == "first\n"
+
+    def test_sessions_share_one_loop(self, tmp_path):
+        executors = [AsyncSandboxExecutor(tmp_path / f"s{i}") for i in range(8)]
+
+        async def run_all():
+            return await asyncio.gather(*(e.arun("sleep 0.5; pwd") for e in executors))
+
+        start = time.time()
+        results = asyncio.run(run_all())
+
+        assert [r.stdout.strip() for r in results] == [str(e.workspace) for e in executors]
+        assert time.time() - start < 2
+
+
+class ScriptedModel(BaseModel):
+    """Replies with one fixed turn, then finishes."""
+
+    def __init__(self, reply: str):
+        self.replies = [reply, "<done>ok</done>"]
+
+    def complete(self, messages):
+        return ModelResponse(content=self.replies.pop(0), model="scripted")
+
+    @property
+    def name(self):
+        return "scripted"
+
+    @property
+    def provider(self):
+        return "test"
+
+
+class TestAgentLoopParallel:
+    """Tests for AgentLoop(parallel_commands=True)."""
+
+    def test_feedback_in_command_order(self, workspace):
+        reply = (
+            f"<run_command>{SLOW_TEST}</run_command>"
+            "<run_command>echo second</run_command>"
+            "<run_command>python main.py</run_command>"
+        )
+        agent = AgentLoop(ScriptedModel(reply), "spec", workspace=workspace, parallel_commands=True)
+
+        try:
+            result = agent.run()
+        finally:
+            close_shared_clients()
+
+        feedback = agent.conversation[2].content
+        assert feedback.index(SLOW_TEST) < feedback.index("echo second") < feedback.index("python main.py")
+        assert result.metrics.commands_run == 3
+        assert result.metrics.concurrent_commands == 2
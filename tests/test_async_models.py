@@ -0,0 +1,153 @@
+"""
+=============================================================================
+SCRIPT NAME: test_async_models.py
+=============================================================================
+
+Tests for the async model adapters and the shared HTTP connection pool.
+
+Tests cover:
+- Sync complete() wrapper over acomplete()
+- Concurrent acomplete() calls overlapping on one event loop
+- Keep-alive connection reuse across adapter instances
+
+Uses a local OpenAI-compatible HTTP server, so no API key is needed.
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from vibe_eval.models.base import AsyncBaseModel, Message
+from vibe_eval.models.lmstudio import LMStudioModel
+from vibe_eval.models.pool import (
+    aclose_shared_client,
+    close_shared_clients,
+    run_sync,
+    shared_async_client,
+)
+
+
+class FakeChatServer(ThreadingHTTPServer):
+    """OpenAI-compatible /chat/completions endpoint that records client ports."""
+
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), FakeChatHandler)
+        self.delay = delay
+        self.client_ports: set[int] = set()
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+class FakeChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length))
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.client_ports.add(self.client_address[1])
+        time.sleep(self.server.delay)
+
+        body = json.dumps({
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": request["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": request["messages"][-1]["content"]},
+            }],
+            "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    fake = FakeChatServer(delay=0.05)
+    thread = threading.Thread(target=fake.serve_forever, daemon=True)
+    thread.start()
+    yield fake
+    fake.shutdown()
+    fake.server_close()
+    close_shared_clients()
+
+
+def make_model(server: FakeChatServer) -> LMStudioModel:
+    host, port = server.server_address
+    return LMStudioModel(model_id="test", base_url=f"http://{host}:{port}/v1")
+
+
+class TestAsyncAdapters:
+    """Tests for AsyncBaseModel adapters."""
+
+    def test_is_async_model(self, server):
+        assert isinstance(make_model(server), AsyncBaseModel)
+
+    def test_sync_wrapper(self, server):
+        response = make_model(server).complete([Message(role="user", content="hello")])
+
+        assert response.content == "hello"
+        assert response.usage == {"input_tokens": 3, "output_tokens": 2}
+
+    def test_concurrent_acomplete(self, server):
+        model = make_model(server)
+
+        async def run_all():
+            try:
+                # Warm up: building the first client can take longer than the requests
+                await model.acomplete([Message(role="user", content="warm-up")])
+                start = time.time()
+                responses = await asyncio.gather(*[
+                    model.acomplete([Message(role="user", content=str(i))])
+                    for i in range(8)
+                ])
+                return responses, time.time() - start
+            finally:
+                await aclose_shared_client()
+
+        responses, elapsed = asyncio.run(run_all())
+
+        assert [r.content for r in responses] == [str(i) for i in range(8)]
+        # Serial would be 8 × 0.05s
+        assert elapsed < 0.3
+
+
+class TestSharedPool:
+    """Tests for the process-wide connection pool."""
+
+    def test_connections_reused_across_models(self, server):
+        for i in range(5):
+            make_model(server).complete([Message(role="user", content=str(i))])
+
+        assert server.requests == 5
+        assert len(server.client_ports) == 1
+
+    def test_one_client_per_loop(self):
+        async def client_id():
+            return id(shared_async_client())
+
+        try:
+            assert run_sync(client_id()) == run_sync(client_id())
+        finally:
+            close_shared_clients()
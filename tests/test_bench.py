@@ -0,0 +1,165 @@
+"""
+=============================================================================
+SCRIPT NAME: test_bench.py
+=============================================================================
+
+Tests for the harness benchmark and its mock model server.
+
+Tests cover:
+- Loading recorded sessions, token counts and scores from the gold run
+- Agent and judge replies through the LM Studio adapter, plain and
+  streamed, with configured latency
+- Requests that match no recorded session failing loudly
+- Span statistics and report comparison
+- run_bench() driving EvalRunner end to end and saving its JSON
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from vibe_eval import tracing
+from vibe_eval.action_parser import parse_actions
+from vibe_eval.bench import (
+    GOLD_RUN,
+    JUDGE_MODEL,
+    MockModelServer,
+    RecordedSession,
+    compare_reports,
+    load_recorded_run,
+    run_bench,
+    span_stats,
+)
+from vibe_eval.models.base import Message
+from vibe_eval.models.lmstudio import LMStudioModel
+from vibe_eval.models.pool import close_shared_clients
+
+ROOT = Path(__file__).resolve().parent.parent
+SPEC = "Build a calculator with + - * / buttons."
+SESSION = RecordedSession(
+    case_name="calc",
+    model_id="recorded/model-1.0",
+    files={"index.html": "<html>calc</html>", "js/app.js": "let x = 1;"},
+    output_tokens=400,
+    scores={"executes": {"score": 8, "reason": "Runs"}},
+)
+
+
+@pytest.fixture
+def server():
+    with MockModelServer([SESSION], {"calc": SPEC}, latency_ms=100, tokens_per_second=4000) as server:
+        yield server
+    close_shared_clients()
+
+
+def ask(server, model_id: str, content: str, stream: bool = False):
+    model = LMStudioModel(model_id=model_id, base_url=server.base_url)
+    messages = [Message(role="user", content=content)]
+    if stream:
+        deltas = []
+        return model.complete_stream(messages, deltas.append), deltas
+    return model.complete(messages), None
+
+
+class TestRecordedRun:
+    """Tests for load_recorded_run()."""
+
+    def test_loads_gold_run(self):
+        sessions = load_recorded_run(ROOT / GOLD_RUN)
+
+        assert len(sessions) == 20
+        slides = next(s for s in sessions if s.case_name == "case_18_slides")
+        assert slides.model_id == "claude-opus-4.5"
+        assert "slides/slide1.txt" in slides.files and "slide_reporter.py" in slides.files
+        assert slides.output_tokens > 0 and slides.scores["executes"]["score"] >= 0
+
+    def test_reply_recreates_workspace(self):
+        actions = parse_actions(SESSION.reply())
+
+        assert actions.files_to_write == SESSION.files and actions.is_done
+
+
+class TestMockServer:
+    """Tests for MockModelServer through the LM Studio adapter."""
+
+    def test_agent_reply(self, server):
+        start = time.time()
+        response, _ = ask(server, "recorded/model-1.0", f"Build the following:\n\n{SPEC}")
+
+        assert response.content == SESSION.reply()
+        assert response.usage["output_tokens"] == 400
+        assert time.time() - start >= 0.2  # 100 ms latency + 400 tokens at 4000/s
+
+    def test_streamed_reply(self, server):
+        response, deltas = ask(server, "recorded/model-1.0", f"Build the following:\n\n{SPEC}", stream=True)
+
+        assert response.content == SESSION.reply() and len(deltas) > 10  # About one per 16 tokens
+        assert response.usage["output_tokens"] == 400
+
+    def test_judge_reply(self, server):
+        response, _ = ask(server, JUDGE_MODEL, f"## Original Spec:\n{SPEC}\n\n## Generated Code: ...")
+
+        scores = json.loads(response.content)
+        assert scores["executes"] == {"score": 8, "reason": "Runs"}
+        assert scores["code_quality"]["reason"] == "Not recorded"
+        assert server.stats["judge_requests"] == 1 and server.stats["agent_requests"] == 0
+
+    def test_unknown_request_fails(self, server):
+        with pytest.raises(Exception, match="No recorded session"):
+            ask(server, "other-model", f"Build the following:\n\n{SPEC}")
+
+        assert server.stats["failed_requests"] == 1
+
+
+class TestReport:
+    """Tests for span_stats() and compare_reports()."""
+
+    def test_span_stats(self):
+        spans = []
+        for ms in (10, 20, 30, 40):
+            span = tracing.span("stage.test")
+            span.start_ns, span.end_ns = 0, ms * 1_000_000
+            spans.append(span)
+
+        stats = span_stats(spans)["stage.test"]
+
+        assert stats == {"count": 4, "total_s": 0.1, "mean_ms": 25.0, "p50_ms": 25.0, "p95_ms": 40.0, "max_ms": 40.0}
+
+    def test_compare_reports(self):
+        baseline = {"sessions_per_minute": 10, "wall_seconds": 6, "stages": {"a": {"mean_ms": 5}, "b": {"mean_ms": 1}}}
+        current = {"sessions_per_minute": 12, "wall_seconds": 5, "stages": {"a": {"mean_ms": 4}}}
+
+        assert compare_reports(baseline, current) == [
+            ("sessions_per_minute", 10, 12), ("wall_seconds", 6, 5), ("a mean_ms", 5, 4),
+        ]
+
+
+class TestRunBench:
+    """run_bench() end to end."""
+
+    def test_replays_gold_cases(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(ROOT)
+
+        report = run_bench(
+            case_filter=["case_03_calculator", "case_04_notes"],
+            latency_ms=0,
+            tokens_per_second=0,
+            jobs=2,
+            run_functional_tests=False,
+            validate_execution=False,
+        )
+        saved = json.loads(report.save(tmp_path).read_text())
+
+        assert report.sessions == report.completed == 2
+        assert report.server["agent_requests"] == report.server["judge_requests"] == 2
+        assert report.mean_score is not None and report.sessions_per_minute > 0
+        assert {"agent.session", "model.request", "judge.score", "stage.generate"} <= set(report.stages)
+        assert [stage["name"] for stage in report.pipeline] == ["generate", "test", "validate", "score"]
+        assert saved["config"]["jobs"] == 2 and saved["sessions"] == 2
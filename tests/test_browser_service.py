@@ -0,0 +1,289 @@
+"""
+=============================================================================
+SCRIPT NAME: test_browser_service.py
+=============================================================================
+
+Tests for the shared browser service.
+
+Tests cover:
+- Start-up: endpoint discovery, warm-up pages, exported address, health
+- max_contexts: leases wait for a free slot, time out when none frees up
+- Recycling Chromium after N leases once open contexts drain
+- Health checks restarting a dead Chromium; reclaiming expired leases
+- ServiceBrowser: a lease per context, released on close, reconnect
+  after a restart
+- launch_or_connect() falling back to a local launch
+
+A small Python process stands in for Chromium: it announces a DevTools
+endpoint on stderr and answers the CDP HTTP endpoints.
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from vibe_eval.sandbox.browser_service import (
+    SERVICE_ENV,
+    BrowserService,
+    ServiceBrowser,
+    ServiceClient,
+    launch_or_connect,
+)
+
+FAKE_CHROMIUM = r'''
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+log = open(sys.argv[1], "a")
+
+
+class Handler(BaseHTTPRequestHandler):
+    def reply(self, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        log.write(f"GET {self.path}\n")
+        log.flush()
+        self.reply({"Browser": "FakeChrome"})
+
+    def do_PUT(self):
+        log.write(f"PUT {self.path}\n")
+        log.flush()
+        self.reply({"id": "page1"})
+
+    def log_message(self, *args):
+        pass
+
+
+server = HTTPServer(("127.0.0.1", 0), Handler)
+port = server.server_address[1]
+sys.stderr.write(f"noise\nDevTools listening on ws://127.0.0.1:{port}/devtools/browser/fake\n")
+sys.stderr.flush()
+server.serve_forever()
+'''
+
+
+@pytest.fixture
+def fake_chromium(tmp_path):
+    script = tmp_path / "chromium.py"
+    script.write_text(FAKE_CHROMIUM)
+    log = tmp_path / "cdp.log"
+    launched = []
+
+    def launcher(user_data_dir):
+        process = subprocess.Popen(
+            [sys.executable, str(script), str(log)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        launched.append(process)
+        return process
+
+    launcher.log = log
+    launcher.launched = launched
+    return launcher
+
+
+@pytest.fixture
+def service_factory(fake_chromium, monkeypatch):
+    monkeypatch.delenv(SERVICE_ENV, raising=False)
+    services = []
+
+    def make(**kwargs):
+        service = BrowserService(launcher=fake_chromium, **kwargs)
+        service.start()
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        service.stop()
+
+
+class TestService:
+    """Tests for BrowserService."""
+
+    def test_start_warms_up_and_exports(self, service_factory, fake_chromium):
+        service = service_factory(warm_pages=2)
+
+        assert os.environ[SERVICE_ENV] == service.address
+        assert service.endpoint.startswith("ws://127.0.0.1:")
+        log = fake_chromium.log.read_text().splitlines()
+        assert log.count("PUT /json/new?about:blank") == 2
+        assert log.count("GET /json/close/page1") == 2
+        health = ServiceClient(service.address).health()
+        assert health["healthy"] and health["active"] == 0 and health["generation"] == 1
+
+    def test_stop_terminates_chromium(self, fake_chromium, monkeypatch):
+        monkeypatch.delenv(SERVICE_ENV, raising=False)
+        service = BrowserService(launcher=fake_chromium)
+        service.start()
+        service.stop()
+
+        assert fake_chromium.launched[0].poll() is not None
+        assert SERVICE_ENV not in os.environ
+
+    def test_max_contexts(self, service_factory):
+        service = service_factory(max_contexts=2)
+        client = ServiceClient(service.address, lease_timeout=0.3)
+
+        first, endpoint = client.lease()
+        client.lease()
+        assert endpoint == service.endpoint
+        start = time.time()
+        with pytest.raises(RuntimeError, match="no browser context available"):
+            client.lease()
+        assert time.time() - start >= 0.3
+
+        client.release(first)
+        client.lease()
+        assert service.health()["active"] == 2
+
+    def test_recycles_after_drain(self, service_factory, fake_chromium):
+        service = service_factory(recycle_after=2)
+        client = ServiceClient(service.address, lease_timeout=5)
+        first_endpoint = service.endpoint
+
+        leases = [client.lease()[0] for _ in range(2)]
+        for lease in leases:
+            client.release(lease)
+        _, endpoint = client.lease()
+
+        assert endpoint != first_endpoint
+        assert len(fake_chromium.launched) == 2 and fake_chromium.launched[0].poll() is not None
+        health = service.health()
+        assert (health["restarts"], health["generation"], health["last_restart_reason"]) == (1, 2, "recycle")
+
+    def test_health_check_restarts_dead_chromium(self, service_factory, fake_chromium):
+        service = service_factory(health_interval=0.1)
+        fake_chromium.launched[0].kill()
+
+        deadline = time.time() + 10
+        while service.restarts == 0 and time.time() < deadline:
+            time.sleep(0.05)
+
+        health = service.health()
+        assert health["healthy"] and health["last_restart_reason"] == "unhealthy"
+
+    def test_expired_leases_reclaimed(self, service_factory):
+        service = service_factory(max_contexts=1, lease_ttl=0.2)
+
+        assert service.lease(timeout=0) is not None
+        # The first lease is never released, but expires
+        assert service.lease(timeout=2) is not None
+
+
+class FakeContext:
+    def __init__(self, log):
+        self.log = log
+
+    def new_page(self):
+        return FakeContextPage(self.log)
+
+    def close(self):
+        self.log.append("context.close")
+
+
+class FakeContextPage:
+    def __init__(self, log):
+        self.log = log
+
+    def goto(self, url):
+        self.log.append(f"goto {url}")
+
+    def close(self):
+        self.log.append("page.close")
+
+
+class FakeCdpBrowser:
+    def __init__(self, endpoint, log):
+        self.endpoint = endpoint
+        self.log = log
+        self.connected = True
+
+    def new_context(self, **kwargs):
+        return FakeContext(self.log)
+
+    def is_connected(self):
+        return self.connected
+
+    def close(self):
+        self.connected = False
+        self.log.append(f"disconnect {self.endpoint}")
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.log = []
+        self.connections = []
+        self.launched = 0
+        playwright = self
+
+        class Chromium:
+            def connect_over_cdp(self, endpoint):
+                browser = FakeCdpBrowser(endpoint, playwright.log)
+                playwright.connections.append(browser)
+                return browser
+
+            def launch(self, headless):
+                playwright.launched += 1
+                return "local browser"
+
+        self.chromium = Chromium()
+
+
+class TestServiceBrowser:
+    """Tests for the client side."""
+
+    def test_context_holds_lease_until_closed(self, service_factory):
+        service = service_factory(max_contexts=1)
+        playwright = FakePlaywright()
+        browser = ServiceBrowser(playwright, ServiceClient(service.address, lease_timeout=0.2))
+
+        context = browser.new_context()
+        assert service.health()["active"] == 1
+        with pytest.raises(RuntimeError):
+            browser.new_context()
+        context.close()
+        assert service.health()["active"] == 0
+
+        page = browser.new_page()
+        page.goto("file:///x.html")  # Proxied to the real page
+        page.close()
+        assert playwright.log == ["context.close", "goto file:///x.html", "page.close", "context.close"]
+        assert service.health()["active"] == 0
+        # One CDP connection reused for every context
+        assert [c.endpoint for c in playwright.connections] == [service.endpoint]
+
+    def test_reconnects_after_restart(self, service_factory):
+        service = service_factory(recycle_after=1)
+        playwright = FakePlaywright()
+        browser = ServiceBrowser(playwright, ServiceClient(service.address))
+
+        browser.new_context().close()
+        browser.new_context().close()
+
+        first, second = playwright.connections
+        assert first.endpoint != second.endpoint
+        assert f"disconnect {first.endpoint}" in playwright.log
+
+    def test_launch_or_connect(self, service_factory, monkeypatch):
+        playwright = FakePlaywright()
+        monkeypatch.delenv(SERVICE_ENV, raising=False)
+        assert launch_or_connect(playwright) == "local browser"
+
+        service_factory()
+        assert isinstance(launch_or_connect(playwright), ServiceBrowser)
+        assert playwright.launched == 1
@@ -0,0 +1,169 @@
+"""
+=============================================================================
+SCRIPT NAME: test_capture.py
+=============================================================================
+
+Tests for streaming, bounded output capture.
+
+Tests cover:
+- BoundedCapture keeping head and tail in constant memory
+- SandboxExecutor keeping the first and last part of long output
+- Commands killed once they exceed the output byte budget, through the
+  shell and the fork server, with the total bytes reported
+- Timeouts killing the shell's children too
+- Per-command rlimits set by the shell
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import os
+import time
+
+import pytest
+
+from vibe_eval.sandbox.capture import BoundedCapture
+from vibe_eval.sandbox.executor import SandboxExecutor
+from vibe_eval.sandbox.isolation import ResourceLimits
+from vibe_eval.sandbox.zygote import PythonZygote
+
+ENDLESS = "python -c \"while True: print('x' * 999)\""
+
+
+@pytest.fixture(scope="module")
+def zygote():
+    zygote = PythonZygote()
+    zygote.start()
+    yield zygote
+    zygote.stop()
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "long.py").write_text(
+        "print('START')\n"
+        "for i in range(20000):\n"
+        "    print('filler line', i)\n"
+        "print('END')\n"
+    )
+    return tmp_path
+
+
+class TestBoundedCapture:
+    """Tests for BoundedCapture."""
+
+    def test_short_output_kept_whole(self):
+        capture = BoundedCapture(4, 4)
+        capture.feed(b"abc")
+        capture.feed(b"defgh")
+
+        assert capture.text() == "abcdefgh" and capture.omitted_bytes == 0
+
+    def test_keeps_head_and_tail(self):
+        capture = BoundedCapture(3, 3)
+        for chunk in (b"abcd", b"efgh", b"ij"):
+            capture.feed(chunk)
+
+        assert capture.total_bytes == 10 and capture.omitted_bytes == 4
+        assert capture.text() == "abc\n... (4 bytes omitted, 10 bytes total) ...\nhij"
+
+    def test_memory_constant(self):
+        capture = BoundedCapture(100, 100)
+        for _ in range(10000):
+            capture.feed(b"y" * 10000)
+
+        assert capture.total_bytes == 100_000_000
+        assert len(capture._head) + len(capture._tail) == 200
+
+    def test_universal_newlines(self):
+        capture = BoundedCapture(100, 100)
+        capture.feed(b"a\r\nb\rc\n")
+
+        assert capture.text() == "a\nb\nc\n"
+
+
+class TestExecutorCapture:
+    """SandboxExecutor output through the bounded capture."""
+
+    def test_normal_output(self, workspace):
+        result = SandboxExecutor(workspace).run("python -c \"print('hi')\"")
+
+        assert result.success and result.stdout == "hi\n"
+        assert result.output_bytes == 3 and not result.output_limited
+
+    def test_long_output_keeps_head_and_tail(self, workspace):
+        result = SandboxExecutor(workspace, max_output_chars=100).run("python long.py")
+
+        assert result.success
+        assert result.stdout.startswith("START\n") and result.stdout.endswith("END\n")
+        assert "bytes omitted" in result.stdout and len(result.stdout) < 200
+        lines = ["START", *(f"filler line {i}" for i in range(20000)), "END"]
+        assert result.output_bytes == sum(len(line) + 1 for line in lines)
+
+    def test_output_budget_kills_command(self, workspace):
+        executor = SandboxExecutor(workspace, timeout=30, max_output_bytes=1_000_000)
+
+        start = time.time()
+        result = executor.run(ENDLESS)
+
+        assert result.output_limited and not result.success and not result.timed_out
+        assert 1_000_000 < result.output_bytes < 1_200_000
+        assert "Output limit exceeded" in result.stderr
+        assert result.stdout.startswith("x" * 999)
+        assert time.time() - start < 10
+
+    def test_budget_counts_both_streams(self, workspace):
+        executor = SandboxExecutor(workspace, timeout=30, max_output_bytes=100_000)
+
+        result = executor.run("python -c \"import sys\nwhile True: sys.stderr.write('e' * 1000)\"")
+
+        assert result.output_limited and result.stderr.startswith("e" * 100)
+
+    def test_timeout_kills_shell_children(self, workspace):
+        start = time.time()
+        result = SandboxExecutor(workspace, timeout=1).run("sleep 30 | cat")
+
+        assert result.timed_out and result.return_code == -1
+        assert time.time() - start < 5
+
+    @pytest.mark.skipif(os.name != "posix", reason="rlimits are POSIX-only")
+    def test_cpu_limit(self, workspace):
+        executor = SandboxExecutor(workspace, timeout=30, limits=ResourceLimits(cpu_seconds=1, memory_mb=None))
+
+        start = time.time()
+        result = executor.run("python -c 'while True: pass'")
+
+        assert not result.success and not result.timed_out
+        assert time.time() - start < 10
+
+    @pytest.mark.skipif(not os.path.exists("/proc/self"), reason="RLIMIT_AS is not enforced everywhere")
+    def test_memory_limit_keeps_output(self, workspace):
+        executor = SandboxExecutor(workspace, limits=ResourceLimits(cpu_seconds=None, memory_mb=200))
+
+        result = executor.run("echo before; python -c 'x = bytearray(500 * 1024 * 1024)'")
+
+        assert not result.success and result.stdout == "before\n"
+        assert "MemoryError" in result.stderr
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork server is POSIX-only")
+class TestForkedCapture:
+    """The fork server streams through the same capture and budget."""
+
+    def test_same_truncation_as_shell(self, zygote, workspace):
+        forked = SandboxExecutor(workspace, max_output_chars=100, zygote=zygote).run("python long.py")
+        shell = SandboxExecutor(workspace, max_output_chars=100).run("python long.py")
+
+        assert forked.forked
+        assert (forked.stdout, forked.output_bytes) == (shell.stdout, shell.output_bytes)
+
+    def test_output_budget_kills_command(self, zygote, workspace):
+        executor = SandboxExecutor(workspace, timeout=30, zygote=zygote, max_output_bytes=1_000_000)
+
+        result = executor.run(ENDLESS)
+
+        assert result.forked and result.output_limited and not result.success
+        assert 1_000_000 < result.output_bytes < 1_200_000
+        assert "Output limit exceeded" in result.stderr
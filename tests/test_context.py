@@ -0,0 +1,160 @@
+"""
+=============================================================================
+SCRIPT NAME: test_context.py
+=============================================================================
+
+Tests for agent context compaction.
+
+Tests cover:
+- Superseded <write_file> bodies replaced by hash stubs
+- Old feedback summarized to status lines
+- Sliding window over turns
+- AgentLoop sending compacted context and counting tokens saved
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+from vibe_eval.agent_loop import AgentLoop
+from vibe_eval.context import (
+    ContextManager,
+    ContextPolicy,
+    estimate_tokens,
+    file_stub,
+    summarize_feedback,
+)
+from vibe_eval.models.base import BaseModel, Message, ModelResponse
+
+LONG_OUTPUT = "✓ Command: python app.py\nExit code: 0\nSTDOUT:\n" + "line of output\n" * 100
+
+
+def conversation(*turns: tuple[str, str]) -> list[Message]:
+    messages = [Message(role="system", content="SYSTEM"), Message(role="user", content="TASK")]
+    for reply, feedback in turns:
+        messages.append(Message(role="assistant", content=reply))
+        messages.append(Message(role="user", content=feedback))
+    return messages
+
+
+class TestSupersededFiles:
+    """Tests for file body stubs."""
+
+    def test_older_write_stubbed(self):
+        convo = conversation(
+            ('<write_file path="app.py">v1\nold</write_file>', "ok"),
+            ('<write_file path="app.py">v2</write_file>', "ok"),
+        )
+        compacted = ContextManager(ContextPolicy()).compact(convo)
+
+        assert compacted[2].content == f'<write_file path="app.py">{file_stub("app.py", "v2")}</write_file>'
+        assert compacted[4].content == convo[4].content
+        assert "1 lines" in file_stub("app.py", "v2")
+
+    def test_other_files_untouched(self):
+        convo = conversation(
+            ('<write_file path="a.py">A</write_file><write_file path="b.py">B</write_file>', "ok"),
+            ('<write_file path="a.py">A2</write_file>', "ok"),
+        )
+        compacted = ContextManager(ContextPolicy()).compact(convo)
+
+        assert '<write_file path="b.py">B</write_file>' in compacted[2].content
+        assert ">A<" not in compacted[2].content
+
+    def test_full_transcript_not_mutated(self):
+        convo = conversation(
+            ('<write_file path="a.py">A</write_file>', "ok"),
+            ('<write_file path="a.py">A2</write_file>', "ok"),
+        )
+        ContextManager(ContextPolicy()).compact(convo)
+
+        assert convo[2].content == '<write_file path="a.py">A</write_file>'
+
+
+class TestFeedbackSummaries:
+    """Tests for summarizing old tool feedback."""
+
+    def test_keeps_status_lines(self):
+        summary = summarize_feedback(LONG_OUTPUT)
+
+        assert "✓ Command: python app.py" in summary
+        assert "Exit code: 0" in summary
+        assert "line of output" not in summary
+
+    def test_only_old_feedback_summarized(self):
+        convo = conversation(*[("<run_command>python app.py</run_command>", LONG_OUTPUT)] * 4)
+        compacted = ContextManager(ContextPolicy(summarize_feedback_after=2)).compact(convo)
+
+        feedback = [m.content for m in compacted[3::2]]
+        assert [f == LONG_OUTPUT for f in feedback] == [False, False, True, True]
+
+    def test_short_feedback_left_alone(self):
+        convo = conversation(*[("x", "✓ Files written: ['a.py']")] * 4)
+
+        assert ContextManager(ContextPolicy(summarize_feedback_after=0)).compact(convo) == convo
+
+
+class TestSlidingWindow:
+    """Tests for window_turns."""
+
+    def test_keeps_head_and_recent_turns(self):
+        convo = conversation(
+            ('<write_file path="old.py">x</write_file>', "f1"),
+            ("reply 2", "f2"),
+            ("reply 3", "f3"),
+        )
+        compacted = ContextManager(ContextPolicy(window_turns=1)).compact(convo)
+
+        assert [m.role for m in compacted] == ["system", "user", "assistant", "user"]
+        assert compacted[2].content.startswith("[2 earlier turns omitted to save context. Files written in them: old.py.]")
+        assert compacted[2].content.endswith("reply 3")
+        assert compacted[3].content == "f3"
+
+
+class ScriptedModel(BaseModel):
+    """Replies from a script and records the prompts it was sent."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    def complete(self, messages):
+        self.prompts.append(list(messages))
+        return ModelResponse(content=self.replies.pop(0), model="scripted")
+
+    @property
+    def name(self):
+        return "scripted"
+
+    @property
+    def provider(self):
+        return "test"
+
+
+class TestAgentLoopCompaction:
+    """Tests for AgentLoop(context_policy=...)."""
+
+    REPLIES = [
+        '<write_file path="app.py">' + "print('v1')\n" * 200 + "</write_file>",
+        '<write_file path="app.py">print(\'v2\')</write_file>',
+        "<done>ok</done>",
+    ]
+
+    def test_sends_compacted_context(self, tmp_path):
+        model = ScriptedModel(self.REPLIES)
+        result = AgentLoop(model, "spec", workspace=tmp_path, context_policy=ContextPolicy()).run()
+
+        assert result.completed
+        assert "superseded: app.py" in model.prompts[2][2].content
+        # The saved transcript is complete
+        assert "print('v1')" in result.conversation[2].content
+        assert result.metrics.context_tokens_saved > 500
+        assert result.metrics.to_dict()["context_tokens_saved"] == result.metrics.context_tokens_saved
+
+    def test_no_policy_sends_everything(self, tmp_path):
+        model = ScriptedModel(self.REPLIES)
+        result = AgentLoop(model, "spec", workspace=tmp_path).run()
+
+        assert estimate_tokens(model.prompts[2]) > 500
+        assert result.metrics.context_tokens_saved == 0
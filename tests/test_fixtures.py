@@ -0,0 +1,157 @@
+"""
+=============================================================================
+SCRIPT NAME: test_fixtures.py
+=============================================================================
+
+Tests for the memoized run_once fixture.
+
+Tests cover:
+- One execution per argument set, shared by tests in worker processes
+- Recorded exit code, stdout, stderr and changed files
+- The workspace left untouched; private copies for tests that write
+- Timeouts re-raised for every caller
+- In-process locks dropped when a run's fixtures are done
+- The migrated case_35 tests running the pipeline once
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from vibe_eval.sandbox import fixtures
+from vibe_eval.sandbox.fixtures import RunOnce
+from vibe_eval.sandbox.test_runner import FunctionalTestRunner
+
+CASES_DIR = Path(__file__).resolve().parent.parent / "eval_cases"
+
+SCRIPT = '''
+import sys
+import time
+from pathlib import Path
+
+with open(LOG, "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+if "--sleep" in sys.argv:
+    time.sleep(5)
+Path("out.txt").write_text("args=" + ",".join(sys.argv[1:]) + " stdin=" + sys.stdin.read())
+print("done")
+print("warning", file=sys.stderr)
+sys.exit(3 if "--fail" in sys.argv else 0)
+'''
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    workspace = tmp_path / "ws"
+    workspace.mkdir()
+    (workspace / "main.py").write_text(f"LOG = {str(tmp_path / 'runs.log')!r}\n" + SCRIPT)
+    (workspace / "input.csv").write_text("a,b\n")
+    return workspace
+
+
+def runs(workspace):
+    log = workspace.parent / "runs.log"
+    return log.read_text().splitlines() if log.exists() else []
+
+
+class TestRunOnce:
+    """Tests for RunOnce and ProgramRun."""
+
+    def test_runs_once_per_argument_set(self, workspace, tmp_path):
+        run_once = RunOnce(workspace, workspace / "main.py", tmp_path / "fixtures")
+
+        first = run_once(["--x"], stdin="hi")
+        again = RunOnce(workspace, workspace / "main.py", tmp_path / "fixtures")(["--x"], stdin="hi")
+        other = run_once(["--fail"])
+
+        assert runs(workspace) == ["--x", "--fail"]
+        assert (first.returncode, first.stdout, first.stderr) == (0, "done\n", "warning\n")
+        assert again.read_text("out.txt") == "args=--x stdin=hi"
+        assert first.changed_files == ["out.txt"]
+        assert other.returncode == 3
+        # The program ran in a copy
+        assert not (workspace / "out.txt").exists()
+        assert first.exists("input.csv")
+
+    def test_private_workspace_copy(self, workspace, tmp_path):
+        run = RunOnce(workspace, workspace / "main.py", tmp_path / "fixtures")()
+
+        run.workspace.joinpath("out.txt").write_text("changed")
+
+        assert run.read_text("out.txt").startswith("args=")
+        assert run.workspace.joinpath("out.txt").read_text() == "changed"
+
+    def test_timeout_raised_for_every_caller(self, workspace, tmp_path):
+        run_once = RunOnce(workspace, workspace / "main.py", tmp_path / "fixtures", timeout=0.5)
+
+        for _ in range(2):
+            with pytest.raises(subprocess.TimeoutExpired):
+                run_once(["--sleep"])
+        assert runs(workspace) == ["--sleep"]
+
+    def test_forget_drops_locks(self, workspace, tmp_path):
+        run_once = RunOnce(workspace, workspace / "main.py", tmp_path / "fixtures")
+        run_once(["--x"])
+        run_once(["--fail"])
+
+        assert len(fixtures._thread_locks[str(tmp_path / "fixtures")]) == 2
+        RunOnce.forget(tmp_path / "fixtures")
+        assert str(tmp_path / "fixtures") not in fixtures._thread_locks
+
+
+class TestRunnerFixture:
+    """run_once through FunctionalTestRunner."""
+
+    def test_shared_across_isolated_workers(self, workspace, tmp_path):
+        test_file = tmp_path / "tests.py"
+        test_file.write_text(
+            "".join(
+                f"def test_{i}(workspace, main_file, run_once):\n"
+                f"    assert run_once(['--x']).read_text('out.txt') == 'args=--x stdin='\n\n"
+                for i in range(6)
+            )
+            + "def test_plain(workspace, main_file):\n    assert main_file.exists()\n"
+        )
+
+        result = FunctionalTestRunner(workers=3).run_tests(workspace, test_file)
+
+        assert (result.passed, result.failed) == (7, 0)
+        assert runs(workspace) == ["--x"]
+
+    def test_locks_dropped_after_in_process_run(self, workspace, tmp_path):
+        test_file = tmp_path / "tests.py"
+        test_file.write_text("def test_x(workspace, main_file, run_once):\n    assert run_once().returncode == 0\n")
+        locked_dirs = set(fixtures._thread_locks)
+
+        result = FunctionalTestRunner(isolate=False).run_tests(workspace, test_file)
+
+        assert result.passed == 1 and runs(workspace) == [""]
+        assert set(fixtures._thread_locks) == locked_dirs
+
+    def test_case_35_pipeline_runs_once(self, tmp_path):
+        workspace = tmp_path / "ws"
+        workspace.mkdir()
+        (workspace / "pipeline.py").write_text(
+            "import json\n"
+            "from pathlib import Path\n"
+            f"with open({str(tmp_path / 'runs.log')!r}, 'a') as log:\n"
+            "    log.write('run\\n')\n"
+            "Path('valid_employees.json').write_text(json.dumps("
+            "[{'email_domain': 'x.com', 'salary_band': 'high'}]))\n"
+            "Path('invalid_records.json').write_text(json.dumps("
+            "[{'errors': ['invalid email', 'invalid age'], 'name': 'Eve'}]))\n"
+            "Path('department_summary.json').write_text(json.dumps({'eng': {'count': 1}}))\n"
+        )
+
+        result = FunctionalTestRunner(workers=4).run_tests(
+            workspace, CASES_DIR / "case_35_data_pipeline" / "tests.py"
+        )
+
+        assert result.failed == 0 and result.passed == result.total_tests
+        assert runs(workspace) == ["run"]
@@ -0,0 +1,633 @@
+"""
+=============================================================================
+SCRIPT NAME: test_functional_runner.py
+=============================================================================
+
+Tests for parallel functional test execution.
+
+Tests cover:
+- Python tests sharded across worker processes, merged in order
+- Worker isolation for tests that change global state
+- Wall-clock kills (including processes a test started), CPU and memory
+  limits, results streamed as tests finish
+- HTML tests sharded across browser lanes with a context per test
+- Skipped tests when the browser is unavailable
+- Readiness-based page settling and recorded settle times
+- Page snapshots: read-only test detection, one cold load per run,
+  restored pages served from memory with scripts disabled
+- Execution validation sharing the tests' program run or page load, with
+  the same report as a separate validate()
+
+Browser tests use a fake Playwright browser, so Playwright is not needed.
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from vibe_eval.sandbox.browser import shutdown_browser_thread
+from vibe_eval.sandbox.isolation import ResourceLimits, iter_isolated_tests
+from vibe_eval.sandbox.settle import SETTLED_PREDICATE, SettleConfig, settle_page
+from vibe_eval.sandbox.snapshot import (
+    CAPTURE_SCRIPT,
+    NO_SCRIPTS_CSP,
+    RESTORE_FORMS_SCRIPT,
+    SNAPSHOT_ORIGIN,
+    is_read_only,
+    mutates_state,
+)
+from vibe_eval.sandbox.test_runner import FunctionalTestRunner, _merge_results, _shard
+from vibe_eval.sandbox.validator import ExecutionValidator
+
+PYTHON_TESTS = '''
+import os
+import time
+
+
+def test_a_sleep(workspace, main_file):
+    time.sleep(0.5)
+
+
+def test_b_sleep(workspace, main_file):
+    time.sleep(0.5)
+    assert main_file.name == "main.py"
+
+
+def test_c_fails(workspace, main_file):
+    time.sleep(0.5)
+    assert False, "expected failure"
+
+
+def test_d_sets_env(workspace, main_file):
+    time.sleep(0.5)
+    os.environ["VIBE_LEAK"] = "1"
+
+
+def test_e_raises(workspace, main_file):
+    raise ValueError("boom")
+'''
+
+
+@pytest.fixture
+def python_case(tmp_path):
+    workspace = tmp_path / "ws"
+    workspace.mkdir()
+    (workspace / "main.py").write_text("print('hi')\n")
+    test_file = tmp_path / "tests.py"
+    test_file.write_text(PYTHON_TESTS)
+    return workspace, test_file
+
+
+class TestPythonParallel:
+    """Tests for worker-process sharding."""
+
+    def test_same_outcome_as_serial(self, python_case, monkeypatch):
+        monkeypatch.delenv("VIBE_LEAK", raising=False)
+        workspace, test_file = python_case
+        parallel = FunctionalTestRunner(workers=4).run_tests(workspace, test_file)
+
+        assert [r.name for r in parallel.results] == [
+            "test_a_sleep", "test_b_sleep", "test_c_fails", "test_d_sets_env", "test_e_raises",
+        ]
+        assert [r.passed for r in parallel.results] == [True, True, False, True, False]
+        assert parallel.results[2].error == "expected failure"
+        assert parallel.results[4].error == "ValueError: boom"
+        assert (parallel.passed, parallel.failed, parallel.skipped) == (3, 2, 0)
+        # Ran in workers: the parent's environment is untouched
+        assert "VIBE_LEAK" not in os.environ
+
+    def test_overlaps_slow_tests(self, python_case):
+        workspace, test_file = python_case
+        result = FunctionalTestRunner(workers=4).run_tests(workspace, test_file)
+
+        serial_time = sum(r.duration_ms for r in result.results) / 1000
+        assert serial_time >= 2.0
+        # Wall clock covers worker start-up but not four sequential sleeps
+        assert result.execution_time < serial_time
+
+
+SNAPSHOT_STATE = {
+    "html": "<!DOCTYPE html>\n<html><body><button>1</button><script>build()</script></body></html>",
+    "forms": [{"value": "0", "checked": False, "selectedIndex": -1}],
+    "localStorage": {"theme": "dark"},
+    "sessionStorage": {},
+}
+
+
+class FakeRoute:
+    def __init__(self, url):
+        self.request = type("Request", (), {"url": url})()
+        self.response = None
+
+    def fulfill(self, **kwargs):
+        self.response = kwargs
+
+
+LIMIT_TESTS = '''
+import subprocess
+import sys
+import time
+
+
+def test_fast(workspace, main_file):
+    pass
+
+
+def test_hangs(workspace, main_file):
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    # Outside the workspace: each test sees its own copy of that
+    with open(PID_FILE, "w") as f:
+        f.write(str(child.pid))
+    time.sleep(60)
+
+
+def test_allocates(workspace, main_file):
+    blob = bytearray(1024 * 1024 * 1024)
+
+
+def test_spins(workspace, main_file):
+    while True:
+        pass
+'''
+
+
+@pytest.fixture
+def limit_case(tmp_path):
+    workspace = tmp_path / "ws"
+    workspace.mkdir()
+    (workspace / "main.py").write_text("")
+    test_file = tmp_path / "tests.py"
+    test_file.write_text(f"PID_FILE = {str(tmp_path / 'child.pid')!r}\n" + LIMIT_TESTS)
+    return workspace, test_file
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # A killed child of ours lingers as a zombie until reaped; that counts as dead
+    stat = Path(f"/proc/{pid}/stat")
+    return not (stat.exists() and stat.read_text().split(")")[-1].split()[0] == "Z")
+
+
+@pytest.mark.skipif(os.name != "posix", reason="process groups and rlimits are POSIX-only")
+class TestIsolation:
+    """Tests for per-test worker processes and resource limits."""
+
+    def test_limits_enforced(self, limit_case):
+        workspace, test_file = limit_case
+        runner = FunctionalTestRunner(
+            workers=4, limits=ResourceLimits(wall_seconds=2, cpu_seconds=1, memory_mb=512),
+        )
+        start = time.time()
+        result = runner.run_tests(workspace, test_file)
+        elapsed = time.time() - start
+
+        by_name = {r.name: r for r in result.results}
+        assert by_name["test_fast"].passed
+        assert "MemoryError" in by_name["test_allocates"].error
+        assert by_name["test_spins"].error.startswith("Worker CPU time limit exceeded")
+        assert by_name["test_hangs"].error == "Timeout: killed after 2s"
+        assert not pid_alive(int((workspace.parent / "child.pid").read_text()))
+        # Concurrent: bounded by the 2 s kill, not the sum of the tests
+        assert elapsed < 5
+
+    def test_results_stream_as_completed(self, limit_case):
+        workspace, test_file = limit_case
+        stream = iter_isolated_tests(
+            test_file, ["test_hangs", "test_fast"], workspace, workspace / "main.py",
+            ResourceLimits(wall_seconds=2), workers=2,
+        )
+
+        assert next(stream)[0] == 1  # test_fast, before the hanging test is killed
+        index, result = next(stream)
+        assert index == 0 and not result.passed
+
+    def test_in_process_when_not_isolated(self, python_case, monkeypatch):
+        monkeypatch.delenv("VIBE_LEAK", raising=False)
+        workspace, test_file = python_case
+        result = FunctionalTestRunner(isolate=False).run_tests(workspace, test_file)
+
+        assert [r.passed for r in result.results] == [True, True, False, True, False]
+        assert os.environ.pop("VIBE_LEAK") == "1"
+
+
+class FakePage:
+    def __init__(self, log, busy_seconds=0.0, context=None):
+        self.log = log
+        self.busy_seconds = busy_seconds
+        self.context = context
+        self.waits = []
+        self.evaluated = []
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def screenshot(self):
+        return b"png"
+
+    def goto(self, url, **kwargs):
+        if url.startswith(SNAPSHOT_ORIGIN):
+            assert kwargs["wait_until"] == "load"
+            for route in [FakeRoute(url), FakeRoute(f"{SNAPSHOT_ORIGIN}/style.css"),
+                          FakeRoute(f"{SNAPSHOT_ORIGIN}/../secret.txt")]:
+                self.context.routes[0][1](route)
+                self.context.served.append(route)
+        elif "pageerror" in self.handlers:
+            # Observed for ExecutionValidator
+            assert kwargs["wait_until"] == "networkidle"
+            self.handlers["pageerror"]("ReferenceError: build is not defined")
+        else:
+            assert kwargs["wait_until"] == "domcontentloaded"
+        self.log.append(("goto", threading.get_ident()))
+
+    def evaluate(self, expression, arg=None):
+        self.evaluated.append(expression)
+        if expression == CAPTURE_SCRIPT:
+            return SNAPSHOT_STATE
+        assert expression == RESTORE_FORMS_SCRIPT and arg == SNAPSHOT_STATE["forms"]
+
+    def wait_for_function(self, expression, arg=None, polling=None, timeout=None):
+        self.waits.append((expression, arg, polling, timeout))
+        if self.busy_seconds * 1000 > timeout:
+            time.sleep(timeout / 1000)
+            raise TimeoutError("page never settled")
+        time.sleep(self.busy_seconds)
+
+
+class FakeContext:
+    def __init__(self, log):
+        self.log = log
+        self.closed = False
+        self.init_scripts = []
+        self.routes = []
+        self.served = []
+        self.pages = []
+
+    def set_default_timeout(self, ms):
+        pass
+
+    def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    def new_page(self):
+        page = FakePage(self.log, context=self)
+        self.pages.append(page)
+        return page
+
+    def close(self):
+        self.closed = True
+        self.log.append(("close", threading.get_ident()))
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.log = []
+        self.contexts = []
+
+    def new_context(self):
+        context = FakeContext(self.log)
+        self.contexts.append(context)
+        return context
+
+
+def html_tests(tmp_path, count=6):
+    workspace = tmp_path / "ws"
+    workspace.mkdir()
+    (workspace / "index.html").write_text("<button>1</button>")
+    body = "import time\n"
+    for i in range(count):
+        body += (
+            f"\ndef test_{i:02d}(page):\n"
+            f"    time.sleep(0.2)\n"
+            f"    assert {i} != 3, 'three fails'\n"
+        )
+    test_file = tmp_path / "tests.py"
+    test_file.write_text(body)
+    return workspace, test_file
+
+
+class TestHtmlParallel:
+    """Tests for browser-lane sharding."""
+
+    @pytest.fixture(autouse=True)
+    def lanes(self):
+        yield
+        shutdown_browser_thread()
+
+    def test_shards_across_lanes(self, tmp_path, monkeypatch):
+        browser = FakeBrowser()
+        monkeypatch.setattr(FunctionalTestRunner, "_get_browser", classmethod(lambda cls: browser))
+        workspace, test_file = html_tests(tmp_path)
+
+        start = time.time()
+        result = FunctionalTestRunner(workers=3).run_tests(workspace, test_file)
+        elapsed = time.time() - start
+
+        assert [r.name for r in result.results] == [f"test_{i:02d}" for i in range(6)]
+        assert [r.passed for r in result.results] == [True, True, True, False, True, True]
+        assert result.results[3].error == "three fails"
+        assert len({ident for _, ident in browser.log}) == 3
+        # One context per test, all closed
+        assert len(browser.contexts) == 6 and all(c.closed for c in browser.contexts)
+        assert elapsed < 6 * 0.2
+        assert all(r.duration_ms >= 150 for r in result.results)
+
+    def test_browser_unavailable_skips(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(FunctionalTestRunner, "_get_browser", classmethod(lambda cls: None))
+        workspace, test_file = html_tests(tmp_path, count=4)
+
+        result = FunctionalTestRunner(workers=2).run_tests(workspace, test_file)
+
+        assert (result.total_tests, result.skipped, result.passed) == (4, 4, 0)
+        assert len(result.errors) == 1 and "Playwright not available" in result.errors[0]
+
+
+class TestSettle:
+    """Tests for readiness-based settling."""
+
+    def test_waits_for_quiet_page(self):
+        page = FakePage([], busy_seconds=0.05)
+        result = settle_page(page, SettleConfig(quiet_ms=30, max_ms=1000))
+
+        assert page.waits == [(SETTLED_PREDICATE, 30, "raf", 1000)]
+        assert not result.capped
+        assert 40 <= result.settle_ms < 500
+
+    def test_busy_page_capped(self):
+        result = settle_page(FakePage([], busy_seconds=5), SettleConfig(max_ms=100))
+
+        assert result.capped
+        assert result.settle_ms >= 100
+
+    def test_init_script_uses_cap_for_short_timers(self):
+        script = SettleConfig(max_ms=1234).init_script()
+
+        assert "maxTimerMs: 1234" in script
+        assert "__MAX_TIMER_MS__" not in script
+
+    def test_settle_time_recorded(self, tmp_path, monkeypatch):
+        browser = FakeBrowser()
+        monkeypatch.setattr(FunctionalTestRunner, "_get_browser", classmethod(lambda cls: browser))
+        workspace, test_file = html_tests(tmp_path, count=2)
+        try:
+            result = FunctionalTestRunner().run_tests(workspace, test_file)
+        finally:
+            shutdown_browser_thread()
+
+        assert all(c.init_scripts == [SettleConfig().init_script()] for c in browser.contexts)
+        assert all(r.settle_ms is not None and not r.settle_capped for r in result.results)
+        assert "settle_ms" in result.to_dict()["results"][0]
+
+
+def read_only_test(page):
+    buttons = page.locator("button").all_text_contents()
+    first = page.locator("button").first
+    assert first.is_visible() and len(" ".join(buttons)) > 0
+    assert "build" in page.content()
+
+
+def clicks_via_variable(page):
+    clear = page.locator("button:has-text('C')").first
+    if clear.count() > 0:
+        clear.click()
+
+
+def clicks_in_loop(page):
+    for button in page.locator("button").all():
+        button.click()
+
+
+def passes_page_to_helper(page):
+    helper = print
+    helper(page)
+
+
+def evaluates_script(page):
+    page.evaluate("localStorage.clear()")
+
+
+@mutates_state
+def marked_mutating(page):
+    assert page.locator("button").count() > 0
+
+
+class TestSnapshot:
+    """Tests for page snapshot reuse."""
+
+    def test_read_only_detection(self):
+        assert is_read_only(read_only_test)
+        for func in [clicks_via_variable, clicks_in_loop, passes_page_to_helper,
+                     evaluates_script, marked_mutating, print]:
+            assert not is_read_only(func), func.__name__
+
+    def test_read_only_tests_use_snapshot(self, tmp_path, monkeypatch):
+        browser = FakeBrowser()
+        monkeypatch.setattr(FunctionalTestRunner, "_get_browser", classmethod(lambda cls: browser))
+        workspace = tmp_path / "ws"
+        workspace.mkdir()
+        (workspace / "index.html").write_text("<button>1</button>")
+        (workspace / "style.css").write_text("button {}")
+        (tmp_path / "secret.txt").write_text("no")
+        test_file = tmp_path / "tests.py"
+        test_file.write_text(
+            "def test_a_reads(page):\n"
+            "    assert page is not None\n\n"
+            "def test_b_clicks(page):\n"
+            "    if page is None:\n"
+            "        page.click('button')\n\n"
+            "def test_c_reads(page):\n"
+            "    assert page.evaluated == [RESTORE_FORMS_SCRIPT]\n"
+            "from vibe_eval.sandbox.snapshot import RESTORE_FORMS_SCRIPT\n"
+        )
+        try:
+            result = FunctionalTestRunner(snapshot=True).run_tests(workspace, test_file)
+        finally:
+            shutdown_browser_thread()
+
+        assert [r.passed for r in result.results] == [True, True, True]
+        assert [r.from_snapshot for r in result.results] == [True, False, True]
+        assert result.to_dict()["results"][0]["from_snapshot"] is True
+        # One cold capture load, one cold test, two restored tests
+        capture, a, b, c = browser.contexts
+        assert capture.pages[0].evaluated == [CAPTURE_SCRIPT]
+        assert b.routes == [] and b.init_scripts == [SettleConfig().init_script()]
+        for restored in (a, c):
+            page, css, escape = restored.served
+            assert page.response["body"] == SNAPSHOT_STATE["html"]
+            assert page.response["headers"] == {"Content-Security-Policy": NO_SCRIPTS_CSP}
+            assert css.response["path"] == str(workspace / "style.css")
+            assert escape.response["status"] == 404
+            assert '"theme": "dark"' in restored.init_scripts[0]
+            assert restored.pages[0].evaluated == [RESTORE_FORMS_SCRIPT]
+        assert all(context.closed for context in browser.contexts)
+
+    def test_no_read_only_tests_skips_capture(self, tmp_path, monkeypatch):
+        browser = FakeBrowser()
+        monkeypatch.setattr(FunctionalTestRunner, "_get_browser", classmethod(lambda cls: browser))
+        workspace, _ = html_tests(tmp_path, count=0)
+        test_file = tmp_path / "tests.py"
+        test_file.write_text("def test_clicks(page):\n    if page is None:\n        page.click('b')\n")
+        try:
+            result = FunctionalTestRunner(snapshot=True).run_tests(workspace, test_file)
+        finally:
+            shutdown_browser_thread()
+
+        assert len(browser.contexts) == 1
+        assert not result.results[0].from_snapshot
+
+
+def report_fields(report):
+    return (report.executed, report.exit_code, report.stdout, report.stderr, report.errors, report.file_type)
+
+
+class TestExecuteAndObserve:
+    """run_tests(validator=...) launching each workspace once."""
+
+    @pytest.fixture
+    def counted_script(self, tmp_path):
+        workspace = tmp_path / "ws"
+        workspace.mkdir()
+        log = tmp_path / "runs.log"
+
+        def write(body):
+            (workspace / "main.py").write_text(
+                f"with open({str(log)!r}, 'a') as f:\n    f.write('run\\n')\n" + body
+            )
+            return workspace, lambda: log.read_text().count("run") if log.exists() else 0
+
+        return write
+
+    @pytest.mark.parametrize("isolate", [True, False])
+    def test_python_runs_once(self, counted_script, tmp_path, isolate):
+        workspace, runs = counted_script("print('hi')\n")
+        test_file = tmp_path / "tests.py"
+        test_file.write_text(
+            "def test_output(workspace, main_file, run_once):\n"
+            "    assert run_once().stdout == 'hi\\n'\n\n"
+            "def test_plain(workspace, main_file):\n"
+            "    assert main_file.exists()\n"
+        )
+        validator = ExecutionValidator(timeout=10)
+
+        result = FunctionalTestRunner(workers=2, isolate=isolate).run_tests(
+            workspace, test_file, validator=validator
+        )
+
+        assert (result.passed, result.failed) == (2, 0)
+        assert runs() == 1
+        assert report_fields(result.execution_report) == report_fields(validator.validate(workspace))
+
+    def test_python_failure_reported_the_same(self, counted_script, tmp_path):
+        workspace, runs = counted_script("import sys\nsys.exit('bad input')\n")
+        test_file = tmp_path / "tests.py"
+        test_file.write_text("def test_exit(workspace, main_file, run_once):\n    assert run_once().returncode == 0\n")
+        validator = ExecutionValidator(timeout=10)
+
+        result = FunctionalTestRunner().run_tests(workspace, test_file, validator=validator)
+
+        assert result.failed == 1 and runs() == 1
+        report = result.execution_report
+        assert not report.executed and report.exit_code == 1 and "bad input" in report.stderr
+        assert report_fields(report) == report_fields(validator.validate(workspace))
+
+    def test_shared_run_keeps_test_timeout(self, counted_script, tmp_path):
+        workspace, runs = counted_script("import time\ntime.sleep(1.5)\nprint('done')\n")
+        test_file = tmp_path / "tests.py"
+        test_file.write_text("def test_output(workspace, main_file, run_once):\n    assert run_once().stdout == 'done\\n'\n")
+
+        result = FunctionalTestRunner().run_tests(workspace, test_file, validator=ExecutionValidator(timeout=1))
+
+        assert result.passed == 1 and runs() == 1
+        report = result.execution_report
+        assert not report.executed and report.errors == ["Execution timed out after 1s"]
+
+    def test_shared_run_uses_validator_env(self, counted_script, tmp_path):
+        workspace, _ = counted_script("import os\nprint(os.environ.get('PYTHONUNBUFFERED'))\n")
+        test_file = tmp_path / "tests.py"
+        test_file.write_text("def test_env(workspace, main_file, run_once):\n    assert run_once().stdout == '1\\n'\n")
+
+        result = FunctionalTestRunner().run_tests(workspace, test_file, validator=ExecutionValidator())
+
+        assert result.passed == 1 and result.execution_report.stdout == "1\n"
+
+    def test_validated_separately_without_tests(self, counted_script, tmp_path):
+        workspace, runs = counted_script("print('hi')\n")
+        test_file = tmp_path / "tests.py"
+        test_file.write_text("HELPER = 1\n")
+
+        result = FunctionalTestRunner().run_tests(workspace, test_file, validator=ExecutionValidator())
+
+        assert result.total_tests == 0
+        assert result.execution_report.executed and runs() == 1
+
+    def test_html_observed_on_snapshot_load(self, tmp_path, monkeypatch):
+        browser = FakeBrowser()
+        monkeypatch.setattr(FunctionalTestRunner, "_get_browser", classmethod(lambda cls: browser))
+        workspace, test_file = html_tests(tmp_path, count=0)
+        test_file.write_text(
+            "def test_reads(page):\n    assert page is not None\n\n"
+            "def test_clicks(page):\n    if page is None:\n        page.click('b')\n"
+        )
+        try:
+            result = FunctionalTestRunner(snapshot=True).run_tests(
+                workspace, test_file, validator=ExecutionValidator()
+            )
+        finally:
+            shutdown_browser_thread()
+
+        report = result.execution_report
+        assert report.errors == ["JS Error: ReferenceError: build is not defined"]
+        assert report.screenshot == b"png" and report.file_type == "html"
+        # One observed load (also captured), one cold test, one restored test
+        observed, _, _ = browser.contexts
+        assert observed.pages[0].evaluated == [CAPTURE_SCRIPT]
+        assert [r.from_snapshot for r in result.results] == [False, True]
+        assert all(context.closed for context in browser.contexts)
+
+    def test_python_report_not_taken_from_html_launch(self, counted_script, tmp_path, monkeypatch):
+        monkeypatch.setattr(FunctionalTestRunner, "_get_browser", classmethod(lambda cls: FakeBrowser()))
+        workspace, runs = counted_script("raise RuntimeError('crash')\n")
+        (workspace / "report.html").write_text("<html><body>Report</body></html>")
+        test_file = tmp_path / "tests.py"
+        test_file.write_text("def test_reads(page):\n    pass\n")
+        try:
+            result = FunctionalTestRunner().run_tests(workspace, test_file, validator=ExecutionValidator())
+        finally:
+            shutdown_browser_thread()
+
+        report = result.execution_report
+        assert report.file_type == "python" and not report.executed and runs() == 1
+        assert "RuntimeError" in report.stderr
+
+
+class TestHelpers:
+    """Tests for sharding and merging."""
+
+    def test_shard_round_robin(self):
+        tests = [(f"t{i}", None) for i in range(5)]
+
+        assert [[i for i, _, _ in shard] for shard in _shard(tests, 2)] == [[0, 2, 4], [1, 3]]
+        assert len(_shard(tests[:1], 8)) == 1
+
+    def test_merge_counts_missing_as_skipped(self):
+        from vibe_eval.sandbox.test_runner import TestResult  # Not at module level: pytest would collect it
+
+        result = _merge_results(3, [(1, TestResult("b", False)), (0, TestResult("a", True))], [], time.time())
+
+        assert [r.name for r in result.results] == ["a", "b"]
+        assert (result.passed, result.failed, result.skipped) == (1, 1, 1)
+        assert result.pass_rate == pytest.approx(1 / 3)
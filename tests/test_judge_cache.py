@@ -0,0 +1,156 @@
+"""
+=============================================================================
+SCRIPT NAME: test_judge_cache.py
+=============================================================================
+
+Tests for the persistent judge result cache.
+
+Tests cover:
+- Cache key stability and sensitivity to every prompt input
+- Hit/miss counting and stored token usage
+- Size-based LRU eviction
+- AbsoluteJudge answering repeat prompts from the cache
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from vibe_eval.judge.absolute import AbsoluteJudge, clear_file_cache
+from vibe_eval.judge.cache import CachedJudgement, JudgeCache, cache_key
+from vibe_eval.models.base import ModelResponse
+
+SCORES = {
+    "executes": {"score": 8, "reason": "runs"},
+    "features_complete": {"score": 7, "reason": "most features"},
+    "output_quality": {"score": 6, "reason": "ok"},
+    "direction_following": {"score": 9, "reason": "on spec"},
+    "code_quality": {"score": 7, "reason": "tidy"},
+}
+
+
+def entry(raw: str = "{}") -> CachedJudgement:
+    return CachedJudgement(raw_response=raw, scores=SCORES, input_tokens=1000, output_tokens=200)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    judge_cache = JudgeCache(tmp_path / "cache.sqlite")
+    yield judge_cache
+    judge_cache.close()
+
+
+class TestCacheKey:
+    """Tests for cache_key."""
+
+    BASE = dict(
+        spec="Build a timer",
+        criteria=None,
+        code_files={"a.py": "print(1)", "b.py": "print(2)"},
+        judge_model="anthropic/claude-opus-4.5",
+        temperature=0.0,
+    )
+
+    def test_file_order_does_not_matter(self):
+        reordered = dict(self.BASE, code_files={"b.py": "print(2)", "a.py": "print(1)"})
+        assert cache_key(**self.BASE) == cache_key(**reordered)
+
+    @pytest.mark.parametrize("field, value", [
+        ("spec", "Build a clock"),
+        ("criteria", "Must be accessible"),
+        ("code_files", {"a.py": "print(1)", "b.py": "print(3)"}),
+        ("judge_model", "openai/gpt-4o"),
+        ("temperature", 0.5),
+    ])
+    def test_every_input_changes_key(self, field, value):
+        assert cache_key(**self.BASE) != cache_key(**dict(self.BASE, **{field: value}))
+
+
+class TestJudgeCache:
+    """Tests for JudgeCache storage."""
+
+    def test_miss_then_hit(self, cache):
+        assert cache.get("k") is None
+        cache.put("k", "judge", entry("raw"))
+
+        hit = cache.get("k")
+
+        assert hit.raw_response == "raw"
+        assert hit.scores == SCORES
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.saved_input_tokens == 1000
+
+    def test_persists_across_instances(self, tmp_path):
+        first = JudgeCache(tmp_path / "cache.sqlite")
+        first.put("k", "judge", entry())
+        first.close()
+
+        second = JudgeCache(tmp_path / "cache.sqlite")
+        assert second.get("k") is not None
+        second.close()
+
+    def test_lru_eviction(self, tmp_path):
+        size = len(entry("x" * 100).raw_response) + len(json.dumps(SCORES))
+        small = JudgeCache(tmp_path / "cache.sqlite", max_bytes=size * 2)
+
+        small.put("old", "judge", entry("x" * 100))
+        small.put("used", "judge", entry("x" * 100))
+        small.get("old")  # Refresh "old" so "used" becomes least recently used
+        small.put("new", "judge", entry("x" * 100))
+
+        assert len(small) == 2
+        assert small.get("used") is None
+        assert small.get("old") is not None
+        assert small.size_bytes() <= small.max_bytes
+        small.close()
+
+
+class TestAbsoluteJudgeCaching:
+    """Tests for AbsoluteJudge with a cache."""
+
+    def make_judge(self, cache):
+        model = MagicMock()
+        model.complete.return_value = ModelResponse(
+            content=json.dumps(SCORES),
+            model="judge",
+            usage={"input_tokens": 1000, "output_tokens": 200},
+        )
+        with patch("vibe_eval.judge.absolute.get_model", return_value=model):
+            judge = AbsoluteJudge(judge_model="anthropic/claude-opus-4.5", cache=cache)
+        return judge, model
+
+    def test_repeat_prompt_served_from_cache(self, cache, tmp_path):
+        workspace = tmp_path / "ws"
+        workspace.mkdir()
+        (workspace / "main.py").write_text("print('hi')")
+        clear_file_cache()
+        judge, model = self.make_judge(cache)
+
+        first = judge.score("spec", workspace)
+        second = judge.score("spec", workspace)
+
+        assert model.complete.call_count == 1
+        assert first.total_score == second.total_score
+        assert second.judge_metrics.cached
+        assert second.judge_metrics.estimated_cost() == 0
+
+    def test_parse_errors_not_cached(self, cache, tmp_path):
+        workspace = tmp_path / "ws"
+        workspace.mkdir()
+        (workspace / "main.py").write_text("print('hi')")
+        clear_file_cache()
+        judge, model = self.make_judge(cache)
+        model.complete.return_value = ModelResponse(content="not json", model="judge")
+
+        judge.score("spec", workspace)
+        judge.score("spec", workspace)
+
+        assert model.complete.call_count == 2
+        assert len(cache) == 0
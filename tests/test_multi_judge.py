@@ -10,6 +10,7 @@ Tests cover:
 - Disagreement detection
 - Multi-judge score calculation
 - Edge cases
+- Concurrent fan-out, timeouts, quorum and cancelled stragglers
 
 VERSION: 1.0
 LAST UPDATED: 2026-01-04
@@ -17,7 +18,9 @@ LAST UPDATED: 2026-01-04
 =============================================================================
 """
 
+import asyncio
 import statistics
+import time
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
@@ -398,5 +401,143 @@ class TestIntegrationScenarios:
         assert result.disagreement_flag is True
 
 
+class SlowJudge:
+    """Judge stand-in that sleeps before returning a fixed score."""
+
+    def __init__(self, delay: float, score: AbsoluteScore = None, error: Exception = None):
+        self.delay = delay
+        self._score = score or create_mock_score()
+        self.error = error
+
+    def score(self, spec, workspace, criteria=None):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self._score
+
+
+class AsyncSlowJudge:
+    """Async judge stand-in that records whether it was cancelled."""
+
+    def __init__(self, delay: float, score: AbsoluteScore = None):
+        self.delay = delay
+        self._score = score or create_mock_score()
+        self.cancelled = False
+
+    async def ascore(self, spec, workspace, criteria=None):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self._score
+
+
+def arbitrator_with(judges: dict, **kwargs) -> MultiJudgeArbitrator:
+    """Build an arbitrator whose judge instances are pre-populated."""
+    arbitrator = MultiJudgeArbitrator(judges=list(judges), **kwargs)
+    arbitrator._judges.update(judges)
+    return arbitrator
+
+
+class TestParallelFanOut:
+    """Tests for concurrent judge fan-out, timeouts and quorum."""
+
+    def test_judges_run_concurrently(self):
+        arbitrator = arbitrator_with({
+            "judge1": SlowJudge(0.2, create_mock_score(7, 7, 7, 7, 7)),
+            "judge2": SlowJudge(0.2, create_mock_score(8, 8, 8, 8, 8)),
+            "judge3": SlowJudge(0.2, create_mock_score(9, 9, 9, 9, 9)),
+        })
+
+        start = time.time()
+        result = arbitrator.score("spec", Path("."))
+        elapsed = time.time() - start
+
+        assert elapsed < 0.45
+        assert result.final_score == 80.0
+        assert result.judges_used == ["judge1", "judge2", "judge3"]
+        assert result.stragglers == []
+
+    def test_timeout_records_stragglers(self):
+        arbitrator = arbitrator_with({
+            "fast": SlowJudge(0.01),
+            "slow": SlowJudge(1.0),
+        }, judge_timeout=0.2)
+
+        start = time.time()
+        result = arbitrator.score("spec", Path("."))
+
+        assert time.time() - start < 0.6
+        assert result.judges_used == ["fast"]
+        assert result.stragglers == ["slow"]
+        assert result.to_dict()["stragglers"] == ["slow"]
+
+    def test_quorum_returns_early(self):
+        arbitrator = arbitrator_with({
+            "judge1": SlowJudge(0.01, create_mock_score(8, 8, 8, 8, 8)),
+            "judge2": SlowJudge(0.02, create_mock_score(8, 8, 8, 8, 7)),
+            "judge3": SlowJudge(1.0, create_mock_score(2, 2, 2, 2, 2)),
+        }, quorum=2)
+
+        start = time.time()
+        result = arbitrator.score("spec", Path("."))
+
+        assert time.time() - start < 0.6
+        assert set(result.judges_used) == {"judge1", "judge2"}
+        assert result.stragglers == ["judge3"]
+
+    def test_quorum_waits_when_judges_disagree(self):
+        arbitrator = arbitrator_with({
+            "judge1": SlowJudge(0.01, create_mock_score(9, 9, 9, 9, 9)),
+            "judge2": SlowJudge(0.02, create_mock_score(3, 3, 3, 3, 3)),
+            "judge3": SlowJudge(0.1, create_mock_score(8, 8, 8, 8, 8)),
+        }, quorum=2)
+
+        result = arbitrator.score("spec", Path("."))
+
+        assert len(result.judges_used) == 3
+        assert result.stragglers == []
+
+    def test_stragglers_cancelled(self):
+        slow = AsyncSlowJudge(5.0)
+        arbitrator = arbitrator_with({
+            "fast": AsyncSlowJudge(0.01),
+            "sync": SlowJudge(0.01),
+            "slow": slow,
+        }, judge_timeout=0.2)
+
+        start = time.time()
+        result = arbitrator.score("spec", Path("."))
+
+        assert time.time() - start < 0.6
+        assert result.judges_used == ["fast", "sync"]
+        assert result.stragglers == ["slow"]
+        assert slow.cancelled
+
+    def test_quorum_cancels_remaining_judges(self):
+        slow = AsyncSlowJudge(5.0, create_mock_score(2, 2, 2, 2, 2))
+        arbitrator = arbitrator_with({
+            "judge1": AsyncSlowJudge(0.01, create_mock_score(8, 8, 8, 8, 8)),
+            "judge2": AsyncSlowJudge(0.02, create_mock_score(8, 8, 8, 8, 7)),
+            "judge3": slow,
+        }, quorum=2)
+
+        result = arbitrator.score("spec", Path("."))
+
+        assert result.stragglers == ["judge3"] and slow.cancelled
+
+    def test_failed_judge_skipped(self):
+        arbitrator = arbitrator_with({
+            "ok": SlowJudge(0.01, create_mock_score(8, 8, 8, 8, 8)),
+            "broken": SlowJudge(0.01, error=RuntimeError("API down")),
+        })
+
+        result = arbitrator.score("spec", Path("."))
+
+        assert result.judges_used == ["ok"]
+        assert result.final_score == 80.0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
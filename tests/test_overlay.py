@@ -0,0 +1,132 @@
+"""
+=============================================================================
+SCRIPT NAME: test_overlay.py
+=============================================================================
+
+Tests for per-test workspace clones.
+
+Tests cover:
+- clone_tree(): contents, modes, symlinks, skipped cache directories
+- Writes to a clone never reaching the original
+- Falling back to plain copies where reflinks are unsupported
+- Tests run by FunctionalTestRunner not seeing each other's files,
+  in-process and in isolated workers
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import errno
+import os
+import time
+
+import pytest
+
+from vibe_eval.sandbox import overlay
+from vibe_eval.sandbox.overlay import clone_tree
+from vibe_eval.sandbox.test_runner import FunctionalTestRunner
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    workspace = tmp_path / "ws"
+    (workspace / "pkg").mkdir(parents=True)
+    (workspace / "__pycache__").mkdir()
+    (workspace / "main.py").write_text("print('hi')\n")
+    (workspace / "main.py").chmod(0o755)
+    (workspace / "pkg" / "util.py").write_text("X = 1\n")
+    (workspace / "__pycache__" / "main.cpython.pyc").write_bytes(b"\0")
+    (workspace / "link.py").symlink_to("main.py")
+    return workspace
+
+
+class TestCloneTree:
+    """Tests for clone_tree()."""
+
+    def test_contents_and_metadata(self, workspace, tmp_path):
+        stats = clone_tree(workspace, tmp_path / "copy")
+
+        copy = tmp_path / "copy"
+        assert (copy / "pkg" / "util.py").read_text() == "X = 1\n"
+        assert os.stat(copy / "main.py").st_mode == os.stat(workspace / "main.py").st_mode
+        assert os.readlink(copy / "link.py") == "main.py"
+        assert not (copy / "__pycache__").exists()
+        assert stats.files == 3 and stats.reflinked + stats.copied == 2
+
+    def test_writes_stay_in_clone(self, workspace, tmp_path):
+        copy = tmp_path / "copy"
+        clone_tree(workspace, copy)
+
+        with open(copy / "main.py", "w") as f:
+            f.write("changed")
+        (copy / "new.txt").write_text("x")
+
+        assert (workspace / "main.py").read_text() == "print('hi')\n"
+        assert not (workspace / "new.txt").exists()
+
+    def test_destination_must_not_exist(self, workspace, tmp_path):
+        (tmp_path / "copy").mkdir()
+        with pytest.raises(FileExistsError):
+            clone_tree(workspace, tmp_path / "copy")
+
+    def test_falls_back_to_copy(self, workspace, tmp_path, monkeypatch):
+        def unsupported(fd, request, arg):
+            raise OSError(errno.EOPNOTSUPP, "not supported")
+
+        monkeypatch.setattr(overlay.fcntl, "ioctl", unsupported)
+        monkeypatch.setattr(overlay, "_no_reflink_devices", set())
+
+        stats = clone_tree(workspace, tmp_path / "copy")
+
+        assert (stats.reflinked, stats.copied) == (0, 2)
+        assert (tmp_path / "copy" / "main.py").read_text() == "print('hi')\n"
+        assert overlay._no_reflink_devices == {os.stat(workspace).st_dev}
+
+    def test_small_workspace_is_fast(self, tmp_path):
+        workspace = tmp_path / "ws"
+        workspace.mkdir()
+        for i in range(20):
+            (workspace / f"module_{i}.py").write_text("x = 1\n" * 200)
+
+        start = time.perf_counter()
+        clone_tree(workspace, tmp_path / "copy")
+        # Generous bound for slow CI disks; typically well under 5 ms
+        assert time.perf_counter() - start < 0.5
+
+
+LEAKY_TESTS = '''
+def test_a_writes(workspace, main_file):
+    assert main_file.parent == workspace
+    (workspace / "scratch.txt").write_text("from a")
+    main_file.write_text("broken(")
+
+
+def test_b_reads(workspace, main_file):
+    assert not (workspace / "scratch.txt").exists()
+    assert main_file.read_text() == "print('hi')\\n"
+'''
+
+
+class TestRunnerClones:
+    """Each Python test gets its own workspace."""
+
+    @pytest.mark.parametrize("isolate", [True, False])
+    def test_tests_do_not_see_each_other(self, workspace, tmp_path, isolate):
+        test_file = tmp_path / "tests.py"
+        test_file.write_text(LEAKY_TESTS)
+
+        result = FunctionalTestRunner(isolate=isolate).run_tests(workspace, test_file)
+
+        assert (result.passed, result.failed) == (2, 0)
+        assert not (workspace / "scratch.txt").exists()
+
+    def test_shared_workspace_when_disabled(self, workspace, tmp_path):
+        test_file = tmp_path / "tests.py"
+        test_file.write_text(LEAKY_TESTS)
+
+        result = FunctionalTestRunner(isolate=False, clone_workspaces=False).run_tests(workspace, test_file)
+
+        assert [r.passed for r in result.results] == [True, False]
+        assert (workspace / "scratch.txt").read_text() == "from a"
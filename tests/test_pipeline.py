@@ -0,0 +1,115 @@
+"""
+=============================================================================
+SCRIPT NAME: test_pipeline.py
+=============================================================================
+
+Tests for the streaming stage pipeline used by the concurrent runner.
+
+Tests cover:
+- Every item passes through every stage
+- Stage errors are counted and the item is forwarded
+- Backpressure is recorded when a downstream queue is full
+- Wall time approaches the slowest stage rather than the sum
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import time
+
+import pytest
+
+from vibe_eval.pipeline import Stage, StagePipeline
+from vibe_eval.scheduler import parse_stage_workers
+
+
+class TestStagePipeline:
+    """Tests for StagePipeline."""
+
+    def test_items_visit_all_stages(self):
+        pipeline = StagePipeline([
+            Stage("a", lambda item: item + ["a"], workers=2),
+            Stage("b", lambda item: item + ["b"], workers=3),
+        ])
+
+        results = pipeline.run([[i] for i in range(10)])
+
+        assert len(results) == 10
+        assert sorted(r[0] for r in results) == list(range(10))
+        assert all(r[1:] == ["a", "b"] for r in results)
+        assert [st.processed for st in pipeline.stats()] == [10, 10]
+
+    def test_errors_forward_original_item(self):
+        def explode(item):
+            raise RuntimeError("boom")
+
+        pipeline = StagePipeline([
+            Stage("bad", explode),
+            Stage("good", lambda item: item * 2),
+        ])
+
+        results = pipeline.run([1, 2, 3])
+
+        assert sorted(results) == [2, 4, 6]
+        assert pipeline.stats()[0].errors == 3
+
+    def test_on_result_called_per_item(self):
+        seen = []
+        pipeline = StagePipeline([Stage("only", lambda item: item)])
+
+        pipeline.run(range(5), on_result=seen.append)
+
+        assert sorted(seen) == [0, 1, 2, 3, 4]
+
+    def test_backpressure_recorded(self):
+        def slow(item):
+            time.sleep(0.05)
+            return item
+
+        pipeline = StagePipeline([
+            Stage("fast", lambda item: item, workers=1),
+            Stage("slow", slow, workers=1, capacity=1),
+        ])
+
+        pipeline.run(range(6))
+
+        fast, slow_stats = pipeline.stats()
+        assert fast.blocked_seconds > 0.05
+        assert slow_stats.max_queue_depth <= 1
+
+    def test_wall_time_tracks_slowest_stage(self):
+        def sleep_for(seconds):
+            def func(item):
+                time.sleep(seconds)
+                return item
+            return func
+
+        pipeline = StagePipeline([
+            Stage("generate", sleep_for(0.1), workers=1),
+            Stage("test", sleep_for(0.1), workers=1),
+            Stage("score", sleep_for(0.1), workers=1),
+        ])
+
+        start = time.time()
+        pipeline.run(range(5))
+        elapsed = time.time() - start
+
+        # Serial would be 5 × 0.3s = 1.5s; pipelined is ~(5 + 2) × 0.1s
+        assert elapsed < 1.1
+
+    def test_requires_a_stage(self):
+        with pytest.raises(ValueError):
+            StagePipeline([])
+
+
+class TestParseStageWorkers:
+    """Tests for --stage-workers parsing."""
+
+    def test_parses_known_stages(self):
+        assert parse_stage_workers(("test=4", "score=2")) == {"test": 4, "score": 2}
+
+    def test_rejects_unknown_stage(self):
+        with pytest.raises(ValueError):
+            parse_stage_workers(("judge=2",))
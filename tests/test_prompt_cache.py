@@ -0,0 +1,190 @@
+"""
+=============================================================================
+SCRIPT NAME: test_prompt_cache.py
+=============================================================================
+
+Tests for provider prompt-cache hints and cached-token accounting.
+
+Tests cover:
+- cache_control breakpoints on marked messages (Anthropic/Google only)
+- cached_input_tokens read from OpenRouter usage
+- AgentLoop and AbsoluteJudge marking their stable prefixes
+- Cached tokens costed at the provider's discounted rate
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from vibe_eval.agent_loop import AgentLoop
+from vibe_eval.judge.absolute import AbsoluteJudge, JudgeMetrics
+from vibe_eval.models.base import BaseModel, Message, ModelResponse, cached_input_rate
+from vibe_eval.models.openrouter import MAX_CACHE_BREAKPOINTS, format_messages
+from vibe_eval.models.pool import close_shared_clients
+from vibe_eval.reporting.leaderboard import ModelMetrics
+
+MESSAGES = [
+    Message(role="system", content="system prompt"),
+    Message(role="user", content="spec", cache=True),
+    Message(role="assistant", content="reply"),
+    Message(role="user", content="feedback", cache=True),
+]
+
+
+class TestFormatMessages:
+    """Tests for cache_control hints."""
+
+    def test_anthropic_gets_breakpoints(self):
+        formatted = format_messages(MESSAGES, "anthropic/claude-opus-4.5")
+
+        assert formatted[0] == {"role": "system", "content": "system prompt"}
+        assert formatted[1]["content"] == [
+            {"type": "text", "text": "spec", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert isinstance(formatted[3]["content"], list)
+
+    def test_alias_resolves_provider(self):
+        assert isinstance(format_messages(MESSAGES, "claude-opus-4.5")[1]["content"], list)
+
+    def test_automatic_caching_providers_unchanged(self):
+        formatted = format_messages(MESSAGES, "openai/gpt-4o")
+
+        assert formatted == [{"role": m.role, "content": m.content} for m in MESSAGES]
+
+    def test_breakpoint_limit_keeps_latest(self):
+        messages = [Message(role="user", content=str(i), cache=True) for i in range(6)]
+        formatted = format_messages(messages, "google/gemini-3-flash")
+
+        marked = [i for i, m in enumerate(formatted) if isinstance(m["content"], list)]
+        assert marked == list(range(6 - MAX_CACHE_BREAKPOINTS, 6))
+
+
+class CachingHandler(BaseHTTPRequestHandler):
+    """Records request bodies and reports cached prompt tokens."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.server.bodies.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+        body = json.dumps({
+            "id": "x", "object": "chat.completion", "created": 0, "model": "m",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": "ok"}}],
+            "usage": {"prompt_tokens": 1000, "completion_tokens": 10, "total_tokens": 1010,
+                      "prompt_tokens_details": {"cached_tokens": 800}},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestOpenRouterUsage:
+    """Tests for cached-token usage from OpenRouterModel."""
+
+    def test_cached_tokens_in_usage(self, monkeypatch):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), CachingHandler)
+        server.bodies = []
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test")
+
+        from vibe_eval.models.openrouter import OpenRouterModel
+        host, port = server.server_address
+        try:
+            with patch("vibe_eval.models.openrouter.OPENROUTER_BASE_URL", f"http://{host}:{port}/v1"):
+                response = OpenRouterModel(model_id="anthropic/test").complete(MESSAGES)
+        finally:
+            server.shutdown()
+            server.server_close()
+            close_shared_clients()
+
+        assert response.usage == {"input_tokens": 1000, "output_tokens": 10, "cached_input_tokens": 800}
+        sent = server.bodies[0]["messages"]
+        assert sent[1]["content"][0]["cache_control"] == {"type": "ephemeral"}
+
+
+class RecordingModel(BaseModel):
+    """Returns scripted replies and records each prompt."""
+
+    def __init__(self, replies, usage=None):
+        self.replies = list(replies)
+        self.usage = usage
+        self.prompts = []
+
+    def complete(self, messages):
+        self.prompts.append(list(messages))
+        return ModelResponse(content=self.replies.pop(0), model="m", usage=self.usage)
+
+    @property
+    def name(self):
+        return "m"
+
+    @property
+    def provider(self):
+        return "test"
+
+
+class TestPrefixMarking:
+    """AgentLoop and AbsoluteJudge mark what repeats between requests."""
+
+    def test_agent_marks_task_and_latest_message(self, tmp_path):
+        model = RecordingModel(
+            ['<write_file path="a.py">x</write_file>', "<done>ok</done>"],
+            usage={"input_tokens": 100, "output_tokens": 5, "cached_input_tokens": 60},
+        )
+        result = AgentLoop(model, "spec", workspace=tmp_path).run()
+
+        first, second = model.prompts
+        assert [m.cache for m in first] == [False, True]
+        assert [m.cache for m in second] == [False, True, False, True]
+        # The stored transcript is not marked
+        assert not result.conversation[-1].cache
+        assert result.total_cached_input_tokens == 120
+
+    def test_judge_instructions_cached_code_separate(self, tmp_path):
+        (tmp_path / "main.py").write_text("print('hi')")
+        scores = {dim: {"score": 7, "reason": "ok"} for dim in
+                  ["executes", "features_complete", "output_quality", "direction_following", "code_quality"]}
+        model = RecordingModel([json.dumps(scores)], usage={"input_tokens": 50, "output_tokens": 5,
+                                                            "cached_input_tokens": 40})
+        with patch("vibe_eval.judge.absolute.get_model", return_value=model):
+            score = AbsoluteJudge("anthropic/claude-opus-4.5").score("Build a CLI", tmp_path)
+
+        system, user = model.prompts[0]
+        assert system.cache and "Build a CLI" in system.content and "print('hi')" not in system.content
+        assert not user.cache and "print('hi')" in user.content
+        assert score.judge_metrics.cached_input_tokens == 40
+
+
+class TestCachedCost:
+    """Tests for cost estimates with cached input."""
+
+    def test_model_metrics_discount(self):
+        plain = ModelMetrics(time_seconds=1, turns=1, files_created=1,
+                             input_tokens=1_000_000, output_tokens=0)
+        cached = ModelMetrics(time_seconds=1, turns=1, files_created=1,
+                              input_tokens=1_000_000, output_tokens=0, cached_input_tokens=1_000_000)
+
+        assert plain.estimated_llm_cost("anthropic/claude-opus-4.5") == 5.0
+        assert cached.estimated_llm_cost("anthropic/claude-opus-4.5") == pytest.approx(0.5)
+
+    def test_judge_metrics_discount(self):
+        metrics = JudgeMetrics(input_tokens=1_000_000, judge_model="openai/gpt-4o",
+                               cached_input_tokens=1_000_000)
+
+        assert metrics.estimated_cost() == pytest.approx(1.25)
+
+    def test_unknown_provider_not_discounted(self):
+        assert cached_input_rate("local:qwen") == 1.0
@@ -0,0 +1,227 @@
+"""
+=============================================================================
+SCRIPT NAME: test_ratelimit.py
+=============================================================================
+
+Tests for the client-side rate limiter.
+
+Tests cover:
+- Token bucket reservations
+- AIMD concurrency adjustments
+- Retry-After parsing and the shared back-off gate
+- OpenRouterModel retrying a 429 through the limiter
+- --rate-limit parsing
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import asyncio
+import json
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from vibe_eval.models.base import Message
+from vibe_eval.models.pool import close_shared_clients
+from vibe_eval.models.ratelimit import (
+    AdaptiveConcurrency,
+    RateLimitConfig,
+    RateLimiter,
+    TokenBucket,
+    configure_rate_limits,
+    get_rate_limiter,
+    parse_retry_after,
+    rate_limit_stats,
+)
+from vibe_eval.scheduler import parse_rate_limits
+
+
+@pytest.fixture(autouse=True)
+def reset_limiters():
+    configure_rate_limits({})
+    yield
+    configure_rate_limits({})
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(per_minute=60, capacity=2)
+
+        assert bucket.reserve(1) == 0.0
+        assert bucket.reserve(1) == 0.0
+        assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+
+    def test_refund_restores_capacity(self):
+        bucket = TokenBucket(per_minute=600, capacity=100)
+        bucket.reserve(100)
+        bucket.refund(50)
+
+        assert bucket.reserve(50) == 0.0
+
+
+class TestAdaptiveConcurrency:
+    """Tests for the AIMD limit."""
+
+    def test_unbounded_until_congestion(self):
+        aimd = AdaptiveConcurrency()
+        for _ in range(8):
+            assert aimd.try_acquire()
+
+        aimd.on_congestion()
+
+        assert aimd.limit == 4.0
+        assert not aimd.try_acquire()
+
+    def test_additive_increase(self):
+        aimd = AdaptiveConcurrency(max_limit=4)
+        aimd.limit = 2.0
+
+        aimd.on_success()
+        aimd.on_success()
+
+        assert 2.5 < aimd.limit <= 3.0
+
+    def test_decrease_respects_cooldown_and_floor(self):
+        aimd = AdaptiveConcurrency(min_limit=2)
+        for _ in range(3):
+            aimd.try_acquire()
+
+        aimd.on_congestion()
+        aimd.on_congestion()  # Within cooldown: ignored
+
+        assert aimd.limit == 2.0
+
+
+class TestRetryAfter:
+    """Tests for parse_retry_after."""
+
+    def test_seconds(self):
+        assert parse_retry_after({"retry-after": "3"}) == 3.0
+
+    def test_milliseconds_preferred(self):
+        assert parse_retry_after({"retry-after-ms": "250", "retry-after": "3"}) == 0.25
+
+    def test_http_date(self):
+        header = formatdate(time.time() + 10, usegmt=True)
+        assert 8 <= parse_retry_after({"retry-after": header}) <= 10
+
+    def test_missing(self):
+        assert parse_retry_after({}) is None
+
+    def test_gate_delays_next_request(self):
+        limiter = RateLimiter("test")
+
+        async def go():
+            await limiter.acquire()
+            limiter.release(ok=False, throttled=True, retry_after=0.2)
+            start = time.monotonic()
+            await limiter.acquire()
+            limiter.release()
+            return time.monotonic() - start
+
+        assert asyncio.run(go()) >= 0.15
+        assert limiter.stats.throttled == 1
+
+
+class TestRegistry:
+    """Tests for limiter lookup."""
+
+    def test_shared_per_provider(self):
+        assert get_rate_limiter("anthropic/claude-opus-4.5") is get_rate_limiter("claude-sonnet-4.5")
+
+    def test_model_config_wins(self):
+        configure_rate_limits({"openai/gpt-4o": RateLimitConfig(requests_per_minute=10)})
+
+        assert get_rate_limiter("openai/gpt-4o").name == "openai/gpt-4o"
+        assert get_rate_limiter("openai/o1").name == "openai"
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """Returns 429 with Retry-After for the first request, then succeeds."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            self.server.calls += 1
+            first = self.server.calls == 1
+
+        if first:
+            body = json.dumps({"error": {"message": "rate limited"}}).encode()
+            self.send_response(429)
+            self.send_header("Retry-After", "0.2")
+        else:
+            body = json.dumps({
+                "id": "x", "object": "chat.completion", "created": 0, "model": "m",
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": "ok"}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+            }).encode()
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestOpenRouterRetries:
+    """Tests for 429 handling in OpenRouterModel."""
+
+    def test_retries_after_429(self, monkeypatch):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), ThrottlingHandler)
+        server.calls = 0
+        server.lock = threading.Lock()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test")
+
+        from vibe_eval.models.openrouter import OpenRouterModel
+        host, port = server.server_address
+        try:
+            with patch("vibe_eval.models.openrouter.OPENROUTER_BASE_URL", f"http://{host}:{port}/v1"):
+                model = OpenRouterModel(model_id="anthropic/test")
+                start = time.time()
+                response = model.complete([Message(role="user", content="hi")])
+                elapsed = time.time() - start
+        finally:
+            server.shutdown()
+            server.server_close()
+            close_shared_clients()
+
+        assert response.content == "ok"
+        assert server.calls == 2
+        assert elapsed >= 0.15
+        stats = rate_limit_stats()["anthropic"]
+        assert stats["throttled"] == 1
+        assert stats["requests"] == 2
+
+
+class TestParseRateLimits:
+    """Tests for --rate-limit parsing."""
+
+    def test_rpm_and_tpm(self):
+        limits = parse_rate_limits(("Anthropic=500:400000", "openai/gpt-4o=60"))
+
+        assert limits["anthropic"].requests_per_minute == 500
+        assert limits["anthropic"].tokens_per_minute == 400000
+        assert limits["openai/gpt-4o"].tokens_per_minute is None
+
+    def test_tpm_only(self):
+        assert parse_rate_limits(("openai=:200000",))["openai"].requests_per_minute is None
+
+    @pytest.mark.parametrize("spec", ["anthropic", "anthropic=", "anthropic=0", "anthropic=x:1"])
+    def test_rejects_malformed(self, spec):
+        with pytest.raises(ValueError):
+            parse_rate_limits((spec,))
@@ -0,0 +1,186 @@
+"""
+=============================================================================
+SCRIPT NAME: test_scheduler.py
+=============================================================================
+
+Tests for concurrent (case, model) scheduling.
+
+Tests cover:
+- Provider key resolution and CLI limit parsing
+- Per-provider concurrency caps
+- Concurrent runner regrouping results into per-case CaseResults
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from vibe_eval.judge.absolute import AbsoluteScore, DimensionScore
+from vibe_eval.models.base import BaseModel, ModelResponse
+from vibe_eval.runner import EvalRunner
+from vibe_eval.scheduler import (
+    ProviderLimiter,
+    parse_provider_limits,
+    provider_key,
+)
+
+
+class ScriptedModel(BaseModel):
+    """Model that writes one Python file and signals done."""
+
+    def __init__(self, model_id: str, delay: float = 0.0):
+        self.model_id = model_id
+        self.delay = delay
+
+    def complete(self, messages):
+        time.sleep(self.delay)
+        return ModelResponse(
+            content='<write_file path="main.py">print("hi")</write_file><done>ok</done>',
+            model=self.model_id,
+            usage={"input_tokens": 10, "output_tokens": 5},
+        )
+
+    @property
+    def name(self) -> str:
+        return self.model_id
+
+    @property
+    def provider(self) -> str:
+        return "test"
+
+
+def fixed_score(*args, **kwargs) -> AbsoluteScore:
+    """Judge stand-in returning a constant score."""
+    return AbsoluteScore(
+        executes=DimensionScore(8, "ok"),
+        features_complete=DimensionScore(8, "ok"),
+        output_quality=DimensionScore(8, "ok"),
+        direction_following=DimensionScore(8, "ok"),
+        code_quality=DimensionScore(8, "ok"),
+    )
+
+
+def make_runner(tmp_path: Path, cases: list[str], models: list[str], **kwargs) -> EvalRunner:
+    """Build a single-judge runner whose judge returns fixed_score."""
+    with patch("vibe_eval.judge.absolute.get_model", side_effect=lambda m: ScriptedModel(m)):
+        runner = EvalRunner(
+            models=models,
+            cases_dir=make_cases(tmp_path, cases),
+            results_dir=tmp_path / "results",
+            multi_judge=False,
+            validate_execution=False,
+            run_functional_tests=False,
+            **kwargs,
+        )
+    runner.absolute_judge.score = fixed_score
+    return runner
+
+
+def make_cases(root: Path, names: list[str]) -> Path:
+    """Create minimal case directories with a spec.md each."""
+    cases_dir = root / "cases"
+    for name in names:
+        (cases_dir / name).mkdir(parents=True)
+        (cases_dir / name / "spec.md").write_text(f"# {name}\nPrint hi.")
+    return cases_dir
+
+
+class TestProviderKey:
+    """Tests for provider resolution."""
+
+    def test_full_model_id(self):
+        assert provider_key("anthropic/claude-opus-4.5") == "anthropic"
+
+    def test_shorthand_resolved_via_aliases(self):
+        assert provider_key("gpt-4o") == "openai"
+
+    def test_provider_hint_ignored(self):
+        assert provider_key("openai/gpt-oss-120b@Cerebras") == "openai"
+
+    def test_local_models(self):
+        assert provider_key("local:qwen") == "local"
+
+
+class TestParseProviderLimits:
+    """Tests for --provider-limit parsing."""
+
+    def test_parses_specs(self):
+        assert parse_provider_limits(("anthropic=4", "OpenAI=2")) == {
+            "anthropic": 4,
+            "openai": 2,
+        }
+
+    @pytest.mark.parametrize("spec", ["anthropic", "anthropic=0", "anthropic=x"])
+    def test_rejects_malformed(self, spec):
+        with pytest.raises(ValueError):
+            parse_provider_limits((spec,))
+
+
+class TestProviderLimiter:
+    """Tests for per-provider caps."""
+
+    def test_cap_is_enforced(self):
+        limiter = ProviderLimiter({"anthropic": 2})
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def work():
+            nonlocal active, peak
+            with limiter.slot("anthropic/claude-opus-4.5"):
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.05)
+                with lock:
+                    active -= 1
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert peak == 2
+
+    def test_unlimited_provider_passes_through(self):
+        limiter = ProviderLimiter({})
+        with limiter.slot("openai/gpt-4o"):
+            pass
+
+
+class TestConcurrentRunner:
+    """Tests for the concurrent runner path."""
+
+    def test_results_grouped_per_case(self, tmp_path):
+        models = ["openai/model-1", "anthropic/model-2"]
+        runner = make_runner(tmp_path, ["case_a", "case_b"], models, jobs=4)
+
+        with patch("vibe_eval.runner.get_model", side_effect=lambda m: ScriptedModel(m, 0.05)):
+            run = runner.run()
+
+        assert set(run.case_results) == {"case_a", "case_b"}
+        for case_result in run.case_results.values():
+            assert list(case_result.absolute_scores) == models
+            assert list(case_result.model_metrics) == models
+            assert case_result.absolute_scores["openai/model-1"].total_score == 80.0
+
+    def test_pairs_overlap(self, tmp_path):
+        models = ["openai/model-1", "anthropic/model-2"]
+        runner = make_runner(tmp_path, ["case_a", "case_b"], models, jobs=4)
+
+        with patch("vibe_eval.runner.get_model", side_effect=lambda m: ScriptedModel(m, 0.3)):
+            start = time.time()
+            runner.run()
+            elapsed = time.time() - start
+
+        # Four 0.3s sessions on four workers should take well under 4 × 0.3s
+        assert elapsed < 0.9
@@ -0,0 +1,197 @@
+"""
+=============================================================================
+SCRIPT NAME: test_streaming.py
+=============================================================================
+
+Tests for streamed completions and early action execution.
+
+Tests cover:
+- ActionParser emitting blocks as their closing tags arrive
+- complete_stream() fallback and the async-to-sync bridge
+- AgentLoop executing actions before the reply finishes streaming
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import threading
+
+from vibe_eval.action_parser import ActionParser
+from vibe_eval.agent_loop import AgentLoop
+from vibe_eval.models.base import AsyncBaseModel, BaseModel, ModelResponse
+from vibe_eval.models.pool import close_shared_clients
+
+REPLY = (
+    'Plan first.\n'
+    '<write_file path="main.py">print("hi")</write_file>\n'
+    '<run_command>python main.py</run_command>\n'
+    '<write_file path="README.md">Run <run_command>echo nested</run_command></write_file>\n'
+    '<done>ok</done>'
+)
+
+
+def chunks(text: str, size: int = 7) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestActionParser:
+    """Tests for ActionParser."""
+
+    def test_emits_in_order_as_blocks_close(self):
+        parser = ActionParser()
+        emitted = []
+        for delta in chunks(REPLY, 3):
+            emitted.extend(parser.feed(delta))
+
+        assert [list(a.files_to_write) or a.commands_to_run for a in emitted[:3]] == [
+            ["main.py"],
+            ["python main.py"],
+            ["README.md"],
+        ]
+        assert emitted[3].is_done
+        assert parser.text == REPLY
+
+    def test_nothing_emitted_before_closing_tag(self):
+        parser = ActionParser()
+
+        assert parser.feed('<write_file path="a.py">x = 1') == []
+        assert len(parser.feed('</write_file>')) == 1
+
+    def test_commands_inside_file_bodies_not_emitted(self):
+        parser = ActionParser()
+        actions = parser.feed('<write_file path="doc.md"><run_command>ls</run_command>')
+
+        assert actions == []
+
+    def test_read_file_and_empty_command(self):
+        parser = ActionParser()
+        actions = parser.feed('<run_command>  </run_command><read_file path="a.py"/>')
+
+        assert len(actions) == 1
+        assert actions[0].files_to_read == ["a.py"]
+
+
+class StreamingModel(BaseModel):
+    """Streams a fixed reply and records what the workspace held mid-stream."""
+
+    def __init__(self, reply: str, workspace):
+        self.reply = reply
+        self.workspace = workspace
+        self.seen_mid_stream = None
+
+    def complete(self, messages):
+        return ModelResponse(content=self.reply, model="stream")
+
+    def complete_stream(self, messages, on_text):
+        parts = chunks(self.reply)
+        for i, part in enumerate(parts):
+            on_text(part)
+            if i == len(parts) // 2:
+                self.seen_mid_stream = sorted(p.name for p in self.workspace.iterdir())
+        return ModelResponse(content=self.reply, model="stream", usage={"input_tokens": 1, "output_tokens": 1})
+
+    @property
+    def name(self):
+        return "stream"
+
+    @property
+    def provider(self):
+        return "test"
+
+
+class TestAgentLoopStreaming:
+    """Tests for AgentLoop(stream=True)."""
+
+    def test_actions_run_before_stream_ends(self, tmp_path):
+        reply = (
+            '<write_file path="main.py">print("hi")</write_file>'
+            '<run_command>python main.py</run_command>'
+            + "padding " * 50
+            + '<write_file path="extra.py">x = 1</write_file><done>ok</done>'
+        )
+        model = StreamingModel(reply, tmp_path)
+        result = AgentLoop(model, "spec", workspace=tmp_path, stream=True).run()
+
+        assert result.completed
+        assert model.seen_mid_stream == ["main.py"]
+        assert sorted(result.files_created) == ["extra.py", "main.py"]
+        # Each action ran exactly once
+        assert result.metrics.files_written == 2
+        assert result.metrics.commands_run == 1
+        assert result.metrics.early_actions == 3
+        assert len(result.metrics.first_token_seconds) == 1
+        assert result.metrics.to_dict()["time_to_first_action"] is not None
+
+    def test_matches_non_streaming_outcome(self, tmp_path):
+        streamed = AgentLoop(StreamingModel(REPLY, tmp_path / "a"), "spec",
+                             workspace=tmp_path / "a", stream=True)
+        plain = AgentLoop(StreamingModel(REPLY, tmp_path / "b"), "spec",
+                          workspace=tmp_path / "b")
+
+        a, b = streamed.run(), plain.run()
+
+        assert sorted(a.files_created) == sorted(b.files_created)
+        assert (tmp_path / "a" / "README.md").read_text() == (tmp_path / "b" / "README.md").read_text()
+        # The command quoted inside README.md is file content in both modes
+        assert a.metrics.commands_run == b.metrics.commands_run == 1
+
+
+class FallbackModel(BaseModel):
+    def complete(self, messages):
+        return ModelResponse(content="whole reply", model="m")
+
+    @property
+    def name(self):
+        return "m"
+
+    @property
+    def provider(self):
+        return "test"
+
+
+class AsyncStreamingModel(AsyncBaseModel):
+    async def acomplete(self, messages):
+        return ModelResponse(content="abc", model="m")
+
+    async def acomplete_stream(self, messages, on_text):
+        for part in "abc":
+            on_text(part)
+        return ModelResponse(content="abc", model="m")
+
+    @property
+    def name(self):
+        return "m"
+
+    @property
+    def provider(self):
+        return "test"
+
+
+class TestCompleteStream:
+    """Tests for the complete_stream() API."""
+
+    def test_fallback_delivers_single_delta(self):
+        deltas = []
+        response = FallbackModel().complete_stream([], deltas.append)
+
+        assert deltas == ["whole reply"]
+        assert response.content == "whole reply"
+
+    def test_async_bridge_calls_back_on_caller_thread(self):
+        threads = set()
+        deltas = []
+
+        def on_text(text):
+            threads.add(threading.get_ident())
+            deltas.append(text)
+
+        try:
+            response = AsyncStreamingModel().complete_stream([], on_text)
+        finally:
+            close_shared_clients()
+
+        assert deltas == ["a", "b", "c"]
+        assert threads == {threading.get_ident()}
+        assert response.content == "abc"
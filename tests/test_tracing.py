@@ -0,0 +1,239 @@
+"""
+=============================================================================
+SCRIPT NAME: test_tracing.py
+=============================================================================
+
+Tests for trace spans and the Chrome trace export.
+
+Tests cover:
+- Span timing, attributes and errors; nothing recorded while tracing is off
+- Tracks nesting, following asyncio tasks and pool.submit(), and the
+  thread fallback
+- Chrome trace event format of Tracer.export()
+- Spans from the model adapter, sandbox commands and tests
+- AgentLoop session/turn/model/tool spans and per-turn metrics
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from vibe_eval import tracing
+from vibe_eval.agent_loop import AgentLoop, AsyncAgentLoop
+from vibe_eval.models.base import BaseModel, Message, ModelResponse
+from vibe_eval.models.pool import close_shared_clients, run_sync, submit
+from vibe_eval.sandbox.executor import SandboxExecutor
+from vibe_eval.sandbox.test_runner import FunctionalTestRunner
+from tests.test_async_models import FakeChatServer, make_model
+
+
+@pytest.fixture
+def tracer():
+    tracer = tracing.start_tracing()
+    yield tracer
+    tracing.stop_tracing()
+
+
+class TestSpan:
+    """Tests for tracing.span()."""
+
+    def test_times_and_records(self, tracer):
+        with tracing.span("work", "test", size=3) as span:
+            time.sleep(0.05)
+            span.set(result="ok")
+
+        assert span.seconds >= 0.05
+        assert tracer.spans("work") == [span]
+        assert span.attributes == {"size": 3, "result": "ok"}
+
+    def test_error_recorded(self, tracer):
+        with pytest.raises(ValueError):
+            with tracing.span("work"):
+                raise ValueError("bad input")
+
+        assert tracer.spans("work")[0].attributes["error"] == "ValueError: bad input"
+
+    def test_not_recorded_when_off(self):
+        with tracing.span("work") as span:
+            pass
+
+        assert tracing.active_tracer() is None
+        assert span.seconds >= 0
+
+    def test_span_limit(self):
+        tracer = tracing.start_tracing(max_spans=2)
+        try:
+            for _ in range(5):
+                with tracing.span("work"):
+                    pass
+        finally:
+            tracing.stop_tracing()
+
+        assert len(tracer.spans()) == 2 and tracer.dropped == 3
+
+
+class TestTracks:
+    """Tests for tracing.track()."""
+
+    def test_nesting(self, tracer):
+        with tracing.track("case/model"):
+            with tracing.track("judge a"):
+                with tracing.span("inner"):
+                    pass
+            with tracing.span("outer"):
+                pass
+
+        assert tracer.spans("inner")[0].track == "case/model/judge a"
+        assert tracer.spans("outer")[0].track == "case/model"
+
+    def test_thread_fallback(self, tracer):
+        thread = threading.Thread(target=lambda: tracing.span("work").__enter__().__exit__(None, None, None),
+                                  name="worker-1")
+        thread.start()
+        thread.join()
+
+        assert tracer.spans("work")[0].track == "thread worker-1"
+
+    def test_follows_asyncio_tasks(self, tracer):
+        async def child():
+            with tracing.span("child"):
+                await asyncio.sleep(0)
+
+        async def main():
+            with tracing.track("session"):
+                await asyncio.gather(child(), child())
+
+        asyncio.run(main())
+
+        assert [s.track for s in tracer.spans("child")] == ["session", "session"]
+
+    def test_follows_pool_submit(self, tracer):
+        async def request():
+            with tracing.span("request"):
+                pass
+
+        try:
+            with tracing.track("case/model"):
+                submit(request()).result()
+            run_sync(request())
+        finally:
+            close_shared_clients()
+
+        inside, outside = [s.track for s in tracer.spans("request")]
+        assert inside == "case/model" and outside.startswith("thread ")
+
+
+class TestExport:
+    """Tests for the Chrome trace export."""
+
+    def test_chrome_trace_format(self, tracer, tmp_path):
+        with tracing.track("a/m"):
+            with tracing.span("outer", "agent", turn=1):
+                with tracing.span("inner", "model", path=tmp_path):
+                    time.sleep(0.01)
+
+        trace = json.loads(tracer.export(tmp_path / "run_trace.json").read_text())
+
+        events = trace["traceEvents"]
+        names = [e for e in events if e["ph"] == "M" and e["name"] == "thread_name"]
+        assert [e["args"]["name"] for e in names] == ["a/m"]
+        outer, inner = [e for e in events if e["ph"] == "X"]
+        assert (outer["name"], outer["cat"], outer["args"]) == ("outer", "agent", {"turn": 1})
+        assert inner["args"] == {"path": str(tmp_path)}
+        assert outer["ts"] <= inner["ts"] and inner["dur"] >= 10_000  # Microseconds
+        assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+        assert outer["tid"] == inner["tid"] == names[0]["tid"]
+        assert trace["otherData"]["dropped_spans"] == 0
+
+
+class TestInstrumentation:
+    """Spans recorded by the adapters, sandbox and test runner."""
+
+    def test_model_request(self, tracer):
+        server = FakeChatServer()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            make_model(server).complete([Message(role="user", content="hello")])
+        finally:
+            server.shutdown()
+            server.server_close()
+            close_shared_clients()
+
+        request = tracer.spans("model.request")[0]
+        assert request.attributes["model"] == "test" and request.attributes["stream"] is False
+
+    def test_sandbox_command(self, tracer, tmp_path):
+        SandboxExecutor(tmp_path).run("echo hi; exit 2")
+
+        command = tracer.spans("sandbox.command")[0]
+        assert command.attributes["command"] == "echo hi; exit 2"
+        assert command.attributes["return_code"] == 2 and command.attributes["output_bytes"] == 3
+
+    def test_functional_tests(self, tracer, tmp_path):
+        (tmp_path / "main.py").write_text("print('hi')\n")
+        test_file = tmp_path / "case" / "tests.py"
+        test_file.parent.mkdir()
+        test_file.write_text("def test_ok(workspace, main_file):\n    pass\n\ndef test_bad(workspace, main_file):\n    assert False\n")
+
+        FunctionalTestRunner().run_tests(tmp_path, test_file)
+
+        run = tracer.spans("tests.run")[0]
+        assert run.attributes == {"test_file": "case", "total": 2, "passed": 1, "failed": 1}
+        cases = {s.attributes["test"]: s.attributes["passed"] for s in tracer.spans("tests.case")}
+        assert cases == {"test_ok": True, "test_bad": False}
+
+
+class ScriptedModel(BaseModel):
+    """Replays fixed replies, each after a delay."""
+
+    def __init__(self, delay: float = 0.05):
+        self.replies = ['<run_command>sleep 0.1</run_command>', '<done>ok</done>']
+        self.delay = delay
+
+    def complete(self, messages):
+        time.sleep(self.delay)
+        return ModelResponse(
+            content=self.replies.pop(0), model="scripted", usage={"input_tokens": 10, "output_tokens": 2},
+        )
+
+    @property
+    def name(self):
+        return "scripted"
+
+    @property
+    def provider(self):
+        return "test"
+
+
+class TestAgentLoop:
+    """Session breakdown from AgentLoop and AsyncAgentLoop."""
+
+    @pytest.mark.parametrize("run", [
+        lambda agent: agent.run(),
+        lambda agent: asyncio.run(AsyncAgentLoop(agent.model, agent.spec, workspace=agent.workspace).arun()),
+    ], ids=["run", "arun"])
+    def test_spans_and_metrics(self, tracer, tmp_path, run):
+        result = run(AgentLoop(ScriptedModel(), "spec", workspace=tmp_path))
+
+        session = tracer.spans("agent.session")[0]
+        assert session.attributes["turns"] == 2 and session.attributes["completed"] is True
+        assert [s.attributes["turn"] for s in tracer.spans("agent.turn")] == [1, 2]
+        calls = tracer.spans("model.complete")
+        assert len(calls) == 2 and calls[0].attributes["output_tokens"] == 2
+        command = tracer.spans("sandbox.command")[0]
+        tools = tracer.spans("agent.tools")[0]
+        assert tools.start_ns <= command.start_ns and command.end_ns <= tools.end_ns
+
+        metrics = result.metrics
+        assert len(metrics.model_seconds) == len(metrics.tool_seconds) == 2
+        assert all(s >= 0.05 for s in metrics.model_seconds)
+        assert metrics.tool_seconds[0] >= 0.1 > metrics.tool_seconds[1]
@@ -294,6 +294,20 @@ class TestWorkspaceValidation:
             assert result.executed is True
             assert "main" in result.stdout
 
+    def test_main_py_wins_over_generated_html(self):
+        """A crashing main.py is still run when it wrote an HTML report."""
+        validator = ExecutionValidator(timeout=10)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "main.py").write_text('raise RuntimeError("crash")')
+            (Path(tmpdir) / "report.html").write_text('<html><body>Report</body></html>')
+
+            result = validator.validate(Path(tmpdir))
+
+            assert result.file_type == "python"
+            assert result.executed is False
+            assert "RuntimeError" in result.stderr
+
 
 class TestStdlibModules:
     """Tests for stdlib module list."""
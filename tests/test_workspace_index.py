@@ -0,0 +1,163 @@
+"""
+=============================================================================
+SCRIPT NAME: test_workspace_index.py
+=============================================================================
+
+Tests for the shared workspace index.
+
+Tests cover:
+- One walk: file order, skipped cache directories, metadata
+- Entry-point rules (HTML app first, then Python priority names)
+- Cached contents, hashes and fingerprint
+- Publishing: stages reuse a published index instead of walking again
+- Validator and static analyzer agreeing with the index
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import hashlib
+
+import pytest
+
+from vibe_eval.judge.absolute import clear_file_cache, collect_code_files
+from vibe_eval.sandbox import workspace_index
+from vibe_eval.sandbox.validator import ExecutionValidator
+from vibe_eval.sandbox.workspace_index import WorkspaceIndex
+from vibe_eval.scoring.static_scorer import StaticAnalyzer
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    workspace = tmp_path / "ws"
+    (workspace / "lib").mkdir(parents=True)
+    (workspace / "__pycache__").mkdir()
+    (workspace / "main.py").write_text("print('hi')\n")
+    (workspace / "lib" / "helpers.py").write_text("def f():\n    return 1\n")
+    (workspace / "__pycache__" / "main.cpython-311.pyc").write_bytes(b"\0")
+    (workspace / "README.md").write_text("# App\n")
+    yield workspace
+    WorkspaceIndex.forget()
+
+
+class TestBuild:
+    """Tests for scanning and entry points."""
+
+    def test_files_and_metadata(self, workspace):
+        index = WorkspaceIndex.build(workspace)
+
+        assert [f.relative for f in index.entries()] == ["README.md", "main.py", "lib/helpers.py"]
+        assert index.files(".py") == [workspace / "main.py", workspace / "lib" / "helpers.py"]
+        main = index.entries()[1]
+        assert main.size == len("print('hi')\n") and main.mtime_ns > 0
+
+    def test_python_entry_point(self, workspace):
+        (workspace / "app.py").write_text("")
+
+        index = WorkspaceIndex.build(workspace)
+
+        assert index.entry_point == workspace / "main.py" and index.language == "python"
+
+    def test_root_level_python_fallback(self, workspace):
+        (workspace / "main.py").rename(workspace / "calc.py")
+
+        assert WorkspaceIndex.build(workspace).entry_point == workspace / "calc.py"
+
+    def test_html_app_wins(self, workspace):
+        (workspace / "pages").mkdir()
+        (workspace / "pages" / "index.html").write_text("<html></html>")
+        (workspace / "about.html").write_text("<html></html>")
+
+        index = WorkspaceIndex.build(workspace)
+
+        assert index.entry_point == workspace / "pages" / "index.html"
+        assert index.language == "html"
+
+    def test_python_report_validated_as_python(self, workspace):
+        (workspace / "report.html").write_text("<html></html>")
+
+        index = WorkspaceIndex.build(workspace)
+
+        assert index.entry_point == workspace / "report.html"
+        assert index.validation_entry_point == workspace / "main.py"
+
+    def test_html_validated_without_priority_python(self, workspace):
+        (workspace / "main.py").rename(workspace / "build.py")
+        (workspace / "index.html").write_text("<html></html>")
+
+        index = WorkspaceIndex.build(workspace)
+
+        assert index.validation_entry_point == index.entry_point == workspace / "index.html"
+
+    def test_empty_workspace(self, tmp_path):
+        index = WorkspaceIndex.build(tmp_path)
+
+        assert index.entry_point is None and index.language is None
+
+
+class TestContents:
+    """Tests for cached reads and hashes."""
+
+    def test_read_text_cached(self, workspace):
+        index = WorkspaceIndex.build(workspace)
+
+        assert index.read_text("main.py") == "print('hi')\n"
+        (workspace / "main.py").write_text("changed")
+        assert index.read_text(workspace / "main.py") == "print('hi')\n"
+
+    def test_hashes_and_fingerprint(self, workspace):
+        index = WorkspaceIndex.build(workspace)
+
+        assert index.sha256("main.py") == hashlib.sha256(b"print('hi')\n").hexdigest()
+        assert index.fingerprint == WorkspaceIndex.build(workspace).fingerprint
+        (workspace / "README.md").write_text("# Changed\n")
+        assert index.fingerprint != WorkspaceIndex.build(workspace).fingerprint
+
+
+class TestShared:
+    """Stages reuse one published scan."""
+
+    def test_get_returns_published_index(self, workspace):
+        published = WorkspaceIndex.scan(workspace)
+
+        assert WorkspaceIndex.get(workspace) is published
+        WorkspaceIndex.forget(workspace)
+        assert WorkspaceIndex.get(workspace) is not published
+
+    def test_unpublished_get_sees_current_files(self, workspace):
+        WorkspaceIndex.get(workspace)
+        (workspace / "new.py").write_text("")
+
+        assert workspace / "new.py" in WorkspaceIndex.get(workspace).files()
+
+    def test_stages_do_not_walk_again(self, workspace, monkeypatch):
+        WorkspaceIndex.scan(workspace)
+        clear_file_cache()
+
+        def no_walk(*args, **kwargs):
+            raise AssertionError("workspace walked again")
+
+        monkeypatch.setattr(workspace_index.os, "walk", no_walk)
+
+        assert ExecutionValidator().find_entry_point(workspace) == workspace / "main.py"
+        assert StaticAnalyzer().analyze(workspace).files_analyzed == 2
+        assert sorted(collect_code_files(workspace)) == ["README.md", "lib/helpers.py", "main.py"]
+        clear_file_cache()
+
+    def test_validator_follows_index(self, workspace):
+        (workspace / "main.py").rename(workspace / "build.py")
+        (workspace / "index.html").write_text("<html><body>hi</body></html>")
+
+        report = ExecutionValidator().validate(workspace)
+
+        assert report.file_type == "html"
+
+    def test_validator_runs_main_py_next_to_report(self, workspace):
+        (workspace / "main.py").write_text("raise SystemExit('crash')\n")
+        (workspace / "report.html").write_text("<html><body>report</body></html>")
+
+        report = ExecutionValidator().validate(workspace)
+
+        assert report.file_type == "python" and not report.executed
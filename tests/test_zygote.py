@@ -0,0 +1,160 @@
+"""
+=============================================================================
+SCRIPT NAME: test_zygote.py
+=============================================================================
+
+Tests for the fork server behind SandboxExecutor.
+
+Tests cover:
+- Which commands are forked and which still need the shell
+- Same stdout, stderr and exit code as running through the shell, for
+  scripts, -m, -c, tracebacks, sys.exit and missing files, and
+  workspace files shadowing modules the zygote has loaded, directly or
+  transitively
+- Workspace cwd and executor environment in the forked command
+- Timeouts killing the forked command; blocked commands staying blocked
+- Startup overhead reported per forked command
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+=============================================================================
+"""
+
+import os
+import time
+
+import pytest
+
+from vibe_eval.sandbox.executor import SandboxExecutor
+from vibe_eval.sandbox.zygote import PythonZygote, parse_python_command
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="fork server is POSIX-only")
+
+
+@pytest.fixture(scope="module")
+def zygote():
+    zygote = PythonZygote()
+    zygote.start()
+    yield zygote
+    zygote.stop()
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "main.py").write_text(
+        "import os, sys\n"
+        "print('args', sys.argv[1:])\n"
+        "print('cwd', os.getcwd())\n"
+        "print('unbuffered', os.environ.get('PYTHONUNBUFFERED'))\n"
+        "print('to stderr', file=sys.stderr)\n"
+        "sys.exit(int(sys.argv[1]) if len(sys.argv) > 1 else 0)\n"
+    )
+    (tmp_path / "crash.py").write_text("def f():\n    raise ValueError('boom')\n\nf()\n")
+    (tmp_path / "helper.py").write_text("VALUE = 42\n")
+    (tmp_path / "uses_helper.py").write_text("import helper\nprint(helper.VALUE)\n")
+    (tmp_path / "shadowing").mkdir()
+    (tmp_path / "shadowing" / "statistics.py").write_text("def mean(values):\n    return 'LOCAL'\n")
+    (tmp_path / "shadowing" / "main.py").write_text("import statistics\nprint(statistics.mean([1, 2]))\n")
+    (tmp_path / "slow.py").write_text("import time\nprint('started', flush=True)\ntime.sleep(30)\n")
+    return tmp_path
+
+
+class TestParse:
+    """Tests for parse_python_command()."""
+
+    @pytest.mark.parametrize("command, expected", [
+        ("python main.py", ["python", "main.py"]),
+        ("python -u main.py --n 3", ["python", "-u", "main.py", "--n", "3"]),
+        ("python -m unittest -v", ["python", "-m", "unittest", "-v"]),
+        ("python -c \"print('a; b')\"", ["python", "-c", "print('a; b')"]),
+        ("python main.py '$HOME'", ["python", "main.py", "$HOME"]),
+    ])
+    def test_forked(self, command, expected):
+        assert parse_python_command(command) == expected
+
+    @pytest.mark.parametrize("command", [
+        "python main.py | head", "python main.py > out.txt", "python a.py && python b.py",
+        "python main.py $HOME", "python main.py \"$HOME\"", "python *.py", "FOO=1 python main.py",
+        "python", "python -V", "python -m", "ls -la", "python 'unterminated",
+        "cd sub\npython main.py",
+    ])
+    def test_needs_shell(self, command):
+        assert parse_python_command(command) is None
+
+
+class TestForkedCommands:
+    """Forked commands behave like the shell ran them."""
+
+    @pytest.mark.parametrize("command", [
+        "python main.py",
+        "python main.py 3",
+        "python crash.py",
+        "python uses_helper.py",
+        "python -c \"import sys; print(sys.argv, __name__); sys.exit('bad')\" x",
+        "python -m json.tool --help",
+        "python missing.py",
+        "python -m no_such_module",
+        "python shadowing/main.py",
+    ])
+    def test_same_result_as_shell(self, zygote, workspace, command):
+        forked = SandboxExecutor(workspace, zygote=zygote).run(command)
+        shell = SandboxExecutor(workspace).run(command)
+
+        assert forked.forked and not shell.forked
+        assert (forked.return_code, forked.success) == (shell.return_code, shell.success)
+        assert forked.stdout == shell.stdout
+        assert forked.stderr == shell.stderr
+
+    def test_workspace_shadows_preloaded_module(self, zygote, workspace):
+        executor = SandboxExecutor(workspace / "shadowing", zygote=zygote)
+
+        for command in ("python main.py", "python -m main", "python -c \"import main\""):
+            result = executor.run(command)
+            assert result.forked and result.stdout == "LOCAL\n", command
+
+    @pytest.mark.parametrize("module", ["copy", "enum", "queue", "heapq", "inspect", "types"])
+    def test_workspace_shadows_transitively_loaded_module(self, zygote, tmp_path, module):
+        (tmp_path / f"{module}.py").write_text("NAME = 'LOCAL'\n")
+        (tmp_path / "main.py").write_text(f"import {module}\nprint(getattr({module}, 'NAME', 'stdlib'))\n")
+
+        forked = SandboxExecutor(tmp_path, zygote=zygote).run("python main.py")
+        shell = SandboxExecutor(tmp_path).run("python main.py")
+
+        assert forked.forked
+        assert (forked.stdout, forked.stderr) == (shell.stdout, shell.stderr)
+
+    def test_startup_overhead_reported(self, zygote, workspace):
+        result = SandboxExecutor(workspace, zygote=zygote).run("python main.py")
+
+        assert result.startup_ms is not None and result.startup_ms < zygote.cold_start_ms
+        assert f"cwd {workspace}" in result.stdout
+
+    def test_timeout_kills_command(self, zygote, workspace):
+        executor = SandboxExecutor(workspace, timeout=1, zygote=zygote)
+
+        start = time.time()
+        result = executor.run("python slow.py")
+
+        assert result.timed_out and result.return_code == -1
+        assert result.stdout == "started\n"
+        assert time.time() - start < 5
+
+    def test_shell_commands_not_forked(self, zygote, workspace):
+        result = SandboxExecutor(workspace, zygote=zygote).run("python main.py | tr a-z A-Z")
+
+        assert not result.forked and "ARGS" in result.stdout
+
+    def test_blocked_before_forking(self, zygote, workspace):
+        result = SandboxExecutor(workspace, zygote=zygote).run("python -m pip install requests")
+
+        assert not result.success and result.stderr.startswith("BLOCKED")
+
+    def test_falls_back_when_zygote_stopped(self, workspace):
+        zygote = PythonZygote()
+        zygote.start()
+        zygote.stop()
+
+        result = SandboxExecutor(workspace, zygote=zygote).run("python main.py")
+
+        assert result.success and not result.forked
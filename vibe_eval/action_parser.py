@@ -0,0 +1,400 @@
+"""
+Single-pass, incremental parser for agent action tags.
+
+The agent protocol (see SYSTEM_PROMPT in agent_loop) has two kinds of tag:
+
+- Blocks with a body: <write_file path="...">...</write_file>,
+  <run_command>...</run_command>, <done>...</done>
+- Self-closing tags: <read_file path="..."/>, <list_files path="..."/>,
+  <lint_code path="..."/> or <lint_code/>, <web_search query="..."/>,
+  <run_tests/> (also accepted as a bare <run_tests>)
+
+ActionParser walks the response once, left to right. Outside a block it
+jumps from '<' to '<'; inside a block it only searches the newly arrived
+text for that block's closing tag, keeping the body as a list of chunks
+until the block closes. Every character is therefore examined a bounded
+number of times, no matter how large or malformed the reply is (the old
+regex passes backtracked badly on a missing closing tag in a 100 KB
+reply).
+
+Block bodies are opaque: a <run_command> quoted inside a file body is file
+content, not a command. Quoted attribute values may contain '<' and '>'
+(<web_search query="a > b"/>). Malformed action tags are reported as
+diagnostics rather than silently dropped.
+
+The parser can be fed incrementally. feed() returns each action as soon as
+it is complete, which lets AgentLoop execute file writes and commands while
+the reply is still streaming; finish() returns the merged AgentAction for
+the whole reply.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class AgentAction:
+    """Parsed action from agent response."""
+    files_to_write: dict[str, str] = field(default_factory=dict)
+    files_to_read: list[str] = field(default_factory=list)
+    dirs_to_list: list[str] = field(default_factory=list)
+    commands_to_run: list[str] = field(default_factory=list)
+    run_tests: bool = False
+    lint_files: list[str] = field(default_factory=list)
+    web_searches: list[str] = field(default_factory=list)
+    is_done: bool = False
+    done_message: str = ""
+    # Malformed or unclosed tags found while parsing
+    diagnostics: list[str] = field(default_factory=list)
+
+
+@dataclass
+class BlockSpan:
+    """Where a closed block tag sits in the response text."""
+    tag: str
+    attrs: dict[str, str]
+    start: int        # Offset of the opening '<'
+    end: int          # Offset just past the closing tag
+    body_start: int
+    body_end: int
+
+
+# Tags with a body, and the attribute each one requires (None = no attributes)
+BLOCK_TAGS = {
+    "write_file": "path",
+    "run_command": None,
+    "done": None,
+}
+
+# Self-closing tags and their attribute (lint_code's path is optional)
+SELF_CLOSING_TAGS = {
+    "read_file": "path",
+    "list_files": "path",
+    "lint_code": "path",
+    "web_search": "query",
+    "run_tests": None,
+}
+
+# Longest opening tag we will wait for; anything longer is treated as text
+MAX_TAG_LENGTH = 1024
+
+_TAG = re.compile(r'<(/?)([a-z_]+)((?:\s+[a-z_]+="[^"]*")*)\s*(/?)>')
+# The start of a tag that may still be completed by more input
+_TAG_PREFIX = re.compile(r'</?[a-z_]+(?:\s+[a-z_]+="[^"]*")*(?:\s+[a-z_]*=?(?:"[^"]*)?)?\s*/?')
+_TAG_NAME = re.compile(r'</?([a-z_]+)[\s/>]')
+_ATTR = re.compile(r'([a-z_]+)="([^"]*)"')
+
+
+@dataclass
+class _OpenBlock:
+    tag: str
+    attrs: dict[str, str]
+    start: int                   # Offset of '<'
+    body_start: int              # Offset just past the opening tag
+    parts: list[str] = field(default_factory=list)   # Body received so far
+    length: int = 0              # Total length of parts
+    tail: str = ""               # Last len(closer) - 1 body characters
+
+
+class ActionParser:
+    """
+    Incremental state machine over the action tag grammar.
+
+    Usage:
+        parser = ActionParser()
+        for delta in stream:
+            for action in parser.feed(delta):
+                ...                  # One completed tag per AgentAction
+        actions = parser.finish()    # Everything, merged
+    """
+
+    def __init__(self):
+        self._chunks: list[str] = []
+        # Text state: unconsumed text starting at absolute offset _base
+        self._buffer = ""
+        self._base = 0
+        self._pos = 0
+        # Index of the next '>' in _buffer (-1: none before _gt_scanned)
+        self._next_gt = -1
+        self._gt_scanned = 0
+        self._open: Optional[_OpenBlock] = None
+        self._result = AgentAction()
+        self._blocks: list[BlockSpan] = []
+        self._finished = False
+        # Block tags known to have no closing tag after the current position
+        # (only valid once all input has arrived)
+        self._no_closer: set[str] = set()
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    @property
+    def diagnostics(self) -> list[str]:
+        return self._result.diagnostics
+
+    @property
+    def blocks(self) -> list[BlockSpan]:
+        """Every block closed so far, in order."""
+        return self._blocks
+
+    def feed(self, delta: str) -> list[AgentAction]:
+        """
+        Add more response text.
+
+        Returns:
+            One AgentAction per tag completed by this delta, in order
+        """
+        if self._finished:
+            raise RuntimeError("ActionParser.feed() called after finish()")
+        if delta:
+            self._chunks.append(delta)
+        return self._consume(delta, final=False)
+
+    def finish(self) -> AgentAction:
+        """Mark the end of input and return the merged AgentAction."""
+        if not self._finished:
+            self._finished = True
+            self._consume("", final=True)
+        return self._result
+
+    # ------------------------------------------------------------------
+    # Scanner
+    # ------------------------------------------------------------------
+
+    def _consume(self, text: str, final: bool) -> list[AgentAction]:
+        """Alternate between text and block state until input runs out."""
+        completed: list[AgentAction] = []
+        while text is not None:
+            if self._open is not None:
+                text = self._scan_block(text, final, completed)
+            else:
+                text = self._scan_text(text, final, completed)
+        return completed
+
+    def _scan_text(self, text: str, final: bool, completed: list[AgentAction]) -> Optional[str]:
+        """
+        Scan for tags outside any block.
+
+        Returns the text following an opening block tag, or None once the
+        input is used up.
+        """
+        if text:
+            self._buffer += text
+        buffer = self._buffer
+        while True:
+            lt = buffer.find("<", self._pos)
+            if lt == -1:
+                self._drop(len(buffer))
+                return None
+
+            gt = self._find_gt(lt)
+            if gt == -1:
+                # No tag can end in the text we have. Once input is complete
+                # we are done; otherwise keep the last MAX_TAG_LENGTH
+                # characters' first '<', which could still become a tag.
+                if final:
+                    self._drop(len(buffer))
+                    return None
+                keep = buffer.find("<", max(lt, len(buffer) - MAX_TAG_LENGTH + 1))
+                self._drop(len(buffer) if keep == -1 else keep)
+                return None
+            if gt - lt >= MAX_TAG_LENGTH:
+                # Too long to be a tag: skip to the first '<' within reach of '>'
+                self._pos = gt - MAX_TAG_LENGTH + 1
+                continue
+
+            match = _TAG.match(buffer, lt, gt + 1)
+            if match is None and buffer.count('"', lt, gt) % 2:
+                # The first '>' is inside a quoted value: the tag ends later
+                end = min(len(buffer), lt + MAX_TAG_LENGTH)
+                match = _TAG.match(buffer, lt, end)
+                if match is None and not final and end == len(buffer) and _TAG_PREFIX.fullmatch(buffer, lt, end):
+                    self._drop(lt)  # Wait for the rest of the tag
+                    return None
+            if match is None:
+                self._diagnose_malformed(buffer, lt)
+                self._pos = lt + 1
+                continue
+            self._pos = match.end()
+
+            self._handle_tag(match, self._base + lt, completed)
+            if self._open is not None:
+                rest = buffer[self._pos:]
+                self._drop(len(buffer))
+                return rest
+
+    def _find_gt(self, lt: int) -> int:
+        """Index of the first '>' at or after lt, reusing the previous search."""
+        if self._next_gt >= lt:
+            return self._next_gt
+        start = max(lt, self._gt_scanned) if self._next_gt == -1 else lt
+        self._next_gt = self._buffer.find(">", start)
+        self._gt_scanned = len(self._buffer)
+        return self._next_gt
+
+    def _drop(self, count: int):
+        """Discard the first count characters of the text buffer."""
+        self._buffer = self._buffer[count:]
+        self._base += count
+        self._pos = 0
+        self._next_gt = self._next_gt - count if self._next_gt != -1 else -1
+        self._gt_scanned = max(0, self._gt_scanned - count)
+
+    def _scan_block(self, text: str, final: bool, completed: list[AgentAction]) -> Optional[str]:
+        """
+        Look for the open block's closing tag in the new text.
+
+        Only the new text plus a short tail is searched, so a large body is
+        examined once however it is split. Returns the text after the
+        closing tag, or None while still waiting for it. An unclosed block
+        at end of input is reported and its body returned to be rescanned
+        as text.
+        """
+        block = self._open
+        closer = f"</{block.tag}>"
+        window = block.tail + text
+        index = window.find(closer)
+        if index != -1:
+            body = "".join(block.parts) + text
+            cut = block.length - len(block.tail) + index
+            self._open = None
+            self._base = block.body_start + cut + len(closer)
+            self._blocks.append(BlockSpan(
+                block.tag, block.attrs, block.start, self._base,
+                block.body_start, block.body_start + cut,
+            ))
+            self._block_action(block.tag, block.attrs, body[:cut], completed)
+            return body[cut + len(closer):]
+
+        if text:
+            block.parts.append(text)
+            block.length += len(text)
+            block.tail = window[-(len(closer) - 1):]
+        if not final:
+            return None
+
+        # No closing tag anywhere: report it and treat the body as text
+        self._diagnose(block.start, f"unclosed <{block.tag}> (no {closer} before end of response)")
+        self._no_closer.add(block.tag)
+        self._open = None
+        self._base = block.body_start
+        return "".join(block.parts)
+
+    def _handle_tag(self, match: "re.Match[str]", start: int, completed: list[AgentAction]):
+        closing, name, raw_attrs, self_closing = match.groups()
+        attrs = dict(_ATTR.findall(raw_attrs))
+
+        if closing:
+            if name in BLOCK_TAGS:
+                self._diagnose(start, f"stray </{name}> without an opening tag")
+            return
+
+        if name in BLOCK_TAGS:
+            required = BLOCK_TAGS[name]
+            if self_closing:
+                self._diagnose(start, f"<{name}/> needs a body and a closing </{name}>")
+            elif required and not attrs.get(required):
+                self._diagnose(start, f'<{name}> is missing {required}="..."')
+            elif name in self._no_closer:
+                self._diagnose(start, f"unclosed <{name}> (no </{name}> before end of response)")
+            else:
+                self._open = _OpenBlock(name, attrs, start, start + len(match.group(0)))
+            return
+
+        if name in SELF_CLOSING_TAGS:
+            action = self._self_closing(name, attrs, bool(self_closing), start)
+            if action is not None:
+                completed.append(action)
+        # Anything else is not an action tag (HTML in prose, etc.)
+
+    # ------------------------------------------------------------------
+    # Actions
+    # ------------------------------------------------------------------
+
+    def _block_action(
+        self,
+        tag: str,
+        attrs: dict[str, str],
+        body: str,
+        completed: list[AgentAction],
+    ):
+        content = body.strip()
+        result = self._result
+
+        if tag == "write_file":
+            path = attrs["path"]
+            result.files_to_write[path] = content
+            completed.append(AgentAction(files_to_write={path: content}))
+        elif tag == "run_command":
+            if content:
+                result.commands_to_run.append(content)
+                completed.append(AgentAction(commands_to_run=[content]))
+        else:
+            # done: the first one wins
+            if not result.is_done:
+                result.is_done = True
+                result.done_message = content
+            completed.append(AgentAction(is_done=True, done_message=content))
+
+    def _self_closing(
+        self,
+        tag: str,
+        attrs: dict[str, str],
+        self_closing: bool,
+        start: int,
+    ) -> Optional[AgentAction]:
+        result = self._result
+
+        if tag == "run_tests":
+            # <run_tests> has always been accepted without the slash
+            result.run_tests = True
+            return AgentAction(run_tests=True)
+
+        if not self_closing:
+            self._diagnose(start, f"<{tag}> must be self-closing (<{tag} .../>)")
+            return None
+
+        value = attrs.get(SELF_CLOSING_TAGS[tag])
+        if tag == "lint_code":
+            path = value or ""  # Empty means all files
+            result.lint_files.append(path)
+            return AgentAction(lint_files=[path])
+
+        if not value:
+            self._diagnose(start, f'<{tag}/> is missing {SELF_CLOSING_TAGS[tag]}="..."')
+            return None
+
+        if tag == "read_file":
+            result.files_to_read.append(value)
+            return AgentAction(files_to_read=[value])
+        if tag == "list_files":
+            result.dirs_to_list.append(value)
+            return AgentAction(dirs_to_list=[value])
+        result.web_searches.append(value)
+        return AgentAction(web_searches=[value])
+
+    def _diagnose_malformed(self, buffer: str, lt: int):
+        """Report an action tag at lt that does not parse (other '<' are prose)."""
+        name = _TAG_NAME.match(buffer, lt)
+        if name is not None and name.group(1) in (BLOCK_TAGS.keys() | SELF_CLOSING_TAGS.keys()):
+            self._diagnose(self._base + lt, f'malformed <{name.group(1)}> tag (attributes are name="value")')
+
+    def _diagnose(self, offset: int, message: str):
+        self._result.diagnostics.append(f"{message} at offset {offset}")
+
+
+def parse_actions(response: str) -> AgentAction:
+    """Parse every action in a complete response."""
+    parser = ActionParser()
+    parser.feed(response)
+    return parser.finish()
+
+
+def is_early_action(action: AgentAction) -> bool:
+    """True if a single-tag action from feed() may run before the reply ends."""
+    return bool(action.files_to_write or action.commands_to_run or action.files_to_read)
@@ -2,16 +2,37 @@
 Multi-turn agent loop for running coding sessions.
 
 V3: Enhanced with expanded tool set and detailed metrics tracking.
+Optional streaming mode executes file writes, reads and commands as soon
+as each block's closing tag arrives. An optional ContextPolicy compacts
+the conversation sent each turn (see context.py). With fork_server, plain
+`python ...` commands run in a pre-started interpreter (see
+sandbox/zygote.py) and their startup overhead is recorded. With
+parallel_commands, a turn's read-only commands run concurrently through
+the asyncio executor (see sandbox/async_executor.py).
+
+AsyncAgentLoop runs the same session as a coroutine, so one process can
+drive hundreds of sessions on a single event loop.
+
+Sessions, turns, model calls, parsing and tool execution are trace spans
+(see tracing.py); AgentMetrics keeps each turn's model and tool time.
 """
 
-import re
+import asyncio
 import time
-from dataclasses import dataclass, field
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
-from .models.base import BaseModel, Message, get_model
-from .sandbox.executor import SandboxExecutor, create_workspace
+from . import tracing
+from .action_parser import ActionParser, AgentAction, is_early_action, parse_actions
+from .context import ContextManager, ContextPolicy, estimate_tokens
+from .models.base import AsyncBaseModel, BaseModel, Message, ModelResponse, get_model
+from .models.pool import run_sync
+from .sandbox.async_executor import AsyncSandboxExecutor, plan_batches
+from .sandbox.executor import ExecutionResult, SandboxExecutor, create_workspace
+from .sandbox.isolation import ResourceLimits
+from .sandbox.zygote import shared_zygote
 
 
 # V3: Enhanced system prompt with more tools
@@ -91,6 +112,23 @@ class AgentMetrics:
     files_written: int = 0
     files_read: int = 0
     commands_run: int = 0
+    # Streaming mode: per-turn latency from request to first token / first early action
+    first_token_seconds: list[float] = field(default_factory=list)
+    first_action_seconds: list[float] = field(default_factory=list)
+    early_actions: int = 0  # Actions executed while the reply was still streaming
+    context_tokens_saved: int = 0  # Estimated prompt tokens removed by context compaction
+    # Fork server: startup overhead of forked commands vs a cold `python -c pass`
+    forked_commands: int = 0
+    command_startup_ms: list[float] = field(default_factory=list)
+    cold_start_ms: Optional[float] = None
+    concurrent_commands: int = 0  # Commands run alongside others in the same turn
+    # Per turn: waiting for the model (including early actions while streaming) / running tools
+    model_seconds: list[float] = field(default_factory=list)
+    tool_seconds: list[float] = field(default_factory=list)
+
+    @staticmethod
+    def _mean(values: list[float]) -> Optional[float]:
+        return round(sum(values) / len(values), 3) if values else None
     
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
@@ -108,23 +146,19 @@ class AgentMetrics:
             "files_written": self.files_written,
             "files_read": self.files_read,
             "commands_run": self.commands_run,
+            "time_to_first_token": self._mean(self.first_token_seconds),
+            "time_to_first_action": self._mean(self.first_action_seconds),
+            "early_actions": self.early_actions,
+            "context_tokens_saved": self.context_tokens_saved,
+            "forked_commands": self.forked_commands,
+            "command_startup_ms": self._mean(self.command_startup_ms),
+            "cold_start_ms": round(self.cold_start_ms, 1) if self.cold_start_ms is not None else None,
+            "concurrent_commands": self.concurrent_commands,
+            "model_seconds": [round(s, 3) for s in self.model_seconds],
+            "tool_seconds": [round(s, 3) for s in self.tool_seconds],
         }
 
 
-@dataclass
-class AgentAction:
-    """Parsed action from agent response."""
-    files_to_write: dict[str, str] = field(default_factory=dict)
-    files_to_read: list[str] = field(default_factory=list)
-    dirs_to_list: list[str] = field(default_factory=list)
-    commands_to_run: list[str] = field(default_factory=list)
-    run_tests: bool = False
-    lint_files: list[str] = field(default_factory=list)
-    web_searches: list[str] = field(default_factory=list)
-    is_done: bool = False
-    done_message: str = ""
-
-
 @dataclass
 class AgentResult:
     """Result of an agent loop run."""
@@ -136,70 +170,12 @@ class AgentResult:
     files_created: list[str]
     total_input_tokens: int = 0
     total_output_tokens: int = 0
+    total_cached_input_tokens: int = 0  # Input tokens served from the provider's prompt cache
     error: Optional[str] = None
     # V3: Add detailed metrics
     metrics: Optional[AgentMetrics] = None
 
 
-def parse_actions(response: str) -> AgentAction:
-    """
-    Parse structured actions from model response.
-    
-    V3: Extended to parse new tool calls.
-    """
-    action = AgentAction()
-    
-    # Parse file writes
-    file_pattern = r'<write_file\s+path="([^"]+)">(.*?)</write_file>'
-    for match in re.finditer(file_pattern, response, re.DOTALL):
-        path = match.group(1)
-        content = match.group(2).strip()
-        action.files_to_write[path] = content
-    
-    # V3: Parse file reads
-    read_pattern = r'<read_file\s+path="([^"]+)"\s*/>'
-    for match in re.finditer(read_pattern, response):
-        action.files_to_read.append(match.group(1))
-    
-    # V3: Parse list files
-    list_pattern = r'<list_files\s+path="([^"]+)"\s*/>'
-    for match in re.finditer(list_pattern, response):
-        action.dirs_to_list.append(match.group(1))
-    
-    # Parse commands
-    cmd_pattern = r'<run_command>(.*?)</run_command>'
-    for match in re.finditer(cmd_pattern, response, re.DOTALL):
-        command = match.group(1).strip()
-        if command:
-            action.commands_to_run.append(command)
-    
-    # V3: Parse run_tests
-    if '<run_tests/>' in response or '<run_tests>' in response:
-        action.run_tests = True
-    
-    # V3: Parse lint_code
-    lint_pattern = r'<lint_code\s+path="([^"]+)"\s*/>'
-    for match in re.finditer(lint_pattern, response):
-        action.lint_files.append(match.group(1))
-    # Also support linting without path
-    if '<lint_code/>' in response:
-        action.lint_files.append("")  # Empty means all files
-    
-    # V3: Parse web_search
-    search_pattern = r'<web_search\s+query="([^"]+)"\s*/>'
-    for match in re.finditer(search_pattern, response):
-        action.web_searches.append(match.group(1))
-    
-    # Parse done signal
-    done_pattern = r'<done>(.*?)</done>'
-    done_match = re.search(done_pattern, response, re.DOTALL)
-    if done_match:
-        action.is_done = True
-        action.done_message = done_match.group(1).strip()
-    
-    return action
-
-
 class AgentLoop:
     """
     Runs a multi-turn coding session with an LLM.
@@ -217,7 +193,11 @@ class AgentLoop:
         timeout_minutes: int = 20,
         workspace: Optional[Path] = None,
         max_turns: int = 50,
-        enable_tools: bool = True  # V3: Enable extended tools
+        enable_tools: bool = True,  # V3: Enable extended tools
+        stream: bool = False,
+        context_policy: Optional[ContextPolicy] = None,
+        fork_server: bool = False,
+        parallel_commands: bool = False,
     ):
         """
         Initialize agent loop.
@@ -229,22 +209,40 @@ class AgentLoop:
             workspace: Working directory (created if not provided)
             max_turns: Maximum conversation turns
             enable_tools: Enable V3 extended tools
+            stream: Stream replies and execute writes/reads/commands as
+                    soon as each block is complete
+            context_policy: Compact the conversation sent each turn
+                            (None = always send the full transcript)
+            fork_server: Fork plain `python ...` commands from a warm
+                         interpreter instead of starting one per command
+            parallel_commands: Run a turn's read-only commands (tests,
+                               linters) concurrently, each under
+                               ResourceLimits; feedback keeps command order
         """
         self.model = model
         self.spec = spec
         self.timeout = timeout_minutes * 60
         self.max_turns = max_turns
         self.enable_tools = enable_tools
+        self.stream = stream
+        self.context = ContextManager(context_policy) if context_policy else None
         
         # Set up workspace and executor
         self.workspace = workspace or create_workspace()
-        self.executor = SandboxExecutor(self.workspace)
+        zygote = shared_zygote() if fork_server else None
+        self.parallel_commands = parallel_commands
+        if parallel_commands:
+            self.executor = AsyncSandboxExecutor(self.workspace, zygote=zygote, limits=ResourceLimits())
+        else:
+            self.executor = SandboxExecutor(self.workspace, zygote=zygote)
         
         # Initialize conversation
         self.conversation: list[Message] = []
         
         # V3: Initialize metrics
         self.metrics = AgentMetrics()
+        if zygote is not None:
+            self.metrics.cold_start_ms = zygote.cold_start_ms
     
     def _record_tool_call(self, tool: str, args: dict, result: dict):
         """Record a tool invocation for metrics."""
@@ -255,12 +253,34 @@ class AgentLoop:
             timestamp=time.time()
         ))
     
+    def _run_commands(self, commands: list[str]) -> list[ExecutionResult]:
+        """Run a turn's commands; results are in the order of commands."""
+        if not self.parallel_commands or len(commands) < 2:
+            return [self.executor.run(command) for command in commands]
+        self._count_concurrent(commands)
+        return run_sync(self.executor.arun_many(commands, concurrent=True))
+
+    def _count_concurrent(self, commands: list[str]):
+        self.metrics.concurrent_commands += sum(
+            len(batch) for batch in plan_batches(commands) if len(batch) > 1
+        )
+
     def _execute_tools(self, actions: AgentAction) -> list[str]:
         """
         Execute all parsed tool actions and return feedback.
         
-        V3: Handles extended tool set.
+        V3: Handles extended tool set. Runs in three phases: file tools,
+        then commands, then checks (tests, lint, search).
         """
+        commands = actions.commands_to_run
+        return (
+            self._execute_file_tools(actions)
+            + self._command_feedback(commands, self._run_commands(commands))
+            + self._execute_check_tools(actions)
+        )
+
+    def _execute_file_tools(self, actions: AgentAction) -> list[str]:
+        """Reads, listings and writes."""
         feedback_parts = []
         
         # Handle file reads (V3)
@@ -305,14 +325,20 @@ class AgentLoop:
                 f"✓ Files written: {list(actions.files_to_write.keys())}"
             )
         
-        # Handle command execution
-        for command in actions.commands_to_run:
-            result = self.executor.run(command)
+        return feedback_parts
+
+    def _command_feedback(self, commands: list[str], results: list[ExecutionResult]) -> list[str]:
+        """Record commands that ran and describe their results."""
+        feedback_parts = []
+        for command, result in zip(commands, results):
             self._record_tool_call("run_command", {"command": command}, {
                 "success": result.success,
                 "return_code": result.return_code
             })
             self.metrics.commands_run += 1
+            if result.forked:
+                self.metrics.forked_commands += 1
+                self.metrics.command_startup_ms.append(result.startup_ms)
             
             output_lines = []
             if result.stdout:
@@ -330,6 +356,12 @@ class AgentLoop:
             if not result.success:
                 self.metrics.errors_encountered += 1
         
+        return feedback_parts
+
+    def _execute_check_tools(self, actions: AgentAction) -> list[str]:
+        """Tests, lint and web search."""
+        feedback_parts = []
+
         # Handle run_tests (V3)
         if self.enable_tools and actions.run_tests:
             from .tools.test_tools import run_tests_tool
@@ -394,103 +426,381 @@ class AgentLoop:
         
         return feedback_parts
     
-    def run(self) -> AgentResult:
-        """Execute the agent loop until done or timeout."""
-        
-        start_time = time.time()
-        turns = 0
-        completed = False
-        error = None
-        total_input_tokens = 0
-        total_output_tokens = 0
-        
-        # Track previous files for backtrack detection
-        previous_files = set()
-        
-        # Initialize conversation with system prompt and task
+    def _request_messages(self) -> list[Message]:
+        """
+        The conversation to send this turn, compacted if a policy is set.
+
+        The task message and the latest message are marked as prompt-cache
+        breakpoints: the first covers the system prompt and spec, the second
+        lets the next turn reuse everything sent so far.
+        """
+        messages = self.conversation
+        if self.context is not None:
+            messages = self.context.compact(self.conversation)
+            self.metrics.context_tokens_saved += estimate_tokens(self.conversation) - estimate_tokens(messages)
+        if len(messages) > 2:
+            messages = messages[:-1] + [replace(messages[-1], cache=True)]
+        return messages
+
+    def _complete_streaming(
+        self,
+        messages: list[Message],
+    ) -> tuple[ModelResponse, AgentAction, AgentAction, list[str]]:
+        """
+        Stream one model reply, executing completed blocks as they arrive.
+
+        Returns:
+            (response, all parsed actions, actions still to execute,
+             feedback from early actions)
+        """
+        stream = _StreamTracker()
+
+        def on_text(delta: str):
+            for action in stream.feed(delta):
+                stream.executed(action, self._execute_tools(action))
+                self.metrics.early_actions += 1
+
+        response = self.model.complete_stream(messages, on_text)
+        actions, remaining = stream.finish(response, self.metrics)
+        return response, actions, remaining, stream.feedback_parts
+
+    def _start_session(self) -> "_Session":
+        """Reset the conversation to the system prompt and task."""
         self.conversation = [
             Message(role="system", content=SYSTEM_PROMPT),
-            Message(role="user", content=f"Build the following:\n\n{self.spec}")
+            Message(role="user", content=f"Build the following:\n\n{self.spec}", cache=True)
         ]
-        
-        try:
-            while time.time() - start_time < self.timeout and turns < self.max_turns:
-                turns += 1
-                self.metrics.turns = turns
-                
-                # Get model response
-                response = self.model.complete(self.conversation)
-                self.conversation.append(
-                    Message(role="assistant", content=response.content)
-                )
-                
-                # Track token usage
-                if response.usage:
-                    total_input_tokens += response.usage.get("input_tokens", 0)
-                    total_output_tokens += response.usage.get("output_tokens", 0)
-                
-                # Parse actions from response
-                actions = parse_actions(response.content)
-                
-                # V3: Detect backtracking (rewriting files)
-                current_files = set(actions.files_to_write.keys())
-                if current_files & previous_files:
-                    self.metrics.backtrack_count += 1
-                previous_files.update(current_files)
-                
-                # Execute all tools and collect feedback
-                feedback_parts = self._execute_tools(actions)
-                
-                # NOW check if done (after processing actions)
-                if actions.is_done:
-                    completed = True
-                    break
-                
-                # If no actions were parsed, prompt to continue
-                if not any([
-                    actions.files_to_write, actions.commands_to_run,
-                    actions.files_to_read, actions.dirs_to_list,
-                    actions.run_tests, actions.lint_files, actions.web_searches
-                ]):
-                    feedback_parts.append(
-                        "No actions detected. Please write files, run commands, "
-                        "or signal <done> when complete."
-                    )
-                    self.metrics.planning_turns += 1
-                
-                # Add feedback to conversation
-                feedback = "\n\n".join(feedback_parts)
-                self.conversation.append(
-                    Message(role="user", content=feedback)
-                )
-                
-        except Exception as e:
-            error = str(e)
-            self.metrics.errors_encountered += 1
-        
-        elapsed = time.time() - start_time
-        files = self.executor.list_files()
-        
+        return _Session()
+
+    def _begin_turn(self, session: "_Session"):
+        session.turns += 1
+        self.metrics.turns = session.turns
+
+    def _record_reply(self, session: "_Session", response: ModelResponse, actions: AgentAction):
+        """Add the model's reply to the conversation and count its tokens."""
+        self.conversation.append(
+            Message(role="assistant", content=response.content)
+        )
+
+        # Track token usage
+        if response.usage:
+            session.input_tokens += response.usage.get("input_tokens", 0)
+            session.output_tokens += response.usage.get("output_tokens", 0)
+            session.cached_input_tokens += response.usage.get("cached_input_tokens", 0)
+
+        # V3: Detect backtracking (rewriting files)
+        current_files = set(actions.files_to_write.keys())
+        if current_files & session.previous_files:
+            self.metrics.backtrack_count += 1
+        session.previous_files.update(current_files)
+
+    def _end_turn(self, session: "_Session", actions: AgentAction, feedback_parts: list[str]) -> bool:
+        """Send the turn's feedback; True once the model signalled done."""
+        # Tell the model about tags we could not parse
+        for diagnostic in actions.diagnostics:
+            feedback_parts.append(f"⚠ Malformed tag: {diagnostic}")
+
+        # NOW check if done (after processing actions)
+        if actions.is_done:
+            session.completed = True
+            return True
+
+        # If no actions were parsed, prompt to continue
+        if not any([
+            actions.files_to_write, actions.commands_to_run,
+            actions.files_to_read, actions.dirs_to_list,
+            actions.run_tests, actions.lint_files, actions.web_searches
+        ]):
+            feedback_parts.append(
+                "No actions detected. Please write files, run commands, "
+                "or signal <done> when complete."
+            )
+            self.metrics.planning_turns += 1
+
+        # Add feedback to conversation
+        feedback = "\n\n".join(feedback_parts)
+        self.conversation.append(
+            Message(role="user", content=feedback)
+        )
+        return False
+
+    @contextmanager
+    def _session_span(self, session: "_Session") -> Iterator[tracing.Span]:
+        with tracing.span("agent.session", "agent", model=self.model.name, workspace=self.workspace.name) as span:
+            try:
+                yield span
+            finally:
+                span.set(turns=session.turns, completed=session.completed, error=session.error)
+
+    def _model_span(self) -> tracing.Span:
+        return tracing.span("model.complete", "model", model=self.model.name, stream=self.stream)
+
+    def _model_done(self, call: tracing.Span, response: ModelResponse):
+        """Record a model call's time and tokens."""
+        usage = response.usage or {}
+        call.set(input_tokens=usage.get("input_tokens", 0), output_tokens=usage.get("output_tokens", 0))
+        self.metrics.model_seconds.append(call.seconds)
+
+    @staticmethod
+    def _parse(response: ModelResponse) -> AgentAction:
+        with tracing.span("agent.parse", "agent"):
+            return parse_actions(response.content)
+
+    @contextmanager
+    def _tools_span(self) -> Iterator[tracing.Span]:
+        """Span around a turn's tool execution; its time goes into tool_seconds."""
+        with tracing.span("agent.tools", "agent") as span:
+            try:
+                yield span
+            finally:
+                self.metrics.tool_seconds.append(span.seconds)
+
+    def _session_result(self, session: "_Session") -> AgentResult:
         return AgentResult(
             workspace=self.workspace,
             conversation=self.conversation,
-            elapsed_seconds=elapsed,
-            completed=completed,
-            turns=turns,
-            files_created=files,
-            total_input_tokens=total_input_tokens,
-            total_output_tokens=total_output_tokens,
-            error=error,
+            elapsed_seconds=time.time() - session.start_time,
+            completed=session.completed,
+            turns=session.turns,
+            files_created=self.executor.list_files(),
+            total_input_tokens=session.input_tokens,
+            total_output_tokens=session.output_tokens,
+            total_cached_input_tokens=session.cached_input_tokens,
+            error=session.error,
             metrics=self.metrics
         )
 
+    def run(self) -> AgentResult:
+        """Execute the agent loop until done or timeout."""
+        session = self._start_session()
+
+        with self._session_span(session):
+            try:
+                while time.time() - session.start_time < self.timeout and session.turns < self.max_turns:
+                    self._begin_turn(session)
+                    with tracing.span("agent.turn", "agent", turn=session.turns):
+                        # Get model response and parse actions from it
+                        messages = self._request_messages()
+                        with self._model_span() as call:
+                            if self.stream:
+                                response, actions, pending, early_feedback = self._complete_streaming(messages)
+                            else:
+                                response = self.model.complete(messages)
+                            self._model_done(call, response)
+                        if not self.stream:
+                            actions = pending = self._parse(response)
+                            early_feedback = []
+                        self._record_reply(session, response, actions)
+
+                        # Execute all tools and collect feedback
+                        with self._tools_span():
+                            feedback_parts = early_feedback + self._execute_tools(pending)
+                        if self._end_turn(session, actions, feedback_parts):
+                            break
+
+            except Exception as e:
+                session.error = str(e)
+                self.metrics.errors_encountered += 1
+
+        return self._session_result(session)
+
+
+class AsyncAgentLoop(AgentLoop):
+    """
+    AgentLoop whose session is a coroutine, for many sessions on one event loop.
+
+    Same AgentResult and AgentMetrics as AgentLoop.run(). Model calls are
+    awaited (adapters without an async API run in a worker thread),
+    commands run as asyncio subprocesses and the other tools in the
+    loop's default thread pool, so an idle session holds no thread. The
+    session timeout cancels the turn in progress instead of being checked
+    between turns; a cancelled command is killed with its process group.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not isinstance(self.executor, AsyncSandboxExecutor):
+            self.executor = AsyncSandboxExecutor(self.workspace, zygote=self.executor.zygote)
+
+    async def arun(self) -> AgentResult:
+        """Execute the agent loop until done, max_turns or the timeout cancels it."""
+        session = self._start_session()
+        with self._session_span(session):
+            turns = asyncio.ensure_future(self._aturns(session))
+            try:
+                done, _ = await asyncio.wait({turns}, timeout=self.timeout)
+                if not done:
+                    turns.cancel()
+                    await asyncio.gather(turns, return_exceptions=True)
+                elif turns.exception() is not None:
+                    session.error = str(turns.exception())
+                    self.metrics.errors_encountered += 1
+            finally:
+                turns.cancel()  # No-op once finished; stops the session if arun() is cancelled
+
+        return self._session_result(session)
+
+    async def _aturns(self, session: "_Session"):
+        while session.turns < self.max_turns:
+            self._begin_turn(session)
+            with tracing.span("agent.turn", "agent", turn=session.turns):
+                messages = self._request_messages()
+                with self._model_span() as call:
+                    if self.stream:
+                        response, actions, pending, early_feedback = await self._acomplete_streaming(messages)
+                    else:
+                        response = await self._acomplete(messages)
+                    self._model_done(call, response)
+                if not self.stream:
+                    actions = pending = self._parse(response)
+                    early_feedback = []
+                self._record_reply(session, response, actions)
+
+                with self._tools_span():
+                    feedback_parts = early_feedback + await self._aexecute_tools(pending)
+                if self._end_turn(session, actions, feedback_parts):
+                    return
+
+    async def _acomplete(self, messages: list[Message]) -> ModelResponse:
+        if isinstance(self.model, AsyncBaseModel):
+            return await self.model.acomplete(messages)
+        return await asyncio.to_thread(self.model.complete, messages)
+
+    async def _acomplete_streaming(
+        self,
+        messages: list[Message],
+    ) -> tuple[ModelResponse, AgentAction, AgentAction, list[str]]:
+        """_complete_streaming() with early actions awaited between deltas."""
+        stream = _StreamTracker()
+        loop = asyncio.get_running_loop()
+        deltas: asyncio.Queue = asyncio.Queue()
+        end = object()
+
+        def on_text(delta: str):  # On the loop (async adapters) or a worker thread
+            loop.call_soon_threadsafe(deltas.put_nowait, delta)
+
+        async def request() -> ModelResponse:
+            try:
+                if isinstance(self.model, AsyncBaseModel):
+                    return await self.model.acomplete_stream(messages, on_text)
+                return await asyncio.to_thread(self.model.complete_stream, messages, on_text)
+            finally:
+                loop.call_soon_threadsafe(deltas.put_nowait, end)
+
+        reply = asyncio.ensure_future(request())
+        try:
+            while True:
+                delta = await deltas.get()
+                if delta is end:
+                    break
+                for action in stream.feed(delta):
+                    stream.executed(action, await self._aexecute_tools(action))
+                    self.metrics.early_actions += 1
+            response = await reply
+        finally:
+            reply.cancel()
+
+        actions, remaining = stream.finish(response, self.metrics)
+        return response, actions, remaining, stream.feedback_parts
+
+    async def _aexecute_tools(self, actions: AgentAction) -> list[str]:
+        """_execute_tools() with commands awaited and the other tools in worker threads."""
+        feedback_parts = []
+        if actions.files_to_read or actions.dirs_to_list or actions.files_to_write:
+            feedback_parts += await asyncio.to_thread(self._execute_file_tools, actions)
+        commands = actions.commands_to_run
+        if self.parallel_commands and len(commands) > 1:
+            self._count_concurrent(commands)
+        results = await self.executor.arun_many(commands, concurrent=self.parallel_commands)
+        feedback_parts += self._command_feedback(commands, results)
+        if self.enable_tools and (actions.run_tests or actions.lint_files or actions.web_searches):
+            feedback_parts += await asyncio.to_thread(self._execute_check_tools, actions)
+        return feedback_parts
+
+
+@dataclass
+class _Session:
+    """Counters of one run() / arun() call."""
+    start_time: float = field(default_factory=time.time)
+    turns: int = 0
+    completed: bool = False
+    error: Optional[str] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0
+    previous_files: set = field(default_factory=set)  # For backtrack detection
+
+
+class _StreamTracker:
+    """Parser, timings and early actions of one streamed reply."""
+
+    def __init__(self):
+        self.parser = ActionParser()
+        self.feedback_parts: list[str] = []
+        self.written: set[str] = set()
+        self.commands: list[str] = []
+        self.reads: list[str] = []
+        self.request_start = time.time()
+        self.first_token: Optional[float] = None
+        self.first_action: Optional[float] = None
+
+    def feed(self, delta: str) -> list[AgentAction]:
+        """Parse a delta; return the actions to execute now."""
+        if self.first_token is None:
+            self.first_token = time.time() - self.request_start
+        early = [action for action in self.parser.feed(delta) if is_early_action(action)]
+        if early and self.first_action is None:
+            self.first_action = time.time() - self.request_start
+        return early
+
+    def executed(self, action: AgentAction, feedback: list[str]):
+        self.feedback_parts.extend(feedback)
+        self.written.update(action.files_to_write)
+        self.commands.extend(action.commands_to_run)
+        self.reads.extend(action.files_to_read)
+
+    def finish(self, response: ModelResponse, metrics: AgentMetrics) -> tuple[AgentAction, AgentAction]:
+        """(all parsed actions, actions not executed early) once the reply is complete."""
+        if self.first_token is not None:
+            metrics.first_token_seconds.append(self.first_token)
+        if self.first_action is not None:
+            metrics.first_action_seconds.append(self.first_action)
+
+        # Adapters return the full text; parse any tail the deltas did not cover
+        parser = self.parser
+        if parser.text != response.content:
+            parser = ActionParser()
+            parser.feed(response.content)
+        actions = parser.finish()
+
+        # Whatever was not executed early runs now, in the usual order
+        remaining = replace(
+            actions,
+            files_to_write={
+                path: content for path, content in actions.files_to_write.items()
+                if path not in self.written
+            },
+            files_to_read=list(actions.files_to_read),
+            commands_to_run=list(actions.commands_to_run),
+        )
+        for command in self.commands:
+            if command in remaining.commands_to_run:
+                remaining.commands_to_run.remove(command)
+        for path in self.reads:
+            if path in remaining.files_to_read:
+                remaining.files_to_read.remove(path)
+
+        return actions, remaining
+
 
 def run_agent(
     model_id: str,
     spec: str,
     timeout_minutes: int = 20,
     workspace: Optional[Path] = None,
-    enable_tools: bool = True
+    enable_tools: bool = True,
+    stream: bool = False,
+    context_policy: Optional[ContextPolicy] = None,
 ) -> AgentResult:
     """
     Convenience function to run an agent loop.
@@ -501,6 +811,8 @@ def run_agent(
         timeout_minutes: Session timeout
         workspace: Optional workspace directory
         enable_tools: Enable V3 extended tools
+        stream: Stream replies and execute actions early
+        context_policy: Compact the conversation sent each turn
         
     Returns:
         AgentResult with session details
@@ -511,6 +823,8 @@ def run_agent(
         spec=spec,
         timeout_minutes=timeout_minutes,
         workspace=workspace,
-        enable_tools=enable_tools
+        enable_tools=enable_tools,
+        stream=stream,
+        context_policy=context_policy,
     )
     return agent.run()
@@ -0,0 +1,516 @@
+"""
+=============================================================================
+SCRIPT NAME: bench.py
+=============================================================================
+
+Benchmark the evaluation harness itself against a local mock model server.
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+Tuning the harness (jobs, stage workers, test lanes, fork server ...)
+needs a run that can be repeated and costs nothing. run_bench() starts
+MockModelServer, an OpenAI-compatible /v1/chat/completions endpoint on
+localhost. It points the LM Studio adapter at the server
+(LMSTUDIO_BASE_URL, models "local:<recorded model>") and drives the full
+EvalRunner pipeline: agent sessions, functional tests, validation and
+judging.
+
+The server replays a recorded run (default gold/20260102_191730). A
+results directory keeps each session's final files and token counts but
+not the conversation, so each session is replayed as one turn. That turn
+writes the recorded files and signals done. Judge requests (model
+JUDGE_MODEL) get the run's recorded scores back. A reply waits
+latency_ms, then output tokens / tokens_per_second, streamed if the
+client asks for a stream. The recorded output token count is used, so
+replies are paced like the real run at the chosen rate.
+
+The BenchReport has throughput (sessions/min), latency per stage (from
+the trace spans, see tracing.py), peak RSS, browser page loads and the
+mock server's counters. It is saved as JSON together with the git
+commit, and compare_reports() lines up two reports, so harness
+regressions show up between commits.
+
+=============================================================================
+"""
+
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+from . import tracing
+from .judge.absolute import AbsoluteScore
+from .runner import EvalRunner, load_cases
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+GOLD_RUN = Path("gold/20260102_191730")
+
+# Model name the benchmark's judge asks the mock server for
+JUDGE_MODEL = "replay-judge"
+
+# Rough characters per token, for prompts and replies without a recorded count
+CHARS_PER_TOKEN = 4
+
+# Tokens per streamed delta
+STREAM_CHUNK_TOKENS = 16
+
+
+@dataclass
+class RecordedSession:
+    """One model's recorded session on one case."""
+    case_name: str
+    model_id: str
+    files: dict[str, str]            # Path in the workspace -> content
+    input_tokens: int = 0
+    output_tokens: int = 0
+    scores: dict = field(default_factory=dict)  # Dimension -> {"score", "reason"}
+
+    def reply(self) -> str:
+        """The agent reply that recreates the recorded workspace."""
+        blocks = [
+            f'<write_file path="{path}">\n{content}\n</write_file>'
+            for path, content in sorted(self.files.items())
+        ]
+        blocks.append("<done>\nReplayed recorded session\n</done>")
+        return "\n\n".join(blocks)
+
+    def judge_reply(self) -> str:
+        """The recorded scores as the judge's JSON answer."""
+        return json.dumps({
+            dim: self.scores.get(dim, {"score": 5, "reason": "Not recorded"})
+            for dim in AbsoluteScore.WEIGHTS
+        })
+
+
+def load_recorded_run(run_dir: Path) -> list[RecordedSession]:
+    """
+    Read a results run: <run_dir>/<case>/<model>/ files plus the
+    <run_dir>_results.json next to it (token counts and scores).
+    """
+    run_dir = Path(run_dir)
+    results_file = run_dir.parent / f"{run_dir.name}_results.json"
+    data = json.loads(results_file.read_text()) if results_file.exists() else {}
+    details = data.get("case_results_details") or data.get("case_results") or {}
+    # Workspace directories are model IDs with "/" and "." replaced
+    model_ids = {m.replace("/", "_").replace(".", "_"): m for m in data.get("models", [])}
+
+    sessions = []
+    for workspace in sorted(p for p in run_dir.glob("*/*") if p.is_dir()):
+        case_name = workspace.parent.name
+        model_id = model_ids.get(workspace.name, workspace.name)
+        case = details.get(case_name, {})
+        metrics = case.get("model_metrics", {}).get(model_id, {})
+        sessions.append(RecordedSession(
+            case_name=case_name,
+            model_id=model_id,
+            files={
+                str(f.relative_to(workspace)): f.read_text(errors="replace")
+                for f in sorted(workspace.rglob("*")) if f.is_file()
+            },
+            input_tokens=metrics.get("input_tokens", 0),
+            output_tokens=metrics.get("output_tokens", 0),
+            scores=case.get("absolute_scores", {}).get(model_id, {}),
+        ))
+    return sessions
+
+
+class MockModelServer(ThreadingHTTPServer):
+    """OpenAI-compatible chat endpoint replaying recorded sessions."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        sessions: list[RecordedSession],
+        specs: dict[str, str],
+        latency_ms: float = 200.0,
+        tokens_per_second: float = 2000.0,
+    ):
+        """
+        Initialize the mock server (on a free localhost port).
+
+        Args:
+            sessions: Recorded sessions to replay
+            specs: Case name -> spec; a request's case is the one whose
+                   spec appears in its messages
+            latency_ms: Delay before the first token of every reply
+            tokens_per_second: Output rate (0 = no generation delay)
+        """
+        super().__init__(("127.0.0.1", 0), _MockHandler)
+        self.sessions = {(s.case_name, s.model_id): s for s in sessions}
+        # Longest first, in case one spec contains another
+        self.specs = sorted(((case, spec.strip()) for case, spec in specs.items()), key=lambda c: -len(c[1]))
+        self.latency_ms = latency_ms
+        self.tokens_per_second = tokens_per_second
+        self.stats = {"requests": 0, "agent_requests": 0, "judge_requests": 0, "failed_requests": 0,
+                      "output_tokens": 0}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockModelServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="vibe-mock-model", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self.shutdown()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> "MockModelServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def answer(self, request: dict) -> tuple[str, int, int]:
+        """
+        Reply to a chat completion request.
+
+        Returns:
+            (content, input tokens, output tokens)
+
+        Raises:
+            LookupError: No recorded session matches the request
+        """
+        text = "\n".join(m.get("content") or "" for m in request.get("messages", []))
+        model = request.get("model")
+        try:
+            case = next(case for case, spec in self.specs if spec in text)
+            if model == JUDGE_MODEL:
+                session = next(s for s in self.sessions.values() if s.case_name == case and s.scores)
+                content = session.judge_reply()
+                output_tokens = len(content) // CHARS_PER_TOKEN
+            else:
+                session = self.sessions[(case, model)]
+                content = session.reply()
+                output_tokens = session.output_tokens or len(content) // CHARS_PER_TOKEN
+        except (StopIteration, KeyError):
+            self._count(requests=1, failed_requests=1)
+            raise LookupError(f"No recorded session for model {model!r} matches this request")
+
+        self._count(
+            requests=1,
+            judge_requests=int(model == JUDGE_MODEL),
+            agent_requests=int(model != JUDGE_MODEL),
+            output_tokens=output_tokens,
+        )
+        return content, len(text) // CHARS_PER_TOKEN + 1, output_tokens
+
+    def generation_seconds(self, output_tokens: int) -> float:
+        return output_tokens / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def _count(self, **counts: int):
+        with self._lock:
+            for key, value in counts.items():
+                self.stats[key] += value
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like a real provider
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length))
+        server: MockModelServer = self.server
+        try:
+            content, input_tokens, output_tokens = server.answer(request)
+        except LookupError as e:
+            self._send_json(400, {"error": {"message": str(e), "type": "invalid_request_error"}})
+            return
+
+        time.sleep(server.latency_ms / 1000)
+        usage = {"prompt_tokens": input_tokens, "completion_tokens": output_tokens,
+                 "total_tokens": input_tokens + output_tokens}
+        if request.get("stream"):
+            self._stream(request["model"], content, output_tokens, usage)
+            return
+        time.sleep(server.generation_seconds(output_tokens))
+        self._send_json(200, {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }],
+            "usage": usage,
+        })
+
+    def _stream(self, model: str, content: str, output_tokens: int, usage: dict):
+        """Send content as server-sent events, paced at the token rate."""
+        server: MockModelServer = self.server
+        pieces = max(1, math.ceil(output_tokens / STREAM_CHUNK_TOKENS))
+        size = max(1, math.ceil(len(content) / pieces))
+        delay = server.generation_seconds(output_tokens) / pieces
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(choices: list, **extra):
+            chunk = {"id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": model, "choices": choices, **extra}
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+
+        for start in range(0, len(content), size):
+            time.sleep(delay)
+            event([{"index": 0, "delta": {"content": content[start:start + size]}, "finish_reason": None}])
+        event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        event([], usage=usage)
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@dataclass
+class BenchReport:
+    """Outcome of one harness benchmark."""
+    timestamp: datetime
+    commit: Optional[str]
+    config: dict
+    sessions: int
+    completed: int
+    wall_seconds: float
+    stages: dict[str, dict]           # Span name -> latency statistics (see span_stats)
+    pipeline: list[dict] = field(default_factory=list)  # StageStats when jobs > 1
+    peak_rss_mb: Optional[float] = None
+    children_peak_rss_mb: Optional[float] = None  # Largest child process
+    browser_pages: dict = field(default_factory=dict)
+    server: dict = field(default_factory=dict)
+    mean_score: Optional[float] = None
+
+    @property
+    def sessions_per_minute(self) -> float:
+        return self.sessions / self.wall_seconds * 60 if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "commit": self.commit,
+            "config": self.config,
+            "sessions": self.sessions,
+            "completed": self.completed,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "sessions_per_minute": round(self.sessions_per_minute, 2),
+            "stages": self.stages,
+            "pipeline": self.pipeline,
+            "peak_rss_mb": self.peak_rss_mb,
+            "children_peak_rss_mb": self.children_peak_rss_mb,
+            "browser_pages": self.browser_pages,
+            "server": self.server,
+            "mean_score": self.mean_score,
+        }
+
+    def save(self, output_dir: Path) -> Path:
+        """Write the report to <output_dir>/<timestamp>_bench.json."""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        path = output_dir / f"{self.timestamp.strftime('%Y%m%d_%H%M%S')}_bench.json"
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+        return path
+
+
+def run_bench(
+    run_dir: Path = GOLD_RUN,
+    cases_dir: Path = Path("eval_cases"),
+    case_filter: Optional[list[str]] = None,
+    latency_ms: float = 200.0,
+    tokens_per_second: float = 2000.0,
+    **runner_options,
+) -> BenchReport:
+    """
+    Replay a recorded run through EvalRunner and measure the harness.
+
+    Args:
+        run_dir: Recorded results run to replay
+        cases_dir: Directory containing eval cases
+        case_filter: Only these cases (None = every recorded case)
+        latency_ms: Mock server delay before each reply's first token
+        tokens_per_second: Mock server output rate (0 = no generation delay)
+        **runner_options: Passed to EvalRunner (jobs, stream, test_workers,
+                          snapshot_pages, fork_server ...)
+
+    Returns:
+        BenchReport; workspaces and runner results go to a temporary
+        directory and are removed
+    """
+    cases_dir = Path(cases_dir)
+    recorded = [
+        s for s in load_recorded_run(run_dir)
+        if (cases_dir / s.case_name / "spec.md").exists() and (case_filter is None or s.case_name in case_filter)
+    ]
+    if not recorded:
+        raise ValueError(f"No recorded sessions in {run_dir} match cases in {cases_dir}")
+    case_names = sorted({s.case_name for s in recorded})
+    specs = {case.name: case.spec for case in load_cases(cases_dir, case_names)}
+    models = sorted({s.model_id for s in recorded})
+
+    previous_url = os.environ.get("LMSTUDIO_BASE_URL")
+    with MockModelServer(recorded, specs, latency_ms, tokens_per_second) as server, \
+            tempfile.TemporaryDirectory(prefix="vibe-bench-") as results_dir:
+        os.environ["LMSTUDIO_BASE_URL"] = server.base_url
+        tracer = tracing.start_tracing()
+        try:
+            runner = EvalRunner(
+                models=[f"local:{m}" for m in models],
+                cases_dir=cases_dir,
+                case_filter=case_names,
+                results_dir=Path(results_dir),
+                judge_model=f"local:{JUDGE_MODEL}",
+                multi_judge=False,
+                run_comparisons=False,
+                **runner_options,
+            )
+            timestamp = datetime.now()
+            start = time.perf_counter()
+            eval_run = runner.run()
+            wall_seconds = time.perf_counter() - start
+        finally:
+            tracing.stop_tracing()
+            if previous_url is None:
+                os.environ.pop("LMSTUDIO_BASE_URL", None)
+            else:
+                os.environ["LMSTUDIO_BASE_URL"] = previous_url
+
+    sessions = tracer.spans("agent.session")
+    pages = tracer.spans("browser.page")
+    scores = [
+        score.total_score
+        for case in eval_run.case_results.values()
+        for score in case.absolute_scores.values()
+    ]
+    return BenchReport(
+        timestamp=timestamp,
+        commit=_git_commit(),
+        config={
+            "run_dir": str(run_dir),
+            "cases": case_names,
+            "models": models,
+            "latency_ms": latency_ms,
+            "tokens_per_second": tokens_per_second,
+            **{key: _json_value(value) for key, value in sorted(runner_options.items())},
+        },
+        sessions=len(sessions),
+        completed=sum(1 for s in sessions if s.attributes.get("completed")),
+        wall_seconds=wall_seconds,
+        stages=span_stats(tracer.spans()),
+        pipeline=[stats.to_dict() for stats in runner.pipeline_stats],
+        peak_rss_mb=_peak_rss_mb("self"),
+        children_peak_rss_mb=_peak_rss_mb("children"),
+        browser_pages={
+            "cold": sum(1 for p in pages if not p.attributes.get("snapshot")),
+            "snapshot": sum(1 for p in pages if p.attributes.get("snapshot")),
+        },
+        server=dict(server.stats),
+        mean_score=round(statistics.mean(scores), 2) if scores else None,
+    )
+
+
+def span_stats(spans: list[tracing.Span]) -> dict[str, dict]:
+    """Count and latency (total, mean, p50, p95, max) per span name."""
+    by_name: dict[str, list[float]] = {}
+    for span in spans:
+        by_name.setdefault(span.name, []).append(span.seconds * 1000)
+    return {
+        name: {
+            "count": len(values),
+            "total_s": round(sum(values) / 1000, 3),
+            "mean_ms": round(statistics.mean(values), 1),
+            "p50_ms": round(statistics.median(values), 1),
+            "p95_ms": round(_percentile(values, 95), 1),
+            "max_ms": round(max(values), 1),
+        }
+        for name, values in sorted(by_name.items())
+    }
+
+
+def compare_reports(baseline: dict, current: dict) -> list[tuple[str, float, float]]:
+    """
+    (metric, baseline, current) for the numbers two saved reports share:
+    throughput, wall time, peak RSS and every stage's mean latency.
+    """
+    rows = []
+    for key in ("sessions_per_minute", "wall_seconds", "peak_rss_mb"):
+        if baseline.get(key) is not None and current.get(key) is not None:
+            rows.append((key, baseline[key], current[key]))
+    for name, stats in current.get("stages", {}).items():
+        if name in baseline.get("stages", {}):
+            rows.append((f"{name} mean_ms", baseline["stages"][name]["mean_ms"], stats["mean_ms"]))
+    return rows
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def _peak_rss_mb(who: str) -> Optional[float]:
+    """Peak resident set size of this process or its largest child, in MB."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(usage.ru_maxrss / divisor, 1)
+
+
+def _git_commit() -> Optional[str]:
+    """Commit of the harness checkout, if it is a git repository."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _json_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, dict):
+        return {str(k): _json_value(v) for k, v in value.items()}
+    return str(value)
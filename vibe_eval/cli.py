@@ -22,6 +22,7 @@ CLI entry point for Vibe Eval V3. Provides commands for:
 - list-cases: List available eval cases
 - dashboard: Show detailed metrics dashboard
 - list-models: List supported models available via OpenRouter
+- bench: Benchmark the harness against a local mock model server
 
 V3 FEATURES:
 - Fast suite mode for high-signal subset evaluation
@@ -38,6 +39,7 @@ USAGE:
 python -m vibe_eval run -m anthropic/claude-opus-4.5 -c all
 python -m vibe_eval diagnose --results-dir results --output-dir reports
 python -m vibe_eval list-cases
+python -m vibe_eval bench --jobs 4
 =============================================================================
 """
 
@@ -126,10 +128,134 @@ def cli():
     default='full',
     help='Evaluation suite: full (default) or fast (high-signal subset)'
 )
-def run(models, cases, timeout, cases_dir, output, judge, single_judge, no_validation, head_to_head, suite):
+@click.option(
+    '--jobs',
+    default=1,
+    type=click.IntRange(min=1),
+    help='Number of (case, model) pairs to evaluate concurrently (default 1 = serial)'
+)
+@click.option(
+    '--provider-limit',
+    multiple=True,
+    metavar='PROVIDER=N',
+    help='Cap concurrent agent sessions per provider, e.g. anthropic=4 (repeatable)'
+)
+@click.option(
+    '--stage-workers',
+    multiple=True,
+    metavar='STAGE=N',
+    help='Workers per pipeline stage when --jobs > 1: generate, test, validate, score (repeatable)'
+)
+@click.option(
+    '--judge-timeout',
+    default=None,
+    type=click.FloatRange(min=1),
+    help='Seconds to wait for each multi-judge judge; late judges are recorded as stragglers'
+)
+@click.option(
+    '--judge-quorum',
+    default=None,
+    type=click.IntRange(min=1),
+    help='Finish multi-judge scoring once N judges agree within the disagreement threshold'
+)
+@click.option(
+    '--rate-limit',
+    multiple=True,
+    metavar='KEY=RPM[:TPM]',
+    help='Requests/min and optional tokens/min for a provider or model ID '
+         '(e.g. anthropic=500:400000); repeatable'
+)
+@click.option(
+    '--stream',
+    is_flag=True,
+    default=False,
+    help='Stream model replies and run file writes/commands as soon as each block completes'
+)
+@click.option(
+    '--context',
+    'context_mode',
+    type=click.Choice(['full', 'compact', 'window']),
+    default='full',
+    help='Agent context: full transcript, compact (stub superseded files, summarize old '
+         'feedback) or window (compact plus only the last 8 turns)'
+)
+@click.option(
+    '--test-workers',
+    default=1,
+    type=click.IntRange(min=1),
+    help='Shard each functional test run across N browser lanes (HTML) or worker processes (Python)'
+)
+@click.option(
+    '--settle-max-ms',
+    default=2000,
+    type=click.IntRange(min=0),
+    help='Longest wait (ms) for an HTML test page to stop changing before each test'
+)
+@click.option(
+    '--snapshot-pages',
+    is_flag=True,
+    default=False,
+    help='Load each HTML app once and run read-only functional tests against its saved DOM and storage'
+)
+@click.option(
+    '--browser-service',
+    is_flag=True,
+    default=False,
+    help='Launch one shared Chromium for the whole run; validators and test lanes connect to it over CDP'
+)
+@click.option(
+    '--browser-max-contexts',
+    default=8,
+    type=click.IntRange(min=1),
+    help='With --browser-service: most browser contexts open at once'
+)
+@click.option(
+    '--fork-server',
+    is_flag=True,
+    default=False,
+    help="Run agents' plain `python ...` commands by forking a warm interpreter instead of a cold start"
+)
+@click.option(
+    '--parallel-commands',
+    is_flag=True,
+    default=False,
+    help="Run an agent turn's read-only commands (tests, linters) concurrently, each under CPU/memory limits"
+)
+@click.option(
+    '--trace',
+    is_flag=True,
+    default=False,
+    help='Save a Chrome trace of the run (model calls, commands, tests, judges) next to the results'
+)
+@click.option(
+    '--no-judge-cache',
+    is_flag=True,
+    default=False,
+    help='Always call the judge instead of reusing cached results from ~/.cache/vibe_eval'
+)
+def run(models, cases, timeout, cases_dir, output, judge, single_judge, no_validation, head_to_head, suite,
+        jobs, provider_limit, stage_workers, judge_timeout, judge_quorum, rate_limit, stream, context_mode,
+        test_workers, settle_max_ms, snapshot_pages, browser_service, browser_max_contexts, fork_server,
+        parallel_commands, trace, no_judge_cache):
     """Run evaluation across models and cases."""
     from .runner import EvalRunner
     from .reporting.leaderboard import print_leaderboard
+    from .scheduler import parse_provider_limits, parse_rate_limits, parse_stage_workers
+    from .judge.cache import JudgeCache
+    from .context import CONTEXT_POLICIES
+
+    try:
+        provider_limits = parse_provider_limits(provider_limit)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--provider-limit')
+    try:
+        stage_worker_counts = parse_stage_workers(stage_workers)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--stage-workers')
+    try:
+        rate_limits = parse_rate_limits(rate_limit)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--rate-limit')
     
     # Parse models
     model_list = [m.strip() for m in models.split(',')]
@@ -159,6 +285,23 @@ def run(models, cases, timeout, cases_dir, output, judge, single_judge, no_valid
         validate_execution=not no_validation,
         run_comparisons=head_to_head,  # V2: Off by default
         suite_mode=suite,
+        jobs=jobs,
+        provider_limits=provider_limits,
+        stage_workers=stage_worker_counts,
+        judge_timeout=judge_timeout,
+        judge_quorum=judge_quorum,
+        judge_cache=None if no_judge_cache else JudgeCache(),
+        rate_limits=rate_limits,
+        stream=stream,
+        context_policy=CONTEXT_POLICIES[context_mode],
+        test_workers=test_workers,
+        settle_max_ms=settle_max_ms,
+        snapshot_pages=snapshot_pages,
+        browser_service=browser_service,
+        browser_max_contexts=browser_max_contexts,
+        fork_server=fork_server,
+        parallel_commands=parallel_commands,
+        trace=trace,
     )
     
     results = runner.run()
@@ -429,6 +572,115 @@ def dashboard(results_file, output):
     console.print()
 
 
+@cli.command()
+@click.option(
+    '--gold-run',
+    default='gold/20260102_191730',
+    type=click.Path(exists=True, file_okay=False),
+    help='Recorded run whose sessions and scores the mock server replays'
+)
+@click.option(
+    '--cases', '-c',
+    default='all',
+    help='Case filter: "all" or comma-separated case names'
+)
+@click.option(
+    '--cases-dir', '-d',
+    default='eval_cases',
+    type=click.Path(exists=True),
+    help='Directory containing eval cases'
+)
+@click.option(
+    '--latency-ms',
+    default=200.0,
+    type=click.FloatRange(min=0),
+    help='Mock server delay before the first token of each reply'
+)
+@click.option(
+    '--tokens-per-second',
+    default=2000.0,
+    type=click.FloatRange(min=0),
+    help='Mock server output rate (0 = no generation delay)'
+)
+@click.option(
+    '--jobs',
+    default=1,
+    type=click.IntRange(min=1),
+    help='Number of (case, model) pairs to evaluate concurrently (default 1 = serial)'
+)
+@click.option('--stream', is_flag=True, default=False, help='Stream agent replies')
+@click.option('--test-workers', default=1, type=click.IntRange(min=1), help='Browser lanes / processes per test run')
+@click.option('--snapshot-pages', is_flag=True, default=False, help='Run read-only HTML tests against page snapshots')
+@click.option('--browser-service', is_flag=True, default=False, help='Share one Chromium across the run')
+@click.option('--fork-server', is_flag=True, default=False, help="Fork agents' python commands from a warm interpreter")
+@click.option('--no-validation', is_flag=True, default=False, help='Disable runtime execution validation')
+@click.option(
+    '--output', '-o',
+    default='bench_results',
+    type=click.Path(),
+    help='Directory for the benchmark JSON'
+)
+@click.option(
+    '--baseline',
+    type=click.Path(exists=True, dir_okay=False),
+    help='Earlier benchmark JSON to compare against'
+)
+def bench(gold_run, cases, cases_dir, latency_ms, tokens_per_second, jobs, stream, test_workers,
+          snapshot_pages, browser_service, fork_server, no_validation, output, baseline):
+    """Benchmark the harness by replaying a recorded run from a local mock model server."""
+    from rich.table import Table
+    from .bench import compare_reports, run_bench
+
+    case_filter = None if cases.lower() == 'all' else [c.strip() for c in cases.split(',')]
+    try:
+        report = run_bench(
+            run_dir=Path(gold_run),
+            cases_dir=Path(cases_dir),
+            case_filter=case_filter,
+            latency_ms=latency_ms,
+            tokens_per_second=tokens_per_second,
+            jobs=jobs,
+            stream=stream,
+            test_workers=test_workers,
+            snapshot_pages=snapshot_pages,
+            browser_service=browser_service,
+            fork_server=fork_server,
+            validate_execution=not no_validation,
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--gold-run / --cases')
+    path = report.save(Path(output))
+
+    console.print(f"\n[bold]Harness benchmark[/bold] ({report.commit or 'no commit'})")
+    console.print(
+        f"  {report.sessions} sessions ({report.completed} completed) in {report.wall_seconds:.1f}s: "
+        f"[cyan]{report.sessions_per_minute:.1f} sessions/min[/cyan]"
+    )
+    console.print(
+        f"  Peak RSS {report.peak_rss_mb} MB (largest child {report.children_peak_rss_mb} MB), "
+        f"pages {report.browser_pages['cold']} cold / {report.browser_pages['snapshot']} snapshot"
+    )
+
+    table = Table(title="Stage latency")
+    for column in ("span", "count", "mean ms", "p50 ms", "p95 ms", "max ms"):
+        table.add_column(column, justify="left" if column == "span" else "right")
+    for name, stats in report.stages.items():
+        table.add_row(name, str(stats["count"]), *(f"{stats[k]:.1f}" for k in ("mean_ms", "p50_ms", "p95_ms", "max_ms")))
+    console.print(table)
+
+    if baseline:
+        previous = json.loads(Path(baseline).read_text())
+        table = Table(title=f"Against {Path(baseline).name} ({previous.get('commit') or 'no commit'})")
+        for column in ("metric", "baseline", "current", "change"):
+            table.add_column(column, justify="left" if column == "metric" else "right")
+        for metric, old, new in compare_reports(previous, report.to_dict()):
+            change = f"{(new - old) / old * 100:+.0f}%" if old else "-"
+            table.add_row(metric, f"{old:g}", f"{new:g}", change)
+        console.print(table)
+
+    console.print(f"[green]✓ Saved {path}[/green]")
+
+
 @cli.command('list-models')
 def list_models():
     """List supported models (all via OpenRouter)."""
@@ -0,0 +1,168 @@
+"""
+Context compaction for long agent sessions.
+
+AgentLoop keeps the full transcript in its conversation (it is returned in
+AgentResult). Without compaction every turn resends all of it: each earlier
+<write_file> body and up to 10k characters of output per command, so prompt
+size grows with every turn. With a ContextPolicy, ContextManager builds a
+compacted copy for each request:
+
+- Superseded file bodies: when a path is written again later, the older
+  <write_file> keeps its tags but its body becomes a one-line stub naming
+  the hash and line count of the latest version.
+- Old feedback: tool feedback older than the most recent few turns is
+  reduced to its status lines (✓/✗ lines and exit codes).
+- Sliding window: optionally only the most recent turns are sent after the
+  system prompt and task. A note on the first kept turn lists the files
+  written in the dropped turns.
+
+The system prompt and task message are never changed, so they remain a
+stable prefix for provider prompt caching.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+
+from .action_parser import ActionParser, BlockSpan
+from .models.base import Message
+
+# Feedback lines kept when summarizing (everything else is tool output)
+_STATUS_PREFIXES = ("✓", "✗", "ℹ", "⚠", "Exit code:", "No actions detected")
+_MAX_SUMMARY_LINE = 200
+
+
+@dataclass
+class ContextPolicy:
+    """What ContextManager may compact. The defaults keep recent turns intact."""
+    stub_superseded_files: bool = True
+    # Keep this many most recent feedback messages verbatim (None = never summarize)
+    summarize_feedback_after: Optional[int] = 2
+    # Feedback shorter than this is left alone
+    min_summary_chars: int = 400
+    # Send only this many most recent turns (None = all)
+    window_turns: Optional[int] = None
+
+
+# Named policies for --context
+CONTEXT_POLICIES: dict[str, Optional[ContextPolicy]] = {
+    "full": None,
+    "compact": ContextPolicy(),
+    "window": ContextPolicy(window_turns=8),
+}
+
+
+def estimate_tokens(messages: list[Message]) -> int:
+    """Rough token count (4 characters per token, as the rate limiter uses)."""
+    return sum(len(m.content) for m in messages) // 4
+
+
+def summarize_feedback(text: str) -> str:
+    """Reduce tool feedback to its status lines; returns text if that is not shorter."""
+    lines = []
+    for line in text.splitlines():
+        if line.startswith(_STATUS_PREFIXES):
+            if len(line) > _MAX_SUMMARY_LINE:
+                line = line[:_MAX_SUMMARY_LINE] + "…"
+            lines.append(line)
+    summary = "[Earlier feedback, output omitted]\n" + "\n".join(lines)
+    return summary if len(summary) < len(text) else text
+
+
+def file_stub(path: str, content: str) -> str:
+    """One-line replacement for a superseded file body."""
+    digest = hashlib.sha256(content.encode()).hexdigest()[:12]
+    lines = content.count("\n") + 1 if content else 0
+    return f"[superseded: {path} now at sha256:{digest}, {lines} lines]"
+
+
+class ContextManager:
+    """
+    Builds the compacted message list sent to the model each turn.
+
+    Block positions in assistant messages are parsed once per message and
+    cached, so compaction costs one pass over new text per turn.
+    """
+
+    def __init__(self, policy: ContextPolicy):
+        self.policy = policy
+        self._writes: dict[int, tuple[str, list[tuple[BlockSpan, str]]]] = {}
+
+    def compact(self, conversation: list[Message]) -> list[Message]:
+        """
+        Return a compacted copy of conversation.
+
+        Expects the AgentLoop layout: system prompt, task, then alternating
+        assistant replies and user feedback.
+        """
+        head, turns = conversation[:2], list(conversation[2:])
+        policy = self.policy
+
+        writes = {i: self._file_writes(i, turns[i].content)
+                  for i in range(0, len(turns), 2) if turns[i].role == "assistant"}
+
+        if policy.stub_superseded_files:
+            latest: dict[str, tuple[int, int, str]] = {}
+            for i, blocks in writes.items():
+                for span, content in blocks:
+                    latest[span.attrs["path"]] = (i, span.start, content)
+            for i, blocks in writes.items():
+                stale = [
+                    (span, file_stub(path, latest[path][2]))
+                    for span, _ in blocks
+                    for path in [span.attrs["path"]]
+                    if latest[path][:2] != (i, span.start)
+                ]
+                if stale:
+                    turns[i] = Message(role="assistant", content=_replace_bodies(turns[i].content, stale))
+
+        if policy.summarize_feedback_after is not None:
+            feedback = [i for i in range(1, len(turns), 2) if turns[i].role == "user"]
+            keep = policy.summarize_feedback_after
+            for i in feedback[:max(0, len(feedback) - keep)]:
+                if len(turns[i].content) >= policy.min_summary_chars:
+                    turns[i] = Message(role="user", content=summarize_feedback(turns[i].content))
+
+        if policy.window_turns is not None and len(turns) > 2 * policy.window_turns:
+            cut = len(turns) - 2 * policy.window_turns
+            # Keep assistant/user alternation: always drop whole turns
+            cut += cut % 2
+            dropped_files = sorted({
+                span.attrs["path"]
+                for i, blocks in writes.items() if i < cut
+                for span, _ in blocks
+            })
+            note = f"[{cut // 2} earlier turns omitted to save context."
+            if dropped_files:
+                note += f" Files written in them: {', '.join(dropped_files)}."
+            note += "]\n\n"
+            first = turns[cut]
+            turns = [Message(role=first.role, content=note + first.content)] + turns[cut + 1:]
+
+        return head + turns
+
+    def _file_writes(self, index: int, content: str) -> list[tuple[BlockSpan, str]]:
+        """write_file spans (with stripped bodies) in one assistant message, cached."""
+        cached = self._writes.get(index)
+        if cached is not None and cached[0] is content:
+            return cached[1]
+        parser = ActionParser()
+        parser.feed(content)
+        parser.finish()
+        blocks = [
+            (span, content[span.body_start:span.body_end].strip())
+            for span in parser.blocks if span.tag == "write_file"
+        ]
+        self._writes[index] = (content, blocks)
+        return blocks
+
+
+def _replace_bodies(content: str, stale: list[tuple[BlockSpan, str]]) -> str:
+    parts = []
+    pos = 0
+    for span, stub in sorted(stale, key=lambda item: item[0].start):
+        parts.append(content[pos:span.body_start])
+        parts.append(stub)
+        pos = span.body_end
+    parts.append(content[pos:])
+    return "".join(parts)
@@ -5,17 +5,38 @@ SCRIPT NAME: absolute.py
 
 Absolute scoring judge - scores individual outputs on 0-100 scale.
 
-VERSION: 2.0
-LAST UPDATED: 2026-01-04
+VERSION: 2.5
+LAST UPDATED: 2026-10-16
 
 CHANGES IN V2:
 - Rebalanced scoring weights (executes increased, elegance removed)
 - Added execution gate (non-running code capped at 30)
 - Integrated with execution validator
 
+CHANGES IN V2.1:
+- Optional persistent JudgeCache; identical prompts are answered from disk
+
+CHANGES IN V2.2:
+- Instructions + spec sent as a system message marked for prompt caching,
+  generated code in the user message; cached input tokens are costed at
+  the provider's discounted rate
+
+CHANGES IN V2.3:
+- collect_code_files() reads the shared WorkspaceIndex instead of
+  walking the workspace again
+
+CHANGES IN V2.4:
+- score() is a "judge.score" trace span (see tracing.py)
+
+CHANGES IN V2.5:
+- ascore(): the same scoring as a coroutine, awaiting async adapters
+  directly so a cancelled judge drops its HTTP request and rate-limiter
+  slot (used by MultiJudgeArbitrator)
+
 =============================================================================
 """
 
+import asyncio
 import json
 import os
 import re
@@ -24,7 +45,10 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
-from ..models.base import get_model, Message
+from .. import tracing
+from ..models.base import AsyncBaseModel, ModelResponse, cached_input_rate, get_model, Message
+from ..sandbox.workspace_index import WorkspaceIndex
+from .cache import CachedJudgement, JudgeCache, cache_key
 
 # V2: Global cache for file reads to avoid repeated rglob
 _file_cache: dict[str, dict[str, str]] = {}
@@ -43,6 +67,8 @@ class JudgeMetrics:
     input_tokens: int = 0
     output_tokens: int = 0
     judge_model: str = ""
+    cached: bool = False  # Answered from JudgeCache (no API call, no cost)
+    cached_input_tokens: int = 0  # Part of input_tokens served from the provider's prompt cache
 
     @property
     def total_tokens(self) -> int:
@@ -66,7 +92,9 @@ class JudgeMetrics:
         # Normalize model name for lookup
         model_key = self.judge_model.lower()
         input_rate, output_rate = pricing.get(model_key, pricing["default"])
-        cost = (self.input_tokens / 1_000_000) * input_rate
+        uncached = self.input_tokens - self.cached_input_tokens
+        cost = (uncached / 1_000_000) * input_rate
+        cost += (self.cached_input_tokens / 1_000_000) * input_rate * cached_input_rate(self.judge_model)
         cost += (self.output_tokens / 1_000_000) * output_rate
         return round(cost, 6)
 
@@ -74,9 +102,11 @@ class JudgeMetrics:
         return {
             "input_tokens": self.input_tokens,
             "output_tokens": self.output_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
             "total_tokens": self.total_tokens,
             "judge_model": self.judge_model,
             "estimated_cost": self.estimated_cost(),
+            "cached": self.cached,
         }
 
 
@@ -143,7 +173,11 @@ class AbsoluteScore:
         return result
 
 
-def collect_code_files(workspace: Path, max_files: int = 20) -> dict[str, str]:
+def collect_code_files(
+    workspace: Path,
+    max_files: int = 20,
+    index: Optional[WorkspaceIndex] = None,
+) -> dict[str, str]:
     """
     Collect code files from workspace.
 
@@ -152,6 +186,7 @@ def collect_code_files(workspace: Path, max_files: int = 20) -> dict[str, str]:
     Args:
         workspace: Directory to scan
         max_files: Maximum number of files to include
+        index: Scan of the workspace (default: WorkspaceIndex.get())
 
     Returns:
         Dict mapping relative paths to file contents
@@ -169,19 +204,19 @@ def collect_code_files(workspace: Path, max_files: int = 20) -> dict[str, str]:
         ".sh", ".bash", ".sql", ".go", ".rs", ".java"
     }
 
+    index = index or WorkspaceIndex.get(workspace)
     files = {}
-    for path in sorted(workspace.rglob("*")):
-        if path.is_file() and path.suffix in code_extensions:
-            if len(files) >= max_files:
-                break
-            try:
-                content = path.read_text()
-                # Truncate very large files
-                if len(content) > 100000:
-                    content = content[:100000] + "\n\n... (truncated)"
-                files[str(path.relative_to(workspace))] = content
-            except Exception:
-                pass
+    for path in sorted(index.files(*code_extensions)):
+        if len(files) >= max_files:
+            break
+        try:
+            content = index.read_text(path)
+            # Truncate very large files
+            if len(content) > 100000:
+                content = content[:100000] + "\n\n... (truncated)"
+            files[str(path.relative_to(index.root))] = content
+        except Exception:
+            pass
 
     # V2: Cache results for this workspace
     _file_cache[cache_key] = files
@@ -227,7 +262,8 @@ class AbsoluteJudge:
     def __init__(
         self,
         judge_model: str = "claude-opus-4.5",
-        temperature: float = 0.0
+        temperature: float = 0.0,
+        cache: Optional[JudgeCache] = None,
     ):
         """
         Initialize absolute judge.
@@ -235,8 +271,11 @@ class AbsoluteJudge:
         Args:
             judge_model: Model to use for judging
             temperature: Sampling temperature (0 for determinism)
+            cache: Optional result cache shared across judges and runs
         """
         self.judge_model_name = judge_model  # Store for cost tracking
+        self.temperature = temperature
+        self.cache = cache
         self.model = get_model(judge_model)
         # Force low temperature for judging if supported
         if hasattr(self.model, 'temperature'):
@@ -259,6 +298,58 @@ class AbsoluteJudge:
         Returns:
             AbsoluteScore with dimension breakdowns
         """
+        with tracing.span("judge.score", "judge", judge=self.judge_model_name) as span:
+            result = self._score(spec, workspace, criteria)
+            metrics = result.judge_metrics
+            span.set(score=result.total_score, cached=metrics is not None and metrics.cached)
+        return result
+
+    async def ascore(
+        self,
+        spec: str,
+        workspace: Path,
+        criteria: Optional[str] = None
+    ) -> AbsoluteScore:
+        """
+        score() as a coroutine; cancelling it cancels the judge's request.
+
+        File reads and cache lookups run on a worker thread, the model call
+        on the running loop (async adapters) or a worker thread (others).
+        """
+        with tracing.span("judge.score", "judge", judge=self.judge_model_name) as span:
+            result = await self._ascore(spec, workspace, criteria)
+            metrics = result.judge_metrics
+            span.set(score=result.total_score, cached=metrics is not None and metrics.cached)
+        return result
+
+    def _score(self, spec: str, workspace: Path, criteria: Optional[str]) -> AbsoluteScore:
+        """score() without the trace span."""
+        early, key, messages = self._prepare(spec, workspace, criteria)
+        if early is not None:
+            return early
+        return self._finish(self.model.complete(messages), key)
+
+    async def _ascore(self, spec: str, workspace: Path, criteria: Optional[str]) -> AbsoluteScore:
+        """ascore() without the trace span."""
+        early, key, messages = await asyncio.to_thread(self._prepare, spec, workspace, criteria)
+        if early is not None:
+            return early
+        if isinstance(self.model, AsyncBaseModel):
+            response = await self.model.acomplete(messages)
+        else:
+            response = await asyncio.to_thread(self.model.complete, messages)
+        return await asyncio.to_thread(self._finish, response, key)
+
+    def _prepare(
+        self, spec: str, workspace: Path, criteria: Optional[str]
+    ) -> tuple[Optional[AbsoluteScore], Optional[str], list[Message]]:
+        """
+        Everything before the model call.
+
+        Returns:
+            (score, None, []) when no call is needed (no files, cache hit),
+            else (None, cache key or None, messages to send)
+        """
         code_files = collect_code_files(workspace)
         
         if not code_files:
@@ -269,21 +360,31 @@ class AbsoluteJudge:
                 output_quality=DimensionScore(0, "No output"),
                 direction_following=DimensionScore(0, "No attempt"),
                 code_quality=DimensionScore(0, "No code"),
-            )
+            ), None, []
         
+        key = None
+        if self.cache is not None:
+            key = cache_key(spec, criteria, code_files, self.judge_model_name, self.temperature)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self._build_score(
+                    cached.scores,
+                    JudgeMetrics(judge_model=self.judge_model_name, cached=True),
+                ), None, []
+
         criteria_section = ""
         if criteria:
             criteria_section = f"\n\n## Additional Evaluation Criteria:\n{criteria}"
         
-        prompt = f"""You are a STRICT code reviewer evaluating AI-generated code. Your job is to find problems and score harshly but fairly.
+        # Everything that is the same for every model on this case comes
+        # first, as a system message marked for prompt caching; only the
+        # generated code differs between judge calls.
+        instructions = f"""You are a STRICT code reviewer evaluating AI-generated code. Your job is to find problems and score harshly but fairly.
 
 ## Original Spec:
 {spec}
 {criteria_section}
 
-## Generated Code:
-{format_code_files(code_files)}
-
 ## CRITICAL: Scoring Guidelines
 
 Score STRICTLY on a 0-10 scale. Most implementations should score 4-7. Only exceptional, production-ready code gets 8+.
@@ -333,43 +434,31 @@ Respond ONLY with JSON:
   "code_quality": {{"score": N, "reason": "..."}}
 }}
 """
-        
-        response = self.model.complete([Message(role="user", content=prompt)])
+        prompt = f"""## Generated Code:
+{format_code_files(code_files)}
 
+Score this code against the spec using the guidelines above. Respond ONLY with JSON."""
+
+        return None, key, [
+            Message(role="system", content=instructions, cache=True),
+            Message(role="user", content=prompt),
+        ]
+
+    def _finish(self, response: ModelResponse, key: Optional[str]) -> AbsoluteScore:
+        """Score from the judge's response; well-formed answers are cached under key."""
         # V2: Track judge token usage
+        usage = response.usage or {}
         judge_metrics = JudgeMetrics(
-            input_tokens=response.usage.get("input_tokens", 0) if response.usage else 0,
-            output_tokens=response.usage.get("output_tokens", 0) if response.usage else 0,
+            input_tokens=usage.get("input_tokens", 0),
+            output_tokens=usage.get("output_tokens", 0),
             judge_model=self.judge_model_name,
+            cached_input_tokens=usage.get("cached_input_tokens", 0),
         )
 
         try:
             raw_json = extract_json(response.content)
             scores = json.loads(raw_json)
-
-            return AbsoluteScore(
-                executes=DimensionScore(
-                    scores["executes"]["score"],
-                    scores["executes"]["reason"]
-                ),
-                features_complete=DimensionScore(
-                    scores["features_complete"]["score"],
-                    scores["features_complete"]["reason"]
-                ),
-                output_quality=DimensionScore(
-                    scores["output_quality"]["score"],
-                    scores["output_quality"]["reason"]
-                ),
-                direction_following=DimensionScore(
-                    scores["direction_following"]["score"],
-                    scores["direction_following"]["reason"]
-                ),
-                code_quality=DimensionScore(
-                    scores["code_quality"]["score"],
-                    scores["code_quality"]["reason"]
-                ),
-                judge_metrics=judge_metrics,
-            )
+            result = self._build_score(scores, judge_metrics)
 
         except (json.JSONDecodeError, KeyError) as e:
             # Return error-state scores if parsing fails
@@ -381,3 +470,41 @@ Respond ONLY with JSON:
                 code_quality=DimensionScore(0, "Could not parse"),
                 judge_metrics=judge_metrics,  # Still track tokens even on parse error
             )
+
+        # Only well-formed answers are cached; parse failures are retried next time
+        if key is not None:
+            self.cache.put(key, self.judge_model_name, CachedJudgement(
+                raw_response=response.content,
+                scores={dim: {"score": getattr(result, dim).score, "reason": getattr(result, dim).reason}
+                        for dim in AbsoluteScore.WEIGHTS},
+                input_tokens=judge_metrics.input_tokens,
+                output_tokens=judge_metrics.output_tokens,
+            ))
+        return result
+
+    @staticmethod
+    def _build_score(scores: dict, judge_metrics: JudgeMetrics) -> AbsoluteScore:
+        """Build an AbsoluteScore from the judge's parsed JSON."""
+        return AbsoluteScore(
+            executes=DimensionScore(
+                scores["executes"]["score"],
+                scores["executes"]["reason"]
+            ),
+            features_complete=DimensionScore(
+                scores["features_complete"]["score"],
+                scores["features_complete"]["reason"]
+            ),
+            output_quality=DimensionScore(
+                scores["output_quality"]["score"],
+                scores["output_quality"]["reason"]
+            ),
+            direction_following=DimensionScore(
+                scores["direction_following"]["score"],
+                scores["direction_following"]["reason"]
+            ),
+            code_quality=DimensionScore(
+                scores["code_quality"]["score"],
+                scores["code_quality"]["reason"]
+            ),
+            judge_metrics=judge_metrics,
+        )
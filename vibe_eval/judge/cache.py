@@ -0,0 +1,235 @@
+"""
+=============================================================================
+SCRIPT NAME: cache.py
+=============================================================================
+
+Persistent, content-addressed cache for judge results.
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+AbsoluteJudge calls are the most expensive part of scoring. Re-scoring an
+old run, tweaking AbsoluteScore.WEIGHTS, or re-running a model that wrote
+identical files produces exactly the same judge prompt, so the answer can
+be reused. Entries are keyed by a SHA-256 of everything that goes into the
+prompt (spec, criteria, sorted workspace files) plus the judge model and
+temperature, and store the raw response, the parsed dimension scores and
+the original token usage.
+
+Only dimension scores are cached, never totals, so weight changes take
+effect on a cache hit. The database is SQLite under ~/.cache/vibe_eval
+(or $XDG_CACHE_HOME/vibe_eval) and is trimmed least-recently-used first
+once it grows past max_bytes.
+
+=============================================================================
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+# Bump when the judge prompt or response format changes incompatibly
+CACHE_VERSION = 2  # V2: judge prompt split into cached instructions + code
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+
+
+def default_cache_path() -> Path:
+    """Location of the shared judge cache database."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "vibe_eval" / "judge_cache.sqlite"
+
+
+def cache_key(
+    spec: str,
+    criteria: Optional[str],
+    code_files: dict[str, str],
+    judge_model: str,
+    temperature: float,
+) -> str:
+    """
+    Hash the judge prompt inputs into a cache key.
+
+    Files are hashed in sorted path order so the key does not depend on
+    directory traversal order.
+    """
+    digest = hashlib.sha256()
+    header = {
+        "version": CACHE_VERSION,
+        "judge_model": judge_model,
+        "temperature": temperature,
+        "spec": spec,
+        "criteria": criteria or "",
+    }
+    digest.update(json.dumps(header, sort_keys=True).encode())
+    for path in sorted(code_files):
+        digest.update(b"\0" + path.encode() + b"\0")
+        digest.update(code_files[path].encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedJudgement:
+    """A stored judge result."""
+    raw_response: str
+    scores: dict            # Dimension name -> {"score": N, "reason": "..."}
+    input_tokens: int
+    output_tokens: int
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one process."""
+    hits: int = 0
+    misses: int = 0
+    saved_input_tokens: int = 0
+    saved_output_tokens: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+            "saved_input_tokens": self.saved_input_tokens,
+            "saved_output_tokens": self.saved_output_tokens,
+        }
+
+
+class JudgeCache:
+    """
+    SQLite-backed judge result cache.
+
+    Safe to share between threads (one connection guarded by a lock) and
+    between processes (SQLite file locking).
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize cache.
+
+        Args:
+            path: Database file (defaults to default_cache_path())
+            max_bytes: Evict least-recently-used entries beyond this size
+        """
+        self.path = Path(path) if path else default_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS judge_results (
+                key TEXT PRIMARY KEY,
+                judge_model TEXT NOT NULL,
+                raw_response TEXT NOT NULL,
+                scores TEXT NOT NULL,
+                input_tokens INTEGER NOT NULL,
+                output_tokens INTEGER NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_judge_results_last_used ON judge_results (last_used_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[CachedJudgement]:
+        """Look up a key, counting the hit or miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT raw_response, scores, input_tokens, output_tokens "
+                "FROM judge_results WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE judge_results SET last_used_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+
+            entry = CachedJudgement(
+                raw_response=row[0],
+                scores=json.loads(row[1]),
+                input_tokens=row[2],
+                output_tokens=row[3],
+            )
+            self.stats.hits += 1
+            self.stats.saved_input_tokens += entry.input_tokens
+            self.stats.saved_output_tokens += entry.output_tokens
+            return entry
+
+    def put(self, key: str, judge_model: str, entry: CachedJudgement):
+        """Store a judge result and evict old entries if over budget."""
+        scores = json.dumps(entry.scores)
+        size = len(entry.raw_response.encode()) + len(scores.encode())
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO judge_results "
+                "(key, judge_model, raw_response, scores, input_tokens, output_tokens, "
+                "size_bytes, created_at, last_used_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, judge_model, entry.raw_response, scores, entry.input_tokens,
+                 entry.output_tokens, size, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least-recently-used entries until the cache fits max_bytes."""
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM judge_results"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size_bytes FROM judge_results ORDER BY last_used_at ASC"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM judge_results WHERE key = ?", stale)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM judge_results").fetchone()[0]
+
+    def size_bytes(self) -> int:
+        """Total stored payload size."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM judge_results"
+            ).fetchone()[0]
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM judge_results")
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
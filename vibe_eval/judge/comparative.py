@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal
 
+from .. import tracing
 from .absolute import collect_code_files, format_code_files, extract_json
 from ..models.base import get_model, Message
 
@@ -130,7 +131,8 @@ Respond ONLY with JSON in this exact format:
 }}
 """
         
-        response = self.model.complete([Message(role="user", content=prompt)])
+        with tracing.span("judge.compare", "judge", model_a=model_a_name, model_b=model_b_name):
+            response = self.model.complete([Message(role="user", content=prompt)])
         
         try:
             raw_json = extract_json(response.content)
@@ -5,23 +5,43 @@ SCRIPT NAME: multi_judge.py
 
 Multi-judge arbitration system - aggregates scores from multiple judges.
 
-VERSION: 2.0
-LAST UPDATED: 2026-01-04
+VERSION: 2.3
+LAST UPDATED: 2026-10-16
 
 CHANGES IN V2:
 - Uses 3 default judges via OpenRouter
 - Supports average, median, consensus aggregation modes
 - Tracks disagreement flags when judges disagree significantly
 
+CHANGES IN V2.1:
+- Judges are fanned out concurrently on a thread pool
+- Per-judge timeout; judges that miss it are recorded as stragglers
+- Optional quorum: return once N judges agree within the threshold
+- Judges share an optional persistent JudgeCache
+
+CHANGES IN V2.2:
+- score() is a "judge.multi" trace span; each judge's spans go on a
+  "judge <model>" track under the caller's (see tracing.py)
+
+CHANGES IN V2.3:
+- Judges run as tasks on the shared HTTP event loop (models/pool.py)
+  instead of threads; stragglers are cancelled, which aborts their
+  requests and frees their rate-limiter slots for the next pair
+
 =============================================================================
 """
 
+import asyncio
 import statistics
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Dict, List
 
+from .. import tracing
+from ..models.pool import run_sync
 from .absolute import AbsoluteJudge, AbsoluteScore
+from .cache import JudgeCache
 
 # V2: Default judges via OpenRouter
 DEFAULT_JUDGES = [
@@ -42,6 +62,8 @@ class MultiJudgeScore:
     judges_used: List[str]
     aggregation_mode: str
     dimension_spreads: Dict[str, int] = field(default_factory=dict)
+    # Judges still running (then cancelled) when the timeout or quorum ended scoring
+    stragglers: List[str] = field(default_factory=list)
 
     @property
     def total_judge_tokens(self) -> int:
@@ -74,6 +96,7 @@ class MultiJudgeScore:
             "judges_used": self.judges_used,
             "aggregation_mode": self.aggregation_mode,
             "dimension_spreads": self.dimension_spreads,
+            "stragglers": self.stragglers,
         }
 
 
@@ -90,6 +113,9 @@ class MultiJudgeArbitrator:
         judges: Optional[List[str]] = None,
         mode: str = "median",
         disagreement_threshold: float = 15.0,
+        judge_timeout: Optional[float] = None,
+        quorum: Optional[int] = None,
+        cache: Optional[JudgeCache] = None,
     ):
         """
         Initialize multi-judge arbitrator.
@@ -98,17 +124,26 @@ class MultiJudgeArbitrator:
             judges: List of judge model IDs (defaults to DEFAULT_JUDGES)
             mode: Aggregation mode - "median", "average", or "consensus"
             disagreement_threshold: Score spread threshold to flag disagreement
+            judge_timeout: Seconds to wait for each judge (None = no limit)
+            quorum: Return as soon as this many judges agree within
+                    disagreement_threshold (None = wait for all judges)
+            cache: Optional judge result cache shared by all judges
         """
         self.judge_models = judges or DEFAULT_JUDGES.copy()
         self.mode = mode
         self.threshold = disagreement_threshold
+        self.judge_timeout = judge_timeout
+        self.quorum = quorum
+        self.cache = cache
         self._judges: Dict[str, AbsoluteJudge] = {}
+        self._judges_lock = threading.Lock()
     
     def _get_judge(self, model_id: str) -> AbsoluteJudge:
         """Get or create judge instance (cached)."""
-        if model_id not in self._judges:
-            self._judges[model_id] = AbsoluteJudge(judge_model=model_id)
-        return self._judges[model_id]
+        with self._judges_lock:
+            if model_id not in self._judges:
+                self._judges[model_id] = AbsoluteJudge(judge_model=model_id, cache=self.cache)
+            return self._judges[model_id]
     
     def score(
         self,
@@ -118,6 +153,13 @@ class MultiJudgeArbitrator:
     ) -> MultiJudgeScore:
         """
         Score workspace using multiple judges and aggregate results.
+
+        All judges run concurrently. Scoring ends when every judge has
+        answered, when the per-judge timeout expires, or when a quorum of
+        judges agree. Judges still running at that point are recorded as
+        stragglers and cancelled.
+
+        Blocks on the shared HTTP event loop; async callers use ascore().
         
         Args:
             spec: Original task specification
@@ -127,17 +169,60 @@ class MultiJudgeArbitrator:
         Returns:
             MultiJudgeScore with aggregated results
         """
-        # Get scores from all judges
+        return run_sync(self.ascore(spec, workspace, criteria))
+
+    async def ascore(
+        self,
+        spec: str,
+        workspace: Path,
+        criteria: Optional[str] = None
+    ) -> MultiJudgeScore:
+        """score() as a coroutine, fanning judges out on the running loop."""
+        with tracing.span("judge.multi", "judge", judges=len(self.judge_models), mode=self.mode) as span:
+            result = await self._ascore(spec, workspace, criteria)
+            span.set(final_score=result.final_score, stragglers=len(result.stragglers))
+        return result
+
+    async def _ascore(self, spec: str, workspace: Path, criteria: Optional[str]) -> MultiJudgeScore:
+        """ascore() without the trace span."""
+        tasks = {
+            asyncio.create_task(self._score_with(judge_model, spec, workspace, criteria)): judge_model
+            for judge_model in self.judge_models
+        }
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.judge_timeout if self.judge_timeout else None
+
         individual_scores = {}
-        for judge_model in self.judge_models:
-            try:
-                judge = self._get_judge(judge_model)
-                score = judge.score(spec, workspace, criteria)
-                individual_scores[judge_model] = score
-            except Exception as e:
-                # If a judge fails, skip it (but log)
-                print(f"Warning: Judge {judge_model} failed: {e}")
-                continue
+        pending = set(tasks)
+        try:
+            while pending:
+                remaining = None if deadline is None else max(0.0, deadline - loop.time())
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break  # Timed out
+
+                # Keep results in configured judge order
+                for task in sorted(done, key=lambda t: self.judge_models.index(tasks[t])):
+                    judge_model = tasks[task]
+                    try:
+                        individual_scores[judge_model] = task.result()
+                    except Exception as e:
+                        # If a judge fails, skip it (but log)
+                        print(f"Warning: Judge {judge_model} failed: {e}")
+
+                if self._quorum_reached(individual_scores):
+                    break
+        finally:
+            # Cancel stragglers and wait until their requests are torn down
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        stragglers = [tasks[t] for t in pending]
+        for judge_model in stragglers:
+            print(f"Warning: Judge {judge_model} did not finish in time (straggler)")
         
         if not individual_scores:
             # All judges failed - return zero score
@@ -149,10 +234,45 @@ class MultiJudgeArbitrator:
                 spread=0.0,
                 judges_used=[],
                 aggregation_mode=self.mode,
+                stragglers=stragglers,
             )
         
         # Aggregate scores
-        return self._aggregate_scores(individual_scores)
+        ordered = {m: individual_scores[m] for m in self.judge_models if m in individual_scores}
+        result = self._aggregate_scores(ordered)
+        result.stragglers = stragglers
+        return result
+
+    async def _score_with(
+        self,
+        judge_model: str,
+        spec: str,
+        workspace: Path,
+        criteria: Optional[str],
+    ) -> AbsoluteScore:
+        """Score with a single judge (runs as its own task)."""
+        judge = self._get_judge(judge_model)
+        with tracing.track(f"judge {judge_model}"):
+            if hasattr(judge, "ascore"):
+                return await judge.ascore(spec, workspace, criteria)
+            # Sync-only judge: cancelling stops waiting for it, not the thread
+            return await asyncio.to_thread(judge.score, spec, workspace, criteria)
+
+    def _quorum_reached(self, scores: Dict[str, AbsoluteScore]) -> bool:
+        """
+        Check whether at least `quorum` judges agree within the threshold.
+
+        Agreement means some group of `quorum` total scores spans no more
+        than disagreement_threshold points.
+        """
+        if not self.quorum or len(scores) < self.quorum:
+            return False
+        totals = sorted(score.total_score for score in scores.values())
+        window = self.quorum - 1
+        return any(
+            totals[i + window] - totals[i] <= self.threshold
+            for i in range(len(totals) - window)
+        )
     
     def _aggregate_scores(self, scores: Dict[str, AbsoluteScore]) -> MultiJudgeScore:
         """
@@ -223,6 +343,9 @@ def create_multi_judge(
     judges: Optional[List[str]] = None,
     mode: str = "median",
     threshold: float = 15.0,
+    judge_timeout: Optional[float] = None,
+    quorum: Optional[int] = None,
+    cache: Optional[JudgeCache] = None,
 ) -> MultiJudgeArbitrator:
     """
     Factory function to create MultiJudgeArbitrator with defaults.
@@ -231,6 +354,9 @@ def create_multi_judge(
         judges: List of judge model IDs (defaults to DEFAULT_JUDGES)
         mode: Aggregation mode - "median", "average", or "consensus"
         threshold: Score spread threshold to flag disagreement
+        judge_timeout: Seconds to wait for each judge (None = no limit)
+        quorum: Return once this many judges agree (None = wait for all)
+        cache: Optional judge result cache
         
     Returns:
         Configured MultiJudgeArbitrator instance
@@ -239,4 +365,7 @@ def create_multi_judge(
         judges=judges,
         mode=mode,
         disagreement_threshold=threshold,
+        judge_timeout=judge_timeout,
+        quorum=quorum,
+        cache=cache,
     )
@@ -1,8 +1,12 @@
 """Abstract base class for model adapters."""
 
+import queue
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Optional
+
+# Receives each text delta of a streamed completion, in order
+TextCallback = Callable[[str], None]
 
 
 @dataclass
@@ -10,6 +14,9 @@ class Message:
     """A message in the conversation."""
     role: str  # "system", "user", or "assistant"
     content: str
+    # Ends a prefix that repeats across requests; adapters with prompt
+    # caching place a cache breakpoint after this message
+    cache: bool = False
 
 
 @dataclass 
@@ -17,6 +24,8 @@ class ModelResponse:
     """Response from a model completion."""
     content: str
     model: str
+    # input_tokens, output_tokens and, when the provider reports it,
+    # cached_input_tokens (the part of input_tokens read from its prompt cache)
     usage: Optional[dict] = None
 
 
@@ -36,6 +45,25 @@ class BaseModel(ABC):
         """
         pass
     
+    def complete_stream(self, messages: list[Message], on_text: TextCallback) -> ModelResponse:
+        """
+        Stream a completion, passing text deltas to on_text as they arrive.
+
+        Adapters without native streaming deliver the whole reply as one
+        delta once complete() returns.
+
+        Args:
+            messages: List of Message objects representing the conversation
+            on_text: Called on the caller's thread with each text delta
+
+        Returns:
+            ModelResponse with the full reply and usage
+        """
+        response = self.complete(messages)
+        if response.content:
+            on_text(response.content)
+        return response
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -49,6 +77,132 @@ class BaseModel(ABC):
         pass
 
 
+class AsyncBaseModel(BaseModel):
+    """
+    Base class for adapters with a native async API.
+
+    Subclasses implement acomplete(); complete() is a thin synchronous
+    wrapper that runs it on the shared HTTP event loop, so existing sync
+    callers keep working and share the same connection pool.
+    """
+
+    @abstractmethod
+    async def acomplete(self, messages: list[Message]) -> ModelResponse:
+        """
+        Send messages and await a completion.
+
+        Args:
+            messages: List of Message objects representing the conversation
+
+        Returns:
+            ModelResponse with the model's reply
+        """
+        pass
+
+    async def acomplete_stream(
+        self,
+        messages: list[Message],
+        on_text: TextCallback,
+    ) -> ModelResponse:
+        """
+        Stream a completion, calling on_text with each text delta.
+
+        Default: one delta containing the full reply from acomplete().
+        """
+        response = await self.acomplete(messages)
+        if response.content:
+            on_text(response.content)
+        return response
+
+    def complete(self, messages: list[Message]) -> ModelResponse:
+        """Synchronous wrapper around acomplete()."""
+        from .pool import run_sync
+        return run_sync(self.acomplete(messages))
+
+    def complete_stream(self, messages: list[Message], on_text: TextCallback) -> ModelResponse:
+        """
+        Synchronous wrapper around acomplete_stream().
+
+        The request runs on the shared HTTP loop; deltas are handed back
+        through a queue so on_text runs on the caller's thread and slow
+        callbacks (e.g. executing actions) never stall the event loop.
+        """
+        from .pool import submit
+
+        deltas: queue.Queue = queue.Queue()
+        end = object()
+        future = submit(self.acomplete_stream(messages, deltas.put))
+        future.add_done_callback(lambda _: deltas.put(end))
+        try:
+            while True:
+                delta = deltas.get()
+                if delta is end:
+                    break
+                on_text(delta)
+        finally:
+            future.cancel()  # No-op once finished; stops the request if on_text raised
+        return future.result()
+
+
+# Shorthand names mapped to OpenRouter format
+# Use actual OpenRouter model IDs (not dated versions)
+MODEL_ALIASES = {
+    "claude-opus-4.5": "anthropic/claude-opus-4.5",
+    "claude-sonnet-4.5": "anthropic/claude-sonnet-4.5",
+    "claude-sonnet-4": "anthropic/claude-sonnet-4",
+    "claude-haiku-4.5": "anthropic/claude-haiku-4.5",
+    "gpt-4o": "openai/gpt-4o",
+    "gpt-4o-mini": "openai/gpt-4o-mini",
+    "gpt-oss": "openai/gpt-oss-120b",
+    "gpt-oss-120b": "openai/gpt-oss-120b",
+    "o1": "openai/o1",
+    "o3-mini": "openai/o3-mini",
+    "gemini-2.0-flash": "google/gemini-2.0-flash-001",
+    "gemini-2.5-pro": "google/gemini-2.5-pro-preview-06-05",
+    "gemini-3-flash": "google/gemini-3-flash",
+    "llama-3.1-8b": "meta-llama/llama-3.1-8b-instruct",
+    "llama-3.1-70b": "meta-llama/llama-3.1-70b-instruct",
+    # Kimi models via OpenRouter
+    "kimi-k2.5": "moonshotai/kimi-k2.5",
+    "kimi-k2": "moonshotai/kimi-k2.5",
+}
+
+
+def provider_key(model_id: str) -> str:
+    """
+    Map a model ID to the provider its requests are throttled under.
+
+    Examples:
+        anthropic/claude-opus-4.5 -> anthropic
+        claude-opus-4.5           -> anthropic (via MODEL_ALIASES)
+        openai/gpt-oss-120b@Cerebras -> openai
+        local:qwen                -> local
+    """
+    model = model_id.split("@", 1)[0]
+    lower = model.lower()
+    if lower.startswith("local"):
+        return "local"
+    if "/" not in lower:
+        lower = MODEL_ALIASES.get(lower, lower)
+    return lower.split("/", 1)[0]
+
+
+# Price of a cached input token relative to an uncached one, per provider.
+# Providers not listed are costed as if nothing was cached.
+CACHED_INPUT_RATES = {
+    "anthropic": 0.1,
+    "openai": 0.5,
+    "google": 0.25,
+    "deepseek": 0.1,
+    "x-ai": 0.25,
+}
+
+
+def cached_input_rate(model_id: str) -> float:
+    """Multiplier applied to the input price for prompt-cache hits."""
+    return CACHED_INPUT_RATES.get(provider_key(model_id), 1.0)
+
+
 def get_model(model_id: str) -> BaseModel:
     """
     Factory function to get a model adapter by ID.
@@ -91,27 +245,6 @@ def get_model(model_id: str) -> BaseModel:
     # Auto-prefix common model names if no provider specified
     if "/" not in model_id:
         # Map shorthand names to OpenRouter format
-        # Use actual OpenRouter model IDs (not dated versions)
-        model_map = {
-            "claude-opus-4.5": "anthropic/claude-opus-4.5",
-            "claude-sonnet-4.5": "anthropic/claude-sonnet-4.5",
-            "claude-sonnet-4": "anthropic/claude-sonnet-4",
-            "claude-haiku-4.5": "anthropic/claude-haiku-4.5",
-            "gpt-4o": "openai/gpt-4o",
-            "gpt-4o-mini": "openai/gpt-4o-mini",
-            "gpt-oss": "openai/gpt-oss-120b",
-            "gpt-oss-120b": "openai/gpt-oss-120b",
-            "o1": "openai/o1",
-            "o3-mini": "openai/o3-mini",
-            "gemini-2.0-flash": "google/gemini-2.0-flash-001",
-            "gemini-2.5-pro": "google/gemini-2.5-pro-preview-06-05",
-            "gemini-3-flash": "google/gemini-3-flash",
-            "llama-3.1-8b": "meta-llama/llama-3.1-8b-instruct",
-            "llama-3.1-70b": "meta-llama/llama-3.1-70b-instruct",
-            # Kimi models via OpenRouter
-            "kimi-k2.5": "moonshotai/kimi-k2.5",
-            "kimi-k2": "moonshotai/kimi-k2.5",
-        }
-        model_id = model_map.get(model_lower, model_id)
+        model_id = MODEL_ALIASES.get(model_lower, model_id)
 
     return OpenRouterModel(model_id=model_id, provider=provider)
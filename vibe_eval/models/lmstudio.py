@@ -1,14 +1,17 @@
 """LM Studio local model adapter (OpenAI-compatible)."""
 
+import asyncio
 import os
 from typing import Optional
 
 import openai
 
-from .base import BaseModel, Message, ModelResponse
+from .. import tracing
+from .base import AsyncBaseModel, Message, ModelResponse, TextCallback
+from .pool import shared_async_client
 
 
-class LMStudioModel(BaseModel):
+class LMStudioModel(AsyncBaseModel):
     """LM Studio local model adapter using OpenAI-compatible API."""
     
     def __init__(
@@ -32,16 +35,26 @@ class LMStudioModel(BaseModel):
             "http://localhost:1234/v1"
         )
         
-        self.client = openai.OpenAI(
-            api_key="lm-studio",  # LM Studio doesn't need real API key
-            base_url=self.base_url
-        )
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
         self.model_id = model_id
         self.max_tokens = max_tokens
         self.temperature = temperature
     
-    def complete(self, messages: list[Message]) -> ModelResponse:
-        """Send messages and get completion from LM Studio."""
+    def _async_client(self) -> openai.AsyncOpenAI:
+        """OpenAI client bound to the running loop's pooled HTTP client."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = openai.AsyncOpenAI(
+                api_key="lm-studio",  # LM Studio doesn't need real API key
+                base_url=self.base_url,
+                http_client=shared_async_client(),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def acomplete(self, messages: list[Message]) -> ModelResponse:
+        """Send messages and await completion from LM Studio."""
         
         # Convert to OpenAI format
         formatted_messages = [
@@ -49,12 +62,13 @@ class LMStudioModel(BaseModel):
             for msg in messages
         ]
         
-        response = self.client.chat.completions.create(
-            model=self.model_id,  # LM Studio uses loaded model
-            messages=formatted_messages,
-            max_tokens=self.max_tokens,
-            temperature=self.temperature,
-        )
+        with tracing.span("model.request", "model", model=self.model_id, stream=False):
+            response = await self._async_client().chat.completions.create(
+                model=self.model_id,  # LM Studio uses loaded model
+                messages=formatted_messages,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+            )
         
         # Handle potential missing usage data from local models
         usage = None
@@ -70,6 +84,41 @@ class LMStudioModel(BaseModel):
             usage=usage
         )
     
+    async def acomplete_stream(
+        self,
+        messages: list[Message],
+        on_text: TextCallback,
+    ) -> ModelResponse:
+        """Stream a completion from LM Studio, calling on_text per delta."""
+        with tracing.span("model.request", "model", model=self.model_id, stream=True):
+            stream = await self._async_client().chat.completions.create(
+                model=self.model_id,
+                messages=[{"role": msg.role, "content": msg.content} for msg in messages],
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            parts = []
+            usage = None
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    text = chunk.choices[0].delta.content
+                    parts.append(text)
+                    on_text(text)
+                # Usage (if the server reports it) arrives on the final chunk
+                if chunk.usage:
+                    usage = {
+                        "input_tokens": chunk.usage.prompt_tokens or 0,
+                        "output_tokens": chunk.usage.completion_tokens or 0,
+                    }
+        
+        return ModelResponse(
+            content="".join(parts),
+            model=self.model_id,
+            usage=usage
+        )
+    
     @property
     def name(self) -> str:
         return f"local:{self.model_id}"
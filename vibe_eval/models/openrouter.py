@@ -1,15 +1,65 @@
 """OpenRouter model adapter for accessing various LLMs."""
 
+import asyncio
 import os
+import random
 from typing import Optional
 
 import openai
 
-from .base import BaseModel, Message, ModelResponse
+from .. import tracing
+from .base import AsyncBaseModel, Message, ModelResponse, TextCallback, provider_key
+from .pool import shared_async_client
+from .ratelimit import estimate_tokens, get_rate_limiter, parse_retry_after
 
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
-class OpenRouterModel(BaseModel):
-    """OpenRouter model adapter using OpenAI-compatible API."""
+# Providers that only cache prompts at explicit cache_control breakpoints.
+# Others (OpenAI, DeepSeek, ...) cache repeated prefixes automatically.
+CACHE_CONTROL_PROVIDERS = ("anthropic", "google")
+# Anthropic allows at most four breakpoints per request
+MAX_CACHE_BREAKPOINTS = 4
+
+
+def format_messages(messages: list[Message], model_id: str) -> list[dict]:
+    """
+    Convert messages to the OpenAI format, adding cache_control hints.
+
+    Messages marked cache=True get an ephemeral cache breakpoint when the
+    model's provider needs explicit hints. If more are marked than the
+    provider allows, the latest ones are kept (each covers everything
+    before it).
+    """
+    formatted = [{"role": msg.role, "content": msg.content} for msg in messages]
+    if provider_key(model_id) not in CACHE_CONTROL_PROVIDERS:
+        return formatted
+    marked = [i for i, msg in enumerate(messages) if msg.cache and msg.content]
+    for i in marked[-MAX_CACHE_BREAKPOINTS:]:
+        formatted[i]["content"] = [{
+            "type": "text",
+            "text": messages[i].content,
+            "cache_control": {"type": "ephemeral"},
+        }]
+    return formatted
+
+
+def usage_dict(usage) -> dict:
+    """Token counts from an OpenAI-style usage object."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "input_tokens": usage.prompt_tokens or 0,
+        "output_tokens": usage.completion_tokens or 0,
+        "cached_input_tokens": getattr(details, "cached_tokens", None) or 0,
+    }
+
+
+class OpenRouterModel(AsyncBaseModel):
+    """
+    OpenRouter model adapter using OpenAI-compatible API.
+
+    Requests go through the process-wide connection pool; complete() is
+    the synchronous wrapper inherited from AsyncBaseModel.
+    """
     
     def __init__(
         self, 
@@ -31,24 +81,49 @@ class OpenRouterModel(BaseModel):
         if not api_key:
             raise ValueError("OPENROUTER_API_KEY environment variable not set")
         
-        self.client = openai.OpenAI(
-            api_key=api_key,
-            base_url="https://openrouter.ai/api/v1",
-            timeout=300.0,  # 5 minute timeout per API call
-        )
+        self._api_key = api_key
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
         self.model_id = model_id
         self.max_tokens = max_tokens
         self.temperature = temperature
         self._preferred_provider = provider  # Renamed to avoid conflict with property
     
-    def complete(self, messages: list[Message]) -> ModelResponse:
-        """Send messages and get completion from OpenRouter."""
+    def _async_client(self) -> openai.AsyncOpenAI:
+        """OpenAI client bound to the running loop's pooled HTTP client."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = openai.AsyncOpenAI(
+                api_key=self._api_key,
+                base_url=OPENROUTER_BASE_URL,
+                timeout=300.0,  # 5 minute timeout per API call
+                max_retries=0,  # Retries go through the shared rate limiter below
+                http_client=shared_async_client(),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def acomplete(self, messages: list[Message]) -> ModelResponse:
+        """Send messages and await completion from OpenRouter."""
+        return await self._request(messages)
+
+    async def acomplete_stream(
+        self,
+        messages: list[Message],
+        on_text: TextCallback,
+    ) -> ModelResponse:
+        """Stream a completion from OpenRouter, calling on_text per delta."""
+        return await self._request(messages, on_text)
+
+    async def _request(
+        self,
+        messages: list[Message],
+        on_text: Optional[TextCallback] = None,
+    ) -> ModelResponse:
+        """Send one chat completion with rate limiting and retries."""
         
-        # Convert to OpenAI format
-        formatted_messages = [
-            {"role": msg.role, "content": msg.content}
-            for msg in messages
-        ]
+        # Convert to OpenAI format (with prompt-cache hints where supported)
+        formatted_messages = format_messages(messages, self.model_id)
         
         # Build request kwargs
         kwargs = {
@@ -69,42 +144,104 @@ class OpenRouterModel(BaseModel):
                 }
             }
         
-        # Retry logic for transient failures
-        max_retries = 3
+        # Once text has been handed to on_text a retry would duplicate it
+        streamed = False
+
+        def forward(text: str):
+            nonlocal streamed
+            streamed = True
+            on_text(text)
+        
+        # Retry logic for transient failures and rate limits. All adapters
+        # for this provider share one limiter, so a 429 slows everyone down.
+        limiter = get_rate_limiter(self.model_id)
+        estimated = estimate_tokens(formatted_messages)
+        max_retries = 5
         last_error = None
         
         for attempt in range(max_retries):
+            with tracing.span("model.rate_limit", "model", model=self.model_id):
+                await limiter.acquire(estimated)
+            backoff = 2 ** attempt + random.uniform(0, 1)  # Exponential backoff with jitter
+            request = tracing.span(
+                "model.request", "model", model=self.model_id, attempt=attempt + 1, stream=on_text is not None,
+            )
             try:
-                response = self.client.chat.completions.create(**kwargs)
-                
-                # Handle usage data
-                usage = None
-                if response.usage:
-                    usage = {
-                        "input_tokens": response.usage.prompt_tokens or 0,
-                        "output_tokens": response.usage.completion_tokens or 0,
-                    }
-                
-                return ModelResponse(
-                    content=response.choices[0].message.content,
-                    model=self.model_id,
-                    usage=usage
-                )
+                with request:
+                    if on_text is None:
+                        content, usage = await self._create(kwargs)
+                    else:
+                        content, usage = await self._create_stream(kwargs, forward)
+            except openai.RateLimitError as e:
+                last_error = e
+                retry_after = parse_retry_after(e.response.headers)
+                limiter.release(ok=False, throttled=True, retry_after=retry_after)
+                if retry_after is not None:
+                    backoff = 0.0  # acquire() waits out Retry-After
+            except openai.InternalServerError as e:
+                last_error = e
+                limiter.release(ok=False, server_error=True)
             except openai.APITimeoutError as e:
                 last_error = e
-                if attempt < max_retries - 1:
-                    import time
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                continue
+                limiter.release(ok=False, server_error=True)
             except openai.APIConnectionError as e:
                 last_error = e
-                if attempt < max_retries - 1:
-                    import time
-                    time.sleep(2 ** attempt)
-                continue
+                limiter.release(ok=False)
+            except BaseException:
+                limiter.release(ok=False)
+                raise
+            else:
+                limiter.release(
+                    estimated_tokens=estimated,
+                    used_tokens=usage["input_tokens"] + usage["output_tokens"] if usage else None,
+                )
+                if usage:
+                    request.set(**usage)
+                return ModelResponse(
+                    content=content,
+                    model=self.model_id,
+                    usage=usage
+                )
+            
+            if streamed:
+                raise last_error
+            if attempt < max_retries - 1 and backoff:
+                with tracing.span("model.backoff", "model", model=self.model_id, attempt=attempt + 1):
+                    await asyncio.sleep(backoff)
         
         # If all retries failed, raise the last error
         raise last_error
+
+    async def _create(self, kwargs: dict) -> tuple[str, Optional[dict]]:
+        """One non-streaming request; returns (content, usage)."""
+        response = await self._async_client().chat.completions.create(**kwargs)
+        
+        # Handle usage data
+        usage = usage_dict(response.usage) if response.usage else None
+        return response.choices[0].message.content, usage
+
+    async def _create_stream(
+        self,
+        kwargs: dict,
+        on_text: TextCallback,
+    ) -> tuple[str, Optional[dict]]:
+        """One streaming request; returns (content, usage) after the last chunk."""
+        stream = await self._async_client().chat.completions.create(
+            **kwargs,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        parts = []
+        usage = None
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                text = chunk.choices[0].delta.content
+                parts.append(text)
+                on_text(text)
+            # Usage arrives on the final chunk (which has no choices)
+            if chunk.usage:
+                usage = usage_dict(chunk.usage)
+        return "".join(parts), usage
     
     @property
     def name(self) -> str:
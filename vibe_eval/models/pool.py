@@ -0,0 +1,140 @@
+"""
+Process-wide HTTP connection pool for model adapters.
+
+Every adapter used to build its own openai.OpenAI client, so each
+get_model() call opened fresh TCP/TLS connections and nothing could run
+concurrently. Adapters now share one pooled httpx.AsyncClient with
+keep-alive (and HTTP/2 when the optional h2 package is installed).
+
+httpx async clients are bound to the event loop that first uses them, so
+the pool keeps one client per loop. Synchronous callers are served by a
+single background event loop thread (see run_sync), which means all sync
+traffic in the process shares one pool as well. Coroutines submitted
+from other threads see the submitter's context variables, so spans they
+record stay on the caller's trace track.
+"""
+
+import asyncio
+import contextvars
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Coroutine, Optional, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+# Sized for hundreds of concurrent agent sessions against a handful of hosts
+POOL_LIMITS = httpx.Limits(
+    max_connections=256,
+    max_keepalive_connections=64,
+    keepalive_expiry=60.0,
+)
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_clients_lock = threading.Lock()
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (pip install vibe-code-bench[http2])."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def shared_async_client() -> httpx.AsyncClient:
+    """
+    Return the pooled async HTTP client for the running event loop.
+
+    Must be called from inside a coroutine.
+    """
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=POOL_LIMITS,
+                http2=http2_available(),
+                # Per-request timeouts are set by the OpenAI client
+                timeout=None,
+            )
+            _clients[loop] = client
+        return client
+
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    """Start the background event loop thread on first use."""
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="vibe-http-loop", daemon=True
+            )
+            thread.start()
+            _loop, _loop_thread = loop, thread
+        return _loop
+
+
+def submit(coro: Coroutine[None, None, T]) -> "Future[T]":
+    """Schedule a coroutine on the shared background loop."""
+    loop = _ensure_loop()
+    if threading.current_thread() is _loop_thread:
+        raise RuntimeError("Blocking on the shared HTTP loop from inside it; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(_in_context(contextvars.copy_context(), coro), loop)
+
+
+async def _in_context(context: contextvars.Context, coro: Coroutine[None, None, T]) -> T:
+    """Await coro with the submitting thread's context variables (e.g. its trace track)."""
+    for var, value in context.items():
+        var.set(value)  # Only affects this task's own copy of the context
+    return await coro
+
+
+def run_sync(coro: Coroutine[None, None, T]) -> T:
+    """
+    Run a coroutine on the shared background loop and wait for the result.
+
+    This is the bridge that lets synchronous callers (AgentLoop, judges)
+    use async adapters. It may be called from any thread except the
+    background loop itself.
+    """
+    return submit(coro).result()
+
+
+async def aclose_shared_client() -> None:
+    """Close the pooled client belonging to the running event loop."""
+    with _clients_lock:
+        client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def close_shared_clients() -> None:
+    """
+    Close the pool used by synchronous callers and stop its loop.
+
+    Pools owned by other event loops are closed with aclose_shared_client()
+    from inside those loops, or are released when the loop is discarded.
+    """
+    global _loop, _loop_thread
+    with _loop_lock:
+        loop, thread = _loop, _loop_thread
+        _loop, _loop_thread = None, None
+    if loop is None:
+        return
+    asyncio.run_coroutine_threadsafe(aclose_shared_client(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join()
+    loop.close()
+
@@ -0,0 +1,322 @@
+"""
+Client-side rate limiting and adaptive concurrency per provider.
+
+All model and judge adapters in the process share one RateLimiter per
+provider (or per model, if a model has its own limits). Each limiter
+combines:
+
+- Token buckets for requests/min and tokens/min. Prompt tokens are
+  estimated up front; the difference to the real usage is charged after
+  the response so the bucket tracks actual consumption.
+- A Retry-After gate: when the provider returns 429 with Retry-After,
+  every request for that provider waits until the deadline passes.
+- AIMD concurrency: the in-flight limit starts unbounded, halves on 429s,
+  5xx and timeouts, and grows by roughly one slot per window of successful
+  requests. This lets the runner find the real provider ceiling instead of
+  relying on a hand-tuned --jobs value.
+
+Limiters are used from several event loops (the shared sync loop plus any
+caller-owned loops), so state is guarded by a threading lock and waits use
+asyncio.sleep rather than loop-bound primitives.
+"""
+
+import asyncio
+import email.utils
+import threading
+import time
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from .base import provider_key
+
+# Poll interval while waiting for a concurrency slot
+_SLOT_POLL_SECONDS = 0.05
+
+
+@dataclass
+class RateLimitConfig:
+    """Limits for one provider or model. None means unlimited."""
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    max_concurrency: Optional[int] = None
+    min_concurrency: int = 1
+
+
+@dataclass
+class RateLimitStats:
+    """Counters reported in the results file."""
+    requests: int = 0
+    throttled: int = 0          # 429 responses
+    server_errors: int = 0      # 5xx responses and timeouts
+    wait_seconds: float = 0.0   # Time spent waiting on buckets, Retry-After or slots
+    concurrency_limit: Optional[float] = None
+    peak_in_flight: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "server_errors": self.server_errors,
+            "wait_seconds": round(self.wait_seconds, 2),
+            "concurrency_limit": (
+                round(self.concurrency_limit, 1) if self.concurrency_limit is not None else None
+            ),
+            "peak_in_flight": self.peak_in_flight,
+        }
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations.
+
+    reserve() always succeeds and returns how long the caller must wait
+    before using the reservation. Letting the bucket go negative keeps the
+    limiter fair under contention without a queue.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take amount tokens; return seconds until they are actually available."""
+        self._refill()
+        self.tokens -= amount
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def refund(self, amount: float):
+        """Return unused tokens (or charge more, if amount is negative)."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AdaptiveConcurrency:
+    """Additive-increase / multiplicative-decrease limit on in-flight requests."""
+
+    def __init__(
+        self,
+        max_limit: Optional[int] = None,
+        min_limit: int = 1,
+        decrease_factor: float = 0.5,
+        cooldown_seconds: float = 1.0,
+    ):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.decrease_factor = decrease_factor
+        self.cooldown_seconds = cooldown_seconds
+        # None until the first congestion signal; max_limit caps it from the start
+        self.limit: Optional[float] = float(max_limit) if max_limit else None
+        self.in_flight = 0
+        self._last_decrease = 0.0
+
+    def try_acquire(self) -> bool:
+        if self.limit is not None and self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+
+    def on_success(self):
+        """Additive increase: about +1 slot per `limit` successful requests."""
+        if self.limit is None:
+            return
+        self.limit += 1.0 / self.limit
+        if self.max_limit is not None:
+            self.limit = min(self.limit, float(self.max_limit))
+
+    def on_congestion(self):
+        """Multiplicative decrease, at most once per cooldown window."""
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown_seconds:
+            return
+        self._last_decrease = now
+        current = float(self.in_flight)
+        if self.limit is not None:
+            current = min(current, self.limit)
+        self.limit = max(float(self.min_limit), current * self.decrease_factor)
+
+
+class RateLimiter:
+    """Request/token buckets, Retry-After gate and AIMD limit for one key."""
+
+    def __init__(self, name: str, config: Optional[RateLimitConfig] = None):
+        self.name = name
+        self.config = config or RateLimitConfig()
+        self.requests = (
+            TokenBucket(self.config.requests_per_minute)
+            if self.config.requests_per_minute else None
+        )
+        self.tokens = (
+            TokenBucket(self.config.tokens_per_minute)
+            if self.config.tokens_per_minute else None
+        )
+        self.concurrency = AdaptiveConcurrency(
+            max_limit=self.config.max_concurrency,
+            min_limit=self.config.min_concurrency,
+        )
+        self.blocked_until = 0.0
+        self.stats = RateLimitStats(concurrency_limit=self.concurrency.limit)
+        self._lock = threading.Lock()
+
+    async def acquire(self, estimated_tokens: int = 0):
+        """
+        Wait until a request may be sent.
+
+        Args:
+            estimated_tokens: Expected tokens for the request (charged to tokens/min)
+        """
+        start = time.monotonic()
+
+        # Provider asked us to back off
+        while True:
+            with self._lock:
+                delay = self.blocked_until - time.monotonic()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+
+        with self._lock:
+            delay = 0.0
+            if self.requests:
+                delay = max(delay, self.requests.reserve(1))
+            if self.tokens and estimated_tokens:
+                delay = max(delay, self.tokens.reserve(estimated_tokens))
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        while True:
+            with self._lock:
+                if self.concurrency.try_acquire():
+                    self.stats.requests += 1
+                    self.stats.peak_in_flight = max(
+                        self.stats.peak_in_flight, self.concurrency.in_flight
+                    )
+                    self.stats.wait_seconds += time.monotonic() - start
+                    return
+            await asyncio.sleep(_SLOT_POLL_SECONDS)
+
+    def release(
+        self,
+        ok: bool = True,
+        throttled: bool = False,
+        server_error: bool = False,
+        estimated_tokens: int = 0,
+        used_tokens: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        """
+        Record the outcome of a request started with acquire().
+
+        Args:
+            ok: Request succeeded
+            throttled: Provider returned 429
+            server_error: Provider returned 5xx or timed out
+            estimated_tokens: The estimate passed to acquire()
+            used_tokens: Actual input + output tokens, if known
+            retry_after: Seconds from a Retry-After header
+        """
+        with self._lock:
+            if throttled or server_error:
+                self.concurrency.on_congestion()
+            if throttled:
+                self.stats.throttled += 1
+            if server_error:
+                self.stats.server_errors += 1
+            if ok:
+                self.concurrency.on_success()
+            self.concurrency.release()
+
+            if retry_after is not None and retry_after > 0:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+            if self.tokens and used_tokens is not None:
+                self.tokens.refund(estimated_tokens - used_tokens)
+            self.stats.concurrency_limit = self.concurrency.limit
+
+
+_configs: dict[str, RateLimitConfig] = {}
+_limiters: dict[str, RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def configure_rate_limits(configs: Mapping[str, RateLimitConfig]):
+    """
+    Set per-provider or per-model limits and reset all limiter state.
+
+    Keys are provider names ("anthropic") or full model IDs
+    ("anthropic/claude-opus-4.5"); a model entry wins over its provider.
+    """
+    with _registry_lock:
+        _configs.clear()
+        _configs.update({key.lower(): config for key, config in configs.items()})
+        _limiters.clear()
+
+
+def get_rate_limiter(model_id: str) -> RateLimiter:
+    """Return the limiter shared by every adapter for this model's provider."""
+    model = model_id.split("@", 1)[0].lower()
+    key = model if model in _configs else provider_key(model_id)
+    with _registry_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(key, _configs.get(key))
+            _limiters[key] = limiter
+        return limiter
+
+
+def rate_limit_stats() -> dict[str, dict]:
+    """Stats for every limiter that has seen traffic."""
+    with _registry_lock:
+        return {
+            key: limiter.stats.to_dict()
+            for key, limiter in _limiters.items()
+            if limiter.stats.requests
+        }
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Read a Retry-After delay in seconds from response headers.
+
+    Supports retry-after-ms, delta-seconds and HTTP-date forms.
+    """
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def estimate_tokens(messages: list[dict]) -> int:
+    """Rough prompt size (4 characters per token) for tokens/min reservations."""
+    total = 0
+    for m in messages:
+        content = m.get("content") or ""
+        if isinstance(content, list):  # Content parts (e.g. with cache_control)
+            total += sum(len(part.get("text", "")) for part in content)
+        else:
+            total += len(content)
+    return total // 4
@@ -0,0 +1,231 @@
+"""
+Streaming stage pipeline for the concurrent runner.
+
+Each stage has its own worker threads and a bounded input queue. Items
+flow through the stages in order as soon as the previous stage finishes
+with them, so slow network-bound work (agent sessions, judging) overlaps
+with CPU/browser-bound work (tests, validation). When a downstream queue
+is full, upstream workers block; that time is reported as backpressure.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+# Marks the end of input for one worker
+_STOP = object()
+
+
+@dataclass
+class StageStats:
+    """Throughput and backpressure statistics for one pipeline stage."""
+    name: str
+    workers: int
+    capacity: int
+    processed: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0      # Time spent inside the stage function
+    idle_seconds: float = 0.0      # Time workers waited for input
+    blocked_seconds: float = 0.0   # Time workers waited on a full downstream queue
+    max_queue_depth: int = 0
+    wall_seconds: float = 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of worker time spent doing work (0.0 - 1.0)."""
+        capacity = self.workers * self.wall_seconds
+        return self.busy_seconds / capacity if capacity > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "processed": self.processed,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 2),
+            "idle_seconds": round(self.idle_seconds, 2),
+            "blocked_seconds": round(self.blocked_seconds, 2),
+            "max_queue_depth": self.max_queue_depth,
+            "wall_seconds": round(self.wall_seconds, 2),
+            "utilization": round(self.utilization, 3),
+        }
+
+
+class Stage:
+    """
+    One pipeline stage.
+
+    The stage function receives an item and returns the item to pass on
+    (usually the same object, updated in place). If it raises, the error
+    is counted and the input item is forwarded unchanged so no work is lost.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        workers: int = 1,
+        capacity: Optional[int] = None,
+    ):
+        """
+        Initialize stage.
+
+        Args:
+            name: Stage name used in stats
+            func: Function applied to every item
+            workers: Number of worker threads
+            capacity: Max items waiting in the input queue (default 2 × workers)
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.capacity = capacity if capacity is not None else 2 * self.workers
+        self.stats = StageStats(name=name, workers=self.workers, capacity=self.capacity)
+        self.input: queue.Queue = queue.Queue(maxsize=self.capacity)
+        self._lock = threading.Lock()
+        self._remaining = self.workers
+
+    def _record(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                setattr(self.stats, key, getattr(self.stats, key) + value)
+            depth = self.input.qsize()
+            if depth > self.stats.max_queue_depth:
+                self.stats.max_queue_depth = depth
+
+    def _worker_done(self) -> bool:
+        """Mark one worker finished; True if it was the last one."""
+        with self._lock:
+            self._remaining -= 1
+            return self._remaining == 0
+
+
+class StagePipeline:
+    """
+    Runs items through a chain of stages with bounded queues between them.
+
+    Results are delivered on the calling thread, in completion order, via
+    the on_result callback and collected into the returned list.
+    """
+
+    def __init__(self, stages: list[Stage]):
+        """
+        Initialize pipeline.
+
+        Args:
+            stages: Stages in processing order (at least one)
+        """
+        if not stages:
+            raise ValueError("StagePipeline needs at least one stage")
+        self.stages = stages
+        self.wall_seconds = 0.0
+
+    def run(
+        self,
+        items: Iterable[Any],
+        on_result: Optional[Callable[[Any], None]] = None,
+    ) -> list[Any]:
+        """
+        Process all items through every stage.
+
+        Args:
+            items: Input items for the first stage
+            on_result: Called on the caller's thread for each finished item
+
+        Returns:
+            Finished items in completion order
+        """
+        start = time.time()
+        output: queue.Queue = queue.Queue()
+        threads = []
+
+        for index, stage in enumerate(self.stages):
+            downstream = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(stage, downstream, output),
+                    name=f"vibe-{stage.name}-{n}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        feeder = threading.Thread(
+            target=self._feed, args=(items, self.stages[0]), name="vibe-feed", daemon=True
+        )
+        feeder.start()
+
+        results = []
+        while True:
+            item = output.get()
+            if item is _STOP:
+                break
+            results.append(item)
+            if on_result:
+                on_result(item)
+
+        feeder.join()
+        for thread in threads:
+            thread.join()
+
+        self.wall_seconds = time.time() - start
+        for stage in self.stages:
+            stage.stats.wall_seconds = self.wall_seconds
+        return results
+
+    def stats(self) -> list[StageStats]:
+        """Per-stage statistics from the last run."""
+        return [stage.stats for stage in self.stages]
+
+    @staticmethod
+    def _feed(items: Iterable[Any], first: Stage):
+        for item in items:
+            first.input.put(item)
+        for _ in range(first.workers):
+            first.input.put(_STOP)
+
+    @staticmethod
+    def _work(stage: Stage, downstream: Optional[Stage], output: queue.Queue):
+        target = downstream.input if downstream else output
+        while True:
+            wait_start = time.time()
+            item = stage.input.get()
+            idle = time.time() - wait_start
+
+            if item is _STOP:
+                stage._record(idle_seconds=idle)
+                break
+
+            work_start = time.time()
+            errors = 0
+            try:
+                result = stage.func(item)
+            except Exception:
+                result = item
+                errors = 1
+            busy = time.time() - work_start
+
+            put_start = time.time()
+            target.put(result)
+            blocked = time.time() - put_start
+
+            stage._record(
+                processed=1,
+                errors=errors,
+                busy_seconds=busy,
+                idle_seconds=idle,
+                blocked_seconds=blocked,
+            )
+
+        # Last worker out propagates end-of-input downstream
+        if stage._worker_done():
+            if downstream:
+                for _ in range(downstream.workers):
+                    downstream.input.put(_STOP)
+            else:
+                output.put(_STOP)
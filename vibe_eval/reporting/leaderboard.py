@@ -11,6 +11,7 @@ from rich.panel import Panel
 from rich.text import Text
 
 from ..judge.absolute import AbsoluteScore
+from ..models.base import cached_input_rate
 from ..judge.comparative import ComparisonResult
 
 
@@ -25,6 +26,8 @@ class ModelMetrics:
     # V2: Separate judge cost tracking
     judge_tokens: int = 0
     judge_cost: float = 0.0
+    # Part of input_tokens served from the provider's prompt cache
+    cached_input_tokens: int = 0
 
     @property
     def total_tokens(self) -> int:
@@ -72,7 +75,10 @@ class ModelMetrics:
                     break
             if not matched:
                 input_rate, output_rate = pricing["default"]
-        cost = (self.input_tokens / 1_000_000) * input_rate
+        # Cache hits are billed at a discount to the uncached input price
+        uncached = self.input_tokens - self.cached_input_tokens
+        cost = (uncached / 1_000_000) * input_rate
+        cost += (self.cached_input_tokens / 1_000_000) * input_rate * cached_input_rate(model_name)
         cost += (self.output_tokens / 1_000_000) * output_rate
         return round(cost, 4)
 
@@ -22,19 +22,30 @@ import os
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 
-from .agent_loop import AgentLoop
+from . import tracing
+from .agent_loop import AgentLoop, AgentResult
+from .context import ContextPolicy
 from .models.base import get_model
+from .models.pool import close_shared_clients
+from .models.ratelimit import RateLimitConfig, configure_rate_limits, rate_limit_stats
 from .judge.absolute import AbsoluteJudge, AbsoluteScore, DimensionScore
 from .judge.comparative import ComparativeJudge, run_all_comparisons
+from .judge.cache import JudgeCache
 from .judge.multi_judge import MultiJudgeArbitrator, create_multi_judge
 from .reporting.leaderboard import EvalRun, CaseResult, print_leaderboard, ModelMetrics
+from .sandbox.browser import shutdown_browser_thread
 from .sandbox.executor import create_workspace
-from .sandbox.validator import ExecutionValidator
+from .sandbox.test_runner import TestRunResult
+from .sandbox.validator import ExecutionValidator, ExecutionReport
+from .sandbox.workspace_index import WorkspaceIndex
+from .sandbox.zygote import stop_shared_zygote
+from .pipeline import Stage, StagePipeline
+from .scheduler import ProviderLimiter
 
 
 @dataclass
@@ -47,6 +58,20 @@ class EvalCase:
     has_tests: bool = False  # V3: Whether tests.py exists
 
 
+@dataclass
+class PairResult:
+    """Outcome of one model on one case (pipelined mode)."""
+    case_name: str
+    model_id: str
+    workspace: Path
+    agent_result: Optional[AgentResult] = None
+    metrics: Optional[ModelMetrics] = None
+    test_result: Optional[TestRunResult] = None
+    execution_report: Optional[ExecutionReport] = None
+    score: Optional[AbsoluteScore] = None
+    error: Optional[str] = None
+
+
 def load_case(case_dir: Path) -> EvalCase:
     """
     Load an eval case from a directory.
@@ -131,6 +156,23 @@ class EvalRunner:
         run_functional_tests: bool = True,  # V3: Enable functional tests
         use_v3_scoring: bool = False,  # V3: Use new scoring system
         suite_mode: str = "full",
+        jobs: int = 1,
+        provider_limits: Optional[dict[str, int]] = None,
+        stage_workers: Optional[dict[str, int]] = None,
+        judge_timeout: Optional[float] = None,
+        judge_quorum: Optional[int] = None,
+        judge_cache: Optional[JudgeCache] = None,
+        rate_limits: Optional[dict[str, RateLimitConfig]] = None,
+        stream: bool = False,
+        context_policy: Optional[ContextPolicy] = None,
+        test_workers: int = 1,
+        settle_max_ms: int = 2000,
+        snapshot_pages: bool = False,
+        browser_service: bool = False,
+        browser_max_contexts: int = 8,
+        fork_server: bool = False,
+        parallel_commands: bool = False,
+        trace: bool = False,
     ):
         """
         Initialize eval runner.
@@ -147,6 +189,31 @@ class EvalRunner:
             run_comparisons: Run head-to-head comparisons (default False, O(n²))
             run_functional_tests: Run functional tests if available (V3)
             use_v3_scoring: Use V3 scoring aggregator (default False for compatibility)
+            suite_mode: "full" or "fast"
+            jobs: Number of (case, model) pairs evaluated concurrently (1 = serial)
+            provider_limits: Max concurrent agent sessions per provider
+            stage_workers: Worker overrides per pipeline stage
+                           (generate, test, validate, score) when jobs > 1
+            judge_timeout: Seconds to wait for each multi-judge judge
+            judge_quorum: Stop multi-judge scoring once this many judges agree
+            judge_cache: Persistent judge result cache (None = always call the judge)
+            rate_limits: Requests/tokens per minute by provider or model ID,
+                         shared by all agent and judge calls
+            stream: Stream agent replies and execute actions as they complete
+            context_policy: Compact agent conversations (None = send full transcripts)
+            test_workers: Browser lanes / processes per functional test run
+            settle_max_ms: Longest wait for an HTML test page to go quiet
+            snapshot_pages: Load each HTML app once and run read-only tests
+                            against its restored snapshot
+            browser_service: Share one Chromium (over CDP) between the
+                             validator, every test lane and worker process
+            browser_max_contexts: Browser contexts open at once when sharing
+            fork_server: Fork agents' `python ...` commands from a warm
+                         interpreter (see sandbox/zygote.py)
+            parallel_commands: Run each agent turn's read-only commands
+                               concurrently (see sandbox/async_executor.py)
+            trace: Record trace spans and save them as a Chrome trace
+                   next to the results (see tracing.py)
         """
         self.models = models
         self.cases_dir = Path(cases_dir)
@@ -159,15 +226,34 @@ class EvalRunner:
         self.run_functional_tests = run_functional_tests
         self.suite_mode = suite_mode
         self.use_v3_scoring = use_v3_scoring or self.suite_mode == "fast"
+        self.jobs = max(1, jobs)
+        self.provider_limits = provider_limits
+        self.stage_workers = stage_workers
+        self.pipeline_stats = []
+        self.stream = stream
+        self.context_policy = context_policy
+        self.fork_server = fork_server
+        self.parallel_commands = parallel_commands
+        self.trace = trace
+        self.browser_service = None
+        if browser_service and (validate_execution or run_functional_tests):
+            from .sandbox.browser_service import BrowserService
+            self.browser_service = BrowserService(max_contexts=browser_max_contexts)
+        configure_rate_limits(rate_limits or {})
 
         # Initialize judges
+        self.judge_cache = judge_cache
         self.multi_judge_enabled = multi_judge
         if multi_judge:
-            self.multi_judge = create_multi_judge()
+            self.multi_judge = create_multi_judge(
+                judge_timeout=judge_timeout,
+                quorum=judge_quorum,
+                cache=judge_cache,
+            )
             self.absolute_judge = None
         else:
             self.multi_judge = None
-            self.absolute_judge = AbsoluteJudge(judge_model=judge_model)
+            self.absolute_judge = AbsoluteJudge(judge_model=judge_model, cache=judge_cache)
 
         # Only init comparative judge if needed
         self.comparative_judge = ComparativeJudge(judge_model=judge_model) if run_comparisons else None
@@ -183,9 +269,15 @@ class EvalRunner:
         # V3: Functional test runner
         self.test_runner = None
         if run_functional_tests:
+            from .sandbox.settle import SettleConfig
             from .sandbox.test_runner import FunctionalTestRunner
             test_timeout = 15 if self.suite_mode == "fast" else 30
-            self.test_runner = FunctionalTestRunner(timeout=test_timeout)
+            self.test_runner = FunctionalTestRunner(
+                timeout=test_timeout,
+                workers=test_workers,
+                settle=SettleConfig(max_ms=settle_max_ms),
+                snapshot=snapshot_pages,
+            )
 
         # Fast suite allowlist lookup (if enabled)
         self._fast_suite_allowlist = None
@@ -210,8 +302,23 @@ class EvalRunner:
         self.console.print(f"Cases: {len(self.cases)}")
         self.console.print(f"Timeout: {self.timeout_minutes} min/case/model")
         self.console.print(f"Functional tests: {'enabled' if self.run_functional_tests else 'disabled'}")
-        self.console.print(f"Suite: {self.suite_mode}\n")
-        
+        self.console.print(f"Suite: {self.suite_mode}")
+        self.console.print(f"Jobs: {self.jobs}\n")
+
+        if self.trace:
+            tracing.start_tracing()
+
+        if self.browser_service:
+            try:
+                self.browser_service.start()
+            except Exception as e:
+                self.console.print(f"[yellow]Browser service unavailable, using per-lane browsers: {e}[/yellow]\n")
+                self.browser_service = None
+
+        if self.jobs > 1:
+            case_results = self._run_concurrent(timestamp)
+            return self._finish_run(timestamp, case_results)
+
         for case in self.cases:
             tier_label = f"[T{case.tier}]" if case.tier > 1 else ""
             self.console.print(f"\n[bold]Case: {case.name} {tier_label}[/bold]")
@@ -226,67 +333,31 @@ class EvalRunner:
             for model_id in self.models:
                 self.console.print(f"  Running {model_id}...", end=" ")
                 
-                # Create workspace
-                workspace = self.results_dir / timestamp.strftime("%Y%m%d_%H%M%S") / case.name / model_id.replace("/", "_").replace(".", "_")
-                workspace.mkdir(parents=True, exist_ok=True)
-                
+                workspace = self._workspace_for(timestamp, case, model_id)
+
                 # Run agent loop
                 try:
-                    model = get_model(model_id)
-                    agent = AgentLoop(
-                        model=model,
-                        spec=case.spec,
-                        timeout_minutes=self.timeout_minutes,
-                        workspace=workspace,
-                        enable_tools=True  # V3: Enable extended tools
-                    )
-                    result = agent.run()
+                    with tracing.track(f"{case.name}/{model_id}"):
+                        result, model_metrics = self._run_agent(case, model_id, workspace)
                     agent_results[model_id] = result
-                    
-                    if result.error:
-                        status = f"[red]error: {result.error}[/red]"
-                    elif result.completed:
-                        status = "[green]✓[/green]"
-                    else:
-                        status = "[yellow]timeout[/yellow]"
-                        
-                    self.console.print(
-                        f"{status} "
-                        f"({result.turns} turns, {result.elapsed_seconds:.0f}s, "
-                        f"{len(result.files_created)} files)"
-                    )
-                    
+                    self.console.print(self._agent_status(result))
                     workspaces[model_id] = result.workspace
-                    
-                    # Capture metrics (V3: include agent metrics)
-                    metrics[model_id] = ModelMetrics(
-                        time_seconds=result.elapsed_seconds,
-                        turns=result.turns,
-                        files_created=len(result.files_created),
-                        input_tokens=result.total_input_tokens,
-                        output_tokens=result.total_output_tokens
-                    )
-                    
+                    metrics[model_id] = model_metrics
+
                 except Exception as e:
                     self.console.print(f"[red]✗ Error: {e}[/red]")
                     workspaces[model_id] = workspace
+
+                # One scan of the finished workspace serves every later stage
+                WorkspaceIndex.scan(workspaces[model_id])
             
             # V3: Run functional tests (if available)
             if self.run_functional_tests and case.has_tests:
                 self.console.print("  Running tests...", end=" ")
-                test_file = self.cases_dir / case.name / "tests.py"
-                
+
                 for model_id, workspace in workspaces.items():
                     try:
-                        allowlist = None
-                        if self._fast_suite_allowlist:
-                            allowlist = self._fast_suite_allowlist(case.name)
-                        test_result = self.test_runner.run_tests(
-                            workspace,
-                            test_file,
-                            allowed_tests=allowlist
-                        )
-                        test_results[model_id] = test_result
+                        test_results[model_id] = self._run_case_tests(case, workspace)
                     except Exception as e:
                         self.console.print(f"\n    [yellow]{model_id}: test error - {e}[/yellow]", end="")
                 
@@ -303,7 +374,10 @@ class EvalRunner:
             if self.validator:
                 self.console.print("  Validating execution...", end=" ")
                 for model_id, workspace in workspaces.items():
-                    exec_report = self.validator.validate(workspace)
+                    tr = test_results.get(model_id)
+                    exec_report = tr.execution_report if tr is not None else None
+                    if exec_report is None:
+                        exec_report = self.validator.validate(workspace)
                     execution_reports[model_id] = exec_report
                     if not exec_report.executed:
                         self.console.print(f"\n    [yellow]{model_id}: execution failed[/yellow]", end="")
@@ -327,27 +401,19 @@ class EvalRunner:
             
             self.console.print("[green]done[/green]")
 
-            # Head-to-head comparisons (opt-in)
-            comparisons = []
-            if self.run_comparisons and len(workspaces) > 1:
-                self.console.print("  Comparing...", end=" ")
-                comparisons = run_all_comparisons(
-                    spec=case.spec,
-                    workspaces=workspaces,
-                    judge=self.comparative_judge
-                )
-                self.console.print("[green]done[/green]")
-
             # Store case result
             case_results[case.name] = CaseResult(
                 case_name=case.name,
                 absolute_scores=absolute_scores,
-                comparisons=comparisons,
+                comparisons=self._run_comparisons(case, workspaces),
                 model_metrics=metrics,
                 winner=None
             )
-        
-        # Compile final results
+
+        return self._finish_run(timestamp, case_results)
+
+    def _finish_run(self, timestamp: datetime, case_results: dict) -> EvalRun:
+        """Compile, save and return the EvalRun, then release shared resources."""
         eval_run = EvalRun(
             timestamp=timestamp,
             models=self.models,
@@ -357,14 +423,278 @@ class EvalRunner:
             suite_mode=self.suite_mode,
         )
 
+        if self.judge_cache:
+            stats = self.judge_cache.stats
+            self.console.print(
+                f"\n[dim]Judge cache: {stats.hits} hits, {stats.misses} misses "
+                f"({stats.saved_input_tokens + stats.saved_output_tokens:,} tokens saved)[/dim]"
+            )
+
         # Save results
         self._save_results(eval_run)
+        if self.trace:
+            self._save_trace(timestamp)
 
         # Cleanup
         self._cleanup()
 
         return eval_run
 
+    def _save_trace(self, timestamp: datetime):
+        """Stop tracing and write the run's spans as a Chrome trace."""
+        tracer = tracing.stop_tracing()
+        if tracer is None:
+            return
+        path = tracer.export(self.results_dir / f"{timestamp.strftime('%Y%m%d_%H%M%S')}_trace.json")
+        self.console.print(f"[dim]Trace: {path} ({len(tracer.spans()):,} spans; open in ui.perfetto.dev)[/dim]")
+
+    def _workspace_for(self, timestamp: datetime, case: EvalCase, model_id: str) -> Path:
+        """Create the workspace directory for one model on one case."""
+        workspace = self.results_dir / timestamp.strftime("%Y%m%d_%H%M%S") / case.name / model_id.replace("/", "_").replace(".", "_")
+        workspace.mkdir(parents=True, exist_ok=True)
+        return workspace
+
+    def _run_agent(self, case: EvalCase, model_id: str, workspace: Path) -> tuple[AgentResult, ModelMetrics]:
+        """Run the agent session for one model on one case."""
+        model = get_model(model_id)
+        agent = AgentLoop(
+            model=model,
+            spec=case.spec,
+            timeout_minutes=self.timeout_minutes,
+            workspace=workspace,
+            enable_tools=True,  # V3: Enable extended tools
+            stream=self.stream,
+            context_policy=self.context_policy,
+            fork_server=self.fork_server,
+            parallel_commands=self.parallel_commands,
+        )
+        result = agent.run()
+
+        # Capture metrics (V3: include agent metrics)
+        model_metrics = ModelMetrics(
+            time_seconds=result.elapsed_seconds,
+            turns=result.turns,
+            files_created=len(result.files_created),
+            input_tokens=result.total_input_tokens,
+            output_tokens=result.total_output_tokens,
+            cached_input_tokens=result.total_cached_input_tokens,
+        )
+        return result, model_metrics
+
+    @staticmethod
+    def _agent_status(result: AgentResult) -> str:
+        """Format the one-line status of a finished agent session."""
+        if result.error:
+            status = f"[red]error: {result.error}[/red]"
+        elif result.completed:
+            status = "[green]✓[/green]"
+        else:
+            status = "[yellow]timeout[/yellow]"
+
+        return (
+            f"{status} "
+            f"({result.turns} turns, {result.elapsed_seconds:.0f}s, "
+            f"{len(result.files_created)} files)"
+        )
+
+    def _run_case_tests(self, case: EvalCase, workspace: Path) -> TestRunResult:
+        """Run the case's functional tests against a workspace."""
+        allowlist = None
+        if self._fast_suite_allowlist:
+            allowlist = self._fast_suite_allowlist(case.name)
+        return self.test_runner.run_tests(
+            workspace,
+            self.cases_dir / case.name / "tests.py",
+            allowed_tests=allowlist,
+            validator=self.validator,  # One launch serves tests and validation
+        )
+
+    def _run_comparisons(self, case: EvalCase, workspaces: dict) -> list:
+        """Head-to-head comparisons (opt-in)."""
+        if not (self.run_comparisons and len(workspaces) > 1):
+            return []
+        self.console.print(f"  Comparing {case.name}...", end=" ")
+        comparisons = run_all_comparisons(
+            spec=case.spec,
+            workspaces=workspaces,
+            judge=self.comparative_judge
+        )
+        self.console.print("[green]done[/green]")
+        return comparisons
+
+    def _run_concurrent(self, timestamp: datetime) -> dict[str, CaseResult]:
+        """
+        Evaluate all (case, model) pairs through a streaming stage pipeline.
+
+        generate → test → validate → score: each finished workspace moves
+        straight on to the next stage, so agent sessions for later pairs
+        overlap with tests and judging of earlier ones. Agent sessions
+        additionally hold a per-provider slot. Results are regrouped into
+        per-case CaseResults in model order.
+        """
+        limiter = ProviderLimiter(self.provider_limits)
+        cases = {case.name: case for case in self.cases}
+        workers = self._stage_workers()
+
+        def traced(name: str, stage: Callable[[PairResult], PairResult]):
+            """Run a stage on its pair's trace track, as a "stage.<name>" span."""
+            def run(pair: PairResult) -> PairResult:
+                with tracing.track(f"{pair.case_name}/{pair.model_id}"), tracing.span(f"stage.{name}", "runner"):
+                    return stage(pair)
+            return run
+
+        def generate(pair: PairResult) -> PairResult:
+            case = cases[pair.case_name]
+            pair.workspace = self._workspace_for(timestamp, case, pair.model_id)
+            try:
+                with limiter.slot(pair.model_id):
+                    pair.agent_result, pair.metrics = self._run_agent(case, pair.model_id, pair.workspace)
+                pair.workspace = pair.agent_result.workspace
+            except Exception as e:
+                pair.error = str(e)
+            # One scan of the finished workspace serves every later stage
+            WorkspaceIndex.scan(pair.workspace)
+            return pair
+
+        def test(pair: PairResult) -> PairResult:
+            case = cases[pair.case_name]
+            if self.run_functional_tests and case.has_tests:
+                try:
+                    pair.test_result = self._run_case_tests(case, pair.workspace)
+                except Exception as e:
+                    pair.error = pair.error or f"tests: {e}"
+            return pair
+
+        def validate(pair: PairResult) -> PairResult:
+            if pair.test_result is not None:
+                pair.execution_report = pair.test_result.execution_report
+            if self.validator and pair.execution_report is None:
+                pair.execution_report = self.validator.validate(pair.workspace)
+            return pair
+
+        def score(pair: PairResult) -> PairResult:
+            try:
+                self._score_pair(cases[pair.case_name], pair)
+            except Exception as e:
+                pair.error = pair.error or f"scoring: {e}"
+            return pair
+
+        pipeline = StagePipeline([
+            Stage("generate", traced("generate", generate), workers=workers["generate"]),
+            Stage("test", traced("test", test), workers=workers["test"]),
+            Stage("validate", traced("validate", validate), workers=workers["validate"]),
+            Stage("score", traced("score", score), workers=workers["score"]),
+        ])
+
+        pairs = [
+            PairResult(case_name=case.name, model_id=model_id, workspace=Path())
+            for case in self.cases
+            for model_id in self.models
+        ]
+        done = 0
+
+        def on_result(pair: PairResult):
+            nonlocal done
+            done += 1
+            self._print_pair(pair, done, len(pairs))
+
+        pipeline.run(pairs, on_result=on_result)
+        self.pipeline_stats = pipeline.stats()
+        self._print_pipeline_stats(pipeline)
+
+        by_case: dict[str, dict[str, PairResult]] = {case.name: {} for case in self.cases}
+        for pair in pairs:
+            by_case[pair.case_name][pair.model_id] = pair
+
+        case_results = {}
+        for case in self.cases:
+            case_pairs = [by_case[case.name][m] for m in self.models]
+            workspaces = {p.model_id: p.workspace for p in case_pairs}
+            case_results[case.name] = CaseResult(
+                case_name=case.name,
+                absolute_scores={p.model_id: p.score for p in case_pairs if p.score is not None},
+                comparisons=self._run_comparisons(case, workspaces),
+                model_metrics={p.model_id: p.metrics for p in case_pairs if p.metrics is not None},
+                winner=None
+            )
+        return case_results
+
+    def _stage_workers(self) -> dict[str, int]:
+        """Worker count per pipeline stage (overrides from stage_workers)."""
+        workers = {
+            "generate": self.jobs,
+            # Browser work is serialized on one thread; extra workers help Python cases
+            "test": 2,
+            "validate": 2,
+            # Judging is network-bound like generation
+            "score": max(1, min(self.jobs, 4)),
+        }
+        workers.update(self.stage_workers or {})
+        return workers
+
+    def _print_pipeline_stats(self, pipeline: StagePipeline):
+        """Print per-stage throughput and backpressure."""
+        from rich.table import Table
+
+        table = Table(title=f"Pipeline ({pipeline.wall_seconds:.0f}s wall)", show_header=True, header_style="bold")
+        table.add_column("Stage", style="cyan")
+        table.add_column("Workers", justify="right")
+        table.add_column("Items", justify="right")
+        table.add_column("Busy", justify="right")
+        table.add_column("Util", justify="right")
+        table.add_column("Blocked", justify="right")
+        table.add_column("Max Queue", justify="right")
+        for st in pipeline.stats():
+            table.add_row(
+                st.name,
+                str(st.workers),
+                str(st.processed),
+                f"{st.busy_seconds:.0f}s",
+                f"{st.utilization * 100:.0f}%",
+                f"{st.blocked_seconds:.0f}s",
+                f"{st.max_queue_depth}/{st.capacity}",
+            )
+        self.console.print()
+        self.console.print(table)
+
+    def _score_pair(self, case: EvalCase, pair: PairResult):
+        """Score a single pair with the configured scoring system."""
+        workspaces = {pair.model_id: pair.workspace}
+        absolute_scores = {}
+        metrics = {pair.model_id: pair.metrics} if pair.metrics else {}
+        execution_reports = {pair.model_id: pair.execution_report} if pair.execution_report else {}
+
+        if self.use_v3_scoring:
+            agent_results = {pair.model_id: pair.agent_result} if pair.agent_result else {}
+            test_results = {pair.model_id: pair.test_result} if pair.test_result else {}
+            self._score_v3(
+                case, workspaces, absolute_scores, metrics,
+                agent_results, test_results, execution_reports
+            )
+        else:
+            self._score_v2(
+                case, workspaces, absolute_scores, metrics,
+                execution_reports
+            )
+
+        pair.score = absolute_scores.get(pair.model_id)
+
+    def _print_pair(self, pair: PairResult, done: int, total: int):
+        """Print one progress line for a finished pair."""
+        parts = [f"  [{done}/{total}] {pair.case_name} / {pair.model_id}:"]
+        if pair.agent_result:
+            parts.append(self._agent_status(pair.agent_result))
+        elif pair.error:
+            parts.append(f"[red]✗ Error: {pair.error}[/red]")
+        tr = pair.test_result
+        if tr is not None and tr.total_tests > 0:
+            parts.append(f"tests {tr.passed}/{tr.total_tests}")
+        if pair.execution_report is not None and not pair.execution_report.executed:
+            parts.append("[yellow]execution failed[/yellow]")
+        if pair.score is not None:
+            parts.append(f"score {pair.score.total_score}")
+        self.console.print(" ".join(parts))
+
     def _score_v2(
         self,
         case: EvalCase,
@@ -526,6 +856,7 @@ class EvalRunner:
         """Clean up shared resources after evaluation run."""
         from .judge.absolute import clear_file_cache
         clear_file_cache()
+        WorkspaceIndex.forget()
 
         if self.validator:
             ExecutionValidator.cleanup()
@@ -534,6 +865,18 @@ class EvalRunner:
         if self.test_runner:
             from .sandbox.test_runner import FunctionalTestRunner
             FunctionalTestRunner.cleanup()
+
+        shutdown_browser_thread()
+        if self.fork_server:
+            stop_shared_zygote()
+        if self.browser_service:
+            health = self.browser_service.health()
+            self.console.print(
+                f"[dim]Browser service: {health['pages_served']} contexts served, "
+                f"{health['restarts']} restarts[/dim]"
+            )
+            self.browser_service.stop()
+        close_shared_clients()
     
     def _save_results(self, run: EvalRun):
         """Save results to JSON file."""
@@ -578,6 +921,7 @@ class EvalRunner:
                             "files_created": met.files_created,
                             "input_tokens": met.input_tokens,
                             "output_tokens": met.output_tokens,
+                            "cached_input_tokens": met.cached_input_tokens,
                             "judge_tokens": met.judge_tokens,
                             "judge_cost": met.judge_cost,
                         } for m, met in cr.model_metrics.items()
@@ -602,6 +946,14 @@ class EvalRunner:
             "absolute_averages": run.get_absolute_averages()
         }
 
+        if self.judge_cache:
+            data["judge_cache"] = self.judge_cache.stats.to_dict()
+        rate_limits = rate_limit_stats()
+        if rate_limits:
+            data["rate_limits"] = rate_limits
+        if self.pipeline_stats:
+            data["pipeline_stats"] = [st.to_dict() for st in self.pipeline_stats]
+
         if run.suite_mode == "fast":
             from .fast_suite import FAST_SUITE_TESTS
             data["fast_suite_tests"] = FAST_SUITE_TESTS
@@ -0,0 +1,206 @@
+"""
+=============================================================================
+SCRIPT NAME: async_executor.py
+=============================================================================
+
+asyncio sandbox executor that can run a turn's independent commands at
+the same time.
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+SandboxExecutor.run blocks its thread for the whole command, so an agent
+turn with a lint and a test command ran them one after the other, and
+every concurrent session needed a thread of its own. AsyncSandboxExecutor
+has the same rules and results (blocked package managers, bounded output
+capture, byte budget, timeouts killing the process group, fork server,
+rlimits) but its arun() is a coroutine built on
+asyncio.create_subprocess_shell, so many sessions can share one event
+loop.
+
+arun_many() runs a turn's commands and returns their results in the order
+the commands were given, whatever order they finish in. Running them
+concurrently is opt-in: plan_batches() puts consecutive commands that
+only read the workspace (test runners, linters, ls/cat/grep ...) in one
+batch, run together, while anything that may write - a script, a
+redirect, mv/rm, --fix - runs alone, after the commands before it.
+
+=============================================================================
+"""
+
+import asyncio
+import os
+import shlex
+from typing import Optional
+
+from .. import tracing
+from .capture import CHUNK_BYTES, EOF, OVER_BUDGET, TIMEOUT, BoundedCapture
+from .executor import ExecutionResult, SandboxExecutor, _describe
+from .zygote import ZygoteError, _kill_group, parse_python_command
+
+# Programs that only read the workspace
+READ_ONLY_PROGRAMS = {
+    "ls", "cat", "head", "tail", "wc", "grep", "find", "tree", "diff", "file", "stat", "echo", "pwd",
+    "pytest", "flake8", "pyflakes", "pylint", "mypy", "ruff", "pycodestyle",
+}
+
+# Modules that only read the workspace when run with `python -m`
+READ_ONLY_MODULES = {
+    "pytest", "unittest", "doctest", "py_compile", "compileall", "flake8", "pyflakes",
+    "pylint", "mypy", "ruff", "pycodestyle", "json.tool", "tabnanny",
+}
+
+# Arguments that turn a read-only tool into one that writes
+WRITING_ARGUMENTS = {"--fix", "--in-place", "--write", "-delete", "-exec", "-execdir", "-fprint"}
+
+# Most commands of one session running at once
+MAX_CONCURRENT = 4
+
+
+def is_read_only(command: str) -> bool:
+    """Whether command only reads the workspace (so may run alongside others)."""
+    if ">" in command:
+        return False  # Redirect
+    for part in command.replace("&&", "|").replace("||", "|").replace(";", "|").split("|"):
+        try:
+            argv = shlex.split(part)
+        except ValueError:
+            return False
+        if not argv:
+            continue
+        if WRITING_ARGUMENTS.intersection(argv):
+            return False
+        program = os.path.basename(argv[0])
+        if program in ("python", "python3"):
+            if len(argv) < 3 or argv[1] != "-m" or argv[2] not in READ_ONLY_MODULES:
+                return False
+        elif program not in READ_ONLY_PROGRAMS:
+            return False
+    return True
+
+
+def plan_batches(commands: list[str]) -> list[list[int]]:
+    """
+    Group command indexes into batches that may run concurrently.
+
+    Consecutive read-only commands share a batch; every other command is a
+    batch of its own. Batches run in order.
+    """
+    batches: list[list[int]] = []
+    for index, command in enumerate(commands):
+        if batches and is_read_only(command) and is_read_only(commands[batches[-1][0]]):
+            batches[-1].append(index)
+        else:
+            batches.append([index])
+    return batches
+
+
+class AsyncSandboxExecutor(SandboxExecutor):
+    """SandboxExecutor with coroutine command execution."""
+
+    def __init__(self, *args, max_concurrent: int = MAX_CONCURRENT, **kwargs):
+        """
+        Initialize async sandbox executor.
+
+        Args:
+            *args, **kwargs: As for SandboxExecutor
+            max_concurrent: Most commands of one arun_many() batch running at once
+        """
+        super().__init__(*args, **kwargs)
+        self.max_concurrent = max(1, max_concurrent)
+
+    async def arun(self, command: str) -> ExecutionResult:
+        """Run a command in the sandbox without blocking the event loop (see run())."""
+        with tracing.span("sandbox.command", "sandbox", command=command) as span:
+            result = await self._arun(command)
+            _describe(span, result)
+        return result
+
+    async def _arun(self, command: str) -> ExecutionResult:
+        """arun() without the trace span."""
+        blocked = self._blocked_result(command)
+        if blocked is not None:
+            return blocked
+        env = self._command_env()
+
+        if self.zygote is not None:
+            argv = parse_python_command(command)
+            if argv is not None:
+                try:
+                    return await asyncio.to_thread(self._run_forked, argv, env)
+                except ZygoteError:
+                    pass  # Fork server gone: fall back to the shell
+
+        try:
+            process = await asyncio.create_subprocess_shell(
+                self._shell_command(command),
+                cwd=self.workspace,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+                start_new_session=True,
+            )
+        except Exception as e:
+            return ExecutionResult(
+                success=False,
+                stdout="",
+                stderr=f"Execution error: {str(e)}",
+                return_code=-1,
+                timed_out=False
+            )
+
+        stdout, stderr = self._new_capture(), self._new_capture()
+        outcome = EOF
+
+        async def drain(stream: asyncio.StreamReader, capture: BoundedCapture):
+            nonlocal outcome
+            while True:
+                data = await stream.read(CHUNK_BYTES)
+                if not data:
+                    return
+                capture.feed(data)
+                if (
+                    self.max_output_bytes is not None
+                    and outcome == EOF
+                    and stdout.total_bytes + stderr.total_bytes > self.max_output_bytes
+                ):
+                    outcome = OVER_BUDGET
+                    _kill_group(process.pid)
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(drain(process.stdout, stdout), drain(process.stderr, stderr), process.wait()),
+                timeout=self.timeout,
+            )
+        except asyncio.TimeoutError:
+            outcome = TIMEOUT
+        finally:
+            if outcome != EOF or process.returncode is None:
+                _kill_group(process.pid)
+                await process.wait()
+        return self._result(outcome, process.returncode, stdout, stderr)
+
+    async def arun_many(self, commands: list[str], concurrent: bool = False) -> list[ExecutionResult]:
+        """
+        Run a turn's commands; results are in the order of commands.
+
+        Args:
+            commands: Shell commands
+            concurrent: Run read-only neighbours together (see plan_batches);
+                        False runs every command after the previous one
+        """
+        if not concurrent:
+            return [await self.arun(command) for command in commands]
+        results: list[Optional[ExecutionResult]] = [None] * len(commands)
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async def run_one(index: int):
+            async with semaphore:
+                with tracing.track(f"command {index + 1}"):  # Overlapping spans get their own rows
+                    results[index] = await self.arun(commands[index])
+
+        for batch in plan_batches(commands):
+            await asyncio.gather(*(run_one(index) for index in batch))
+        return results
+
@@ -0,0 +1,112 @@
+"""
+=============================================================================
+SCRIPT NAME: browser.py
+=============================================================================
+
+Thread affinity for the shared Playwright browsers.
+
+VERSION: 1.1
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+Playwright's sync API is bound to the thread that started it. The validator
+and the functional test runner keep class-level browser instances, so once
+the runner evaluates several (case, model) pairs concurrently every browser
+call has to happen on the same thread. This module owns that thread:
+callers submit work with run_on_browser_thread() and block for the result.
+
+CHANGES IN V1.1:
+- Numbered browser lanes. Lane 0 is the original browser thread; the
+  functional test runner shards tests across lanes 0..N-1, each with its
+  own thread (and its own Playwright instance, as the sync API requires).
+
+=============================================================================
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_executors: dict[int, ThreadPoolExecutor] = {}
+_lane_idents: dict[int, int] = {}  # lane -> thread ident
+_lock = threading.Lock()
+
+
+def _mark_browser_thread(lane: int):
+    """Record the identity of a lane's thread (executor initializer)."""
+    _lane_idents[lane] = threading.get_ident()
+
+
+def current_lane() -> Optional[int]:
+    """Return the browser lane the caller is running on, or None."""
+    ident = threading.get_ident()
+    for lane, lane_ident in list(_lane_idents.items()):
+        if lane_ident == ident:
+            return lane
+    return None
+
+
+def on_browser_thread() -> bool:
+    """Return True if the caller is running on any browser lane."""
+    return current_lane() is not None
+
+
+def submit_to_browser_lane(lane: int, func: Callable[..., T], *args, **kwargs) -> "Future[T]":
+    """
+    Schedule func on a browser lane's thread and return a Future.
+
+    Work submitted from the lane's own thread runs inline so nested browser
+    work cannot deadlock.
+    """
+    if current_lane() == lane:
+        future: Future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    with _lock:
+        executor = _executors.get(lane)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix=f"vibe-browser-{lane}",
+                initializer=_mark_browser_thread,
+                initargs=(lane,),
+            )
+            _executors[lane] = executor
+
+    return executor.submit(func, *args, **kwargs)
+
+
+def run_on_browser_lane(lane: int, func: Callable[..., T], *args, **kwargs) -> T:
+    """Run func on a browser lane's thread and return its result."""
+    return submit_to_browser_lane(lane, func, *args, **kwargs).result()
+
+
+def run_on_browser_thread(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run func on the dedicated browser thread (lane 0) and return its result.
+
+    Calls made from the browser thread itself run inline so nested
+    browser work (e.g. a test helper that validates a page) cannot deadlock.
+    Exceptions raised by func propagate to the caller.
+    """
+    return run_on_browser_lane(0, func, *args, **kwargs)
+
+
+def shutdown_browser_thread():
+    """
+    Stop every browser lane.
+
+    Call after the validator and test runner have closed their browsers.
+    """
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=True)
+    _lane_idents.clear()
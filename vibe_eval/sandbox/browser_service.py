@@ -0,0 +1,557 @@
+"""
+=============================================================================
+SCRIPT NAME: browser_service.py
+=============================================================================
+
+One Chromium per sweep, shared over CDP by every browser lane and process.
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+ExecutionValidator and FunctionalTestRunner each used to launch their own
+Chromium per browser lane, and a worker process would launch yet another.
+BrowserService launches one headless Chromium with a DevTools (CDP)
+endpoint and runs a small HTTP control server next to it:
+
+- GET  /health   Chromium liveness plus lease and recycle counters
+- POST /lease    Wait for a free context slot; returns the CDP endpoint
+- POST /release  Give the slot back
+
+Clients never launch a browser. launch_or_connect() returns a
+ServiceBrowser when VIBE_BROWSER_SERVICE is set (the runner sets it, so
+spawned workers inherit it). That browser connects to the endpoint with
+connect_over_cdp() and takes a lease for every context or page it opens.
+Closing the context releases the lease.
+
+The service keeps memory bounded:
+- Warm-up: Chromium is started and a blank page is opened and closed
+  before the first lease is handed out
+- max_contexts: at most this many contexts are open at once, across all
+  clients; further leases wait
+- recycle_after: after this many leases Chromium is restarted once the
+  open contexts drain, which releases leaked renderer memory
+- Health checks: a background thread probes /json/version and restarts
+  Chromium if it died; leases not released within lease_ttl are reclaimed
+
+USAGE:
+    service = BrowserService(max_contexts=8)
+    service.start()          # exports VIBE_BROWSER_SERVICE
+    ...                      # validators / test runners connect to it
+    service.stop()
+
+=============================================================================
+"""
+
+import itertools
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+# Control server address for clients (inherited by worker processes)
+SERVICE_ENV = "VIBE_BROWSER_SERVICE"
+
+DEVTOOLS_LINE = re.compile(r"DevTools listening on (ws://\S+)")
+
+
+def service_address() -> Optional[str]:
+    """Address of the running browser service, if any."""
+    return os.environ.get(SERVICE_ENV) or None
+
+
+def chromium_command(executable: str, user_data_dir: str) -> list[str]:
+    """Command line for a headless Chromium with a random CDP port."""
+    return [
+        executable,
+        "--headless=new",
+        "--remote-debugging-address=127.0.0.1",
+        "--remote-debugging-port=0",
+        f"--user-data-dir={user_data_dir}",
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--disable-dev-shm-usage",
+        "about:blank",
+    ]
+
+
+def playwright_chromium() -> str:
+    """Path of the Chromium build installed by `playwright install`."""
+    result: dict = {}
+
+    def find():
+        # Own thread: sync_playwright refuses to start inside a running event loop
+        try:
+            from playwright.sync_api import sync_playwright
+            with sync_playwright() as playwright:
+                result["path"] = playwright.chromium.executable_path
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=find)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise RuntimeError(f"Playwright Chromium not available: {result['error']}")
+    return result["path"]
+
+
+def default_launcher(user_data_dir: str) -> subprocess.Popen:
+    """Start Playwright's Chromium; the endpoint is announced on stderr."""
+    return subprocess.Popen(
+        chromium_command(playwright_chromium(), user_data_dir),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+
+@dataclass
+class _Lease:
+    id: str
+    generation: int
+    granted_at: float
+
+
+class BrowserService:
+    """Shared Chromium plus a lease server that bounds open contexts."""
+
+    def __init__(
+        self,
+        max_contexts: int = 8,
+        recycle_after: int = 500,
+        warm_pages: int = 1,
+        health_interval: float = 5.0,
+        lease_ttl: float = 300.0,
+        launch_timeout: float = 30.0,
+        launcher: Optional[Callable[[str], subprocess.Popen]] = None,
+    ):
+        """
+        Initialize (but do not start) the service.
+
+        Args:
+            max_contexts: Contexts open at once across all clients
+            recycle_after: Restart Chromium after this many leases (0 = never)
+            warm_pages: Blank pages opened and closed at each launch
+            health_interval: Seconds between Chromium liveness probes
+            lease_ttl: Seconds after which an unreleased lease is reclaimed
+            launch_timeout: Seconds to wait for Chromium's CDP endpoint
+            launcher: Starts Chromium given a user data dir (tests use a fake)
+        """
+        self.max_contexts = max(1, max_contexts)
+        self.recycle_after = recycle_after
+        self.warm_pages = warm_pages
+        self.health_interval = health_interval
+        self.lease_ttl = lease_ttl
+        self.launch_timeout = launch_timeout
+        self.launcher = launcher or default_launcher
+
+        self.endpoint: Optional[str] = None
+        self.generation = 0
+        self.restarts = 0
+        self.last_restart_reason: Optional[str] = None
+        self.pages_served = 0
+        self._pages_since_launch = 0
+        self._leases: dict[str, _Lease] = {}
+        self._lease_ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._process: Optional[subprocess.Popen] = None
+        self._user_data_dir: Optional[str] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def address(self) -> Optional[str]:
+        """Control server URL (set once started)."""
+        if self._server is None:
+            return None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, export: bool = True) -> str:
+        """
+        Launch and warm Chromium, then start serving leases.
+
+        Args:
+            export: Set VIBE_BROWSER_SERVICE so this process and its
+                    children connect to the service
+
+        Returns:
+            Control server address
+        """
+        with self._cond:
+            self._launch()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _ControlHandler)
+        self._server.daemon_threads = True
+        self._server.service = self
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, name="vibe-browser-service", daemon=True),
+            threading.Thread(target=self._health_loop, name="vibe-browser-health", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        if export:
+            os.environ[SERVICE_ENV] = self.address
+        return self.address
+
+    def stop(self):
+        """Stop serving and shut Chromium down."""
+        self._stopping.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        with self._cond:
+            self._terminate()
+            self._leases.clear()
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        if os.environ.get(SERVICE_ENV) == self.address:
+            del os.environ[SERVICE_ENV]
+
+    def health(self) -> dict:
+        """Liveness and counters, as served on /health."""
+        with self._cond:
+            return {
+                "healthy": self._probe(),
+                "endpoint": self.endpoint,
+                "generation": self.generation,
+                "active": len(self._leases),
+                "max_contexts": self.max_contexts,
+                "pages_served": self.pages_served,
+                "restarts": self.restarts,
+                "last_restart_reason": self.last_restart_reason,
+            }
+
+    def lease(self, timeout: float = 60.0) -> Optional[tuple[str, str]]:
+        """
+        Reserve a context slot.
+
+        Returns:
+            (lease id, CDP endpoint), or None if no slot freed up in time
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._stopping.is_set():
+                    return None
+                self._reap_expired()
+                if self._recycle_due():
+                    if not self._leases:
+                        self._restart("recycle")
+                        continue
+                elif len(self._leases) < self.max_contexts:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(min(remaining, 1.0, self.lease_ttl))
+
+            lease = _Lease(id=str(next(self._lease_ids)), generation=self.generation,
+                           granted_at=time.monotonic())
+            self._leases[lease.id] = lease
+            self.pages_served += 1
+            self._pages_since_launch += 1
+            return lease.id, self.endpoint
+
+    def release(self, lease_id: str):
+        """Free a context slot (unknown or reclaimed leases are ignored)."""
+        with self._cond:
+            if self._leases.pop(lease_id, None) is not None:
+                self._cond.notify_all()
+
+    def _recycle_due(self) -> bool:
+        return self.recycle_after > 0 and self._pages_since_launch >= self.recycle_after
+
+    def _reap_expired(self):
+        cutoff = time.monotonic() - self.lease_ttl
+        for lease_id in [i for i, lease in self._leases.items() if lease.granted_at < cutoff]:
+            del self._leases[lease_id]
+            self._cond.notify_all()
+
+    def _launch(self):
+        """Start Chromium, read its endpoint and warm it up (lock held)."""
+        self._user_data_dir = tempfile.mkdtemp(prefix="vibe-chromium-")
+        self._process = self.launcher(self._user_data_dir)
+        self.endpoint = _read_endpoint(self._process, self.launch_timeout)
+        self.generation += 1
+        self._pages_since_launch = 0
+        self._warm_up()
+
+    def _warm_up(self):
+        """Open and close blank pages so the first real context starts fast."""
+        base = _http_base(self.endpoint)
+        for _ in range(self.warm_pages):
+            request = urllib.request.Request(f"{base}/json/new?about:blank", method="PUT")
+            with urllib.request.urlopen(request, timeout=self.launch_timeout) as response:
+                target = json.loads(response.read())
+            urllib.request.urlopen(f"{base}/json/close/{target['id']}", timeout=5).close()
+
+    def _terminate(self):
+        """Stop Chromium and remove its profile (lock held)."""
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+            self._process = None
+        if self._user_data_dir:
+            shutil.rmtree(self._user_data_dir, ignore_errors=True)
+            self._user_data_dir = None
+        self.endpoint = None
+
+    def _restart(self, reason: str):
+        """Replace Chromium; outstanding leases belong to the dead one (lock held)."""
+        self._terminate()
+        self._leases.clear()
+        self.restarts += 1
+        self.last_restart_reason = reason
+        self._launch()
+        self._cond.notify_all()
+
+    def _probe(self) -> bool:
+        """True if Chromium is running and answering CDP HTTP requests."""
+        if self._process is None or self._process.poll() is not None or not self.endpoint:
+            return False
+        try:
+            urllib.request.urlopen(f"{_http_base(self.endpoint)}/json/version", timeout=2).close()
+        except (urllib.error.URLError, OSError):
+            return False
+        return True
+
+    def _health_loop(self):
+        while not self._stopping.wait(self.health_interval):
+            with self._cond:
+                if self._stopping.is_set():
+                    return
+                if not self._probe():
+                    try:
+                        self._restart("unhealthy")
+                    except Exception:
+                        pass  # Try again next interval; leases wait meanwhile
+                self._reap_expired()
+
+
+def _read_endpoint(process: subprocess.Popen, timeout: float) -> str:
+    """Wait for Chromium's 'DevTools listening on ws://...' line."""
+    found: dict = {}
+    ready = threading.Event()
+
+    def pump():
+        # Keep draining stderr for Chromium's lifetime so it never blocks on a full pipe
+        for line in process.stderr:
+            match = DEVTOOLS_LINE.search(line)
+            if match and not ready.is_set():
+                found["endpoint"] = match.group(1)
+                ready.set()
+        ready.set()
+
+    threading.Thread(target=pump, name="vibe-chromium-stderr", daemon=True).start()
+    if not ready.wait(timeout) or "endpoint" not in found:
+        process.kill()
+        raise RuntimeError("Chromium did not announce a DevTools endpoint")
+    return found["endpoint"]
+
+
+def _http_base(endpoint: str) -> str:
+    """http://host:port for a ws://host:port/devtools/... endpoint."""
+    return "http://" + endpoint.split("://", 1)[1].split("/", 1)[0]
+
+
+class _ControlHandler(BaseHTTPRequestHandler):
+    """JSON control API for BrowserService."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, self.server.service.health())
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        service = self.server.service
+        if self.path == "/lease":
+            try:
+                granted = service.lease(timeout=float(body.get("timeout", 60)))
+            except Exception as e:  # Chromium failed to (re)launch
+                self._reply(503, {"error": f"browser restart failed: {e}"})
+                return
+            if granted is None:
+                self._reply(503, {"error": "no browser context available"})
+            else:
+                self._reply(200, {"lease": granted[0], "endpoint": granted[1]})
+        elif self.path == "/release":
+            service.release(str(body.get("lease", "")))
+            self._reply(200, {})
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def _reply(self, status: int, payload: dict):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class ServiceClient:
+    """HTTP client for a BrowserService control server."""
+
+    def __init__(self, address: str, lease_timeout: float = 60.0):
+        self.address = address.rstrip("/")
+        self.lease_timeout = lease_timeout
+
+    def lease(self) -> tuple[str, str]:
+        """Reserve a context slot; raises RuntimeError if none frees up."""
+        try:
+            reply = self._post("/lease", {"timeout": self.lease_timeout},
+                               timeout=self.lease_timeout + 10)
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(f"Browser service unavailable: {e.read().decode(errors='replace')}") from e
+        return reply["lease"], reply["endpoint"]
+
+    def release(self, lease_id: str):
+        try:
+            self._post("/release", {"lease": lease_id}, timeout=10)
+        except (urllib.error.URLError, OSError):
+            pass  # Service gone or restarting; the lease is reclaimed there
+
+    def health(self) -> dict:
+        with urllib.request.urlopen(f"{self.address}/health", timeout=10) as response:
+            return json.loads(response.read())
+
+    def _post(self, path: str, payload: dict, timeout: float) -> dict:
+        request = urllib.request.Request(
+            f"{self.address}{path}",
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+
+
+class ServiceBrowser:
+    """
+    Browser-like handle backed by the shared service.
+
+    Supports what the validator and test runner use: new_context(),
+    new_page(), is_connected() and close(). Every context holds a lease
+    until it is closed.
+    """
+
+    def __init__(self, playwright, client: ServiceClient):
+        self._playwright = playwright
+        self._client = client
+        self._browser = None
+        self._endpoint: Optional[str] = None
+
+    def _connected(self, endpoint: str):
+        """CDP connection for endpoint; reconnects after a Chromium restart."""
+        if self._browser is None or self._endpoint != endpoint or not self._browser.is_connected():
+            if self._browser is not None:
+                try:
+                    self._browser.close()
+                except Exception:
+                    pass
+            self._browser = self._playwright.chromium.connect_over_cdp(endpoint)
+            self._endpoint = endpoint
+        return self._browser
+
+    def new_context(self, **kwargs):
+        lease_id, endpoint = self._client.lease()
+        try:
+            context = self._connected(endpoint).new_context(**kwargs)
+        except Exception:
+            self._client.release(lease_id)
+            raise
+        return _LeasedContext(context, lambda: self._client.release(lease_id))
+
+    def new_page(self, **kwargs):
+        context = self.new_context(**kwargs)
+        try:
+            return _OwningPage(context.new_page(), context)
+        except Exception:
+            context.close()
+            raise
+
+    def is_connected(self) -> bool:
+        return True  # Connections are (re)made per lease
+
+    def close(self):
+        if self._browser is not None:
+            try:
+                self._browser.close()  # Disconnects; Chromium belongs to the service
+            except Exception:
+                pass
+            self._browser = None
+
+
+class _LeasedContext:
+    """BrowserContext proxy that releases its lease when closed."""
+
+    def __init__(self, context, release: Callable[[], None]):
+        self._context = context
+        self._release = release
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+    def close(self):
+        try:
+            self._context.close()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class _OwningPage:
+    """Page proxy for new_page(): closing the page closes its context."""
+
+    def __init__(self, page, context: _LeasedContext):
+        self._page = page
+        self._context = context
+
+    def __getattr__(self, name):
+        return getattr(self._page, name)
+
+    def close(self):
+        try:
+            self._page.close()
+        finally:
+            self._context.close()
+
+
+def launch_or_connect(playwright):
+    """
+    Browser for the calling lane.
+
+    Connects to the browser service when one is running (see
+    VIBE_BROWSER_SERVICE), otherwise launches a local headless Chromium.
+    """
+    address = service_address()
+    if address:
+        return ServiceBrowser(playwright, ServiceClient(address))
+    return playwright.chromium.launch(headless=True)
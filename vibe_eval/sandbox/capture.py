@@ -0,0 +1,116 @@
+"""
+=============================================================================
+SCRIPT NAME: capture.py
+=============================================================================
+
+Streaming, bounded-memory capture of a command's stdout and stderr.
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+subprocess.run(capture_output=True) keeps everything a command prints in
+memory, so a generated program stuck in a logging loop could hold
+gigabytes before the executor cut the output to 10k characters. Here the
+pipes are read incrementally:
+
+- BoundedCapture keeps the first and last N bytes of a stream and only
+  counts what falls in between, so memory per command is constant
+- pump() reads several pipes until they close, the deadline passes or
+  the total crosses a byte budget, and says which happened so the caller
+  can kill the command
+
+=============================================================================
+"""
+
+import locale
+import os
+import selectors
+import time
+from typing import Optional
+
+# Bytes read per os.read() call
+CHUNK_BYTES = 65536
+
+# pump() outcomes
+EOF = "eof"
+TIMEOUT = "timeout"
+OVER_BUDGET = "over_budget"
+
+
+class BoundedCapture:
+    """First head_bytes and last tail_bytes of a stream, plus a byte count."""
+
+    def __init__(self, head_bytes: int, tail_bytes: int):
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.total_bytes = 0
+        self._head = bytearray()
+        self._tail = bytearray()
+
+    def feed(self, data: bytes):
+        self.total_bytes += len(data)
+        room = self.head_bytes - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if data and self.tail_bytes > 0:
+            self._tail += data[-self.tail_bytes:]
+            excess = len(self._tail) - self.tail_bytes
+            if excess > 0:
+                del self._tail[:excess]
+
+    @property
+    def omitted_bytes(self) -> int:
+        return self.total_bytes - len(self._head) - len(self._tail)
+
+    def text(self) -> str:
+        """Decoded output (universal newlines, like text=True), gap marked."""
+        if not self.omitted_bytes:
+            return _decode(bytes(self._head + self._tail))
+        return (
+            f"{_decode(bytes(self._head))}\n... ({self.omitted_bytes} bytes omitted, "
+            f"{self.total_bytes} bytes total) ...\n{_decode(bytes(self._tail))}"
+        )
+
+
+def pump(streams: dict[int, BoundedCapture], deadline: float, max_bytes: Optional[int] = None) -> str:
+    """
+    Read file descriptors into their captures until every one reaches EOF.
+
+    Args:
+        streams: Readable fd -> capture
+        deadline: time.monotonic() value to give up at
+        max_bytes: Budget for all streams together (None = unlimited)
+
+    Returns:
+        EOF, TIMEOUT or OVER_BUDGET; the caller kills the command on the
+        latter two
+    """
+    selector = selectors.DefaultSelector()
+    try:
+        for fd in streams:
+            selector.register(fd, selectors.EVENT_READ)
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return TIMEOUT
+            for key, _ in selector.select(remaining):
+                try:
+                    data = os.read(key.fd, CHUNK_BYTES)
+                except BlockingIOError:
+                    continue
+                if not data:
+                    selector.unregister(key.fd)
+                    continue
+                streams[key.fd].feed(data)
+                if max_bytes is not None and sum(c.total_bytes for c in streams.values()) > max_bytes:
+                    return OVER_BUDGET
+        return EOF
+    finally:
+        selector.close()
+
+
+def _decode(data: bytes) -> str:
+    encoding = locale.getpreferredencoding(False)  # What text=True decodes with
+    return data.decode(encoding, errors="replace").replace("\r\n", "\n").replace("\r", "\n")
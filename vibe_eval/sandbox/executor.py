@@ -6,24 +6,52 @@ SCRIPT NAME: executor.py
 Sandbox executor for running code in isolated environment with dependency
 enforcement.
 
-VERSION: 2.0
-LAST UPDATED: 2026-01-04
+VERSION: 2.3
+LAST UPDATED: 2026-10-16
 
 DESCRIPTION:
 Executes generated code in a sandboxed environment. Now includes:
 - Blocking of package manager commands (pip, npm, etc.)
 - Zero-dependency enforcement for vibe-coding evaluation
 
+CHANGES IN V2.1:
+- Optional fork server (zygote.py): plain `python ...` commands are forked
+  from a pre-started interpreter instead of going through /bin/sh and a
+  cold start; results report the startup overhead per command
+
+CHANGES IN V2.2:
+- Output is streamed into bounded buffers (capture.py) instead of being
+  collected whole by subprocess.run: the first and last halves of
+  max_output_chars are kept, the rest only counted
+- Commands writing more than max_output_bytes are killed with their
+  process group; results report the total bytes written
+- Timeouts kill the whole process group, not just the shell
+
+CHANGES IN V2.3:
+- Optional per-command ResourceLimits (RLIMIT_CPU / RLIMIT_AS)
+- Blocking, environment and result helpers shared with the asyncio
+  executor (async_executor.py)
+- Each command is a "sandbox.command" trace span (see tracing.py)
+
 =============================================================================
 """
 
 import os
 import subprocess
 import tempfile
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+from .. import tracing
+from .capture import EOF, OVER_BUDGET, TIMEOUT, BoundedCapture, pump
+from .isolation import ResourceLimits
+from .zygote import PythonZygote, ZygoteError, _kill_group, parse_python_command
+
+# Default budget for everything one command writes to stdout + stderr
+MAX_OUTPUT_BYTES = 10_000_000
+
 
 # Package manager commands that are blocked
 BLOCKED_COMMANDS = [
@@ -68,6 +96,10 @@ class ExecutionResult:
     stderr: str
     return_code: int
     timed_out: bool = False
+    output_bytes: int = 0                # Everything written to stdout + stderr
+    output_limited: bool = False         # Killed for exceeding max_output_bytes
+    forked: bool = False                 # Ran in the fork server
+    startup_ms: Optional[float] = None   # Fork server: request until user code started
 
 
 class SandboxExecutor:
@@ -82,7 +114,10 @@ class SandboxExecutor:
         self, 
         workspace: Path,
         timeout: int = 60,
-        max_output_chars: int = 10000
+        max_output_chars: int = 10000,
+        zygote: Optional[PythonZygote] = None,
+        max_output_bytes: Optional[int] = MAX_OUTPUT_BYTES,
+        limits: Optional[ResourceLimits] = None,
     ):
         """
         Initialize sandbox executor.
@@ -90,11 +125,21 @@ class SandboxExecutor:
         Args:
             workspace: Working directory for code execution
             timeout: Maximum seconds per command
-            max_output_chars: Truncate output beyond this length
+            max_output_chars: Bytes of output kept per stream (first and
+                              last half; the middle is only counted)
+            zygote: Fork server for plain `python ...` commands
+                    (None = every command goes through the shell)
+            max_output_bytes: Kill a command once stdout + stderr exceed
+                              this many bytes (None = no limit)
+            limits: CPU-time and memory rlimits per command (POSIX only;
+                    its wall_seconds is ignored in favour of timeout)
         """
         self.workspace = Path(workspace)
         self.timeout = timeout
         self.max_output_chars = max_output_chars
+        self.zygote = zygote
+        self.max_output_bytes = max_output_bytes
+        self.limits = limits
         
         # Ensure workspace exists
         self.workspace.mkdir(parents=True, exist_ok=True)
@@ -113,59 +158,141 @@ class SandboxExecutor:
             Package manager commands (pip, npm, etc.) are blocked
             to enforce the zero-dependency constraint.
         """
-        # Check for blocked commands
-        blocked = self._check_blocked_command(command)
-        if blocked:
-            return ExecutionResult(
-                success=False,
-                stdout="",
-                stderr=f"BLOCKED: Package manager commands are not allowed. "
-                       f"This benchmark requires zero external dependencies.\n"
-                       f"Blocked command pattern: '{blocked}'",
-                return_code=1,
-                timed_out=False
-            )
+        with tracing.span("sandbox.command", "sandbox", command=command) as span:
+            result = self._run(command)
+            _describe(span, result)
+        return result
 
-        try:
-            # Set up environment with workspace in PATH-friendly way
-            env = os.environ.copy()
-            env["PYTHONUNBUFFERED"] = "1"
+    def _run(self, command: str) -> ExecutionResult:
+        """run() without the trace span."""
+        blocked = self._blocked_result(command)
+        if blocked is not None:
+            return blocked
+        env = self._command_env()
 
-            result = subprocess.run(
-                command,
+        if self.zygote is not None:
+            argv = parse_python_command(command)
+            if argv is not None:
+                try:
+                    return self._run_forked(argv, env)
+                except ZygoteError:
+                    pass  # Fork server gone: fall back to the shell
+
+        try:
+            process = subprocess.Popen(
+                self._shell_command(command),
                 shell=True,
                 cwd=self.workspace,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout,
-                env=env
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env,
+                start_new_session=True,  # Kill the shell and its children together
             )
-
+        except Exception as e:
             return ExecutionResult(
-                success=result.returncode == 0,
-                stdout=self._truncate(result.stdout),
-                stderr=self._truncate(result.stderr),
-                return_code=result.returncode,
+                success=False,
+                stdout="",
+                stderr=f"Execution error: {str(e)}",
+                return_code=-1,
                 timed_out=False
             )
 
-        except subprocess.TimeoutExpired as e:
+        stdout, stderr = self._new_capture(), self._new_capture()
+        deadline = time.monotonic() + self.timeout
+        with process:
+            outcome = pump(
+                {process.stdout.fileno(): stdout, process.stderr.fileno(): stderr},
+                deadline,
+                self.max_output_bytes,
+            )
+            if outcome == EOF:
+                try:
+                    process.wait(timeout=max(0.0, deadline - time.monotonic()))
+                except subprocess.TimeoutExpired:
+                    outcome = TIMEOUT  # Closed its output but kept running
+            if outcome != EOF:
+                _kill_group(process.pid)
+                process.wait()
+        return self._result(outcome, process.returncode, stdout, stderr)
+
+    def _blocked_result(self, command: str) -> Optional[ExecutionResult]:
+        """The refusal for a package manager command, or None if allowed."""
+        blocked = self._check_blocked_command(command)
+        if not blocked:
+            return None
+        return ExecutionResult(
+            success=False,
+            stdout="",
+            stderr=f"BLOCKED: Package manager commands are not allowed. "
+                   f"This benchmark requires zero external dependencies.\n"
+                   f"Blocked command pattern: '{blocked}'",
+            return_code=1,
+            timed_out=False
+        )
+
+    def _command_env(self) -> dict[str, str]:
+        """Environment for one command."""
+        env = os.environ.copy()
+        env["PYTHONUNBUFFERED"] = "1"
+        return env
+
+    def _shell_command(self, command: str) -> str:
+        """command with self.limits set by the shell first (POSIX only; no preexec_fn)."""
+        if self.limits is None or os.name != "posix":
+            return command
+        return self.limits.shell_prefix() + command
+
+    def _run_forked(self, argv: list[str], env: dict[str, str]) -> ExecutionResult:
+        """Run a `python ...` command line in the fork server, reporting like run()."""
+        stdout, stderr = self._new_capture(), self._new_capture()
+        run = self.zygote.run(
+            argv, self.workspace.absolute(), env, self.timeout,
+            stdout=stdout, stderr=stderr, max_output_bytes=self.max_output_bytes, limits=self.limits,
+        )
+        outcome = TIMEOUT if run.timed_out else OVER_BUDGET if run.output_limited else EOF
+        result = self._result(outcome, run.returncode, stdout, stderr)
+        result.forked = True
+        result.startup_ms = run.startup_ms
+        return result
+
+    def _new_capture(self) -> BoundedCapture:
+        """Keeps the first and last halves of max_output_chars bytes."""
+        head = self.max_output_chars // 2
+        return BoundedCapture(head, self.max_output_chars - head)
+
+    def _result(
+        self, outcome: str, returncode: int, stdout: BoundedCapture, stderr: BoundedCapture
+    ) -> ExecutionResult:
+        """ExecutionResult for a command that finished, timed out or went over budget."""
+        output_bytes = stdout.total_bytes + stderr.total_bytes
+        if outcome == TIMEOUT:
             return ExecutionResult(
                 success=False,
-                stdout=self._truncate(e.stdout or "") if e.stdout else "",
+                stdout=stdout.text(),
                 stderr=f"Command timed out after {self.timeout} seconds",
                 return_code=-1,
-                timed_out=True
+                timed_out=True,
+                output_bytes=output_bytes,
             )
-
-        except Exception as e:
+        if outcome == OVER_BUDGET:
             return ExecutionResult(
                 success=False,
-                stdout="",
-                stderr=f"Execution error: {str(e)}",
+                stdout=stdout.text(),
+                stderr=stderr.text() + (
+                    f"\nOutput limit exceeded: command killed after writing "
+                    f"{output_bytes} bytes (limit {self.max_output_bytes})"
+                ),
                 return_code=-1,
-                timed_out=False
+                output_bytes=output_bytes,
+                output_limited=True,
             )
+        return ExecutionResult(
+            success=returncode == 0,
+            stdout=stdout.text(),
+            stderr=stderr.text(),
+            return_code=returncode,
+            output_bytes=output_bytes,
+        )
 
     def _check_blocked_command(self, command: str) -> Optional[str]:
         """
@@ -203,14 +330,6 @@ class SandboxExecutor:
         """
         return self._check_blocked_command(command) is None
     
-    def _truncate(self, text: str) -> str:
-        """Truncate text to max_output_chars."""
-        if isinstance(text, bytes):
-            text = text.decode("utf-8", errors="replace")
-        if len(text) > self.max_output_chars:
-            return text[:self.max_output_chars] + f"\n... (truncated, {len(text)} total chars)"
-        return text
-    
     def write_file(self, path: str, content: str) -> Path:
         """
         Write a file to the workspace.
@@ -258,6 +377,16 @@ class SandboxExecutor:
             self.workspace.mkdir(parents=True, exist_ok=True)
 
 
+def _describe(span: "tracing.Span", result: ExecutionResult):
+    """Attach a command's outcome to its trace span."""
+    span.set(
+        return_code=result.return_code,
+        timed_out=result.timed_out,
+        output_bytes=result.output_bytes,
+        forked=result.forked,
+    )
+
+
 def create_workspace(base_dir: Optional[Path] = None) -> Path:
     """
     Create a new temporary workspace directory.
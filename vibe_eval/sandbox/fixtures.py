@@ -0,0 +1,242 @@
+"""
+=============================================================================
+SCRIPT NAME: fixtures.py
+=============================================================================
+
+Memoized program runs for Python-case functional tests.
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+Many Python-case tests run the generated script with the same arguments
+and then inspect different output files, so one case ran the script once
+per test. A test that declares a `run_once` parameter now gets a RunOnce
+fixture instead:
+
+    def test_creates_summary(workspace, main_file, run_once):
+        run = run_once()                   # python main.py, run at most once
+        assert run.returncode == 0, run.stderr
+        assert run.exists("summary.json")
+
+The first call for an (args, stdin) pair copies the workspace to a scratch
+tree, runs the script there and stores exit code, stdout, stderr and the
+resulting file tree under the run's fixture directory. Later calls, from
+any test and any worker process, wait on a file lock and reuse that
+result. The workspace itself is never written to.
+
+ProgramRun reads files from the shared tree. A test that needs to modify
+files uses run.workspace, a private copy made on first access.
+
+The owner of a fixtures directory calls RunOnce.forget() when it is done
+with it, releasing the in-process locks kept per memo key.
+
+=============================================================================
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .overlay import clone_tree
+
+try:
+    import fcntl
+except ImportError:  # Windows: isolated workers are not used there
+    fcntl = None
+
+# Seconds a run may take unless the caller says otherwise
+DEFAULT_TIMEOUT = 30
+
+# Per fixtures directory, one lock per memo key; dropped by RunOnce.forget()
+_thread_locks: dict[str, dict[str, threading.Lock]] = {}
+_thread_locks_guard = threading.Lock()
+
+
+@dataclass
+class ProgramRun:
+    """Outcome of one memoized run and the file tree it left behind."""
+    args: list[str]
+    returncode: Optional[int]
+    stdout: str
+    stderr: str
+    duration_ms: float
+    timed_out: bool = False
+    changed_files: list[str] = field(default_factory=list)  # Created or modified, relative paths
+    tree: Path = Path()  # Workspace copy the program ran in (shared, treat as read-only)
+
+    def path(self, relative: str) -> Path:
+        """Path of a file in the run's output tree."""
+        return self.tree / relative
+
+    def exists(self, relative: str) -> bool:
+        return self.path(relative).exists()
+
+    def read_text(self, relative: str) -> str:
+        return self.path(relative).read_text()
+
+    @property
+    def workspace(self) -> Path:
+        """Private, writable copy of the output tree (copied on first access)."""
+        copy = getattr(self, "_private", None)
+        if copy is None:
+            copy = Path(tempfile.mkdtemp(prefix="view-", dir=self.tree.parent.parent)) / "tree"
+            clone_tree(self.tree, copy)
+            self._private = copy
+        return copy
+
+
+class RunOnce:
+    """Callable fixture: run the case's main script once per argument set."""
+
+    def __init__(
+        self,
+        workspace: Path,
+        main_file: Path,
+        fixtures_dir: Path,
+        timeout: float = DEFAULT_TIMEOUT,
+        env: Optional[dict[str, str]] = None,
+    ):
+        """
+        Args:
+            workspace: Generated code (never modified)
+            main_file: Entry point inside workspace
+            fixtures_dir: Directory shared by all tests of one run_tests() call
+            timeout: Seconds before a run counts as timed out
+            env: Environment of the run (default: this process's)
+
+        Whichever RunOnce on a fixtures_dir runs first decides timeout and
+        env for everyone reusing that run.
+        """
+        self.workspace = Path(workspace)
+        self.main_file = Path(main_file)
+        self.fixtures_dir = Path(fixtures_dir)
+        self.timeout = timeout
+        self.env = env
+
+    def __call__(self, args: Optional[list[str]] = None, stdin: Optional[str] = None) -> ProgramRun:
+        """
+        Run `python main_file *args` (feeding stdin) or reuse the earlier run.
+
+        Raises:
+            subprocess.TimeoutExpired: the run timed out, as
+            subprocess.run(timeout=...) would for every caller
+        """
+        args = [str(a) for a in (args or [])]
+        key = hashlib.sha256(
+            json.dumps([str(self.workspace), str(self.main_file), args, stdin]).encode()
+        ).hexdigest()[:16]
+        run_dir = self.fixtures_dir / key
+        result_file = run_dir / "result.json"
+        self.fixtures_dir.mkdir(parents=True, exist_ok=True)
+
+        with _exclusive(self.fixtures_dir / f"{key}.lock"):
+            if not result_file.exists():
+                run = self._execute(run_dir, args, stdin)
+                data = asdict(run)
+                data["tree"] = str(run.tree)
+                # Atomic: a worker killed mid-write must not leave half a result
+                partial = run_dir / "result.json.tmp"
+                partial.write_text(json.dumps(data))
+                os.replace(partial, result_file)
+
+        data = json.loads(result_file.read_text())
+        run = ProgramRun(**{**data, "tree": Path(data["tree"])})
+        if run.timed_out:
+            raise subprocess.TimeoutExpired([sys.executable, str(self.main_file), *args], self.timeout)
+        return run
+
+    @classmethod
+    def forget(cls, fixtures_dir: Path):
+        """Drop this process's locks for fixtures_dir once its runs are done."""
+        with _thread_locks_guard:
+            _thread_locks.pop(str(Path(fixtures_dir)), None)
+
+    def _execute(self, run_dir: Path, args: list[str], stdin: Optional[str]) -> ProgramRun:
+        """Copy the workspace and run the script in the copy."""
+        tree = run_dir / "tree"
+        if run_dir.exists():
+            shutil.rmtree(run_dir)  # Left over from a worker killed mid-run
+        clone_tree(self.workspace, tree)
+        before = _file_stamps(tree)
+
+        try:
+            main_file = tree / self.main_file.relative_to(self.workspace)
+        except ValueError:
+            main_file = self.main_file  # Entry point outside the workspace
+        start = time.time()
+        try:
+            completed = subprocess.run(
+                [sys.executable, str(main_file), *args],
+                input=stdin,
+                capture_output=True,
+                text=True,
+                cwd=str(tree),
+                env=self.env,
+                timeout=self.timeout,
+            )
+            returncode, stdout, stderr, timed_out = (
+                completed.returncode, completed.stdout, completed.stderr, False
+            )
+        except subprocess.TimeoutExpired as e:
+            returncode, timed_out = None, True
+            stdout = _text(e.stdout)
+            stderr = _text(e.stderr)
+
+        after = _file_stamps(tree)
+        return ProgramRun(
+            args=args,
+            returncode=returncode,
+            stdout=stdout,
+            stderr=stderr,
+            duration_ms=(time.time() - start) * 1000,
+            timed_out=timed_out,
+            changed_files=sorted(p for p, stamp in after.items() if before.get(p) != stamp),
+            tree=tree,
+        )
+
+
+def _file_stamps(root: Path) -> dict[str, tuple[int, int]]:
+    """(mtime_ns, size) per file under root, keyed by relative path."""
+    stamps = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+        for name in filenames:
+            path = Path(dirpath) / name
+            stat = path.stat()
+            stamps[path.relative_to(root).as_posix()] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+
+def _text(output) -> str:
+    if output is None:
+        return ""
+    return output.decode(errors="replace") if isinstance(output, bytes) else output
+
+
+@contextmanager
+def _exclusive(lock_path: Path) -> Iterator[None]:
+    """Hold a lock shared by threads in this process and by other processes."""
+    with _thread_locks_guard:
+        locks = _thread_locks.setdefault(str(lock_path.parent), {})
+        thread_lock = locks.setdefault(lock_path.name, threading.Lock())
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(lock_path, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
@@ -0,0 +1,267 @@
+"""
+=============================================================================
+SCRIPT NAME: isolation.py
+=============================================================================
+
+Run Python functional tests in killable, resource-limited processes.
+
+VERSION: 1.1
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+Python-case tests usually run the generated script themselves
+(subprocess.run([sys.executable, main_file], timeout=30)). Run in-process,
+one hanging or memory-hungry script held up the whole runner. Here every
+test runs in its own worker process:
+
+- Own session (process group), so on timeout the worker and everything it
+  started (the generated script included) is killed with one signal
+- RLIMIT_CPU and RLIMIT_AS set by the worker before it loads the test;
+  children inherit them, so a runaway generated script hits the limit too
+- Hard wall-clock timeout enforced by the parent
+- Up to `workers` tests at once; results are yielded as they finish
+
+The worker is this module run with -m. It loads the test file, runs one
+test and writes its result as JSON to a file named by the parent, so
+whatever the test prints cannot corrupt the result. Resource limits are
+POSIX-only; elsewhere only the wall-clock timeout applies.
+
+CHANGES IN V1.1:
+- Each isolated test is a "tests.case" trace span (see tracing.py)
+
+=============================================================================
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from .. import tracing
+
+if TYPE_CHECKING:
+    from .test_runner import TestResult
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Last lines of worker stderr kept when a worker dies without a result
+STDERR_TAIL_LINES = 5
+
+
+@dataclass
+class ResourceLimits:
+    """Per-test limits for isolated Python tests."""
+    wall_seconds: float = 30.0          # Parent kills the process group after this
+    cpu_seconds: Optional[int] = 60     # RLIMIT_CPU per process (None = unlimited)
+    memory_mb: Optional[int] = 2048     # RLIMIT_AS per process (None = unlimited)
+
+    def apply(self):
+        """Set the rlimits in the current process (a worker, before it loads any test code)."""
+        if resource is None:
+            return
+        for limit, value in [
+            (resource.RLIMIT_CPU, self.cpu_seconds),
+            (resource.RLIMIT_AS, self.memory_mb * 1024 * 1024 if self.memory_mb else None),
+        ]:
+            if value is None:
+                continue
+            try:
+                _, hard = resource.getrlimit(limit)
+                if hard != resource.RLIM_INFINITY:
+                    value = min(value, hard)
+                resource.setrlimit(limit, (value, hard))
+            except (ValueError, OSError):
+                pass  # Not enforceable here (e.g. RLIMIT_AS on macOS)
+
+    def shell_prefix(self) -> str:
+        """
+        Shell lines that set the rlimits for the command after them.
+
+        Soft limits only, like apply(); a limit the shell cannot set (e.g.
+        above the hard limit, or -v on macOS) is skipped silently.
+        """
+        lines = []
+        if self.cpu_seconds is not None:
+            lines.append(f"ulimit -S -t {int(self.cpu_seconds)} 2>/dev/null")
+        if self.memory_mb is not None:
+            lines.append(f"ulimit -S -v {int(self.memory_mb) * 1024} 2>/dev/null")
+        return "".join(f"{line}\n" for line in lines)
+
+
+def run_isolated_test(
+    test_file: Path,
+    name: str,
+    workspace: Path,
+    python_file: Path,
+    limits: ResourceLimits,
+    fixtures_dir: Optional[Path] = None,
+    clone: bool = True,
+) -> "TestResult":
+    """
+    Run one test in a fresh worker process.
+
+    fixtures_dir is shared by all tests of a run so run_once results are
+    reused across workers; clone gives the test its own workspace copy.
+
+    Returns:
+        TestResult; timeouts, limit kills and crashes are failures
+    """
+    with tracing.span("tests.case", "tests", test=name, isolated=True) as span:
+        result = _run_isolated_test(test_file, name, workspace, python_file, limits, fixtures_dir, clone)
+        span.set(passed=result.passed)
+    return result
+
+
+def _run_isolated_test(
+    test_file: Path,
+    name: str,
+    workspace: Path,
+    python_file: Path,
+    limits: ResourceLimits,
+    fixtures_dir: Optional[Path],
+    clone: bool,
+) -> "TestResult":
+    """run_isolated_test() without the trace span."""
+    from .test_runner import TestResult
+
+    fd, result_path = tempfile.mkstemp(prefix="vibe-test-", suffix=".json")
+    os.close(fd)
+    start = time.time()
+    try:
+        process = subprocess.Popen(
+            [sys.executable, "-m", __name__, result_path, str(test_file), name,
+             str(workspace), str(python_file), str(fixtures_dir or ""), "1" if clone else "0",
+             json.dumps([limits.cpu_seconds, limits.memory_mb])],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            env=_worker_env(),
+            start_new_session=os.name == "posix",
+        )
+        try:
+            _, stderr = process.communicate(timeout=limits.wall_seconds)
+        except subprocess.TimeoutExpired:
+            _kill_tree(process)
+            process.communicate()
+            return TestResult(
+                name=name,
+                passed=False,
+                duration_ms=(time.time() - start) * 1000,
+                error=f"Timeout: killed after {limits.wall_seconds:g}s",
+            )
+        finally:
+            # Children the test left running (e.g. a server) go with it
+            _kill_tree(process)
+
+        try:
+            data = json.loads(Path(result_path).read_text())
+        except (OSError, ValueError):
+            return TestResult(
+                name=name,
+                passed=False,
+                duration_ms=(time.time() - start) * 1000,
+                error=_crash_message(process.returncode, stderr.decode(errors="replace")),
+            )
+        return TestResult(**data)
+    finally:
+        try:
+            os.unlink(result_path)
+        except OSError:
+            pass
+
+
+def iter_isolated_tests(
+    test_file: Path,
+    names: list[str],
+    workspace: Path,
+    python_file: Path,
+    limits: ResourceLimits,
+    workers: int = 1,
+    fixtures_dir: Optional[Path] = None,
+    clone: bool = True,
+) -> Iterator[tuple[int, "TestResult"]]:
+    """Run tests in isolated workers, yielding (index, result) as each finishes."""
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(names))),
+                            thread_name_prefix="vibe-isolated-test") as pool:
+        futures = {
+            pool.submit(
+                run_isolated_test, test_file, name, workspace, python_file, limits, fixtures_dir, clone,
+            ): index
+            for index, name in enumerate(names)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def _worker_env() -> dict[str, str]:
+    """Environment with vibe_eval importable even when it is not installed."""
+    env = dict(os.environ)
+    root = str(Path(__file__).resolve().parents[2])
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    return env
+
+
+def _kill_tree(process: subprocess.Popen):
+    """Kill a worker and its process group."""
+    if os.name == "posix":
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    elif process.poll() is None:
+        process.kill()
+
+
+def _crash_message(returncode: int, stderr: str) -> str:
+    """Explain a worker that exited without writing a result."""
+    if returncode is not None and returncode < 0:
+        signum = -returncode
+        if signum == getattr(signal, "SIGXCPU", None):
+            reason = "CPU time limit exceeded"
+        else:
+            reason = f"killed by {signal.Signals(signum).name}"
+    else:
+        reason = f"exited with code {returncode}"
+    tail = "\n".join(stderr.strip().splitlines()[-STDERR_TAIL_LINES:])
+    if "MemoryError" in tail:
+        reason = "memory limit exceeded"
+    return f"Worker {reason}" + (f": {tail}" if tail else "")
+
+
+def _worker_main(argv: list[str]) -> int:
+    """Worker process: run one test and write its result."""
+    result_path, test_file, name, workspace, python_file, fixtures_dir, clone, limits = argv
+    # Set here rather than in a preexec_fn, which can deadlock a child
+    # forked from the parent's test threads
+    cpu_seconds, memory_mb = json.loads(limits)
+    ResourceLimits(cpu_seconds=cpu_seconds, memory_mb=memory_mb).apply()
+
+    from dataclasses import asdict
+
+    from .test_runner import FunctionalTestRunner, TestResult, _python_test_call, _timed_test
+
+    func = dict(FunctionalTestRunner()._load_test_functions(Path(test_file))).get(name)
+    if func is None:
+        result = TestResult(name=name, passed=False, error=f"Test {name} could not be loaded in worker")
+    else:
+        call = _python_test_call(func, Path(workspace), Path(python_file),
+                                 Path(fixtures_dir) if fixtures_dir else None, clone == "1")
+        result = _timed_test(name, call)
+    data = asdict(result)
+    data.pop("screenshot", None)
+    Path(result_path).write_text(json.dumps(data))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_worker_main(sys.argv[1:]))
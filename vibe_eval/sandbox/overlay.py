@@ -0,0 +1,110 @@
+"""
+=============================================================================
+SCRIPT NAME: overlay.py
+=============================================================================
+
+Cheap per-test copies of a generated workspace.
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+Python-case tests used to share the live workspace, so files one test
+wrote were seen by the next and tests re-ran the program defensively.
+Each test now gets its own clone from clone_tree():
+
+- On filesystems with reflinks (Btrfs, XFS, bcachefs; Linux FICLONE)
+  every file is a copy-on-write clone, so cloning costs one ioctl per
+  file whatever the file size
+- Elsewhere files are copied; generated workspaces are a handful of
+  small files, so this stays within a few milliseconds
+
+Hard links are not used: a test that rewrites a file with open(p, "w")
+truncates the shared inode and would change the original workspace.
+
+=============================================================================
+"""
+
+import errno
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# Directories never worth cloning
+SKIP_DIRS = frozenset({"__pycache__", ".git"})
+
+# Devices where FICLONE failed; plain copies from then on
+_no_reflink_devices: set[int] = set()
+
+
+@dataclass
+class CloneStats:
+    """What clone_tree() did."""
+    files: int = 0
+    reflinked: int = 0
+    copied: int = 0
+    elapsed_us: float = 0.0
+
+
+def clone_tree(src: Path, dst: Path) -> CloneStats:
+    """
+    Clone the directory tree at src to dst (which must not exist).
+
+    Symlinks are recreated, not followed. File modes and timestamps are
+    kept.
+    """
+    start = time.perf_counter()
+    stats = CloneStats()
+    src = Path(src)
+    dst = Path(dst)
+    for dirpath, dirnames, filenames in os.walk(src):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        target_dir = dst / os.path.relpath(dirpath, src)
+        target_dir.mkdir(parents=True, exist_ok=dirpath != str(src))
+        for name in dirnames:
+            source = os.path.join(dirpath, name)
+            if os.path.islink(source):
+                os.symlink(os.readlink(source), target_dir / name)
+        dirnames[:] = [d for d in dirnames if not os.path.islink(os.path.join(dirpath, d))]
+        for name in filenames:
+            source = os.path.join(dirpath, name)
+            target = target_dir / name
+            stats.files += 1
+            if os.path.islink(source):
+                os.symlink(os.readlink(source), target)
+            elif _reflink(source, target):
+                stats.reflinked += 1
+            else:
+                shutil.copy2(source, target)
+                stats.copied += 1
+    stats.elapsed_us = (time.perf_counter() - start) * 1_000_000
+    return stats
+
+
+def _reflink(source: str, target: Path) -> bool:
+    """Clone one file copy-on-write; False if the filesystem cannot."""
+    if fcntl is None:
+        return False
+    device = os.stat(source).st_dev
+    if device in _no_reflink_devices:
+        return False
+    with open(source, "rb") as src_file, open(target, "wb") as dst_file:
+        try:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+        except OSError as e:
+            if e.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS):
+                _no_reflink_devices.add(device)
+                return False
+            raise
+    shutil.copystat(source, target)
+    return True
@@ -0,0 +1,122 @@
+"""
+=============================================================================
+SCRIPT NAME: settle.py
+=============================================================================
+
+Readiness-based page settling for Playwright tests.
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+HTML tests used to sleep a fixed 200 ms after page.goto(). That is wasted
+time for static pages and still too short for apps that build their UI in
+a load handler or after a timeout. Instead, an init script installed on the
+browser context tracks page activity from the first script onwards:
+
+- DOM mutations (MutationObserver on the whole document)
+- Pending setTimeout callbacks short enough to fire before the cap
+  (setInterval and long timeouts are ignored; they never "finish")
+
+settle_page() then waits until the document has finished loading and
+nothing has happened for quiet_ms with no short timers pending. The check
+runs once per animation frame, so requestAnimationFrame callbacks queued
+earlier have run by then; a canvas loop that never touches the DOM does
+not hold the page up. A page that never goes quiet (e.g. a DOM animation
+loop) is released after max_ms. The time taken is returned so slow apps
+show up in the results.
+
+=============================================================================
+"""
+
+import time
+from dataclasses import dataclass
+
+try:
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+except ImportError:  # Only reached with a real page, i.e. when Playwright is installed
+    PlaywrightTimeoutError = TimeoutError
+
+# Installed with context.add_init_script(); runs before any page script
+SETTLE_INIT_SCRIPT = """
+(() => {
+  if (window.__vibeSettle) return;
+  const state = window.__vibeSettle = {
+    lastActivity: performance.now(),
+    pendingTimers: new Set(),
+    maxTimerMs: __MAX_TIMER_MS__,
+  };
+  const touch = () => { state.lastActivity = performance.now(); };
+
+  const setTimeout_ = window.setTimeout.bind(window);
+  const clearTimeout_ = window.clearTimeout.bind(window);
+  window.setTimeout = function (callback, delay, ...args) {
+    let id;
+    const wrapped = typeof callback === 'function'
+      ? function () { state.pendingTimers.delete(id); touch(); return callback.apply(this, arguments); }
+      : callback;
+    id = setTimeout_(wrapped, delay, ...args);
+    if (typeof callback === 'function' && (delay || 0) <= state.maxTimerMs) state.pendingTimers.add(id);
+    return id;
+  };
+  window.clearTimeout = function (id) {
+    state.pendingTimers.delete(id);
+    return clearTimeout_(id);
+  };
+
+  new MutationObserver(touch).observe(document, {
+    subtree: true, childList: true, attributes: true, characterData: true,
+  });
+})();
+"""
+
+# Predicate evaluated every animation frame by page.wait_for_function()
+SETTLED_PREDICATE = """
+(quietMs) => {
+  const state = window.__vibeSettle;
+  if (!state) return document.readyState === 'complete';
+  return document.readyState === 'complete'
+    && state.pendingTimers.size === 0
+    && performance.now() - state.lastActivity >= quietMs;
+}
+"""
+
+
+@dataclass
+class SettleConfig:
+    """How long a page must be quiet, and the most we wait for it."""
+    quiet_ms: int = 50
+    max_ms: int = 2000
+
+    def init_script(self) -> str:
+        """SETTLE_INIT_SCRIPT with short timers defined relative to max_ms."""
+        return SETTLE_INIT_SCRIPT.replace("__MAX_TIMER_MS__", str(int(self.max_ms)))
+
+
+@dataclass
+class SettleResult:
+    """How long a page took to settle."""
+    settle_ms: float
+    capped: bool  # Still busy when max_ms ran out
+
+
+def settle_page(page, config: SettleConfig) -> SettleResult:
+    """
+    Wait until the page is quiet (or config.max_ms passes).
+
+    The page's context must have config.init_script() installed for timer
+    and mutation tracking; without it only document.readyState is checked.
+    """
+    start = time.time()
+    capped = False
+    try:
+        page.wait_for_function(
+            SETTLED_PREDICATE,
+            arg=config.quiet_ms,
+            polling="raf",
+            timeout=config.max_ms,
+        )
+    except PlaywrightTimeoutError:
+        # The page never went quiet
+        capped = True
+    return SettleResult(settle_ms=(time.time() - start) * 1000, capped=capped)
@@ -0,0 +1,274 @@
+"""
+=============================================================================
+SCRIPT NAME: snapshot.py
+=============================================================================
+
+Load a generated HTML app once and restore its post-load state per test.
+
+VERSION: 1.1
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+Every HTML test normally opens a fresh page and re-parses and re-runs the
+whole app, then waits for it to settle. For tests that only inspect the
+page (count buttons, read text, check attributes) that work is identical
+every time. In snapshot mode FunctionalTestRunner:
+
+1. Loads the app once (cold, settled) and captures a PageSnapshot: the
+   serialised DOM, the live values of form fields, and localStorage and
+   sessionStorage.
+2. For each read-only test, opens a page on a synthetic http origin whose
+   route handler serves the snapshot from memory (other relative URLs
+   come from the workspace), seeds storage before the page loads and
+   puts the form values back.
+
+A serialised DOM cannot carry event listeners or closures, and re-running
+the app's scripts on top of the DOM they already built would build it
+twice. The snapshot is therefore served verbatim with a
+"script-src 'none'" Content-Security-Policy. page.content() shows the same
+<script> elements and handler attributes as the cold page, but nothing
+executes. Because of this, only tests that never interact with the page
+may use it. is_read_only() decides this from the test's source. Only
+QUERY_METHODS and READ_METHODS may be called on the page or on locators
+derived from it. Passing either to a helper, or marking the test with
+@mutates_state, sends the test down the cold path.
+
+CHANGES IN V1.1:
+- Restoring a snapshot is a "browser.page" trace span (see tracing.py)
+
+=============================================================================
+"""
+
+import ast
+import inspect
+import textwrap
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from .. import tracing
+
+# Synthetic origin for restored pages (never resolves; every request is routed)
+SNAPSHOT_ORIGIN = "http://vibe-snapshot.invalid"
+
+# Page/locator methods that return another page handle (locators, elements)
+QUERY_METHODS = frozenset({
+    "locator", "nth", "filter", "all",
+    "get_by_role", "get_by_text", "get_by_label", "get_by_placeholder",
+    "get_by_alt_text", "get_by_title", "get_by_test_id",
+    "query_selector", "query_selector_all",
+})
+
+# Page/locator methods that only read a value from the page
+READ_METHODS = frozenset({
+    "count", "text_content", "inner_text", "inner_html", "all_text_contents",
+    "all_inner_texts", "get_attribute", "input_value",
+    "is_visible", "is_hidden", "is_enabled", "is_disabled", "is_checked", "is_editable",
+    "bounding_box", "title", "content",
+})
+
+READ_ONLY_METHODS = QUERY_METHODS | READ_METHODS
+
+# Serialises the settled page. Form state lives in properties, not
+# attributes, so it is returned separately rather than baked into the HTML.
+CAPTURE_SCRIPT = """
+() => {
+  const doctype = document.doctype ? new XMLSerializer().serializeToString(document.doctype) + '\\n' : '';
+  const forms = Array.from(document.querySelectorAll('input, textarea, select'), el => ({
+    value: el.value,
+    checked: el.checked === true,
+    selectedIndex: el.tagName === 'SELECT' ? el.selectedIndex : -1,
+  }));
+  const dump = storage => {
+    const out = {};
+    for (let i = 0; i < storage.length; i++) out[storage.key(i)] = storage.getItem(storage.key(i));
+    return out;
+  };
+  return {
+    html: doctype + document.documentElement.outerHTML,
+    forms,
+    localStorage: dump(localStorage),
+    sessionStorage: dump(sessionStorage),
+  };
+}
+"""
+
+RESTORE_FORMS_SCRIPT = """
+(forms) => {
+  document.querySelectorAll('input, textarea, select').forEach((el, i) => {
+    const state = forms[i];
+    if (!state) return;
+    if (el.tagName === 'SELECT') el.selectedIndex = state.selectedIndex;
+    else if (el.type === 'checkbox' || el.type === 'radio') el.checked = state.checked;
+    else if (el.type !== 'file') el.value = state.value;
+  });
+}
+"""
+
+# Nothing in the restored page may run: its DOM is already the result
+NO_SCRIPTS_CSP = "script-src 'none'"
+
+SEED_STORAGE_SCRIPT = """
+(() => {
+  const seed = __SEED__;
+  for (const [k, v] of Object.entries(seed.localStorage)) localStorage.setItem(k, v);
+  for (const [k, v] of Object.entries(seed.sessionStorage)) sessionStorage.setItem(k, v);
+})();
+"""
+
+
+@dataclass
+class PageSnapshot:
+    """Post-load state of an app, captured once per test run."""
+    html: str
+    forms: list[dict] = field(default_factory=list)  # Per input/textarea/select, in document order
+    local_storage: dict[str, str] = field(default_factory=dict)
+    session_storage: dict[str, str] = field(default_factory=dict)
+    capture_ms: float = 0.0  # Serialisation only; the runner records load + settle + capture
+
+
+def mutates_state(func: Callable) -> Callable:
+    """Mark a test that must always run against a freshly loaded page."""
+    func.mutates_state = True
+    return func
+
+
+def is_read_only(func: Callable) -> bool:
+    """
+    True if a test only observes the page it is given.
+
+    Conservative: unreadable source, unknown page methods or passing the
+    page to another callable all count as mutating.
+    """
+    if getattr(func, "mutates_state", False):
+        return False
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    except (OSError, TypeError, SyntaxError):
+        return False
+    funcdef = tree.body[0] if tree.body else None
+    if not isinstance(funcdef, (ast.FunctionDef, ast.AsyncFunctionDef)) or not funcdef.args.args:
+        return False
+    handles = _page_names(funcdef, funcdef.args.args[0].arg)
+
+    for node in ast.walk(funcdef):
+        if not isinstance(node, ast.Call):
+            continue
+        if isinstance(node.func, ast.Attribute) and _is_handle(node.func.value, handles):
+            if node.func.attr not in READ_ONLY_METHODS:
+                return False
+        # The page (or a locator on it) handed to other code
+        for arg in list(node.args) + [kw.value for kw in node.keywords]:
+            if _is_handle(arg, handles):
+                return False
+    return True
+
+
+def _page_names(funcdef: ast.AST, page: str) -> set[str]:
+    """The page parameter plus every variable bound to a handle on it (btn = page.locator(...))."""
+    names = {page}
+    while True:
+        before = len(names)
+        for node in ast.walk(funcdef):
+            if isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign, ast.NamedExpr)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                value = node.value
+            elif isinstance(node, (ast.For, ast.AsyncFor, ast.comprehension)):
+                targets, value = [node.target], node.iter
+            elif isinstance(node, ast.withitem) and node.optional_vars is not None:
+                targets, value = [node.optional_vars], node.context_expr
+            else:
+                continue
+            if value is not None and _is_handle(value, names):
+                names.update(
+                    n.id for target in targets for n in ast.walk(target) if isinstance(n, ast.Name)
+                )
+        if len(names) == before:
+            return names
+
+
+def _is_handle(node: ast.AST, names: set[str]) -> bool:
+    """
+    True if an expression evaluates to the page or something on it.
+
+    page.locator("b").first and page.query_selector_all("b")[0] are
+    handles; page.locator("b").count() is plain data.
+    """
+    if isinstance(node, ast.Name):
+        return node.id in names
+    if isinstance(node, (ast.Attribute, ast.Subscript, ast.Starred)):
+        return _is_handle(node.value, names)
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+        return node.func.attr not in READ_METHODS and _is_handle(node.func.value, names)
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return any(_is_handle(elt, names) for elt in node.elts)
+    if isinstance(node, ast.IfExp):
+        return _is_handle(node.body, names) or _is_handle(node.orelse, names)
+    if isinstance(node, ast.BoolOp):
+        return any(_is_handle(value, names) for value in node.values)
+    return False
+
+
+def capture_snapshot(page) -> PageSnapshot:
+    """Serialise a loaded, settled page."""
+    start = time.time()
+    state = page.evaluate(CAPTURE_SCRIPT)
+    return PageSnapshot(
+        html=state["html"],
+        forms=state["forms"],
+        local_storage=state["localStorage"],
+        session_storage=state["sessionStorage"],
+        capture_ms=(time.time() - start) * 1000,
+    )
+
+
+def snapshot_url(html_file: Path, root: Path) -> str:
+    """URL of the restored app on the snapshot origin."""
+    return f"{SNAPSHOT_ORIGIN}/{html_file.relative_to(root).as_posix()}"
+
+
+def restore_snapshot(context, snapshot: PageSnapshot, html_file: Path, root: Optional[Path] = None):
+    """
+    Open a page in context showing snapshot, with storage and forms restored.
+
+    Other relative URLs (stylesheets, images) are served from root, the
+    directory containing html_file by default, so layout matches the cold
+    page.
+    """
+    import json
+
+    root = Path(root or html_file.parent).absolute()
+    html_file = Path(html_file).absolute()
+    url = snapshot_url(html_file, root)
+
+    def handle(route):
+        request_url = route.request.url.split("#", 1)[0].split("?", 1)[0]
+        if request_url == url:
+            route.fulfill(
+                status=200,
+                content_type="text/html; charset=utf-8",
+                headers={"Content-Security-Policy": NO_SCRIPTS_CSP},
+                body=snapshot.html,
+            )
+            return
+        relative = request_url[len(SNAPSHOT_ORIGIN) + 1:]
+        target = (root / relative).resolve()
+        if relative and target.is_file() and root in target.parents:
+            route.fulfill(status=200, path=str(target))
+        else:
+            route.fulfill(status=404, body="")
+
+    context.route(f"{SNAPSHOT_ORIGIN}/**", handle)
+    if snapshot.local_storage or snapshot.session_storage:
+        seed = json.dumps({
+            "localStorage": snapshot.local_storage,
+            "sessionStorage": snapshot.session_storage,
+        })
+        context.add_init_script(SEED_STORAGE_SCRIPT.replace("__SEED__", seed))
+    page = context.new_page()
+    with tracing.span("browser.page", "browser", file=html_file.name, snapshot=True):
+        page.goto(url, wait_until="load")
+    if snapshot.forms:
+        page.evaluate(RESTORE_FORMS_SCRIPT, snapshot.forms)
+    return page
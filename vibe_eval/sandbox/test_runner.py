@@ -12,8 +12,8 @@ INPUT:
 OUTPUT:
 - TestRunResult: Dataclass with pass/fail counts, details per test
 
-VERSION: 3.0
-LAST UPDATED: 2026-01-27
+VERSION: 3.7
+LAST UPDATED: 2026-10-16
 
 DESCRIPTION:
 This module provides functional test execution for generated code. It:
@@ -22,6 +22,51 @@ This module provides functional test execution for generated code. It:
 3. Runs Python scripts and validates output
 4. Returns detailed pass/fail results for scoring
 
+CHANGES IN V3.1:
+- workers > 1 shards HTML tests across browser lanes (one Playwright
+  instance per lane thread) and Python tests across worker processes;
+  results are merged back in test order
+- Every HTML test gets a fresh browser context, so outcomes do not depend
+  on which tests shared a context
+- Pages settle on readiness (DOMContentLoaded, then no DOM mutations or
+  short timers for a quiet period) instead of a fixed 200 ms sleep; the
+  settle time is recorded per test
+
+CHANGES IN V3.2:
+- snapshot=True loads an HTML app once, captures its settled DOM and
+  storage, and restores that into the page of every read-only test (see
+  snapshot.py); tests that interact with the page still load it cold
+- Browsers come from launch_or_connect(), so every lane shares the
+  browser service's Chromium when one is running
+
+CHANGES IN V3.3:
+- Python tests run one per worker process with a hard wall-clock timeout
+  and CPU/memory rlimits (see isolation.py); a hanging or runaway
+  generated script fails its test instead of stalling the run
+
+CHANGES IN V3.4:
+- Python tests that take a `run_once` parameter get a RunOnce fixture
+  (see fixtures.py): the script runs once per argument set and every test
+  inspects the same recorded output
+
+CHANGES IN V3.5:
+- Each Python test gets its own clone of the workspace (reflinks where the
+  filesystem supports them, see overlay.py), so files one test writes are
+  never seen by another and parallel sharding is safe
+
+CHANGES IN V3.6:
+- run_tests(validator=...) also produces the ExecutionReport, so each
+  workspace is launched once instead of once for tests and once for
+  validation: HTML apps are observed (errors, blank check, screenshot)
+  on the same load that feeds the page snapshot; Python scripts are
+  validated from the run_once() result the tests reuse
+- The entry point comes from the shared WorkspaceIndex (see
+  workspace_index.py), the same one the validator uses
+
+CHANGES IN V3.7:
+- Trace spans for the whole run ("tests.run"), each test ("tests.case")
+  and each page load ("browser.page"); see tracing.py
+
 DEPENDENCIES:
 - ast (stdlib)
 - importlib (stdlib)
@@ -34,12 +79,30 @@ DEPENDENCIES:
 
 import ast
 import importlib.util
+import inspect
 import sys
+import tempfile
 import time
 import traceback
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .. import tracing
+from .browser import current_lane, run_on_browser_lane, run_on_browser_thread, submit_to_browser_lane
+from .browser_service import launch_or_connect
+from .fixtures import DEFAULT_TIMEOUT, RunOnce
+from .overlay import clone_tree
+from .isolation import ResourceLimits, iter_isolated_tests
+from .settle import SettleConfig, settle_page
+from .snapshot import PageSnapshot, capture_snapshot, is_read_only, restore_snapshot
+from .workspace_index import WorkspaceIndex
+
+if TYPE_CHECKING:
+    from .validator import ExecutionReport, ExecutionValidator
+
+# (position in the sorted test list, name, function)
+IndexedTest = tuple[int, str, Callable]
 
 
 @dataclass
@@ -50,6 +113,9 @@ class TestResult:
     duration_ms: float = 0.0
     error: Optional[str] = None
     screenshot: Optional[bytes] = None
+    settle_ms: Optional[float] = None  # HTML: time from DOMContentLoaded until the page went quiet
+    settle_capped: bool = False        # HTML: page was still busy at SettleConfig.max_ms
+    from_snapshot: bool = False        # HTML: ran against the restored page snapshot
 
 
 @dataclass
@@ -63,6 +129,7 @@ class TestRunResult:
     results: list[TestResult] = field(default_factory=list)
     execution_time: float = 0.0
     errors: list[str] = field(default_factory=list)
+    execution_report: Optional["ExecutionReport"] = None  # Set by run_tests(validator=...)
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
@@ -79,6 +146,9 @@ class TestRunResult:
                     "passed": r.passed,
                     "duration_ms": round(r.duration_ms, 2),
                     "error": r.error,
+                    **({"settle_ms": round(r.settle_ms, 1), "settle_capped": r.settle_capped}
+                       if r.settle_ms is not None else {}),
+                    **({"from_snapshot": True} if r.from_snapshot else {}),
                 }
                 for r in self.results
             ],
@@ -101,54 +171,87 @@ class FunctionalTestRunner:
     - Custom test fixtures and helpers
     """
 
-    # Shared Playwright browser instance
-    _playwright = None
-    _browser = None
+    # Shared Playwright instance and browser per browser lane
+    _browsers: dict[int, tuple] = {}
 
-    def __init__(self, timeout: int = 30):
+    def __init__(
+        self,
+        timeout: int = 30,
+        workers: int = 1,
+        settle: Optional[SettleConfig] = None,
+        snapshot: bool = False,
+        limits: Optional[ResourceLimits] = None,
+        isolate: bool = True,
+        clone_workspaces: bool = True,
+    ):
         """
         Initialize test runner.
 
         Args:
             timeout: Maximum seconds per test
+            workers: Browser lanes (HTML) or worker processes (Python)
+                     to shard tests across; 1 runs them serially
+            settle: Quiet period and cap for HTML page settling
+            snapshot: Load HTML apps once and run read-only tests against
+                      the restored post-load snapshot
+            limits: Per-test wall-clock, CPU and memory limits for Python
+                    tests (default: timeout seconds wall clock)
+            isolate: Run each Python test in its own worker process;
+                     False runs them in this process
+            clone_workspaces: Give each Python test a private copy of the
+                              workspace instead of the live directory
         """
         self.timeout = timeout
+        self.workers = max(1, workers)
+        self.settle = settle or SettleConfig()
+        self.snapshot = snapshot
+        self.limits = limits or ResourceLimits(wall_seconds=timeout)
+        self.isolate = isolate
+        self.clone_workspaces = clone_workspaces
 
     @classmethod
     def _get_browser(cls):
-        """Get or create shared browser instance."""
-        if cls._browser is None:
+        """Get or create the browser for the current lane (call on a lane thread)."""
+        lane = current_lane() or 0
+        if lane not in cls._browsers:
             try:
                 from playwright.sync_api import sync_playwright
-                cls._playwright = sync_playwright().start()
-                cls._browser = cls._playwright.chromium.launch(headless=True)
+                playwright = sync_playwright().start()
+                cls._browsers[lane] = (playwright, launch_or_connect(playwright))
             except ImportError:
                 return None
             except Exception:
                 return None
-        return cls._browser
+        return cls._browsers[lane][1]
 
     @classmethod
     def cleanup(cls):
-        """Clean up shared browser instance."""
-        if cls._browser is not None:
+        """Clean up every lane's browser instance."""
+        for lane in list(cls._browsers):
+            run_on_browser_lane(lane, cls._close_browser, lane)
+
+    @classmethod
+    def _close_browser(cls, lane: int):
+        """Close a lane's browser and Playwright (must run on that lane)."""
+        playwright, browser = cls._browsers.pop(lane, (None, None))
+        if browser is not None:
             try:
-                cls._browser.close()
+                browser.close()
             except Exception:
                 pass
-            cls._browser = None
-        if cls._playwright is not None:
+        if playwright is not None:
             try:
-                cls._playwright.stop()
+                playwright.stop()
             except Exception:
                 pass
-            cls._playwright = None
 
     def run_tests(
         self,
         workspace: Path,
         test_file: Path,
         allowed_tests: Optional[set[str]] = None,
+        validator: Optional["ExecutionValidator"] = None,
+        index: Optional[WorkspaceIndex] = None,
     ) -> TestRunResult:
         """
         Run all tests from a test file against workspace code.
@@ -156,12 +259,34 @@ class FunctionalTestRunner:
         Args:
             workspace: Directory containing generated code
             test_file: Path to tests.py with test functions
+            validator: Also validate execution, reusing the tests' page
+                       load or program run
+            index: Scan of the workspace (default: WorkspaceIndex.get())
 
         Returns:
-            TestRunResult with all test outcomes
+            TestRunResult with all test outcomes (and execution_report
+            when a validator is given)
         """
         workspace = Path(workspace).absolute()
         test_file = Path(test_file).absolute()
+        index = index or WorkspaceIndex.get(workspace)
+        with tracing.span("tests.run", "tests", test_file=test_file.parent.name) as span:
+            result = self._run_tests(workspace, test_file, allowed_tests, validator, index)
+            if validator is not None and result.execution_report is None:
+                # Nothing to share (no tests, no browser): validate separately
+                result.execution_report = validator.validate(workspace, index)
+            span.set(total=result.total_tests, passed=result.passed, failed=result.failed)
+        return result
+
+    def _run_tests(
+        self,
+        workspace: Path,
+        test_file: Path,
+        allowed_tests: Optional[set[str]],
+        validator: Optional["ExecutionValidator"],
+        index: WorkspaceIndex,
+    ) -> TestRunResult:
+        """run_tests() body; execution_report is set only if it was shared."""
 
         if not test_file.exists():
             return TestRunResult(
@@ -173,20 +298,9 @@ class FunctionalTestRunner:
                 errors=[f"Test file not found: {test_file}"],
             )
 
-        # Find main HTML or Python file
-        html_files = list(workspace.glob("**/*.html"))
-        python_files = list(workspace.glob("**/*.py"))
-
-        main_file = None
-        file_type = None
-
-        # Prioritize HTML files
-        if html_files:
-            main_file = self._find_main_html(html_files)
-            file_type = "html"
-        elif python_files:
-            main_file = self._find_main_python(python_files, workspace)
-            file_type = "python"
+        # Main HTML or Python file (HTML apps take priority)
+        main_file = index.entry_point
+        file_type = index.language
 
         if main_file is None:
             return TestRunResult(
@@ -211,30 +325,56 @@ class FunctionalTestRunner:
                 errors=["No test functions found in test file"],
             )
 
-        # Run tests based on file type
+        # The validator shares this launch only if it checks the same file
+        if validator is not None and validator.find_entry_point(workspace, index) != main_file:
+            validator = None
+
+        # Run tests based on file type (browser work stays on its own thread)
         if file_type == "html":
-            return self._run_html_tests(main_file, test_functions)
-        else:
-            return self._run_python_tests(main_file, workspace, test_functions)
-
-    def _find_main_html(self, files: list[Path]) -> Optional[Path]:
-        """Find main HTML entry point."""
-        priority = ["index.html", "main.html", "app.html"]
-        for name in priority:
-            for f in files:
-                if f.name == name:
-                    return f
-        return files[0] if files else None
-
-    def _find_main_python(self, files: list[Path], workspace: Path) -> Optional[Path]:
-        """Find main Python entry point."""
-        priority = ["main.py", "app.py", "index.py", "run.py", "server.py"]
-        for name in priority:
-            for f in files:
-                if f.name == name:
-                    return f
-        root_files = [f for f in files if f.parent == workspace]
-        return root_files[0] if root_files else (files[0] if files else None)
+            snapshot, errors, report = None, [], None
+            wants_snapshot = self.snapshot and any(is_read_only(func) for _, func in test_functions)
+            if validator is not None:
+                report, snapshot, error = run_on_browser_thread(
+                    self._observe_html, main_file, validator, wants_snapshot
+                )
+                if error:
+                    errors.append(error)
+            elif wants_snapshot:
+                snapshot, error = run_on_browser_thread(self._capture_snapshot, main_file)
+                if error:
+                    errors.append(error)
+            if self.workers > 1 and len(test_functions) > 1:
+                result = self._run_html_tests_parallel(main_file, test_functions, snapshot, workspace)
+            else:
+                result = run_on_browser_thread(
+                    self._run_html_tests, main_file, test_functions, snapshot, workspace
+                )
+            result.errors.extend(errors)
+            result.execution_report = report
+            return result
+        # Memoized run_once results live only as long as this run
+        with tempfile.TemporaryDirectory(prefix="vibe-fixtures-") as fixtures_dir:
+            try:
+                report = None
+                if validator is not None:
+                    # Tests calling run_once() reuse this run of the script, so it
+                    # gets the longer of the validator's and the tests' timeouts
+                    shared_run = RunOnce(
+                        workspace, main_file, Path(fixtures_dir),
+                        timeout=max(validator.timeout, DEFAULT_TIMEOUT),
+                        env=validator.python_env(),
+                    )
+                    report = validator.validate_python(main_file, workspace, run_once=shared_run)
+                if self.isolate:
+                    result = self._run_python_tests_isolated(
+                        main_file, workspace, test_file, test_functions, Path(fixtures_dir)
+                    )
+                else:
+                    result = self._run_python_tests(main_file, workspace, test_functions, Path(fixtures_dir))
+                result.execution_report = report
+                return result
+            finally:
+                RunOnce.forget(Path(fixtures_dir))
 
     def _load_test_functions(
         self,
@@ -274,196 +414,345 @@ class FunctionalTestRunner:
         self,
         html_file: Path,
         test_functions: list[tuple[str, Callable]],
+        snapshot: Optional[PageSnapshot] = None,
+        root: Optional[Path] = None,
     ) -> TestRunResult:
         """
         Run tests against an HTML file using Playwright.
 
         Each test function receives a Playwright page object.
         """
-        browser = self._get_browser()
-        if browser is None:
-            return TestRunResult(
-                total_tests=len(test_functions),
-                passed=0,
-                failed=0,
-                skipped=len(test_functions),
-                pass_rate=0.0,
-                errors=["Playwright not available - install with: pip install playwright && playwright install"],
-            )
+        start_time = time.time()
+        indexed = [(i, name, func) for i, (name, func) in enumerate(test_functions)]
+        results, error = self._run_html_shard(html_file, indexed, snapshot, root)
+        return _merge_results(len(test_functions), results, [error] if error else [], start_time)
 
-        results = []
+    def _run_html_tests_parallel(
+        self,
+        html_file: Path,
+        test_functions: list[tuple[str, Callable]],
+        snapshot: Optional[PageSnapshot] = None,
+        root: Optional[Path] = None,
+    ) -> TestRunResult:
+        """Shard tests round-robin across browser lanes and merge the results."""
         start_time = time.time()
-        passed = 0
-        failed = 0
+        shards = _shard(test_functions, self.workers)
+        futures = [
+            submit_to_browser_lane(lane, self._run_html_shard, html_file, shard, snapshot, root)
+            for lane, shard in enumerate(shards)
+        ]
 
-        file_url = f"file://{html_file.absolute()}"
-        
-        # Create a single context for all tests (faster than new browser per test)
-        context = None
-        try:
-            context = browser.new_context()
-            # Set default timeout for all operations
-            context.set_default_timeout(self.timeout * 1000)
-        except Exception as e:
-            return TestRunResult(
-                total_tests=len(test_functions),
-                passed=0,
-                failed=0,
-                skipped=len(test_functions),
-                pass_rate=0.0,
-                errors=[f"Failed to create browser context: {e}"],
-            )
+        results = []
+        errors = []
+        for future in futures:
+            shard_results, error = future.result()
+            results.extend(shard_results)
+            if error and error not in errors:
+                errors.append(error)
+        return _merge_results(len(test_functions), results, errors, start_time)
+
+    def _run_html_shard(
+        self,
+        html_file: Path,
+        tests: list[IndexedTest],
+        snapshot: Optional[PageSnapshot] = None,
+        root: Optional[Path] = None,
+    ) -> tuple[list[tuple[int, TestResult]], Optional[str]]:
+        """
+        Run some tests on the current browser lane.
 
-        for name, func in test_functions:
-            test_start = time.time()
-            page = None
-            
-            try:
-                # Create fresh page for each test
-                page = context.new_page()
-                
-                # Use 'load' instead of 'networkidle' - much faster and more reliable
-                page.goto(file_url, wait_until="load", timeout=10000)
+        Read-only tests run against snapshot when one is given; the rest
+        load the app cold.
 
-                # Brief wait for JS initialization (reduced from 500ms)
-                page.wait_for_timeout(200)
+        Returns:
+            ((index, result) per test, error if the browser was unavailable)
+        """
+        browser = self._get_browser()
+        if browser is None:
+            return [], "Playwright not available - install with: pip install playwright && playwright install"
 
-                # Run the test
-                func(page)
+        file_url = f"file://{html_file.absolute()}"
+        init_script = self.settle.init_script()
+        results = []
+        for index, name, func in tests:
+            context = None
+            settled = None
+            restored = snapshot is not None and is_read_only(func)
+
+            def run_test(func=func):
+                nonlocal context, settled
+                # Fresh context per test: no storage or cookies leak between tests
+                context = browser.new_context()
+                context.set_default_timeout(self.timeout * 1000)
+                if restored:
+                    # Static copy of the settled page: nothing left to settle
+                    func(restore_snapshot(context, snapshot, html_file, root))
+                    return
+                context.add_init_script(init_script)
+                page = context.new_page()
 
-                # Test passed
-                duration = (time.time() - test_start) * 1000
-                results.append(TestResult(
-                    name=name,
-                    passed=True,
-                    duration_ms=duration,
-                ))
-                passed += 1
-
-            except AssertionError as e:
-                duration = (time.time() - test_start) * 1000
-                results.append(TestResult(
-                    name=name,
-                    passed=False,
-                    duration_ms=duration,
-                    error=str(e),
-                ))
-                failed += 1
+                with tracing.span("browser.page", "browser", file=html_file.name, snapshot=False):
+                    page.goto(file_url, wait_until="domcontentloaded", timeout=10000)
 
-            except Exception as e:
-                duration = (time.time() - test_start) * 1000
-                error_msg = str(e)
-                # Truncate long timeout messages
-                if len(error_msg) > 200:
-                    error_msg = error_msg[:200] + "..."
-                results.append(TestResult(
-                    name=name,
-                    passed=False,
-                    duration_ms=duration,
-                    error=f"{type(e).__name__}: {error_msg}",
-                ))
-                failed += 1
+                    # Wait for JS initialization to go quiet rather than a fixed sleep
+                    settled = settle_page(page, self.settle)
 
+                func(page)
+
+            try:
+                result = _timed_test(name, run_test, truncate_errors=True)
+                if settled is not None:
+                    result.settle_ms = settled.settle_ms
+                    result.settle_capped = settled.capped
+                result.from_snapshot = restored
+                results.append((index, result))
             finally:
-                if page:
+                if context is not None:
                     try:
-                        page.close()
+                        context.close()
                     except Exception:
                         pass
-        
-        # Clean up context
-        if context:
-            try:
-                context.close()
-            except Exception:
-                pass
+        return results, None
 
-        total_time = time.time() - start_time
-        total = len(test_functions)
-        pass_rate = passed / total if total > 0 else 0.0
-
-        return TestRunResult(
-            total_tests=total,
-            passed=passed,
-            failed=failed,
-            skipped=0,
-            pass_rate=pass_rate,
-            results=results,
-            execution_time=total_time,
-        )
+    def _capture_snapshot(self, html_file: Path) -> tuple[Optional[PageSnapshot], Optional[str]]:
+        """
+        Load an app cold, let it settle and capture its state.
+
+        Returns:
+            (snapshot, None), or (None, error) so every test runs cold
+        """
+        browser = self._get_browser()
+        if browser is None:
+            return None, None  # Reported once by the test shards
+        context = None
+        try:
+            context = browser.new_context()
+            context.set_default_timeout(self.timeout * 1000)
+            context.add_init_script(self.settle.init_script())
+            page = context.new_page()
+            start = time.time()
+            with tracing.span("browser.page", "browser", file=html_file.name, snapshot=False):
+                page.goto(f"file://{html_file.absolute()}", wait_until="domcontentloaded", timeout=10000)
+                settle_page(page, self.settle)
+            snapshot = capture_snapshot(page)
+            snapshot.capture_ms = (time.time() - start) * 1000
+            return snapshot, None
+        except Exception as e:
+            return None, f"Page snapshot failed, all tests loaded cold: {type(e).__name__}: {str(e)[:200]}"
+        finally:
+            if context is not None:
+                try:
+                    context.close()
+                except Exception:
+                    pass
+
+    def _observe_html(
+        self,
+        html_file: Path,
+        validator: "ExecutionValidator",
+        capture: bool,
+    ) -> tuple[Optional["ExecutionReport"], Optional[PageSnapshot], Optional[str]]:
+        """
+        Load an app once for the validator and, if capture, the snapshot.
+
+        Returns:
+            (report, snapshot, error); report is None when no browser is
+            available, leaving validation to the validator itself
+        """
+        browser = self._get_browser()
+        if browser is None:
+            return None, None, None
+        context = None
+        try:
+            context = browser.new_context()
+            context.set_default_timeout(self.timeout * 1000)
+            context.add_init_script(self.settle.init_script())
+            page = context.new_page()
+            start = time.time()
+            report = validator.observe_page(page, html_file)
+            if not capture:
+                return report, None, None
+            if report.exit_code == -1:
+                return report, None, "Page snapshot skipped, the app failed to load: all tests loaded cold"
+            try:
+                settle_page(page, self.settle)
+                snapshot = capture_snapshot(page)
+            except Exception as e:
+                return report, None, (
+                    f"Page snapshot failed, all tests loaded cold: {type(e).__name__}: {str(e)[:200]}"
+                )
+            snapshot.capture_ms = (time.time() - start) * 1000
+            return report, snapshot, None
+        except Exception:
+            return None, None, None  # Could not even open a page: validate separately
+        finally:
+            if context is not None:
+                try:
+                    context.close()
+                except Exception:
+                    pass
 
     def _run_python_tests(
         self,
         python_file: Path,
         workspace: Path,
         test_functions: list[tuple[str, Callable]],
+        fixtures_dir: Optional[Path] = None,
     ) -> TestRunResult:
         """
         Run tests against a Python script.
 
-        Each test function receives the workspace path and main file path.
+        Each test function receives the workspace path and main file path
+        (and a RunOnce fixture if it asks for `run_once`).
+        """
+        start_time = time.time()
+        results = [
+            (i, _timed_test(name, _python_test_call(
+                func, workspace, python_file, fixtures_dir, self.clone_workspaces,
+            )))
+            for i, (name, func) in enumerate(test_functions)
+        ]
+        return _merge_results(len(test_functions), results, [], start_time)
+
+    def _run_python_tests_isolated(
+        self,
+        python_file: Path,
+        workspace: Path,
+        test_file: Path,
+        test_functions: list[tuple[str, Callable]],
+        fixtures_dir: Optional[Path] = None,
+    ) -> TestRunResult:
         """
-        import subprocess
+        Run each test in its own worker process, up to `workers` at once.
 
-        results = []
+        Workers re-import the test file, so a test that changes global state
+        (cwd, environment, module globals) cannot affect the others. Falls
+        back to running in-process if workers cannot be started.
+        """
         start_time = time.time()
-        passed = 0
-        failed = 0
+        names = [name for name, _ in test_functions]
+        try:
+            results = list(iter_isolated_tests(
+                test_file, names, workspace, python_file, self.limits, self.workers, fixtures_dir,
+                self.clone_workspaces,
+            ))
+        except OSError as e:
+            result = self._run_python_tests(python_file, workspace, test_functions, fixtures_dir)
+            result.errors.append(f"Worker processes unavailable, ran in-process: {e}")
+            return result
 
-        for name, func in test_functions:
-            test_start = time.time()
+        return _merge_results(len(names), results, [], start_time)
 
-            try:
-                # Run the test, passing workspace and file info
-                func(workspace, python_file)
-
-                duration = (time.time() - test_start) * 1000
-                results.append(TestResult(
-                    name=name,
-                    passed=True,
-                    duration_ms=duration,
-                ))
-                passed += 1
-
-            except AssertionError as e:
-                duration = (time.time() - test_start) * 1000
-                results.append(TestResult(
-                    name=name,
-                    passed=False,
-                    duration_ms=duration,
-                    error=str(e),
-                ))
-                failed += 1
 
-            except Exception as e:
-                duration = (time.time() - test_start) * 1000
-                results.append(TestResult(
-                    name=name,
-                    passed=False,
-                    duration_ms=duration,
-                    error=f"{type(e).__name__}: {str(e)}",
-                ))
-                failed += 1
-
-        total_time = time.time() - start_time
-        total = len(test_functions)
-        pass_rate = passed / total if total > 0 else 0.0
-
-        return TestRunResult(
-            total_tests=total,
-            passed=passed,
-            failed=failed,
-            skipped=0,
-            pass_rate=pass_rate,
-            results=results,
-            execution_time=total_time,
+def _python_test_call(
+    func: Callable,
+    workspace: Path,
+    python_file: Path,
+    fixtures_dir: Optional[Path],
+    clone: bool = True,
+) -> Callable[[], None]:
+    """
+    Bind a Python test's arguments, adding run_once if it takes one.
+
+    With clone, the test gets its own copy of the workspace (see
+    overlay.py); run_once still keys on, and copies from, the original.
+    """
+    kwargs = {}
+    try:
+        wants_fixture = "run_once" in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        wants_fixture = False
+    if wants_fixture:
+        if fixtures_dir is None:
+            fixtures_dir = Path(tempfile.mkdtemp(prefix="vibe-fixtures-"))
+        kwargs["run_once"] = RunOnce(workspace, python_file, fixtures_dir)
+    if not clone:
+        return lambda: func(workspace, python_file, **kwargs)
+
+    def call():
+        with tempfile.TemporaryDirectory(prefix="vibe-ws-") as scratch:
+            copy = Path(scratch) / workspace.name
+            clone_tree(workspace, copy)
+            try:
+                main_file = copy / python_file.relative_to(workspace)
+            except ValueError:
+                main_file = python_file  # Entry point outside the workspace
+            func(copy, main_file, **kwargs)
+
+    return call
+
+
+def _timed_test(name: str, call: Callable[[], None], truncate_errors: bool = False) -> TestResult:
+    """Run one test callable and record its outcome and duration."""
+    with tracing.span("tests.case", "tests", test=name) as span:
+        result = _run_timed(name, call, truncate_errors)
+        span.set(passed=result.passed)
+    return result
+
+
+def _run_timed(name: str, call: Callable[[], None], truncate_errors: bool) -> TestResult:
+    """_timed_test() without the trace span."""
+    test_start = time.time()
+    try:
+        call()
+    except AssertionError as e:
+        return TestResult(
+            name=name,
+            passed=False,
+            duration_ms=(time.time() - test_start) * 1000,
+            error=str(e),
+        )
+    except Exception as e:
+        error_msg = str(e)
+        # Truncate long timeout messages
+        if truncate_errors and len(error_msg) > 200:
+            error_msg = error_msg[:200] + "..."
+        return TestResult(
+            name=name,
+            passed=False,
+            duration_ms=(time.time() - test_start) * 1000,
+            error=f"{type(e).__name__}: {error_msg}",
         )
+    return TestResult(name=name, passed=True, duration_ms=(time.time() - test_start) * 1000)
+
+
+def _shard(test_functions: list[tuple[str, Callable]], workers: int) -> list[list[IndexedTest]]:
+    """Deal tests round-robin into at most `workers` non-empty shards."""
+    count = min(workers, len(test_functions))
+    shards: list[list[IndexedTest]] = [[] for _ in range(count)]
+    for i, (name, func) in enumerate(test_functions):
+        shards[i % count].append((i, name, func))
+    return shards
+
+
+def _merge_results(
+    total: int,
+    results: list[tuple[int, TestResult]],
+    errors: list[str],
+    start_time: float,
+) -> TestRunResult:
+    """Build a TestRunResult in test order; tests with no result count as skipped."""
+    ordered = [result for _, result in sorted(results, key=lambda item: item[0])]
+    passed = sum(1 for r in ordered if r.passed)
+    return TestRunResult(
+        total_tests=total,
+        passed=passed,
+        failed=len(ordered) - passed,
+        skipped=total - len(ordered),
+        pass_rate=passed / total if total > 0 else 0.0,
+        results=ordered,
+        execution_time=time.time() - start_time,
+        errors=errors,
+    )
 
 
 def run_functional_tests(
     workspace: Path,
     test_file: Path,
     timeout: int = 30,
+    workers: int = 1,
+    settle: Optional[SettleConfig] = None,
+    snapshot: bool = False,
 ) -> TestRunResult:
     """
     Convenience function to run functional tests.
@@ -472,9 +761,12 @@ def run_functional_tests(
         workspace: Directory containing generated code
         test_file: Path to tests.py
         timeout: Timeout per test in seconds
+        workers: Browser lanes or worker processes to shard tests across
+        settle: Quiet period and cap for HTML page settling
+        snapshot: Run read-only HTML tests against a restored page snapshot
 
     Returns:
         TestRunResult with all outcomes
     """
-    runner = FunctionalTestRunner(timeout=timeout)
+    runner = FunctionalTestRunner(timeout=timeout, workers=workers, settle=settle, snapshot=snapshot)
     return runner.run_tests(workspace, test_file)
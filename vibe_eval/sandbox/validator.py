@@ -12,8 +12,8 @@ INPUT:
 OUTPUT:
 - ExecutionReport: Dataclass with execution status, errors, and details
 
-VERSION: 1.0
-LAST UPDATED: 2026-01-04
+VERSION: 1.4
+LAST UPDATED: 2026-10-16
 
 DESCRIPTION:
 This module provides runtime validation for generated code. It:
@@ -21,6 +21,30 @@ This module provides runtime validation for generated code. It:
 2. Validates HTML files load without JS errors using Playwright
 3. Extracts and validates imports against Python stdlib whitelist
 
+CHANGES IN V1.1:
+- The browser comes from launch_or_connect(): the shared browser service
+  when one is running, otherwise a local Chromium
+- Pages are closed on validation errors too
+
+CHANGES IN V1.2:
+- Pieces the functional test phase reuses so a workspace is launched once
+  (FunctionalTestRunner.run_tests(validator=...)):
+  - find_entry_point(): the file validate() would check
+  - observe_page(): error capture, blank check and screenshot on a page
+    the caller provides
+  - validate_python(run_once=...): report on a memoized run the tests
+    share instead of starting the script again
+
+CHANGES IN V1.3:
+- The entry point comes from the shared WorkspaceIndex, so the validator
+  checks the same file as the test runner: an HTML app when the workspace
+  has one, unless a main.py/app.py/... exists (previously any Python file
+  took precedence)
+
+CHANGES IN V1.4:
+- Trace spans for validate(), validate_python(), observe_page() and its
+  page load ("browser.page"); see tracing.py
+
 DEPENDENCIES:
 - ast (stdlib)
 - subprocess (stdlib)
@@ -36,7 +60,12 @@ import subprocess
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+
+from .. import tracing
+from .browser import run_on_browser_thread
+from .browser_service import launch_or_connect
+from .workspace_index import WorkspaceIndex
 
 
 # Complete Python 3.11 stdlib modules list
@@ -152,7 +181,7 @@ class ExecutionValidator:
             try:
                 from playwright.sync_api import sync_playwright
                 cls._playwright = sync_playwright().start()
-                cls._browser = cls._playwright.chromium.launch(headless=True)
+                cls._browser = launch_or_connect(cls._playwright)
             except ImportError:
                 return None
             except Exception:
@@ -166,6 +195,13 @@ class ExecutionValidator:
 
         Call this at end of eval run to release resources.
         """
+        if cls._browser is None and cls._playwright is None:
+            return
+        run_on_browser_thread(cls._close_browser)
+
+    @classmethod
+    def _close_browser(cls):
+        """Close browser and Playwright (must run on the browser thread)."""
         if cls._browser is not None:
             try:
                 cls._browser.close()
@@ -179,7 +215,7 @@ class ExecutionValidator:
                 pass
             cls._playwright = None
 
-    def validate(self, workspace_path: Path) -> ExecutionReport:
+    def validate(self, workspace_path: Path, index: Optional[WorkspaceIndex] = None) -> ExecutionReport:
         """
         Validate all code files in workspace.
 
@@ -187,6 +223,7 @@ class ExecutionValidator:
 
         Args:
             workspace_path: Directory containing generated code
+            index: Scan of the workspace (default: WorkspaceIndex.get())
 
         Returns:
             ExecutionReport with combined validation results
@@ -194,22 +231,15 @@ class ExecutionValidator:
         # V2 Fix: Always use absolute paths to avoid path doubling
         workspace = Path(workspace_path).absolute()
 
-        # Find primary entry point
-        python_files = list(workspace.glob("**/*.py"))
-        html_files = list(workspace.glob("**/*.html"))
-
-        # Priority: main.py > app.py > index.py > first .py
-        # For HTML: index.html > first .html
-
-        if python_files:
-            main_file = self._find_main_python(python_files, workspace)
-            if main_file:
-                return self.validate_python(main_file, workspace)
-
-        if html_files:
-            main_file = self._find_main_html(html_files, workspace)
-            if main_file:
-                return self.validate_html(main_file)
+        main_file = self.find_entry_point(workspace, index)
+        if main_file is not None:
+            with tracing.span("validator.validate", "validator", file=main_file.name) as span:
+                if main_file.suffix == ".py":
+                    report = self.validate_python(main_file, workspace)
+                else:
+                    report = self.validate_html(main_file)
+                span.set(executed=report.executed, errors=len(report.errors))
+            return report
 
         # No files to validate
         return ExecutionReport(
@@ -218,44 +248,43 @@ class ExecutionValidator:
             file_type="none"
         )
 
-    def _find_main_python(self, files: list[Path], workspace: Path) -> Optional[Path]:
-        """Find the main Python entry point."""
-        priority = ["main.py", "app.py", "index.py", "run.py", "server.py"]
-
-        for name in priority:
-            for f in files:
-                if f.name == name:
-                    return f
-
-        # Return first file at root level, or just first file
-        root_files = [f for f in files if f.parent == workspace]
-        return root_files[0] if root_files else (files[0] if files else None)
-
-    def _find_main_html(self, files: list[Path], workspace: Path = None) -> Optional[Path]:
-        """Find the main HTML entry point."""
-        priority = ["index.html", "main.html", "app.html"]
-
-        for name in priority:
-            for f in files:
-                if f.name == name:
-                    return f
-
-        return files[0] if files else None
-
-    def validate_python(self, filepath: Path, workspace: Path = None) -> ExecutionReport:
+    def find_entry_point(
+        self, workspace_path: Path, index: Optional[WorkspaceIndex] = None
+    ) -> Optional[Path]:
+        """The file validate() checks (see WorkspaceIndex.validation_entry_point)."""
+        return (index or WorkspaceIndex.get(workspace_path)).validation_entry_point
+
+    def validate_python(
+        self,
+        filepath: Path,
+        workspace: Path = None,
+        run_once: Optional[Callable] = None,
+    ) -> ExecutionReport:
         """
         Validate a Python script by running it.
 
         Args:
             filepath: Path to Python file
             workspace: Working directory for execution
+            run_once: RunOnce fixture for the script; its no-argument run is
+                      reported (and shared with the tests) instead of
+                      running the script here. A run longer than this
+                      validator's timeout is reported as timed out
 
         Returns:
             ExecutionReport with execution results
         """
+        with tracing.span("validator.python", "validator", shared_run=run_once is not None) as span:
+            report = self._validate_python(Path(filepath), workspace, run_once)
+            span.set(executed=report.executed, exit_code=report.exit_code)
+        return report
+
+    def _validate_python(
+        self, filepath: Path, workspace: Optional[Path], run_once: Optional[Callable]
+    ) -> ExecutionReport:
+        """validate_python() without the trace span."""
         import time
 
-        filepath = Path(filepath)
         workspace = workspace or filepath.parent
 
         errors = []
@@ -286,6 +315,8 @@ class ExecutionValidator:
                 )
 
         # Step 3: Try to run the script
+        if run_once is not None:
+            return self._report_shared_run(run_once, illegal)
         start_time = time.time()
         try:
             result = subprocess.run(
@@ -294,35 +325,35 @@ class ExecutionValidator:
                 text=True,
                 timeout=self.timeout,
                 cwd=str(workspace),
-                env={**subprocess.os.environ, "PYTHONUNBUFFERED": "1"}
+                env=self.python_env()
             )
             elapsed = time.time() - start_time
-
-            # Check for import errors in stderr (ModuleNotFoundError)
-            if "ModuleNotFoundError" in result.stderr:
-                errors.append(f"Missing module: {result.stderr.split('ModuleNotFoundError:')[1].split(chr(10))[0].strip()}")
-
-            return ExecutionReport(
-                executed=(result.returncode == 0 and len(illegal) == 0),
-                exit_code=result.returncode,
-                stdout=result.stdout,
-                stderr=result.stderr,
-                execution_time=elapsed,
-                errors=errors if result.returncode != 0 else [],
-                illegal_imports=illegal,
-                file_type="python"
+            return self._python_report(
+                result.returncode, result.stdout, result.stderr, elapsed, errors, illegal
             )
 
         except subprocess.TimeoutExpired:
             elapsed = time.time() - start_time
+            return self._python_timeout_report(elapsed, illegal)
+        except Exception as e:
             return ExecutionReport(
                 executed=False,
                 exit_code=-1,
-                errors=[f"Execution timed out after {self.timeout}s"],
-                execution_time=elapsed,
+                errors=[f"Execution error: {str(e)}"],
                 illegal_imports=illegal,
                 file_type="python"
             )
+
+    def _report_shared_run(self, run_once: Callable, illegal: list[str]) -> ExecutionReport:
+        """Report on the script's no-argument run_once() result."""
+        import time
+
+        errors = [f"Illegal imports detected: {', '.join(illegal)}"] if illegal else []
+        start_time = time.time()
+        try:
+            run = run_once()
+        except subprocess.TimeoutExpired:
+            return self._python_timeout_report(time.time() - start_time, illegal)
         except Exception as e:
             return ExecutionReport(
                 executed=False,
@@ -331,12 +362,57 @@ class ExecutionValidator:
                 illegal_imports=illegal,
                 file_type="python"
             )
+        elapsed = run.duration_ms / 1000
+        if elapsed > self.timeout:
+            return self._python_timeout_report(elapsed, illegal)  # The run's timeout can be longer
+        return self._python_report(run.returncode, run.stdout, run.stderr, elapsed, errors, illegal)
+
+    def python_env(self) -> dict[str, str]:
+        """Environment validated scripts run in (unbuffered, so a killed run keeps its output)."""
+        return {**subprocess.os.environ, "PYTHONUNBUFFERED": "1"}
+
+    def _python_report(
+        self,
+        returncode: int,
+        stdout: str,
+        stderr: str,
+        elapsed: float,
+        errors: list[str],
+        illegal: list[str],
+    ) -> ExecutionReport:
+        """Report for a script run that finished."""
+        # Check for import errors in stderr (ModuleNotFoundError)
+        if "ModuleNotFoundError" in stderr:
+            errors.append(f"Missing module: {stderr.split('ModuleNotFoundError:')[1].split(chr(10))[0].strip()}")
+
+        return ExecutionReport(
+            executed=(returncode == 0 and len(illegal) == 0),
+            exit_code=returncode,
+            stdout=stdout,
+            stderr=stderr,
+            execution_time=elapsed,
+            errors=errors if returncode != 0 else [],
+            illegal_imports=illegal,
+            file_type="python"
+        )
+
+    def _python_timeout_report(self, elapsed: float, illegal: list[str]) -> ExecutionReport:
+        return ExecutionReport(
+            executed=False,
+            exit_code=-1,
+            errors=[f"Execution timed out after {self.timeout}s"],
+            execution_time=elapsed,
+            illegal_imports=illegal,
+            file_type="python"
+        )
 
     def validate_html(self, filepath: Path) -> ExecutionReport:
         """
         Validate an HTML file by loading it in a headless browser.
 
         V2: Uses shared browser instance for faster validation.
+        Browser work runs on the shared browser thread so validation is
+        safe to call from concurrent runner workers.
 
         Args:
             filepath: Path to HTML file
@@ -344,8 +420,10 @@ class ExecutionValidator:
         Returns:
             ExecutionReport with browser validation results
         """
-        import time
+        return run_on_browser_thread(self._validate_html, filepath)
 
+    def _validate_html(self, filepath: Path) -> ExecutionReport:
+        """Browser-thread implementation of validate_html."""
         filepath = Path(filepath)
 
         if not filepath.exists():
@@ -361,15 +439,48 @@ class ExecutionValidator:
             # Playwright not available - do basic validation only
             return self._validate_html_basic(filepath)
 
+        page = None
+        try:
+            # V2: Create new page on shared browser (much faster than launching browser)
+            page = browser.new_page()
+            return self.observe_page(page, filepath)
+        except Exception as e:
+            return self._browser_error_report(e, 0.0)
+        finally:
+            if page is not None:
+                # A page left open would hold a browser service lease
+                try:
+                    page.close()
+                except Exception:
+                    pass
+
+    def observe_page(self, page, filepath: Path) -> ExecutionReport:
+        """
+        Load an HTML file on a fresh page and report what went wrong.
+
+        Collects JS page errors and console errors, checks for a blank page
+        (fast_fail) and takes a screenshot. The page is left open and loaded
+        so the caller can keep using it.
+
+        Args:
+            page: Playwright page that has not been navigated yet
+            filepath: Path to HTML file
+        """
+        with tracing.span("validator.observe_page", "validator", file=Path(filepath).name) as span:
+            report = self._observe_page(page, filepath)
+            span.set(executed=report.executed, errors=len(report.errors))
+        return report
+
+    def _observe_page(self, page, filepath: Path) -> ExecutionReport:
+        """observe_page() without the trace span."""
+        import time
+
         errors = []
         console_errors = []
         screenshot = None
         start_time = time.time()
 
         try:
-            # V2: Create new page on shared browser (much faster than launching browser)
-            page = browser.new_page()
-
             # Capture JS errors
             def handle_error(error):
                 console_errors.append(f"JS Error: {str(error)}")
@@ -384,7 +495,8 @@ class ExecutionValidator:
             # Load the file
             file_url = f"file://{filepath.absolute()}"
             wait_until = "domcontentloaded" if self.fast_fail else "networkidle"
-            page.goto(file_url, wait_until=wait_until, timeout=self.timeout * 1000)
+            with tracing.span("browser.page", "browser", file=filepath.name, snapshot=False):
+                page.goto(file_url, wait_until=wait_until, timeout=self.timeout * 1000)
 
             # Optional quick empty-page check
             if self.fast_fail:
@@ -398,9 +510,6 @@ class ExecutionValidator:
             if not self.fast_fail:
                 screenshot = page.screenshot()
 
-            # V2: Close page but NOT browser (reuse browser)
-            page.close()
-
             elapsed = time.time() - start_time
 
             if console_errors:
@@ -426,14 +535,16 @@ class ExecutionValidator:
             )
 
         except Exception as e:
-            elapsed = time.time() - start_time
-            return ExecutionReport(
-                executed=False,
-                exit_code=-1,
-                errors=[f"Browser validation error: {str(e)}"],
-                execution_time=elapsed,
-                file_type="html"
-            )
+            return self._browser_error_report(e, time.time() - start_time)
+
+    def _browser_error_report(self, error: Exception, elapsed: float) -> ExecutionReport:
+        return ExecutionReport(
+            executed=False,
+            exit_code=-1,
+            errors=[f"Browser validation error: {str(error)}"],
+            execution_time=elapsed,
+            file_type="html"
+        )
 
     def _validate_html_basic(self, filepath: Path) -> ExecutionReport:
         """
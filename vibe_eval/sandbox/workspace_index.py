@@ -0,0 +1,199 @@
+"""
+=============================================================================
+SCRIPT NAME: workspace_index.py
+=============================================================================
+
+One scan of a generated workspace, shared by every evaluation stage.
+
+VERSION: 1.1
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+The validator, test runner, static analyzer, judges and lint tool each
+globbed the workspace and re-read the same files, and disagreed on which
+file is the entry point (the validator preferred Python, the test runner
+HTML). WorkspaceIndex walks the workspace once and records:
+
+- Every file with its size and mtime, in a stable order (shallow first)
+- Text contents and SHA-256 hashes, read on first use and then cached
+- The entry point and its language, by one set of rules:
+  an HTML app if there is one (index.html > main.html > app.html > first
+  .html), otherwise a Python script (main.py > app.py > index.py >
+  run.py > server.py > first root-level .py > first .py)
+
+EvalRunner publishes an index once a workspace is generated; stages call
+WorkspaceIndex.get(workspace) and receive it instead of walking again.
+Without a published index get() scans afresh, so standalone use always
+sees the current files.
+
+CHANGES IN V1.1:
+- validation_entry_point: the file the execution validator runs. A
+  priority Python script (main.py, app.py, ...) wins over HTML there, so
+  a Python case that writes an HTML report still has its script executed
+
+=============================================================================
+"""
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .overlay import SKIP_DIRS
+
+HTML_PRIORITY = ["index.html", "main.html", "app.html"]
+PYTHON_PRIORITY = ["main.py", "app.py", "index.py", "run.py", "server.py"]
+
+# Larger files are read from disk each time instead of kept in memory
+MAX_CACHED_BYTES = 1_000_000
+
+_published: dict[str, "WorkspaceIndex"] = {}
+_published_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class IndexedFile:
+    """One file found by the scan."""
+    path: Path       # Absolute
+    relative: str    # POSIX path relative to the workspace
+    size: int
+    mtime_ns: int
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix
+
+
+class WorkspaceIndex:
+    """Files, cached contents and entry point of one workspace."""
+
+    def __init__(self, root: Path, files: list[IndexedFile]):
+        self.root = root
+        self._files = files
+        self._by_path = {f.path: f for f in files}
+        self._texts: dict[Path, str] = {}
+        self._hashes: dict[Path, str] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, workspace: Path) -> "WorkspaceIndex":
+        """Walk workspace once (symlinked directories are not followed)."""
+        root = Path(workspace).absolute()
+        files = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for name in filenames:
+                path = Path(dirpath) / name
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue  # Dangling symlink
+                if not path.is_file():
+                    continue
+                files.append(IndexedFile(path, path.relative_to(root).as_posix(), stat.st_size, stat.st_mtime_ns))
+        files.sort(key=lambda f: (f.relative.count("/"), f.relative))
+        return cls(root, files)
+
+    @classmethod
+    def scan(cls, workspace: Path) -> "WorkspaceIndex":
+        """Build an index and publish it for later get() calls."""
+        index = cls.build(workspace)
+        with _published_lock:
+            _published[str(index.root)] = index
+        return index
+
+    @classmethod
+    def get(cls, workspace: Path) -> "WorkspaceIndex":
+        """The published index for workspace, or a fresh unpublished scan."""
+        with _published_lock:
+            index = _published.get(str(Path(workspace).absolute()))
+        return index if index is not None else cls.build(workspace)
+
+    @classmethod
+    def forget(cls, workspace: Optional[Path] = None):
+        """Drop the published index for workspace (all indexes if None)."""
+        with _published_lock:
+            if workspace is None:
+                _published.clear()
+            else:
+                _published.pop(str(Path(workspace).absolute()), None)
+
+    def files(self, *suffixes: str) -> list[Path]:
+        """Absolute paths of all files, or of those with one of suffixes."""
+        return [f.path for f in self._files if not suffixes or f.suffix in suffixes]
+
+    def entries(self) -> list[IndexedFile]:
+        return list(self._files)
+
+    def read_text(self, path: Path) -> str:
+        """File contents (cached); raises like Path.read_text()."""
+        path = self._resolve(path)
+        with self._lock:
+            text = self._texts.get(path)
+        if text is not None:
+            return text
+        text = path.read_text()
+        entry = self._by_path.get(path)
+        if entry is not None and entry.size <= MAX_CACHED_BYTES:
+            with self._lock:
+                self._texts[path] = text
+        return text
+
+    def sha256(self, path: Path) -> str:
+        """Hex SHA-256 of a file's bytes (cached)."""
+        path = self._resolve(path)
+        with self._lock:
+            digest = self._hashes.get(path)
+        if digest is None:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            with self._lock:
+                self._hashes[path] = digest
+        return digest
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of every file's path and contents."""
+        digest = hashlib.sha256()
+        for f in self._files:
+            digest.update(f"{f.relative}\0{self.sha256(f.path)}\n".encode())
+        return digest.hexdigest()
+
+    @property
+    def entry_point(self) -> Optional[Path]:
+        """The file every stage treats as "main" (None if there is none)."""
+        html = self.files(".html")
+        if html:
+            return _by_priority(html, HTML_PRIORITY) or html[0]
+        python = self.files(".py")
+        if python:
+            root_level = [p for p in python if p.parent == self.root]
+            return _by_priority(python, PYTHON_PRIORITY) or (root_level or python)[0]
+        return None
+
+    @property
+    def validation_entry_point(self) -> Optional[Path]:
+        """The file ExecutionValidator runs: a priority Python script, else entry_point."""
+        return _by_priority(self.files(".py"), PYTHON_PRIORITY) or self.entry_point
+
+    @property
+    def language(self) -> Optional[str]:
+        """'html', 'python' or None, from the entry point."""
+        entry = self.entry_point
+        if entry is None:
+            return None
+        return "html" if entry.suffix == ".html" else "python"
+
+    def _resolve(self, path: Path) -> Path:
+        path = Path(path)
+        return path if path.is_absolute() else self.root / path
+
+
+def _by_priority(files: list[Path], names: list[str]) -> Optional[Path]:
+    """First file (shallowest) named like the earliest name in names."""
+    for name in names:
+        for f in files:
+            if f.name == name:
+                return f
+    return None
@@ -0,0 +1,552 @@
+"""
+=============================================================================
+SCRIPT NAME: zygote.py
+=============================================================================
+
+Fork server that runs an agent's `python ...` commands without a cold
+interpreter start.
+
+VERSION: 1.1
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+Agents run `python main.py` or `python -m unittest` dozens of times per
+session and every command paid for /bin/sh plus a fresh interpreter. With
+a PythonZygote the executor hands plain Python commands to a pre-started
+interpreter that has already imported the common stdlib modules:
+
+- The zygote (this module run with -m) listens on a Unix socket and forks
+  a monitor per request; the monitor forks the command's process and
+  reports its exit code, so the zygote itself stays single-threaded
+- The command's process gets its own session, the workspace as cwd, the
+  executor's environment, /dev/null as stdin and pipes from the client
+  (passed over the socket) as stdout/stderr;
+  it runs the script, module (-m) or code (-c) like the interpreter's
+  main would, including exit codes, tracebacks, atexit handlers and
+  waiting for non-daemon threads
+- The client streams the pipes through capture.pump() and kills the
+  process group on timeout or when the output budget is exceeded
+
+Only commands that need no shell are forked: `python`/`python3` resolving
+to this interpreter, optionally -u/-B, then a script, -m or -c, with no
+pipes, redirects, variables or globs. Everything else (and everything on
+platforms without fork) keeps going through the shell.
+
+The client measures startup overhead per command (request sent until the
+child is about to run user code) and, once, a cold `python -c pass`
+through the shell for comparison.
+
+CHANGES IN V1.1:
+- stdout/stderr are pipes streamed into bounded captures instead of temp
+  files read back whole, with the executor's output byte budget
+- Optional per-command rlimits (the executor's ResourceLimits)
+
+=============================================================================
+"""
+
+import atexit
+import builtins
+import importlib
+import importlib.machinery
+import importlib.util
+import json
+import os
+import runpy
+import shlex
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import types
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .capture import EOF, OVER_BUDGET, TIMEOUT, BoundedCapture, pump
+from .isolation import ResourceLimits
+
+# Imported once in the zygote; forked commands find them (and whatever they
+# imported) in sys.modules unless the command's directory shadows them
+# (_forget_shadowed_modules)
+PRELOAD_MODULES = [
+    "argparse", "collections", "csv", "dataclasses", "datetime", "decimal",
+    "functools", "itertools", "json", "logging", "math", "pathlib", "random",
+    "re", "sqlite3", "statistics", "string", "subprocess", "textwrap",
+    "typing", "unittest", "unittest.mock", "urllib.parse", "uuid",
+]
+
+# Set by the zygote: modules a cold interpreter loads at startup, which a
+# workspace file cannot shadow
+_startup_modules: frozenset = frozenset()
+
+# Interpreter options a forked command may use
+ALLOWED_FLAGS = {"-u", "-B"}
+
+# Outside quotes any of these means the command needs a real shell;
+# inside double quotes the shell still expands the second set
+SHELL_CHARACTERS = set("|&;<>()$`*?[]{}~!#\n\\")
+DOUBLE_QUOTED_SHELL_CHARACTERS = set("$`\\!\n")
+
+# Seconds to wait for the zygote to come up / for a fork to start
+START_TIMEOUT = 10.0
+
+
+class ZygoteError(RuntimeError):
+    """The zygote could not run a command; the caller should use the shell."""
+
+
+@dataclass
+class ZygoteRun:
+    """Outcome of one forked command."""
+    returncode: int
+    stdout: str
+    stderr: str
+    timed_out: bool
+    startup_ms: float
+    output_bytes: int = 0
+    output_limited: bool = False   # Killed for exceeding max_output_bytes
+
+
+def parse_python_command(command: str) -> Optional[list[str]]:
+    """
+    Command line of a command the zygote can run, else None.
+
+    `python -u main.py --x 1` gives ["python", "-u", "main.py", "--x", "1"].
+    """
+    if _needs_shell(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if len(argv) < 2 or argv[0] not in ("python", "python3", sys.executable):
+        return None
+    interpreter = shutil.which(argv[0])
+    if interpreter is None or os.path.realpath(interpreter) != os.path.realpath(sys.executable):
+        return None  # `python` on PATH is another interpreter
+    args = argv[1:]
+    i = 0
+    while i < len(args) and args[i] in ALLOWED_FLAGS:
+        i += 1
+    if i == len(args):
+        return None  # Interactive interpreter
+    first = args[i]
+    if first in ("-m", "-c"):
+        return argv if i + 1 < len(args) else None
+    return None if first.startswith("-") else argv
+
+
+def _needs_shell(command: str) -> bool:
+    """Whether the shell would do more than split command into words."""
+    quote = None
+    for ch in command:
+        if quote == "'":
+            if ch == "'":
+                quote = None
+        elif quote == '"':
+            if ch == '"':
+                quote = None
+            elif ch in DOUBLE_QUOTED_SHELL_CHARACTERS:
+                return True
+        elif ch in "'\"":
+            quote = ch
+        elif ch in SHELL_CHARACTERS:
+            return True
+    return quote is not None or "\n" in command
+
+
+class PythonZygote:
+    """Client for one zygote process (thread-safe; one request per connection)."""
+
+    def __init__(self):
+        self._process: Optional[subprocess.Popen] = None
+        self._socket_dir: Optional[str] = None
+        self._lock = threading.Lock()
+        self.cold_start_ms: Optional[float] = None
+
+    @property
+    def socket_path(self) -> str:
+        return os.path.join(self._socket_dir, "zygote.sock")
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        """Start the zygote and wait until it accepts requests."""
+        if not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"):
+            raise ZygoteError("fork server needs os.fork and Unix sockets")
+        from .isolation import _worker_env
+
+        with self._lock:
+            if self.running:
+                return
+            self._socket_dir = tempfile.mkdtemp(prefix="vibe-zygote-")
+            env = {**_worker_env(), "PYTHONUNBUFFERED": "1"}
+            self._process = subprocess.Popen(
+                [sys.executable, "-m", __name__, self.socket_path],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=env,
+                start_new_session=True,
+            )
+            ready = _readline_with_timeout(self._process.stdout, START_TIMEOUT)
+            if ready.strip() != b"ready":
+                self._stop_locked()
+                raise ZygoteError("fork server did not start")
+        if self.cold_start_ms is None:
+            self.cold_start_ms = measure_cold_start()
+
+    def stop(self):
+        with self._lock:
+            self._stop_locked()
+
+    def _stop_locked(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+            self._process.stdout.close()
+            self._process = None
+        if self._socket_dir is not None:
+            shutil.rmtree(self._socket_dir, ignore_errors=True)
+            self._socket_dir = None
+
+    def run(
+        self,
+        argv: list[str],
+        cwd: Path,
+        env: dict[str, str],
+        timeout: float,
+        stdout: Optional[BoundedCapture] = None,
+        stderr: Optional[BoundedCapture] = None,
+        max_output_bytes: Optional[int] = None,
+        limits: Optional[ResourceLimits] = None,
+    ) -> ZygoteRun:
+        """
+        Run a parse_python_command() command line in a forked child.
+
+        Output is streamed into stdout/stderr (default: keep everything);
+        the command is killed once both together pass max_output_bytes.
+        limits' rlimits are set in the child before the command runs.
+
+        Raises:
+            ZygoteError: before the command started (safe to retry elsewhere)
+        """
+        if not self.running:
+            raise ZygoteError("fork server is not running")
+        stdout = stdout if stdout is not None else BoundedCapture(sys.maxsize, 0)
+        stderr = stderr if stderr is not None else BoundedCapture(sys.maxsize, 0)
+        out_read, out_write = os.pipe()
+        err_read, err_write = os.pipe()
+        start = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        try:
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                conn.settimeout(START_TIMEOUT)
+                conn.connect(self.socket_path)
+                socket.send_fds(conn, [b"\0"], [out_write, err_write])
+                os.close(out_write)
+                os.close(err_write)
+                out_write = err_write = None
+                conn.sendall(json.dumps({
+                    "argv": argv, "cwd": str(cwd), "env": env,
+                    "limits": [limits.cpu_seconds, limits.memory_mb] if limits is not None else None,
+                }).encode() + b"\n")
+                reader = conn.makefile("rb")
+                started = json.loads(reader.readline() or b"null")
+                if not started or "started" not in started:
+                    raise ZygoteError("fork server did not start the command")
+            except (OSError, ValueError) as e:
+                conn.close()
+                raise ZygoteError(f"fork server unavailable: {e}") from e
+            startup_ms = (time.perf_counter() - start) * 1000
+            pid = started["started"]
+
+            returncode = -1
+            outcome = pump({out_read: stdout, err_read: stderr}, deadline, max_output_bytes)
+            if outcome != EOF:
+                _kill_group(pid)
+            conn.settimeout(max(0.0, deadline - time.monotonic()) if outcome == EOF else START_TIMEOUT)
+            try:
+                finished = json.loads(reader.readline() or b"null")
+                if finished is not None:
+                    returncode = finished["exit"]
+            except (socket.timeout, TimeoutError):
+                outcome = TIMEOUT  # Closed its output but kept running
+                _kill_group(pid)
+            finally:
+                conn.close()
+
+            return ZygoteRun(
+                returncode=returncode,
+                stdout=stdout.text(),
+                stderr=stderr.text(),
+                timed_out=outcome == TIMEOUT,
+                startup_ms=startup_ms,
+                output_bytes=stdout.total_bytes + stderr.total_bytes,
+                output_limited=outcome == OVER_BUDGET,
+            )
+        finally:
+            for fd in (out_read, err_read, out_write, err_write):
+                if fd is not None:
+                    os.close(fd)
+
+
+_shared: Optional[PythonZygote] = None
+_shared_lock = threading.Lock()
+
+
+def shared_zygote() -> Optional[PythonZygote]:
+    """The process-wide zygote, started on first use (None if unsupported)."""
+    global _shared
+    with _shared_lock:
+        if _shared is None or not _shared.running:
+            zygote = PythonZygote()
+            try:
+                zygote.start()
+            except (ZygoteError, OSError):
+                return None
+            _shared = zygote
+        return _shared
+
+
+def stop_shared_zygote():
+    """Stop the process-wide zygote if one was started."""
+    global _shared
+    with _shared_lock:
+        if _shared is not None:
+            _shared.stop()
+            _shared = None
+
+
+def measure_cold_start(samples: int = 3) -> float:
+    """Median milliseconds for `python -c pass` through the shell."""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        subprocess.run(f"{shlex.quote(sys.executable)} -c pass", shell=True, capture_output=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _readline_with_timeout(stream, timeout: float) -> bytes:
+    """readline() that gives up (returning b"") after timeout seconds."""
+    result = []
+    reader = threading.Thread(target=lambda: result.append(stream.readline()), daemon=True)
+    reader.start()
+    reader.join(timeout)
+    return result[0] if result else b""
+
+
+def _kill_group(pid: int):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+# --- Zygote process -----------------------------------------------------------
+
+
+def _serve(socket_path: str):
+    """Zygote main loop: fork a monitor per connection."""
+    global _startup_modules
+    _startup_modules = _measure_startup_modules()
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen(64)
+    listener.settimeout(1.0)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # Monitors are reaped automatically
+    parent = os.getppid()
+    sys.stdout.write("ready\n")
+    sys.stdout.flush()
+
+    while os.getppid() == parent:  # Exit with the process that started us
+        try:
+            conn, _ = listener.accept()
+        except socket.timeout:
+            continue
+        if os.fork() == 0:
+            listener.close()
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            try:
+                _monitor(conn)
+            finally:
+                os._exit(0)
+        conn.close()
+
+
+def _monitor(conn: socket.socket):
+    """Fork the command's process, wait for it and report its exit code."""
+    conn.settimeout(START_TIMEOUT)
+    _, output_fds, _, _ = socket.recv_fds(conn, 1, 2)
+    request = json.loads(conn.makefile("rb").readline())
+    pid = os.fork()
+    if pid == 0:
+        _child(conn, request, output_fds)
+    for fd in output_fds:
+        os.close(fd)  # Else the client never sees EOF before we exit
+    _, status = os.waitpid(pid, 0)
+    try:
+        conn.sendall(json.dumps({"exit": os.waitstatus_to_exitcode(status)}).encode() + b"\n")
+    except OSError:
+        pass  # Client gave up (timeout)
+
+
+def _child(conn: socket.socket, request: dict, output_fds: list[int]):
+    """Become the command: new session, cwd, env, stdio, then run it."""
+    os.setsid()
+    null = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(null, 0)
+    for fd, target in zip((1, 2), output_fds):
+        os.dup2(target, fd)
+        os.close(target)
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+    if request.get("limits"):
+        cpu_seconds, memory_mb = request["limits"]
+        ResourceLimits(cpu_seconds=cpu_seconds, memory_mb=memory_mb).apply()
+    if "random" in sys.modules:
+        sys.modules["random"].seed()  # Else every fork repeats the zygote's sequence
+    conn.sendall(json.dumps({"started": os.getpid()}).encode() + b"\n")
+    conn.close()
+    os._exit(_run_python(request["argv"]))
+
+
+def _run_python(argv: list[str]) -> int:
+    """Run a `python ...` command line the way the interpreter would; return the exit code."""
+    program, args = argv[0], argv[1:]
+    while args[0] in ALLOWED_FLAGS:
+        if args[0] == "-B":
+            sys.dont_write_bytecode = True
+        args = args[1:]
+    del sys.path[0]  # The zygote's own script directory
+    try:
+        try:
+            if args[0] == "-m":
+                sys.path.insert(0, os.getcwd())
+                _forget_shadowed_modules(os.getcwd())
+                if importlib.util.find_spec(args[1]) is None:
+                    sys.stderr.write(f"{sys.executable}: No module named {args[1]}\n")
+                    return 1
+                sys.argv = [args[1], *args[2:]]
+                runpy.run_module(args[1], run_name="__main__", alter_sys=True)
+            elif args[0] == "-c":
+                sys.path.insert(0, "")
+                _forget_shadowed_modules(os.getcwd())
+                sys.argv = ["-c", *args[2:]]
+                main = types.ModuleType("__main__")
+                main.__builtins__ = builtins
+                sys.modules["__main__"] = main
+                exec(compile(args[1], "<string>", "exec"), main.__dict__)
+            else:
+                script = os.path.abspath(args[0])
+                if not os.path.exists(script):
+                    sys.stderr.write(
+                        f"{program}: can't open file {script!r}: "
+                        f"[Errno 2] No such file or directory\n"
+                    )
+                    return 2
+                sys.path.insert(0, os.path.dirname(script))
+                _forget_shadowed_modules(os.path.dirname(script))
+                sys.argv = list(args)
+                runpy.run_path(script, run_name="__main__")
+            code = 0
+        except SystemExit as e:
+            code = _exit_code(e.code)
+        except BaseException as e:
+            _print_user_traceback(e)
+            code = 1
+        for thread in threading.enumerate():
+            if thread is not threading.current_thread() and not thread.daemon:
+                thread.join()
+        atexit._run_exitfuncs()
+        return code
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+
+
+def _forget_shadowed_modules(directory: str):
+    """
+    Drop loaded modules that a file or package in directory shadows.
+
+    The shell's interpreter would import the workspace's statistics.py or
+    copy.py instead of the stdlib one; forgetting the zygote's copy (and
+    its submodules) makes the next import find the workspace file too.
+    This covers everything the zygote has loaded, preloaded or pulled in
+    transitively, except modules a cold interpreter has already loaded
+    at startup (_startup_modules), which the shell would not re-import.
+    """
+    try:
+        listing = os.listdir(directory)
+    except OSError:
+        return
+    suffixes = importlib.machinery.all_suffixes()
+    shadowing = set()
+    for entry in listing:
+        if os.path.isdir(os.path.join(directory, entry)):
+            if any(os.path.isfile(os.path.join(directory, entry, f"__init__{s}")) for s in suffixes):
+                shadowing.add(entry)
+        else:
+            for suffix in suffixes:
+                if entry.endswith(suffix):
+                    shadowing.add(entry[:-len(suffix)])
+    loaded = {name.split(".")[0] for name in sys.modules}
+    for top in (shadowing & loaded) - _startup_modules - set(sys.builtin_module_names):
+        for name in [m for m in sys.modules if m == top or m.startswith(f"{top}.")]:
+            del sys.modules[name]
+
+
+def _measure_startup_modules() -> frozenset:
+    """Top-level modules a cold interpreter has loaded before running user code."""
+    try:
+        output = subprocess.run(
+            [sys.executable, "-c", "import sys; print(' '.join(sys.modules))"],
+            capture_output=True, text=True, timeout=START_TIMEOUT, check=True,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return frozenset()
+    return frozenset(name.split(".")[0] for name in output.split())
+
+
+def _exit_code(code) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    sys.stderr.write(f"{code}\n")
+    return 1
+
+
+def _print_user_traceback(error: BaseException):
+    """Print a traceback without the zygote's and runpy's frames."""
+    tb = error.__traceback__
+    internal = {os.path.abspath(__file__), os.path.abspath(runpy.__file__)}
+    while tb is not None and (
+        tb.tb_frame.f_code.co_filename == "<frozen runpy>"
+        or os.path.abspath(tb.tb_frame.f_code.co_filename) in internal
+    ):
+        tb = tb.tb_next
+    traceback.print_exception(type(error), error, tb)
+
+
+if __name__ == "__main__":
+    _serve(sys.argv[1])
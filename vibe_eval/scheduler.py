@@ -0,0 +1,133 @@
+"""
+Concurrency limits for running many (case, model) pairs at once.
+
+The runner's stage pipeline bounds total concurrency (--jobs, --stage-workers);
+ProviderLimiter additionally caps how many agent sessions may talk to one
+provider at the same time, so a wide sweep does not hammer a single upstream.
+Request-level throughput (requests/min, tokens/min, 429 back-off) is handled
+by the shared limiters in models.ratelimit, configured via --rate-limit.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from .models.base import provider_key
+from .models.ratelimit import RateLimitConfig
+
+# Local LM Studio serves one generation at a time
+DEFAULT_PROVIDER_LIMITS = {
+    "local": 1,
+}
+
+
+PIPELINE_STAGES = ("generate", "test", "validate", "score")
+
+
+def _parse_counts(specs: tuple[str, ...], label: str) -> dict[str, int]:
+    """Parse "name=N" specs into a dict of positive integers."""
+    counts = {}
+    for spec in specs:
+        if "=" not in spec:
+            raise ValueError(f"Expected {label}=N, got '{spec}'")
+        name, value = spec.split("=", 1)
+        try:
+            count = int(value)
+        except ValueError:
+            raise ValueError(f"Expected {label}=N, got '{spec}'")
+        if count < 1:
+            raise ValueError(f"Value must be >= 1, got '{spec}'")
+        counts[name.strip().lower()] = count
+    return counts
+
+
+def parse_provider_limits(specs: tuple[str, ...]) -> dict[str, int]:
+    """
+    Parse CLI provider limits of the form "provider=N".
+
+    Raises:
+        ValueError: If a spec is malformed or N is not a positive integer
+    """
+    return _parse_counts(specs, "provider")
+
+
+def parse_stage_workers(specs: tuple[str, ...]) -> dict[str, int]:
+    """
+    Parse CLI stage worker counts of the form "stage=N".
+
+    Raises:
+        ValueError: If a spec is malformed or names an unknown stage
+    """
+    workers = _parse_counts(specs, "stage")
+    unknown = set(workers) - set(PIPELINE_STAGES)
+    if unknown:
+        raise ValueError(
+            f"Unknown stage(s): {', '.join(sorted(unknown))} "
+            f"(expected {', '.join(PIPELINE_STAGES)})"
+        )
+    return workers
+
+
+def parse_rate_limits(specs: tuple[str, ...]) -> dict[str, RateLimitConfig]:
+    """
+    Parse CLI rate limits of the form "key=RPM[:TPM]".
+
+    key is a provider ("anthropic") or a full model ID
+    ("anthropic/claude-opus-4.5"). RPM is requests/min, TPM tokens/min;
+    either may be left empty to leave it unlimited ("openai=:200000").
+
+    Raises:
+        ValueError: If a spec is malformed or a limit is not positive
+    """
+    limits = {}
+    for spec in specs:
+        if "=" not in spec:
+            raise ValueError(f"Expected key=RPM[:TPM], got '{spec}'")
+        key, value = spec.split("=", 1)
+        rpm, _, tpm = value.partition(":")
+        try:
+            requests_per_minute = float(rpm) if rpm else None
+            tokens_per_minute = float(tpm) if tpm else None
+        except ValueError:
+            raise ValueError(f"Expected key=RPM[:TPM], got '{spec}'")
+        if requests_per_minute is None and tokens_per_minute is None:
+            raise ValueError(f"No limit given in '{spec}'")
+        if any(v is not None and v <= 0 for v in (requests_per_minute, tokens_per_minute)):
+            raise ValueError(f"Limits must be > 0, got '{spec}'")
+        limits[key.strip().lower()] = RateLimitConfig(
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+        )
+    return limits
+
+
+class ProviderLimiter:
+    """
+    Per-provider concurrency caps shared by all runner workers.
+
+    Providers without an explicit limit are bounded only by the worker pool.
+    """
+
+    def __init__(self, limits: Optional[dict[str, int]] = None):
+        """
+        Initialize limiter.
+
+        Args:
+            limits: Provider name -> max concurrent sessions
+                    (merged over DEFAULT_PROVIDER_LIMITS)
+        """
+        self.limits = {**DEFAULT_PROVIDER_LIMITS, **(limits or {})}
+        self._semaphores = {
+            name: threading.BoundedSemaphore(limit)
+            for name, limit in self.limits.items()
+        }
+
+    @contextmanager
+    def slot(self, model_id: str) -> Iterator[None]:
+        """Hold a provider slot for the duration of the block."""
+        semaphore = self._semaphores.get(provider_key(model_id))
+        if semaphore is None:
+            yield
+            return
+        with semaphore:
+            yield
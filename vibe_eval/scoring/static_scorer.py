@@ -2,6 +2,7 @@
 Static code analysis scoring.
 
 V3: Analyzes code quality without execution.
+V3.1: Files and contents come from the shared WorkspaceIndex.
 """
 
 import ast
@@ -10,6 +11,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from ..sandbox.workspace_index import WorkspaceIndex
+
 
 @dataclass
 class StaticReport:
@@ -109,40 +112,41 @@ class StaticAnalyzer:
     Analyzes Python and JavaScript code without execution.
     """
     
-    def analyze(self, workspace: Path) -> StaticReport:
+    def analyze(self, workspace: Path, index: Optional[WorkspaceIndex] = None) -> StaticReport:
         """
         Analyze all code files in workspace.
         
         Args:
             workspace: Directory containing code
+            index: Scan of the workspace (default: WorkspaceIndex.get())
             
         Returns:
             StaticReport with quality metrics
         """
-        workspace = Path(workspace)
+        index = index or WorkspaceIndex.get(workspace)
         report = StaticReport()
         
         # Find code files
-        python_files = list(workspace.glob("**/*.py"))
-        html_files = list(workspace.glob("**/*.html"))
-        js_files = list(workspace.glob("**/*.js"))
+        python_files = index.files(".py")
+        html_files = index.files(".html")
+        js_files = index.files(".js")
         
         # Analyze Python files
         for filepath in python_files:
-            self._analyze_python(filepath, report)
+            self._analyze_python(filepath, report, index)
         
         # Analyze HTML/JS files
         for filepath in html_files + js_files:
-            self._analyze_html_js(filepath, report)
+            self._analyze_html_js(filepath, report, index)
         
         report.files_analyzed = len(python_files) + len(html_files) + len(js_files)
         
         return report
     
-    def _analyze_python(self, filepath: Path, report: StaticReport):
+    def _analyze_python(self, filepath: Path, report: StaticReport, index: Optional[WorkspaceIndex] = None):
         """Analyze a Python file."""
         try:
-            content = filepath.read_text()
+            content = index.read_text(filepath) if index else filepath.read_text()
             lines = content.split('\n')
             report.total_lines += len(lines)
             
@@ -229,10 +233,10 @@ class StaticAnalyzer:
                 "message": str(e)
             })
     
-    def _analyze_html_js(self, filepath: Path, report: StaticReport):
+    def _analyze_html_js(self, filepath: Path, report: StaticReport, index: Optional[WorkspaceIndex] = None):
         """Analyze HTML or JavaScript file."""
         try:
-            content = filepath.read_text()
+            content = index.read_text(filepath) if index else filepath.read_text()
             lines = content.split('\n')
             report.total_lines += len(lines)
             
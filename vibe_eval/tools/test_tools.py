@@ -2,6 +2,9 @@
 Testing tools for the agent.
 
 Provides run_tests and lint_code capabilities.
+
+lint_code scans the workspace with a fresh WorkspaceIndex: the agent is
+still editing files, so a published index could be stale.
 """
 
 import ast
@@ -10,6 +13,8 @@ import sys
 from pathlib import Path
 from typing import Optional
 
+from ..sandbox.workspace_index import WorkspaceIndex
+
 
 def run_tests_tool(workspace: Path, test_command: Optional[str] = None) -> dict:
     """
@@ -95,10 +100,11 @@ def lint_code_tool(workspace: Path, filepath: Optional[str] = None) -> dict:
     
     try:
         # Determine files to check
+        workspace = Path(workspace).absolute()
         if filepath:
             files = [workspace / filepath]
         else:
-            files = list(workspace.glob("**/*.py"))
+            files = WorkspaceIndex.build(workspace).files(".py")
         
         for file in files:
             if not file.exists():
@@ -0,0 +1,195 @@
+"""
+=============================================================================
+SCRIPT NAME: tracing.py
+=============================================================================
+
+Timed spans across agent sessions, sandbox, tests, validator and judges,
+exported as a Chrome trace.
+
+VERSION: 1.0
+LAST UPDATED: 2026-10-16
+
+DESCRIPTION:
+AgentMetrics counts turns and tool calls but does not say where a
+session's time went. Code wraps the interesting work in spans:
+
+    with tracing.span("sandbox.command", "sandbox", command=command) as s:
+        ...
+        s.set(return_code=0)
+
+Every span measures its duration (span.seconds) whether or not tracing is
+on; while a Tracer is active (start_tracing()) finished spans are also
+recorded. Tracer.export() writes the Chrome trace event format, which
+chrome://tracing and ui.perfetto.dev open directly.
+
+Spans are grouped into tracks (rows in the viewer). tracing.track(name)
+sets the track for everything inside it, including asyncio tasks it
+starts; nested tracks are joined with "/" (e.g. "calc/gpt-4o/judge
+claude"). Outside any track a span lands on its thread's track. Context
+variables do not follow work into thread pools by themselves; submit
+through contextvars.copy_context().run to keep the track.
+
+=============================================================================
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Beyond this many recorded spans, further spans are counted but dropped
+MAX_SPANS = 1_000_000
+
+_track: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("vibe_trace_track", default=None)
+
+_active: Optional["Tracer"] = None
+
+
+class Span:
+    """One timed piece of work; use as a context manager."""
+
+    __slots__ = ("name", "category", "attributes", "track", "start_ns", "end_ns")
+
+    def __init__(self, name: str, category: str, attributes: dict):
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+        self.track: Optional[str] = None
+        self.start_ns = 0
+        self.end_ns: Optional[int] = None
+
+    def set(self, **attributes) -> "Span":
+        """Add attributes (e.g. results known only at the end)."""
+        self.attributes.update(attributes)
+        return self
+
+    @property
+    def seconds(self) -> float:
+        """Duration so far, or in total once the span has ended."""
+        end = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end - self.start_ns) / 1e9
+
+    def __enter__(self) -> "Span":
+        self.track = current_track()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attributes.setdefault("error", f"{exc_type.__name__}: {exc}" if str(exc) else exc_type.__name__)
+        tracer = _active
+        if tracer is not None:
+            tracer.record(self)
+        return False
+
+
+class Tracer:
+    """Collects finished spans (thread-safe)."""
+
+    def __init__(self, max_spans: int = MAX_SPANS):
+        self.max_spans = max_spans
+        self.origin_ns = time.perf_counter_ns()
+        self.started_at = datetime.now()
+        self.dropped = 0
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def record(self, span: Span):
+        with self._lock:
+            if len(self._spans) < self.max_spans:
+                self._spans.append(span)
+            else:
+                self.dropped += 1
+
+    def spans(self, name: Optional[str] = None) -> list[Span]:
+        """Recorded spans (optionally only those called name), in end order."""
+        with self._lock:
+            spans = list(self._spans)
+        return [s for s in spans if name is None or s.name == name]
+
+    def to_chrome_trace(self) -> dict:
+        """The recorded spans in Chrome trace event format."""
+        pid = os.getpid()
+        spans = sorted(self.spans(), key=lambda s: s.start_ns)
+        tracks: dict[str, int] = {}
+        for s in spans:
+            tracks.setdefault(s.track, len(tracks) + 1)
+
+        events = []
+        for track, tid in tracks.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": track}})
+            events.append({"name": "thread_sort_index", "ph": "M", "pid": pid, "tid": tid, "args": {"sort_index": tid}})
+        for s in spans:
+            events.append({
+                "name": s.name,
+                "cat": s.category,
+                "ph": "X",
+                "ts": (s.start_ns - self.origin_ns) / 1000,
+                "dur": (s.end_ns - s.start_ns) / 1000,
+                "pid": pid,
+                "tid": tracks[s.track],
+                "args": {k: _json_safe(v) for k, v in s.attributes.items()},
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"started_at": self.started_at.isoformat(), "dropped_spans": self.dropped},
+        }
+
+    def export(self, path: Path) -> Path:
+        """Write the Chrome trace JSON to path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace()))
+        return path
+
+
+def span(name: str, category: str = "vibe", /, **attributes) -> Span:
+    """A new span; time something with `with span(...) as s:`."""
+    return Span(name, category, attributes)
+
+
+@contextmanager
+def track(name: str) -> Iterator[str]:
+    """Put spans inside on track name (nested under the current track)."""
+    parent = _track.get()
+    full = f"{parent}/{name}" if parent else name
+    token = _track.set(full)
+    try:
+        yield full
+    finally:
+        _track.reset(token)
+
+
+def current_track() -> str:
+    return _track.get() or f"thread {threading.current_thread().name}"
+
+
+def start_tracing(max_spans: int = MAX_SPANS) -> Tracer:
+    """Start recording spans process-wide; returns the new Tracer."""
+    global _active
+    _active = Tracer(max_spans)
+    return _active
+
+
+def stop_tracing() -> Optional[Tracer]:
+    """Stop recording; returns the Tracer that was active (if any)."""
+    global _active
+    tracer, _active = _active, None
+    return tracer
+
+
+def active_tracer() -> Optional[Tracer]:
+    return _active
+
+
+def _json_safe(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)